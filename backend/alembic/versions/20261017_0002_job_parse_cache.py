@@ -0,0 +1,41 @@
+"""add job parse cache table
+
+Revision ID: 20261017_0002
+Revises: 20260220_0001
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0002"
+down_revision = "20260220_0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_parse_cache",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("cache_key", sa.String(length=64), nullable=False),
+        sa.Column("model", sa.String(length=200), nullable=False),
+        sa.Column("prompt_version", sa.String(length=32), nullable=False),
+        sa.Column("source_type", sa.String(length=50), nullable=True),
+        sa.Column("result", sa.JSON(), nullable=False),
+        sa.Column("size_bytes", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("hit_count", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("created_at", sa.DateTime(), nullable=True),
+        sa.Column("last_hit_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_job_parse_cache_cache_key", "job_parse_cache", ["cache_key"], unique=True)
+    op.create_index("ix_job_parse_cache_created_at", "job_parse_cache", ["created_at"])
+    op.create_index("ix_job_parse_cache_last_hit_at", "job_parse_cache", ["last_hit_at"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_parse_cache_last_hit_at", table_name="job_parse_cache")
+    op.drop_index("ix_job_parse_cache_created_at", table_name="job_parse_cache")
+    op.drop_index("ix_job_parse_cache_cache_key", table_name="job_parse_cache")
+    op.drop_table("job_parse_cache")
@@ -0,0 +1,39 @@
+"""add job match features table
+
+Revision ID: 20261017_0003
+Revises: 20261017_0002
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0003"
+down_revision = "20261017_0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "job_match_features",
+        sa.Column("job_id", sa.Integer(), sa.ForeignKey("jobs.id", ondelete="CASCADE"), primary_key=True),
+        sa.Column("is_active", sa.Boolean(), nullable=False, server_default=sa.true()),
+        sa.Column("skills", sa.JSON(), nullable=False),
+        sa.Column("skill_ids", sa.JSON(), nullable=False),
+        sa.Column("title_tokens", sa.JSON(), nullable=False),
+        sa.Column("location", sa.String(length=200), nullable=True),
+        sa.Column("raw_location", sa.String(length=200), nullable=True),
+        sa.Column("location_code", sa.String(length=50), nullable=True),
+        sa.Column("feature_version", sa.Integer(), nullable=False, server_default="1"),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+    op.create_index("ix_job_match_features_is_active", "job_match_features", ["is_active"])
+    op.create_index("ix_job_match_features_location_code", "job_match_features", ["location_code"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_match_features_location_code", table_name="job_match_features")
+    op.drop_index("ix_job_match_features_is_active", table_name="job_match_features")
+    op.drop_table("job_match_features")
@@ -0,0 +1,47 @@
+"""add match result cache keys and match state
+
+Revision ID: 20261017_0004
+Revises: 20261017_0003
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0004"
+down_revision = "20261017_0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("match_results", sa.Column("parse_version", sa.Integer(), nullable=True))
+    op.add_column("match_results", sa.Column("job_set_version", sa.Integer(), nullable=True))
+    op.add_column("match_results", sa.Column("filters_key", sa.String(length=64), nullable=True))
+    op.add_column("match_results", sa.Column("top_n", sa.Integer(), nullable=True))
+    op.add_column("match_results", sa.Column("rank", sa.Integer(), nullable=True))
+    op.create_index(
+        "ux_match_results_cache",
+        "match_results",
+        ["resume_id", "filters_key", "top_n", "job_id"],
+        unique=True,
+    )
+
+    op.create_table(
+        "match_state",
+        sa.Column("name", sa.String(length=50), primary_key=True),
+        sa.Column("value", sa.Integer(), nullable=False, server_default="0"),
+        sa.Column("updated_at", sa.DateTime(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("match_state")
+    op.drop_index("ux_match_results_cache", table_name="match_results")
+    with op.batch_alter_table("match_results") as batch_op:
+        batch_op.drop_column("rank")
+        batch_op.drop_column("top_n")
+        batch_op.drop_column("filters_key")
+        batch_op.drop_column("job_set_version")
+        batch_op.drop_column("parse_version")
@@ -0,0 +1,39 @@
+"""add structured job facet columns
+
+Revision ID: 20261017_0005
+Revises: 20261017_0004
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0005"
+down_revision = "20261017_0004"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows keep feature_version 1 and are recomputed by the feature backfill on startup
+    op.add_column("job_match_features", sa.Column("salary_min", sa.Integer(), nullable=True))
+    op.add_column("job_match_features", sa.Column("salary_max", sa.Integer(), nullable=True))
+    op.add_column("job_match_features", sa.Column("salary_period", sa.String(length=10), nullable=True))
+    op.add_column("job_match_features", sa.Column("education_level", sa.Integer(), nullable=True))
+    op.add_column("job_match_features", sa.Column("experience_band", sa.Integer(), nullable=True))
+    op.create_index("ix_job_match_features_active_city", "job_match_features", ["is_active", "location_code"])
+    op.create_index("ix_job_match_features_salary", "job_match_features", ["salary_period", "salary_min", "salary_max"])
+    op.create_index("ix_job_match_features_requirements", "job_match_features", ["education_level", "experience_band"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_job_match_features_requirements", table_name="job_match_features")
+    op.drop_index("ix_job_match_features_salary", table_name="job_match_features")
+    op.drop_index("ix_job_match_features_active_city", table_name="job_match_features")
+    with op.batch_alter_table("job_match_features") as batch_op:
+        batch_op.drop_column("experience_band")
+        batch_op.drop_column("education_level")
+        batch_op.drop_column("salary_period")
+        batch_op.drop_column("salary_max")
+        batch_op.drop_column("salary_min")
@@ -0,0 +1,25 @@
+"""store match filters with cached match results
+
+Revision ID: 20261017_0006
+Revises: 20261017_0005
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0006"
+down_revision = "20261017_0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing filtered result sets keep NULL and are recomputed on their next request
+    op.add_column("match_results", sa.Column("filters", sa.JSON(), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("match_results") as batch_op:
+        batch_op.drop_column("filters")
@@ -0,0 +1,30 @@
+"""add full-text job search table
+
+Revision ID: 20261017_0007
+Revises: 20261017_0006
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261017_0007"
+down_revision = "20261017_0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # FTS5 is SQLite only; the table is filled with existing jobs on the next startup
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS job_search "
+        "USING fts5(title, company, body, tokenize='unicode61 remove_diacritics 2')"
+    )
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    op.execute("DROP TABLE IF EXISTS job_search")
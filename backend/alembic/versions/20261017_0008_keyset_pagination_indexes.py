@@ -0,0 +1,30 @@
+"""add composite indexes for keyset pagination
+
+Revision ID: 20261017_0008
+Revises: 20261017_0007
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+
+
+revision = "20261017_0008"
+down_revision = "20261017_0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_jobs_created", "jobs", ["created_at", "id"])
+    op.create_index("ix_jobs_status_created", "jobs", ["status", "created_at", "id"])
+    op.create_index("ix_deliveries_user_created", "deliveries", ["user_id", "created_at", "id"])
+    op.create_index("ix_industries_active_sort", "industries", ["is_active", "sort_order", "id"])
+    op.create_index("ix_tags_active_category", "tags", ["is_active", "category", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tags_active_category", table_name="tags")
+    op.drop_index("ix_industries_active_sort", table_name="industries")
+    op.drop_index("ix_deliveries_user_created", table_name="deliveries")
+    op.drop_index("ix_jobs_status_created", table_name="jobs")
+    op.drop_index("ix_jobs_created", table_name="jobs")
@@ -0,0 +1,25 @@
+"""store a fingerprint of the match-relevant job content
+
+Revision ID: 20261017_0009
+Revises: 20261017_0008
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0009"
+down_revision = "20261017_0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Existing rows keep NULL, so their next edit still invalidates cached matches
+    op.add_column("job_match_features", sa.Column("fingerprint", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("job_match_features") as batch_op:
+        batch_op.drop_column("fingerprint")
@@ -0,0 +1,27 @@
+"""make industries.sort_order NOT NULL
+
+Revision ID: 20261017_0010
+Revises: 20261017_0009
+Create Date: 2026-10-17 00:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision = "20261017_0010"
+down_revision = "20261017_0009"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Keyset pages compare (sort_order, id) tuples, which never match a NULL sort_order
+    op.execute("UPDATE industries SET sort_order = 0 WHERE sort_order IS NULL")
+    with op.batch_alter_table("industries") as batch_op:
+        batch_op.alter_column("sort_order", existing_type=sa.Integer(), nullable=False, server_default="0")
+
+
+def downgrade() -> None:
+    with op.batch_alter_table("industries") as batch_op:
+        batch_op.alter_column("sort_order", existing_type=sa.Integer(), nullable=True, server_default=None)
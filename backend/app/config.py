@@ -1,4 +1,5 @@
 from pydantic_settings import BaseSettings
+from typing import List, Dict, Any
 
 class Settings(BaseSettings):
     # Database
@@ -8,6 +9,36 @@ class Settings(BaseSettings):
     openai_api_key: str = ""
     openai_base_url: str = "https://api.openai.com/v1"
     openai_model: str = "gpt-4o-mini"
+    # Structured output mode for job parsing: auto/function/json/plain
+    llm_structured_output_mode: str = "auto"
+    llm_mode_reprobe_seconds: int = 3600
+    # LLM call governor; 0 disables the per-minute limits
+    llm_requests_per_minute: int = 0
+    llm_tokens_per_minute: int = 0
+    llm_max_concurrency: int = 8
+    llm_min_concurrency: int = 1
+    llm_max_retries: int = 4
+    llm_retry_base_delay: float = 1.0
+    llm_retry_max_delay: float = 30.0
+    llm_breaker_failure_threshold: int = 5
+    llm_breaker_cooldown_seconds: float = 30.0
+    # Extra OpenAI-compatible providers, JSON list of {name, base_url, model, api_key, weight}
+    llm_providers: List[Dict[str, Any]] = []
+    # Hedged requests: duplicate a call to the next provider once the primary exceeds its rolling p95
+    llm_hedge_enabled: bool = True
+    llm_hedge_default_delay: float = 8.0
+    llm_hedge_min_delay: float = 1.0
+    llm_hedge_min_samples: int = 20
+    llm_hedge_latency_window: int = 200
+    # Prompt token budgets for raw posting/resume text; overrides: {"model": {"job": n, "resume": n}}
+    prompt_budget_enabled: bool = True
+    prompt_budget_job_tokens: int = 2500
+    prompt_budget_resume_tokens: int = 6000
+    prompt_budget_model_overrides: Dict[str, Dict[str, int]] = {}
+    # LLM telemetry; prices are per 1K tokens in your billing currency, used for cost estimates
+    llm_stats_window: int = 1000
+    llm_prompt_cost_per_1k: float = 0.0
+    llm_completion_cost_per_1k: float = 0.0
     
     # Server
     host: str = "0.0.0.0"
@@ -17,6 +48,55 @@ class Settings(BaseSettings):
     resume_storage_path: str = "./data/resumes"
     resume_max_file_size_mb: int = 10
     resume_allowed_extensions: str = "pdf,doc,docx,txt"
+
+    # Local rule-based job parsing; postings at or above the threshold skip the LLM
+    job_fast_path_enabled: bool = True
+    job_fast_path_threshold: float = 0.85
+
+    # Resume-to-job match scoring: vector (NumPy) or index; compare runs both and counts mismatches
+    match_engine: str = "vector"
+    match_engine_compare: bool = False
+
+    # Serve repeated matches from stored results while the resume parse and job set are unchanged
+    match_cache_enabled: bool = True
+
+    # Default /api/ai/match mode: keyword, or semantic (local embeddings + ANN candidate retrieval, needs NumPy)
+    match_mode: str = "keyword"
+    semantic_index_dir: str = "./data/semantic"
+    semantic_dimensions: int = 128
+    semantic_candidates: int = 200
+    semantic_nprobe: int = 32
+
+    # Bulk matching (/api/ai/match/bulk): worker processes (0 = all cores) and resumes per shard
+    bulk_match_workers: int = 0
+    bulk_match_shard_size: int = 200
+    # Finished bulk match tasks are forgotten after this many seconds, or oldest first beyond the cap
+    bulk_match_task_ttl_seconds: int = 3600
+    bulk_match_max_tasks: int = 100
+
+    # Merge newly created jobs into stored match results in the background:
+    # seconds to collect a batch of new jobs, and stored result sets updated per transaction
+    incremental_match_enabled: bool = True
+    incremental_match_delay: float = 2.0
+    incremental_match_batch_size: int = 500
+
+    # Job browser facet counts (/api/jobs/facets): cache lifetime and filter combinations kept
+    facet_cache_ttl_seconds: int = 60
+    facet_cache_max_entries: int = 256
+
+    # Extra skill lexicon (JSON {"Canonical": ["synonym", ...]}) merged into the built-in one
+    skill_lexicon_path: str = ""
+
+    # Job parse cache
+    parse_cache_enabled: bool = True
+    parse_cache_max_entries: int = 5000
+    parse_cache_max_bytes: int = 50 * 1024 * 1024
+    parse_cache_ttl_days: int = 30
+
+    # Batch job parsing
+    parse_batch_concurrency: int = 4
+    parse_batch_max_items: int = 500
+    posting_split_max_chunks: int = 50
     
     class Config:
         env_file = ".env"
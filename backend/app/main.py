@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from app.routers import (
     job_router,
@@ -13,8 +14,12 @@ from app.routers import (
     analytics_router,
     admin_router,
 )
-from app.database import engine, Base
+from app.database import engine, Base, AsyncSessionLocal
+from app.services.match_features import backfill_job_features
+from app.services.incremental_match import incremental_matcher
+from app.services.job_search import job_search
 from app.services.llm_service import llm_service
+from app.services.llm_telemetry import llm_telemetry
 from contextlib import asynccontextmanager
 from app.config import settings
 from pathlib import Path
@@ -25,8 +30,17 @@ async def lifespan(app: FastAPI):
     Path(settings.resume_storage_path).mkdir(parents=True, exist_ok=True)
     async with engine.begin() as conn:
         await conn.run_sync(Base.metadata.create_all)
+        indexed = await job_search.ensure_table(conn)
+    if indexed:
+        print(f"🔎 Indexed {indexed} jobs for full-text search")
+    # Job list facet filters read job_match_features, so bring it up to date before serving
+    async with AsyncSessionLocal() as session:
+        backfilled = await backfill_job_features(session)
+    if backfilled:
+        print(f"🔄 Backfilled match features for {backfilled} jobs")
     yield
     # Shutdown
+    await incremental_matcher.stop()
     await engine.dispose()
 
 app = FastAPI(
@@ -75,3 +89,8 @@ async def root():
 @app.get("/health")
 async def health_check():
     return {"status": "healthy"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """LLM call counters and latency histograms in Prometheus text format"""
+    return llm_telemetry.render_prometheus()
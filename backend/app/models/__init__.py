@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime, JSON, ForeignKey, Text, Table, Float
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, JSON, ForeignKey, Text, Table, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from app.database import Base
@@ -18,11 +18,17 @@ class Industry(Base):
     code = Column(String(50), unique=True, nullable=False, index=True)
     name = Column(String(200), nullable=False)
     parent_id = Column(Integer, ForeignKey('industries.id'), nullable=True)
-    sort_order = Column(Integer, default=0)
+    # NOT NULL: keyset pages compare (sort_order, id) tuples, which skip NULLs
+    sort_order = Column(Integer, default=0, server_default='0', nullable=False)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Keyset pagination: (sort_order, id) of active industries
+        Index('ix_industries_active_sort', 'is_active', 'sort_order', 'id'),
+    )
+    
     # Self-referential relationship for parent-child hierarchy
     parent = relationship('Industry', remote_side=[id], backref='children')
     jobs = relationship('Job', back_populates='industry')
@@ -39,6 +45,10 @@ class Tag(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        Index('ix_tags_active_category', 'is_active', 'category', 'id'),
+    )
+    
     jobs = relationship('Job', secondary=job_tags, back_populates='tags')
 
 class Job(Base):
@@ -77,6 +87,12 @@ class Job(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # Keyset pagination of the job feed: newest first, optionally by status
+        Index('ix_jobs_created', 'created_at', 'id'),
+        Index('ix_jobs_status_created', 'status', 'created_at', 'id'),
+    )
+    
     # Relationships
     industry = relationship('Industry', back_populates='jobs')
     tags = relationship('Tag', secondary=job_tags, back_populates='jobs')
@@ -142,6 +158,11 @@ class Delivery(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     
+    __table_args__ = (
+        # 按用户分页：最新投递在前
+        Index('ix_deliveries_user_created', 'user_id', 'created_at', 'id'),
+    )
+    
     # Relationships
     job = relationship('Job', back_populates='deliveries')
 
@@ -247,8 +268,19 @@ class MatchResult(Base):
     reason_snippet = Column(Text, nullable=True)
     highlights = Column(JSON, nullable=True)
     template_recommendation = Column(String(100), nullable=True)
+    # 缓存键：同一简历、筛选条件和 top_n 只保留一组结果，解析版本或职位集版本变化时重算
+    parse_version = Column(Integer, nullable=True)
+    job_set_version = Column(Integer, nullable=True)
+    filters_key = Column(String(64), nullable=True)
+    filters = Column(JSON, nullable=True)  # 筛选条件原文，后台增量合并新职位时使用
+    top_n = Column(Integer, nullable=True)
+    rank = Column(Integer, nullable=True)
     created_at = Column(DateTime, default=datetime.utcnow)
 
+    __table_args__ = (
+        Index('ux_match_results_cache', 'resume_id', 'filters_key', 'top_n', 'job_id', unique=True),
+    )
+
     resume = relationship('Resume', back_populates='matches')
     job = relationship('Job')
 
@@ -287,3 +319,58 @@ class DeliveryLog(Base):
     delivery_job = relationship('DeliveryJob', back_populates='logs')
     job = relationship('Job')
     resume = relationship('Resume')
+
+
+class JobParseCache(Base):
+    """职位解析缓存 - 按规范化原文、模型和提示词版本缓存 LLM 解析结果"""
+    __tablename__ = 'job_parse_cache'
+
+    id = Column(Integer, primary_key=True, index=True)
+    cache_key = Column(String(64), unique=True, nullable=False, index=True)
+    model = Column(String(200), nullable=False)
+    prompt_version = Column(String(32), nullable=False)
+    source_type = Column(String(50), nullable=True)
+    result = Column(JSON, nullable=False)
+    size_bytes = Column(Integer, nullable=False, default=0)
+    hit_count = Column(Integer, nullable=False, default=0)
+    created_at = Column(DateTime, default=datetime.utcnow, index=True)
+    last_hit_at = Column(DateTime, default=datetime.utcnow, index=True)
+
+
+class JobMatchFeatures(Base):
+    """职位匹配特征 - 写入职位时预先计算，匹配时只读这张表，不加载完整的职位行"""
+    __tablename__ = 'job_match_features'
+
+    job_id = Column(Integer, ForeignKey('jobs.id', ondelete='CASCADE'), primary_key=True)
+    is_active = Column(Boolean, nullable=False, default=True, index=True)
+    skills = Column(JSON, nullable=False)        # 小写的标准技能名
+    skill_ids = Column(JSON, nullable=False)     # 技能在词典中的编号，词典外的技能没有编号
+    title_tokens = Column(JSON, nullable=False)  # 小写的职位名称分词
+    location = Column(String(200), nullable=True)       # 小写地点，与简历关键词比对
+    raw_location = Column(String(200), nullable=True)   # 原始地点，用于按地点筛选
+    location_code = Column(String(50), nullable=True, index=True)  # 规范化城市，如 "北京"
+    # 由 requirements 解析出的筛选字段，见 app/services/job_facets.py
+    salary_min = Column(Integer, nullable=True)          # 元，面议或无法解析时为空
+    salary_max = Column(Integer, nullable=True)
+    salary_period = Column(String(10), nullable=True)    # hour/day/month/year
+    education_level = Column(Integer, nullable=True)     # 0 不限 1 高中 2 大专 3 本科 4 硕士 5 博士
+    experience_band = Column(Integer, nullable=True)     # 0 不限/应届 1 1-3年 2 3-5年 3 5-10年 4 10年以上
+    feature_version = Column(Integer, nullable=False, default=1)
+    # 影响匹配结果的内容（特征、状态、标题、要求、原文）的哈希，没变化的编辑不使匹配缓存失效
+    fingerprint = Column(String(64), nullable=True)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+    __table_args__ = (
+        Index('ix_job_match_features_active_city', 'is_active', 'location_code'),
+        Index('ix_job_match_features_salary', 'salary_period', 'salary_min', 'salary_max'),
+        Index('ix_job_match_features_requirements', 'education_level', 'experience_band'),
+    )
+
+
+class MatchState(Base):
+    """匹配状态计数器 - 如职位集版本，写入可能影响匹配结果的职位时加一，用于使匹配结果缓存失效"""
+    __tablename__ = 'match_state'
+
+    name = Column(String(50), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
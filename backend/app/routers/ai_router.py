@@ -2,10 +2,20 @@ from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc
 from app.database import get_db
-from app.models import ResumeParse, Job, MatchResult
-from app.schemas import MatchRequest, MatchItem
-from app.services.llm_service import llm_service
-from typing import List
+from app.config import settings
+from app.models import ResumeParse, JobMatchFeatures, MatchResult, Job
+from app.schemas import MatchRequest, BulkMatchRequest, MatchItem
+from app.services.match_index import match_index
+from app.services.match_engine import match_engine
+from app.services.match_cache import match_cache, get_job_set_version, bump_job_set_version
+from app.services.bulk_match import bulk_match_runner
+from app.services.semantic_index import semantic_index
+from app.services.job_facets import facet_conditions
+from app.services.incremental_match import incremental_matcher
+from datetime import datetime, timedelta
+from typing import List, Optional
+
+MATCH_MODES = ("keyword", "semantic")
 
 router = APIRouter(prefix="/api/ai", tags=["AI Matching"])
 
@@ -19,48 +29,172 @@ async def match_resume(
         select(ResumeParse)
         .where(ResumeParse.resume_id == request.resume_id)
         .order_by(desc(ResumeParse.version))
+        .limit(1)
     )
     latest_parse = parse_result.scalar_one_or_none()
     if not latest_parse:
         raise HTTPException(status_code=404, detail="Resume parse not found")
 
-    query = select(Job).where(Job.status == "active")
-    if request.filters:
-        location = request.filters.get("location")
-        if location:
-            query = query.where(Job.requirements["location"].as_string() == location)
-
-    jobs_result = await db.execute(query)
-    jobs = jobs_result.scalars().all()
-    if not jobs:
-        return []
-
-    jobs_data = [
-        {
-            "id": job.id,
-            "title": job.title,
-            "requirements": job.requirements or {},
-        }
-        for job in jobs
-    ]
-
-    matched = llm_service.match_resume_to_jobs(
-        resume_fields=latest_parse.extracted_fields or {},
-        jobs=jobs_data,
-        top_n=request.top_n
+    mode = request.mode or settings.match_mode
+    if mode not in MATCH_MODES:
+        raise HTTPException(status_code=400, detail=f"Unknown match mode: {mode}")
+    if mode == "semantic" and not semantic_index.available:
+        print("⚠️ Semantic matching needs NumPy, using keyword matching")
+        mode = "keyword"
+    # Semantic results are cached separately; keyword results keep the plain filters key
+    cache_filters = {**(request.filters or {}), "mode": mode} if mode != "keyword" else request.filters
+
+    # Read the job-set version before matching, so a job written meanwhile only makes this entry stale
+    job_set_version = await get_job_set_version(db)
+    cached = await match_cache.get(
+        db, request.resume_id, latest_parse.version, job_set_version, cache_filters, request.top_n
     )
+    if cached is not None:
+        return cached
 
-    for item in matched:
-        db.add(
-            MatchResult(
-                resume_id=request.resume_id,
-                job_id=item["job_id"],
-                score=item["score"],
-                reason_snippet="；".join(item.get("highlights", [])),
-                highlights=item.get("highlights", []),
-                template_recommendation=item.get("template_recommendation")
-            )
+    await match_index.ensure_loaded()
+    location = (request.filters or {}).get("location")
+    try:
+        conditions = facet_conditions(request.filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    job_ids = None
+    if conditions:
+        # Facet filters narrow the pool through the indexed feature columns before scoring
+        result = await db.execute(
+            select(JobMatchFeatures.job_id).where(JobMatchFeatures.is_active.is_(True), *conditions)
+        )
+        job_ids = set(result.scalars().all())
+    if mode == "semantic":
+        await semantic_index.ensure_loaded()
+        matched = semantic_index.match(
+            latest_parse.extracted_fields or {}, request.top_n, location or None, match_index, job_ids
+        )
+    else:
+        matched = match_engine.match(
+            resume_fields=latest_parse.extracted_fields or {},
+            top_n=request.top_n,
+            location=location or None,
+            job_ids=job_ids
         )
-    await db.commit()
 
+    await match_cache.put(
+        db, request.resume_id, latest_parse.version, job_set_version, cache_filters, request.top_n, matched
+    )
+    await db.commit()
     return matched
+
+
+@router.get("/match/index")
+async def get_match_index_stats():
+    """Get the size of the inverted match index, the scoring engine in use, its timings, the result cache and the semantic index"""
+    return {
+        **match_index.get_stats(),
+        "engine": match_engine.get_stats(),
+        "cache": match_cache.get_stats(),
+        "semantic": semantic_index.get_stats(),
+        "incremental": incremental_matcher.get_stats(),
+    }
+
+
+@router.get("/match/new", response_model=List[MatchItem])
+async def get_new_matches(
+    resume_id: int,
+    since: Optional[datetime] = None,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Jobs created since `since` (default: the last 24 hours) that made it into
+    any up-to-date stored match result of the resume, best score first.
+    New jobs are merged into stored results in the background shortly after they are created.
+    """
+    since = since or datetime.utcnow() - timedelta(days=1)
+    parse_result = await db.execute(
+        select(ResumeParse.version)
+        .where(ResumeParse.resume_id == resume_id)
+        .order_by(desc(ResumeParse.version))
+        .limit(1)
+    )
+    parse_version = parse_result.scalar()
+    if parse_version is None:
+        raise HTTPException(status_code=404, detail="Resume parse not found")
+    job_set_version = await get_job_set_version(db)
+    result = await db.execute(
+        select(MatchResult.job_id, MatchResult.score, MatchResult.highlights, MatchResult.template_recommendation)
+        .join(Job, Job.id == MatchResult.job_id)
+        .where(
+            MatchResult.resume_id == resume_id,
+            MatchResult.parse_version == parse_version,
+            MatchResult.job_set_version == job_set_version,
+            Job.created_at >= since,
+        )
+        .order_by(desc(MatchResult.score), MatchResult.job_id)
+    )
+    matches = {}
+    for job_id, score, highlights, template in result.all():
+        matches.setdefault(job_id, {
+            "job_id": job_id,
+            "score": score,
+            "highlights": highlights or [],
+            "template_recommendation": template,
+        })
+    return list(matches.values())
+
+
+@router.post("/match/index/rebuild")
+async def rebuild_match_index(db: AsyncSession = Depends(get_db)):
+    """Rebuild the match index from the jobs table (e.g. after editing jobs outside the API); cached results are invalidated"""
+    await bump_job_set_version(db)
+    await db.commit()
+    match_index.invalidate()
+    await match_index.ensure_loaded()
+    return {**match_index.get_stats(), "engine": match_engine.get_stats(), "cache": match_cache.get_stats()}
+
+
+@router.post("/match/semantic/rebuild")
+async def rebuild_semantic_index(db: AsyncSession = Depends(get_db)):
+    """Refit the semantic model on the current jobs and rebuild the on-disk vector index; cached results are invalidated"""
+    if not semantic_index.available:
+        raise HTTPException(status_code=400, detail="Semantic matching requires NumPy")
+    await semantic_index.ensure_loaded(rebuild=True)
+    await bump_job_set_version(db)
+    await db.commit()
+    return semantic_index.get_stats()
+
+
+@router.post("/match/bulk")
+async def start_bulk_match(request: BulkMatchRequest):
+    """
+    Match many resumes (or all of them) against every active job in a process pool; returns a task to poll.
+    Takes the same filters as /api/ai/match, so its stored results are the ones /api/ai/match serves.
+    """
+    try:
+        facet_conditions(request.filters)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    task = bulk_match_runner.start(request.resume_ids, request.top_n, request.filters)
+    return task.to_dict()
+
+
+@router.get("/match/bulk")
+async def list_bulk_matches():
+    """Get the bulk match tasks of this process (finished ones are kept for BULK_MATCH_TASK_TTL_SECONDS)"""
+    return [task.to_dict() for task in bulk_match_runner.list()]
+
+
+@router.get("/match/bulk/{task_id}")
+async def get_bulk_match(task_id: str):
+    """Get the progress of a bulk match task"""
+    task = bulk_match_runner.get(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Bulk match task not found")
+    return task.to_dict()
+
+
+@router.delete("/match/bulk/{task_id}")
+async def cancel_bulk_match(task_id: str):
+    """Cancel a running bulk match task; rows of finished shards are kept"""
+    task = bulk_match_runner.cancel(task_id)
+    if not task:
+        raise HTTPException(status_code=404, detail="Bulk match task not found")
+    return task.to_dict()
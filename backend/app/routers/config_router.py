@@ -1,6 +1,9 @@
 from fastapi import APIRouter
 from app.schemas import LLMConfigResponse, LLMTestResponse
 from app.services.llm_service import llm_service
+from app.services.parse_cache import parse_cache
+from app.services.llm_telemetry import llm_telemetry
+from app.services.skill_lexicon import skill_lexicon
 from app.config import settings
 
 router = APIRouter(prefix="/api/config", tags=["Configuration"])
@@ -21,3 +24,47 @@ async def test_llm_connection():
     """Test LLM API connection"""
     result = await llm_service.test_connection()
     return LLMTestResponse(**result)
+
+@router.get("/llm/modes")
+async def get_llm_modes():
+    """Get the structured output mode learned for each model"""
+    return llm_service.get_mode_info()
+
+@router.get("/llm/coalescing")
+async def get_llm_coalescing_stats():
+    """Get how many LLM calls were saved by coalescing identical in-flight requests"""
+    return llm_service.get_coalescing_stats()
+
+@router.get("/llm/governor")
+async def get_llm_governor_stats():
+    """Get each provider's concurrency limit, circuit state and retry counters"""
+    return {
+        provider["name"]: provider["governor"]
+        for provider in llm_service.get_provider_info()["providers"]
+    }
+
+@router.get("/llm/providers")
+async def get_llm_providers():
+    """Get provider health, observed latency and hedged request counters"""
+    return llm_service.get_provider_info()
+
+@router.get("/llm/stats")
+async def get_llm_stats():
+    """Get a rolling summary of LLM latency, token usage, estimated cost and outcomes"""
+    return llm_telemetry.get_summary()
+
+@router.get("/llm/parse-cache")
+async def get_parse_cache_stats():
+    """Get job parse cache size and hit/miss counters"""
+    return await parse_cache.get_stats()
+
+@router.delete("/llm/parse-cache")
+async def clear_parse_cache():
+    """Drop all cached job parse results"""
+    removed = await parse_cache.clear()
+    return {"message": "Parse cache cleared", "removed": removed}
+
+@router.get("/skill-lexicon")
+async def get_skill_lexicon_info():
+    """Get the size of the compiled skill lexicon"""
+    return skill_lexicon.get_info()
@@ -1,10 +1,11 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, and_, func
 from sqlalchemy.orm import selectinload
 from app.database import get_db
 from app.models import Delivery, Job, CartItem
-from typing import List, Optional
+from app.services.pagination import keyset_query, keyset_page
+from typing import List, Optional, Union
 from datetime import datetime
 from pydantic import BaseModel
 
@@ -33,15 +34,16 @@ class DeliveryStats(BaseModel):
     hired_count: int
 
 
-@router.get("", response_model=List[dict])
+@router.get("", response_model=Union[List[dict], dict])
 async def get_deliveries(
     user_id: str = "default_user",
     status: Optional[str] = None,
     skip: int = 0,
-    limit: int = 50,
+    limit: int = Query(50, ge=1),
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """获取投递记录列表"""
+    """获取投递记录列表，按创建时间倒序；传 cursor（首页传空字符串）时返回 {"items", "next_cursor"}"""
     query = select(Delivery).options(
         selectinload(Delivery.job).selectinload(Job.tags)
     ).where(Delivery.user_id == user_id)
@@ -49,13 +51,22 @@ async def get_deliveries(
     if status:
         query = query.where(Delivery.status == status)
     
-    result = await db.execute(
-        query.order_by(Delivery.created_at.desc()).offset(skip).limit(limit)
-    )
-    deliveries = result.scalars().all()
+    next_cursor = None
+    if cursor is None:
+        result = await db.execute(
+            query.order_by(Delivery.created_at.desc(), Delivery.id.desc()).offset(skip).limit(limit)
+        )
+        deliveries = result.scalars().all()
+    else:
+        try:
+            query = keyset_query(query, [Delivery.created_at, Delivery.id], cursor, descending=True)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        result = await db.execute(query.limit(limit + 1))
+        deliveries, next_cursor = keyset_page(result.scalars().all(), limit, ["created_at", "id"])
     
     # 转换为可序列化的格式
-    return [
+    items = [
         {
             "id": d.id,
             "job_id": d.job_id,
@@ -78,6 +89,9 @@ async def get_deliveries(
         }
         for d in deliveries
     ]
+    if cursor is None:
+        return items
+    return {"items": items, "next_cursor": next_cursor}
 
 
 @router.post("/batch")
@@ -1,29 +1,41 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.database import get_db
 from app.models import Industry
-from app.schemas import IndustryCreate, IndustryUpdate, Industry as IndustrySchema
-from typing import List
+from app.schemas import IndustryCreate, IndustryUpdate, Industry as IndustrySchema, CursorPage
+from app.services.pagination import keyset_query, keyset_page
+from app.services.facet_counts import facet_counts
+from typing import List, Optional, Union
 
 router = APIRouter(prefix="/api/industries", tags=["Industries"])
 
-@router.get("", response_model=List[IndustrySchema])
+@router.get("", response_model=Union[List[IndustrySchema], CursorPage[IndustrySchema]])
 async def get_industries(
     skip: int = 0,
-    limit: int = 100,
+    limit: int = Query(100, ge=1),
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all industries"""
-    result = await db.execute(
-        select(Industry)
-        .where(Industry.is_active == True)
-        .order_by(Industry.sort_order)
-        .offset(skip)
-        .limit(limit)
-    )
-    industries = result.scalars().all()
-    return industries
+    """Get all industries; with `cursor` (empty for the first page) returns {"items", "next_cursor"}"""
+    query = select(Industry).where(Industry.is_active == True)
+    if cursor is None:
+        result = await db.execute(
+            query
+            .order_by(Industry.sort_order, Industry.id)
+            .offset(skip)
+            .limit(limit)
+        )
+        industries = result.scalars().all()
+        return industries
+
+    try:
+        query = keyset_query(query, [Industry.sort_order, Industry.id], cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    result = await db.execute(query.limit(limit + 1))
+    industries, next_cursor = keyset_page(result.scalars().all(), limit, ["sort_order", "id"])
+    return {"items": industries, "next_cursor": next_cursor}
 
 @router.post("", response_model=IndustrySchema)
 async def create_industry(
@@ -68,10 +80,13 @@ async def update_industry(
         raise HTTPException(status_code=404, detail="Industry not found")
     
     update_data = industry_update.model_dump(exclude_unset=True)
+    if "sort_order" in update_data and update_data["sort_order"] is None:
+        raise HTTPException(status_code=400, detail="sort_order cannot be null")
     for key, value in update_data.items():
         setattr(db_industry, key, value)
     
     await db.commit()
+    facet_counts.invalidate()
     await db.refresh(db_industry)
     return db_industry
 
@@ -88,4 +103,5 @@ async def delete_industry(
     
     db_industry.is_active = False
     await db.commit()
+    facet_counts.invalidate()
     return {"message": "Industry deleted successfully"}
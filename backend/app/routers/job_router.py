@@ -1,15 +1,30 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from sqlalchemy.orm import selectinload
 from app.database import get_db
-from app.models import Job, Industry, Tag
+from app.config import settings
+from app.models import Job, Industry, Tag, JobMatchFeatures, job_tags
 from app.schemas import (
     JobCreate, JobUpdate, Job as JobSchema,
-    LLMParseRequest, LLMParseResponse
+    LLMParseRequest, LLMParseResponse, LLMBatchParseRequest, CursorPage
 )
 from app.services.llm_service import llm_service
-from typing import List
+from app.services.skill_lexicon import skill_lexicon
+from app.services.match_index import match_index
+from app.services.match_features import save_job_features, delete_job_features
+from app.services.job_facets import facet_conditions
+from app.services.match_cache import get_job_set_version
+from app.services.incremental_match import incremental_matcher
+from app.services.job_search import job_search
+from app.services.pagination import keyset_query, keyset_page
+from app.services.facet_counts import facet_counts
+from app.services.semantic_index import semantic_index, job_text
+from app.services.posting_splitter import split_job_postings
+from app.services.json_stream import sse_event
+from typing import List, Optional, Tuple, Union, AsyncIterator
+import json
 
 router = APIRouter(prefix="/api/jobs", tags=["Jobs"])
 
@@ -30,6 +45,111 @@ async def parse_job_posting(
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.post("/parse/stream")
+async def stream_parse_job_posting(
+    parse_request: LLMParseRequest
+):
+    """
+    Parse raw job posting text and stream progress as Server-Sent Events
+    `field` events carry {"field", "value", "source"} as values become known;
+    a `final` event carries the validated LLMParseResponse, or `error` on failure
+    """
+    async def event_stream():
+        try:
+            async for event in llm_service.stream_job_posting(
+                raw_content=parse_request.raw_content,
+                source_type=parse_request.source_type
+            ):
+                if event["event"] == "final":
+                    yield sse_event("final", LLMParseResponse.model_validate(event["result"]).model_dump())
+                else:
+                    yield sse_event("field", {key: event[key] for key in ("field", "value", "source")})
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.post("/parse/batch")
+async def parse_job_postings_batch(
+    batch_request: LLMBatchParseRequest
+):
+    """
+    Parse many raw job postings concurrently
+    Streams one NDJSON line per posting as soon as it finishes:
+    {"index": 0, "success": true, "result": {...}} or {"index": 1, "success": false, "error": "..."}
+    """
+    if len(batch_request.items) > settings.parse_batch_max_items:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Too many items: {len(batch_request.items)} > {settings.parse_batch_max_items}"
+        )
+
+    concurrency = min(
+        batch_request.concurrency or settings.parse_batch_concurrency,
+        settings.parse_batch_concurrency
+    )
+    items = [(item.raw_content, item.source_type) for item in batch_request.items]
+    return StreamingResponse(_stream_parse_results(items, concurrency), media_type="application/x-ndjson")
+
+@router.post("/parse/split")
+async def split_job_posting(
+    parse_request: LLMParseRequest
+):
+    """
+    Split an aggregated posting blob into single-posting chunks (local, no LLM)
+    """
+    chunks, dropped = split_job_postings(parse_request.raw_content, max_chunks=settings.posting_split_max_chunks)
+    return {"count": len(chunks), "dropped": dropped, "chunks": chunks}
+
+@router.post("/parse/multi")
+async def parse_multi_job_posting(
+    parse_request: LLMParseRequest
+):
+    """
+    Split an aggregated posting blob locally, then parse every chunk concurrently
+    Streams NDJSON lines like /parse/batch, each carrying its chunk as raw_content.
+    When the blob holds more than POSTING_SPLIT_MAX_CHUNKS postings, the first line is
+    {"index": null, "success": false, "error": "...", "dropped": n} for the ones left out
+    """
+    chunks, dropped = split_job_postings(parse_request.raw_content, max_chunks=settings.posting_split_max_chunks)
+    items = [(chunk, parse_request.source_type) for chunk in chunks]
+    return StreamingResponse(
+        _stream_parse_results(items, settings.parse_batch_concurrency, include_raw_content=True, dropped=dropped),
+        media_type="application/x-ndjson"
+    )
+
+async def _stream_parse_results(
+    items: List[Tuple[str, str]],
+    concurrency: int,
+    include_raw_content: bool = False,
+    dropped: int = 0
+) -> AsyncIterator[str]:
+    if dropped:
+        line = {
+            "index": None,
+            "success": False,
+            "error": f"Only the first {len(items)} postings are parsed, {dropped} more were left out",
+            "dropped": dropped,
+        }
+        yield json.dumps(line, ensure_ascii=False) + "\n"
+    async for outcome in llm_service.iter_parse_job_postings(items, concurrency):
+        line = {"index": outcome["index"], "success": False}
+        if include_raw_content:
+            line["raw_content"] = items[outcome["index"]][0]
+        if "error" in outcome:
+            line["error"] = outcome["error"]
+        else:
+            try:
+                line["result"] = LLMParseResponse.model_validate(outcome["result"]).model_dump()
+                line["success"] = True
+            except Exception as e:
+                line["error"] = str(e)
+        yield json.dumps(line, ensure_ascii=False) + "\n"
+
 @router.post("", response_model=JobSchema)
 async def create_job(
     job: JobCreate,
@@ -52,6 +172,7 @@ async def create_job(
     
     # Create job instance
     job_data = job.model_dump(exclude={'tag_ids'})
+    job_data["requirements"] = skill_lexicon.normalize_requirements(job_data.get("requirements"))
     db_job = Job(**job_data)
     
     # Handle tags
@@ -63,29 +184,128 @@ async def create_job(
         db_job.tags = list(tags)
     
     db.add(db_job)
+    await db.flush()
+    features = await save_job_features(db, db_job)
+    job_set_version = await get_job_set_version(db)
     await db.commit()
+    match_index.upsert(db_job.id, features, db_job.status == "active")
+    facet_counts.invalidate()
+    semantic_index.upsert(db_job.id, job_text(db_job.title, db_job.requirements, db_job.raw_content), db_job.status == "active")
+    incremental_matcher.job_created(db_job.id, job_set_version)
     await db.refresh(db_job, ['tags'])
     return db_job
 
-@router.get("", response_model=List[JobSchema])
+class JobFilters:
+    """Query parameters shared by the job list and job search"""
+
+    def __init__(
+        self,
+        status: str = None,
+        industry_id: int = None,
+        tag_id: Optional[int] = None,
+        city: Optional[str] = None,
+        salary_min: Optional[int] = None,
+        salary_max: Optional[int] = None,
+        salary_period: Optional[str] = None,
+        education_level: Optional[str] = None,
+        education_max: Optional[str] = None,
+        experience_band: Optional[str] = None,
+        experience_max: Optional[str] = None,
+    ):
+        self.status = status
+        self.industry_id = industry_id
+        self.tag_id = tag_id
+        self.facets = {
+            "city": city,
+            "salary_min": salary_min,
+            "salary_max": salary_max,
+            "salary_period": salary_period,
+            "education_level": education_level,
+            "education_max": education_max,
+            "experience_band": experience_band,
+            "experience_max": experience_max,
+        }
+
+    def values(self) -> dict:
+        return {"status": self.status, "industry_id": self.industry_id, "tag_id": self.tag_id, **self.facets}
+
+    def apply(self, query, exclude: Optional[str] = None):
+        """Add the filters to a select on Job, except the one named `exclude`"""
+        if self.status and exclude != "status":
+            query = query.where(Job.status == self.status)
+        if self.industry_id and exclude != "industry_id":
+            query = query.where(Job.industry_id == self.industry_id)
+        if self.tag_id and exclude != "tag_id":
+            query = query.where(Job.id.in_(select(job_tags.c.job_id).where(job_tags.c.tag_id == self.tag_id)))
+        try:
+            conditions = facet_conditions({key: value for key, value in self.facets.items() if key != exclude})
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        if conditions:
+            query = query.join(JobMatchFeatures, JobMatchFeatures.job_id == Job.id).where(*conditions)
+        return query
+
+@router.get("", response_model=Union[List[JobSchema], CursorPage[JobSchema]])
 async def get_jobs(
     skip: int = 0,
-    limit: int = 50,
-    status: str = None,
-    industry_id: int = None,
+    limit: int = Query(50, ge=1),
+    cursor: Optional[str] = None,
+    filters: JobFilters = Depends(),
     db: AsyncSession = Depends(get_db)
 ):
-    """Get jobs with filtering and pagination"""
-    query = select(Job).options(selectinload(Job.tags))
-    
-    if status:
-        query = query.where(Job.status == status)
-    if industry_id:
-        query = query.where(Job.industry_id == industry_id)
-    
-    result = await db.execute(
-        query.order_by(Job.created_at.desc()).offset(skip).limit(limit)
-    )
+    """
+    Get jobs with filtering and pagination, newest first
+    Facet filters use the columns parsed from requirements: salary_min/salary_max
+    select jobs whose salary range overlaps, education/experience take an ordinal
+    or its text ("本科", "3-5年"); *_max also keeps jobs without a requirement
+    With `cursor` (empty for the first page) returns {"items", "next_cursor"}
+    and ignores `skip`; without it returns a plain list paged by skip/limit
+    """
+    query = filters.apply(select(Job).options(selectinload(Job.tags)))
+    if cursor is None:
+        result = await db.execute(
+            query.order_by(Job.created_at.desc(), Job.id.desc()).offset(skip).limit(limit)
+        )
+        jobs = result.scalars().all()
+        return jobs
+
+    try:
+        query = keyset_query(query, [Job.created_at, Job.id], cursor, descending=True)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    result = await db.execute(query.limit(limit + 1))
+    jobs, next_cursor = keyset_page(result.scalars().all(), limit, ["created_at", "id"])
+    return {"items": jobs, "next_cursor": next_cursor}
+
+@router.get("/facets")
+async def get_job_facets(
+    filters: JobFilters = Depends(),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Job counts per industry, tag, location and status for the filters panel
+    Takes the job list filters; each facet is counted with all filters but its
+    own, so the other values of a selected facet keep their counts
+    """
+    return await facet_counts.get(db, filters.values(), lambda exclude: filters.apply(select(Job.id), exclude))
+
+@router.get("/search", response_model=List[JobSchema])
+async def search_jobs(
+    q: str,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    filters: JobFilters = Depends(),
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Full-text search over title, company, industry, requirements and the raw posting
+    Every word of `q` must match (Chinese by substring); results are ranked by BM25
+    with title hits weighted highest, and take the same filters as the job list
+    """
+    query = job_search.apply(filters.apply(select(Job).options(selectinload(Job.tags))), q)
+    if query is None:
+        raise HTTPException(status_code=400, detail="Search query has no searchable words")
+    result = await db.execute(query.offset(skip).limit(limit))
     jobs = result.scalars().all()
     return jobs
 
@@ -122,6 +342,8 @@ async def update_job(
         raise HTTPException(status_code=404, detail="Job not found")
     
     update_data = job_update.model_dump(exclude_unset=True, exclude={'tag_ids'})
+    if "requirements" in update_data:
+        update_data["requirements"] = skill_lexicon.normalize_requirements(update_data["requirements"])
     for key, value in update_data.items():
         setattr(db_job, key, value)
     
@@ -133,7 +355,11 @@ async def update_job(
         tags = result.scalars().all()
         db_job.tags = list(tags)
     
+    features = await save_job_features(db, db_job)
     await db.commit()
+    match_index.upsert(db_job.id, features, db_job.status == "active")
+    facet_counts.invalidate()
+    semantic_index.upsert(db_job.id, job_text(db_job.title, db_job.requirements, db_job.raw_content), db_job.status == "active")
     await db.refresh(db_job, ['tags'])
     return db_job
 
@@ -148,6 +374,10 @@ async def delete_job(
     if not db_job:
         raise HTTPException(status_code=404, detail="Job not found")
     
+    await delete_job_features(db, job_id)
     await db.delete(db_job)
     await db.commit()
+    match_index.remove(job_id)
+    facet_counts.invalidate()
+    semantic_index.remove(job_id)
     return {"message": "Job deleted successfully"}
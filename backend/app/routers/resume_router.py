@@ -1,13 +1,14 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, desc, or_
 from sqlalchemy.orm import selectinload
-from app.database import get_db
+from app.database import get_db, AsyncSessionLocal
 from app.config import settings
 from app.models import Resume, ResumeParse, MatchResult, DeliveryLog
 from app.schemas import ResumeUploadResponse, ResumeParsed
 from app.services.llm_service import llm_service
+from app.services.json_stream import sse_event
 from pathlib import Path
 from datetime import datetime
 from typing import Optional, List
@@ -115,15 +116,74 @@ async def parse_resume(
 
     text_content = _extract_resume_text(Path(resume.storage_path))
     parse_result = await llm_service.parse_resume(text_content)
+    next_version = await _save_resume_parse(db, resume, parse_result)
 
+    return ResumeParsed(
+        resume_id=resume_id,
+        status=resume.status,
+        parsed_fields=parse_result.get("parsed_fields", {}),
+        parsed_json=parse_result,
+        version=next_version,
+    )
+
+
+@router.post("/{resume_id}/parse/stream")
+async def stream_parse_resume(
+    resume_id: int,
+    db: AsyncSession = Depends(get_db)
+):
+    """
+    Re-parse a resume and stream progress as Server-Sent Events
+    `field` events arrive as values become known; the `final` event carries the saved ResumeParsed
+    """
+    result = await db.execute(select(Resume).where(Resume.id == resume_id))
+    resume = result.scalar_one_or_none()
+    if not resume:
+        raise HTTPException(status_code=404, detail="Resume not found")
+
+    text_content = _extract_resume_text(Path(resume.storage_path))
+
+    async def event_stream():
+        try:
+            async for event in llm_service.stream_resume(text_content):
+                if event["event"] != "final":
+                    yield sse_event("field", {key: event[key] for key in ("field", "value", "source")})
+                    continue
+
+                parse_result = event["result"]
+                # The request session is closed once streaming starts, so persist with a fresh one
+                async with AsyncSessionLocal() as session:
+                    stored = await session.execute(select(Resume).where(Resume.id == resume_id))
+                    stored_resume = stored.scalar_one()
+                    next_version = await _save_resume_parse(session, stored_resume, parse_result)
+                    status = stored_resume.status
+                yield sse_event("final", ResumeParsed(
+                    resume_id=resume_id,
+                    status=status,
+                    parsed_fields=parse_result.get("parsed_fields", {}),
+                    parsed_json=parse_result,
+                    version=next_version,
+                ).model_dump())
+        except Exception as e:
+            yield sse_event("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+async def _save_resume_parse(db: AsyncSession, resume: Resume, parse_result: dict) -> int:
+    """Store parse_result as the next ResumeParse version and return that version"""
     parse_result_db = await db.execute(
-        select(ResumeParse).where(ResumeParse.resume_id == resume_id).order_by(desc(ResumeParse.version))
+        select(ResumeParse).where(ResumeParse.resume_id == resume.id).order_by(desc(ResumeParse.version))
     )
-    latest = parse_result_db.scalar_one_or_none()
+    latest = parse_result_db.scalars().first()
     next_version = (latest.version + 1) if latest else 1
 
     record = ResumeParse(
-        resume_id=resume_id,
+        resume_id=resume.id,
         parsed_json=parse_result,
         extracted_fields=parse_result.get("parsed_fields", {}),
         version=next_version,
@@ -132,14 +192,7 @@ async def parse_resume(
     resume.status = "parsed"
     resume.updated_at = datetime.utcnow()
     await db.commit()
-
-    return ResumeParsed(
-        resume_id=resume_id,
-        status=resume.status,
-        parsed_fields=parse_result.get("parsed_fields", {}),
-        parsed_json=parse_result,
-        version=next_version,
-    )
+    return next_version
 
 
 @router.get("/{resume_id}")
@@ -1,31 +1,46 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 from app.database import get_db
 from app.models import Tag
-from app.schemas import TagCreate, TagUpdate, Tag as TagSchema
-from typing import List
+from app.schemas import TagCreate, TagUpdate, Tag as TagSchema, CursorPage
+from app.services.pagination import keyset_query, keyset_page
+from app.services.facet_counts import facet_counts
+from typing import List, Optional, Union
 
 router = APIRouter(prefix="/api/tags", tags=["Tags"])
 
-@router.get("", response_model=List[TagSchema])
+@router.get("", response_model=Union[List[TagSchema], CursorPage[TagSchema]])
 async def get_tags(
     category: str = None,
     skip: int = 0,
-    limit: int = 200,
+    limit: int = Query(200, ge=1),
+    cursor: Optional[str] = None,
     db: AsyncSession = Depends(get_db)
 ):
-    """Get all tags, optionally filtered by category"""
+    """
+    Get all tags, optionally filtered by category
+    With `cursor` (empty for the first page) returns {"items", "next_cursor"}
+    """
     query = select(Tag).where(Tag.is_active == True)
     
     if category:
         query = query.where(Tag.category == category)
     
-    result = await db.execute(
-        query.offset(skip).limit(limit)
-    )
-    tags = result.scalars().all()
-    return tags
+    if cursor is None:
+        result = await db.execute(
+            query.order_by(Tag.id).offset(skip).limit(limit)
+        )
+        tags = result.scalars().all()
+        return tags
+
+    try:
+        query = keyset_query(query, [Tag.id], cursor)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    result = await db.execute(query.limit(limit + 1))
+    tags, next_cursor = keyset_page(result.scalars().all(), limit, ["id"])
+    return {"items": tags, "next_cursor": next_cursor}
 
 @router.post("", response_model=TagSchema)
 async def create_tag(
@@ -74,6 +89,7 @@ async def update_tag(
         setattr(db_tag, key, value)
     
     await db.commit()
+    facet_counts.invalidate()
     await db.refresh(db_tag)
     return db_tag
 
@@ -90,4 +106,5 @@ async def delete_tag(
     
     db_tag.is_active = False
     await db.commit()
+    facet_counts.invalidate()
     return {"message": "Tag deleted successfully"}
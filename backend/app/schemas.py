@@ -1,7 +1,16 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import Optional, List, Dict, Any
+from typing import Optional, List, Dict, Any, Generic, TypeVar
 from datetime import datetime
 
+T = TypeVar("T")
+
+# ============= Pagination Schemas =============
+
+class CursorPage(BaseModel, Generic[T]):
+    """A page of a list endpoint in cursor mode; next_cursor is None on the last page"""
+    items: List[T]
+    next_cursor: Optional[str] = None
+
 # ============= Industry Schemas =============
 
 class IndustryBase(BaseModel):
@@ -111,6 +120,10 @@ class LLMParseRequest(BaseModel):
     raw_content: str
     source_type: Optional[str] = "手动"
 
+class LLMBatchParseRequest(BaseModel):
+    items: List[LLMParseRequest] = Field(..., min_length=1)
+    concurrency: Optional[int] = Field(default=None, ge=1)
+
 class LLMParseResponse(BaseModel):
     title: str
     company_name: str
@@ -122,6 +135,8 @@ class LLMParseResponse(BaseModel):
     email_body_template: Optional[str] = None
     requirements: Optional[Dict[str, Any]] = None
     published_at: Optional[str] = None
+    parse_source: Optional[str] = None  # local/llm
+    field_confidence: Optional[Dict[str, float]] = None  # only for local parses
 
 # ============= LLM Config Schemas =============
 
@@ -182,6 +197,13 @@ class MatchRequest(BaseModel):
     resume_id: int
     top_n: int = Field(default=3, ge=1, le=20)
     filters: Optional[Dict[str, Any]] = None
+    mode: Optional[str] = None  # keyword / semantic, defaults to MATCH_MODE
+
+
+class BulkMatchRequest(BaseModel):
+    resume_ids: Optional[List[int]] = None  # None = every resume with a parse
+    top_n: int = Field(default=3, ge=1, le=20)
+    filters: Optional[Dict[str, Any]] = None
 
 
 class MatchItem(BaseModel):
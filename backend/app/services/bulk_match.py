@@ -0,0 +1,259 @@
+"""
+Bulk resume-to-job matching: ranks the whole active job pool for many resumes
+at once (e.g. after a big import). Resumes are split into shards and scored in
+a process pool, so all cores are used and the API event loop only awaits
+futures and writes each finished shard to the match result cache, which
+/api/ai/match then serves until the resume or the job set changes.
+
+    python -m app.services.bulk_match --all --top-n 10
+    python -m app.services.bulk_match --resume-ids 1,2,3 --location 北京
+    python -m app.services.bulk_match --all --filters '{"city": "上海", "salary_min": 10000}'
+"""
+from sqlalchemy import select, func, and_
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import ResumeParse, JobMatchFeatures
+from app.services.match_index import MatchIndex
+from app.services.match_engine import VectorMatchEngine
+from app.services.match_features import backfill_job_features, load_active_features
+from app.services.match_cache import match_cache, get_job_set_version, clean_filters
+from app.services.job_facets import facet_conditions
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, Any, List, Optional, Tuple, Callable
+import argparse
+import asyncio
+import json
+import multiprocessing
+import os
+import time
+import uuid
+
+# Per-worker scorer, built once from the job feature snapshot by the pool initializer
+_worker_engine = None
+
+
+def _init_worker(records: List[Tuple[int, Dict[str, Any]]], engine: str):
+    global _worker_engine
+    index = MatchIndex()
+    for job_id, record in records:
+        index._add(job_id, record)
+    index.loaded = True
+    vector = VectorMatchEngine(index)
+    _worker_engine = vector if engine == "vector" and vector.available else index
+
+
+def _score_shard(shard: List[Tuple[int, Dict[str, Any]]], top_n: int, location: Optional[str]) -> List[Tuple[int, List[Dict[str, Any]]]]:
+    return [(resume_id, _worker_engine.match(fields, top_n, location)) for resume_id, fields in shard]
+
+
+class BulkMatchTask:
+    def __init__(self, resume_ids: Optional[List[int]], top_n: int, filters: Optional[Dict[str, Any]] = None):
+        self.id = uuid.uuid4().hex[:12]
+        self.resume_ids = resume_ids
+        self.top_n = top_n
+        # Same filters as /api/ai/match: "location" for scoring, facet filters narrow the job pool
+        self.filters = clean_filters(filters)
+        self.location = self.filters.get("location") or None
+        self.status = "queued"
+        self.total = 0
+        self.done = 0
+        self.jobs = 0
+        self.rows_written = 0
+        self.workers = 0
+        self.error: Optional[str] = None
+        self.created_at = datetime.utcnow()
+        self.started: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.runner: Optional[asyncio.Task] = None
+
+    def to_dict(self) -> Dict[str, Any]:
+        elapsed = ((self.finished or time.perf_counter()) - self.started) if self.started else 0.0
+        return {
+            "task_id": self.id,
+            "status": self.status,
+            "resumes": self.total,
+            "done": self.done,
+            "progress": round(self.done / self.total, 4) if self.total else 0.0,
+            "jobs": self.jobs,
+            "top_n": self.top_n,
+            "filters": self.filters,
+            "rows_written": self.rows_written,
+            "workers": self.workers,
+            "elapsed_seconds": round(elapsed, 2),
+            "resumes_per_second": round(self.done / elapsed, 1) if elapsed else None,
+            "error": self.error,
+            "created_at": self.created_at.isoformat(),
+        }
+
+
+async def _load_latest_parses(resume_ids: Optional[List[int]]) -> List[Tuple[int, int, Dict[str, Any]]]:
+    latest = select(ResumeParse.resume_id, func.max(ResumeParse.version).label("version")).group_by(ResumeParse.resume_id)
+    if resume_ids is not None:
+        latest = latest.where(ResumeParse.resume_id.in_(resume_ids))
+    latest = latest.subquery()
+    async with AsyncSessionLocal() as session:
+        result = await session.execute(
+            select(ResumeParse.resume_id, ResumeParse.version, ResumeParse.extracted_fields)
+            .join(latest, and_(ResumeParse.resume_id == latest.c.resume_id, ResumeParse.version == latest.c.version))
+            .order_by(ResumeParse.resume_id)
+        )
+        return [(resume_id, version, fields or {}) for resume_id, version, fields in result.all()]
+
+
+class BulkMatchRunner:
+    """Runs bulk match tasks in the background and keeps their progress in memory"""
+
+    def __init__(self):
+        self.tasks: Dict[str, BulkMatchTask] = {}
+
+    def start(self, resume_ids: Optional[List[int]], top_n: int, filters: Optional[Dict[str, Any]] = None) -> BulkMatchTask:
+        self.prune()
+        task = BulkMatchTask(resume_ids, top_n, filters)
+        self.tasks[task.id] = task
+        task.runner = asyncio.create_task(self.run(task))
+        return task
+
+    def get(self, task_id: str) -> Optional[BulkMatchTask]:
+        self.prune()
+        return self.tasks.get(task_id)
+
+    def list(self) -> List[BulkMatchTask]:
+        self.prune()
+        return list(self.tasks.values())
+
+    def prune(self):
+        """Forget finished tasks older than the TTL, then the oldest finished ones beyond the cap"""
+        now = time.perf_counter()
+        finished = [task for task in self.tasks.values() if task.finished is not None]
+        for task in finished:
+            if now - task.finished > settings.bulk_match_task_ttl_seconds:
+                del self.tasks[task.id]
+        finished = sorted((task for task in self.tasks.values() if task.finished is not None), key=lambda task: task.finished)
+        overflow = len(self.tasks) - max(1, settings.bulk_match_max_tasks)
+        for task in finished[:max(0, overflow)]:
+            del self.tasks[task.id]
+
+    def cancel(self, task_id: str) -> Optional[BulkMatchTask]:
+        task = self.tasks.get(task_id)
+        if task and task.runner and not task.runner.done():
+            task.runner.cancel()
+        return task
+
+    async def run(self, task: BulkMatchTask, on_progress: Optional[Callable[[BulkMatchTask], None]] = None):
+        task.status = "running"
+        task.started = time.perf_counter()
+        loop = asyncio.get_running_loop()
+        pool = None
+        futures: List[asyncio.Future] = []
+        try:
+            async with AsyncSessionLocal() as session:
+                await backfill_job_features(session)
+                job_set_version = await get_job_set_version(session)
+                conditions = facet_conditions(task.filters)
+                job_ids = None
+                if conditions:
+                    result = await session.execute(
+                        select(JobMatchFeatures.job_id).where(JobMatchFeatures.is_active.is_(True), *conditions)
+                    )
+                    job_ids = list(result.scalars().all())
+                records = await load_active_features(session, job_ids)
+            resumes = await _load_latest_parses(task.resume_ids)
+            task.jobs = len(records)
+            task.total = len(resumes)
+            if not resumes or not records:
+                task.status = "completed"
+                return
+
+            shard_size = max(1, settings.bulk_match_shard_size)
+            parse_versions = {resume_id: version for resume_id, version, _ in resumes}
+            shards = [
+                [(resume_id, fields) for resume_id, _, fields in resumes[start:start + shard_size]]
+                for start in range(0, len(resumes), shard_size)
+            ]
+            task.workers = min(settings.bulk_match_workers or os.cpu_count() or 1, len(shards))
+            # spawn, not fork: the API process has running threads and an event loop
+            pool = ProcessPoolExecutor(
+                max_workers=task.workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(records, settings.match_engine)
+            )
+            futures = [
+                loop.run_in_executor(pool, _score_shard, shard, task.top_n, task.location)
+                for shard in shards
+            ]
+            for finished in asyncio.as_completed(futures):
+                scored = await finished
+                async with AsyncSessionLocal() as session:
+                    written = await match_cache.put_many(
+                        session,
+                        [(resume_id, parse_versions[resume_id], results) for resume_id, results in scored],
+                        job_set_version,
+                        task.filters or None,
+                        task.top_n
+                    )
+                    await session.commit()
+                task.done += len(scored)
+                task.rows_written += written
+                if on_progress:
+                    on_progress(task)
+            task.status = "completed"
+        except asyncio.CancelledError:
+            task.status = "cancelled"
+            raise
+        except Exception as e:
+            task.status = "failed"
+            task.error = str(e)
+            print(f"⚠️ Bulk match {task.id} failed: {e}")
+        finally:
+            task.finished = time.perf_counter()
+            for future in futures:
+                future.cancel()
+            if pool is not None:
+                # Joining the workers blocks, so do it off the event loop
+                await loop.run_in_executor(None, lambda: pool.shutdown(wait=True, cancel_futures=True))
+
+
+# Global instance
+bulk_match_runner = BulkMatchRunner()
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rank all active jobs for many resumes and store MatchResult rows")
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument("--all", action="store_true", help="every resume with a parse")
+    target.add_argument("--resume-ids", help="comma separated resume ids")
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--location", default=None, help="only jobs with this location")
+    parser.add_argument("--filters", default=None, help="JSON object of /api/ai/match filters (city, salary_min, ...)")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    resume_ids = None if args.all else [int(value) for value in args.resume_ids.split(",") if value.strip()]
+    filters = json.loads(args.filters) if args.filters else {}
+    if args.location:
+        filters["location"] = args.location
+    try:
+        facet_conditions(filters)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+    task = BulkMatchTask(resume_ids, args.top_n, filters)
+
+    def report(task: BulkMatchTask):
+        info = task.to_dict()
+        print(f"⏳ {info['done']}/{info['resumes']} resumes, {info['rows_written']} rows, {info['resumes_per_second']}/s")
+
+    asyncio.run(BulkMatchRunner().run(task, on_progress=report))
+    info = task.to_dict()
+    if task.status == "completed":
+        print(f"✅ Matched {info['resumes']} resumes against {info['jobs']} jobs in {info['elapsed_seconds']}s ({info['workers']} workers)")
+    else:
+        print(f"❌ Bulk match {task.status}: {task.error}")
+
+
+if __name__ == "__main__":
+    main()
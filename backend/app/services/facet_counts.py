@@ -0,0 +1,105 @@
+from sqlalchemy import select, func, desc
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models import Job, Tag, Industry, JobMatchFeatures, job_tags
+from collections import OrderedDict
+from typing import Dict, Any, Callable, Optional, Tuple
+import time
+
+# Job counts per industry, tag, location and status for the job browser's
+# filter panel, computed with GROUP BY over the filtered job ids. Each facet
+# is counted under every filter except its own (the usual faceted search
+# behaviour), so picking an industry still shows how many jobs the other
+# industries have. Results are cached per filter combination in this process
+# and dropped on any job, tag or industry write; the TTL bounds how stale
+# counts can get when another process writes.
+
+# Facet -> the list filter it ignores
+FACET_FILTERS = {"industry": "industry_id", "tag": "tag_id", "location": "city", "status": "status"}
+
+
+class FacetCounts:
+    """Cached grouped job counts"""
+
+    def __init__(self):
+        self.entries: "OrderedDict[Tuple, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        # Bumped on invalidation, so counts computed across a write aren't stored
+        self.generation = 0
+
+    def invalidate(self):
+        self.entries.clear()
+        self.generation += 1
+
+    async def get(
+        self,
+        db: AsyncSession,
+        filters: Dict[str, Any],
+        job_ids: Callable[[Optional[str]], Any]
+    ) -> Dict[str, Any]:
+        """
+        Counts for `filters`; `job_ids(excluded)` returns a select of the ids of
+        jobs matching every filter but `excluded` (None: all of them)
+        """
+        key = tuple(sorted((name, value) for name, value in filters.items() if value not in (None, "")))
+        cached = self.entries.get(key)
+        if cached and cached[0] > time.monotonic():
+            self.entries.move_to_end(key)
+            return cached[1]
+        generation = self.generation
+        result = await self._count(db, job_ids)
+        if generation == self.generation:
+            self.entries[key] = (time.monotonic() + settings.facet_cache_ttl_seconds, result)
+            self.entries.move_to_end(key)
+            while len(self.entries) > max(1, settings.facet_cache_max_entries):
+                self.entries.popitem(last=False)
+        return result
+
+    async def _count(self, db: AsyncSession, job_ids: Callable[[Optional[str]], Any]) -> Dict[str, Any]:
+        total = await db.execute(select(func.count()).select_from(job_ids(None).subquery()))
+        count = func.count(Job.id).label("count")
+
+        industries = await db.execute(
+            select(Job.industry_id, func.max(func.coalesce(Industry.name, Job.industry_name)), count)
+            .outerjoin(Industry, Industry.id == Job.industry_id)
+            .where(Job.id.in_(job_ids(FACET_FILTERS["industry"])))
+            .group_by(Job.industry_id)
+            .order_by(desc("count"), Job.industry_id)
+        )
+        tag_count = func.count(job_tags.c.job_id).label("count")
+        tags = await db.execute(
+            select(Tag.id, Tag.name, Tag.category, tag_count)
+            .join(job_tags, job_tags.c.tag_id == Tag.id)
+            .where(Tag.is_active == True, job_tags.c.job_id.in_(job_ids(FACET_FILTERS["tag"])))
+            .group_by(Tag.id, Tag.name, Tag.category)
+            .order_by(desc("count"), Tag.id)
+        )
+        location_count = func.count(JobMatchFeatures.job_id).label("count")
+        locations = await db.execute(
+            select(JobMatchFeatures.location_code, location_count)
+            .where(JobMatchFeatures.job_id.in_(job_ids(FACET_FILTERS["location"])))
+            .group_by(JobMatchFeatures.location_code)
+            .order_by(desc("count"), JobMatchFeatures.location_code)
+        )
+        statuses = await db.execute(
+            select(Job.status, count)
+            .where(Job.id.in_(job_ids(FACET_FILTERS["status"])))
+            .group_by(Job.status)
+            .order_by(desc("count"), Job.status)
+        )
+        return {
+            "total": total.scalar() or 0,
+            "industry": [
+                {"id": industry_id, "name": name, "count": n}
+                for industry_id, name, n in industries.all()
+            ],
+            "tag": [
+                {"id": tag_id, "name": name, "category": category, "count": n}
+                for tag_id, name, category, n in tags.all()
+            ],
+            "location": [{"value": value, "count": n} for value, n in locations.all()],
+            "status": [{"value": value, "count": n} for value, n in statuses.all()],
+        }
+
+
+# Global instance
+facet_counts = FacetCounts()
@@ -0,0 +1,235 @@
+"""
+Incremental re-matching when jobs are created. Stored match results (see
+match_cache) go stale whenever the job set changes, and the next
+/api/ai/match would rank the whole job table again. Creating a job only adds
+candidates and never changes the keyword score of existing ones, so a stored
+top-N plus the new jobs' scores is exactly the new top-N. New jobs are queued
+with the job-set version their commit produced; a background task collects
+them for `incremental_match_delay` seconds, scores only those jobs against the
+latest parse of every resume with stored results and writes the merged top-N
+under the current job-set version, so the next request is a cache hit.
+"""
+from sqlalchemy import select, func, and_, tuple_
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import MatchResult, ResumeParse, JobMatchFeatures
+from app.services.match_index import MatchIndex
+from app.services.match_features import load_active_features
+from app.services.match_cache import match_cache, get_job_set_version, filters_key
+from app.services.job_facets import facet_conditions
+from typing import Dict, Any, List, Optional, Set, Tuple
+import asyncio
+import time
+
+# Stored result set: (resume_id, filters_key, top_n)
+EntryKey = Tuple[int, str, int]
+
+
+def merge_top_n(stored: List[Dict[str, Any]], added: List[Dict[str, Any]], top_n: int) -> List[Dict[str, Any]]:
+    """Best top_n of both lists, ties by job id like the full ranking"""
+    merged = {item["job_id"]: item for item in stored}
+    merged.update({item["job_id"]: item for item in added})
+    return sorted(merged.values(), key=lambda item: (-item["score"], item["job_id"]))[:top_n]
+
+
+class IncrementalMatcher:
+    """Queues created jobs and merges them into stored match results off the request path"""
+
+    def __init__(self):
+        self.enabled = settings.incremental_match_enabled
+        # job-set version produced by a job creation -> job id
+        self.pending: Dict[int, int] = {}
+        self.runner: Optional[asyncio.Task] = None
+        self.batches = 0
+        self.jobs_merged = 0
+        self.entries_updated = 0
+        self.entries_skipped = 0
+        self.last_batch_seconds = 0.0
+
+    def job_created(self, job_id: int, job_set_version: int):
+        """Call after the commit that created a job; inactive jobs keep the version chain unbroken"""
+        if not self.enabled:
+            return
+        self.pending[job_set_version] = job_id
+        if self.runner is None or self.runner.done():
+            self.runner = asyncio.create_task(self._run())
+
+    async def _run(self):
+        while self.pending:
+            await asyncio.sleep(settings.incremental_match_delay)
+            try:
+                await self.process()
+            except Exception as e:
+                print(f"⚠️ Incremental match failed: {e}")
+
+    async def stop(self):
+        if self.runner and not self.runner.done():
+            self.runner.cancel()
+            try:
+                await self.runner
+            except asyncio.CancelledError:
+                pass
+
+    async def process(self) -> int:
+        """Merge the queued jobs into every stored result set they can advance; returns result sets updated"""
+        started = time.perf_counter()
+        async with AsyncSessionLocal() as session:
+            job_set_version = await get_job_set_version(session)
+        # Only creations the current version already includes; later ones wait for the next batch
+        added = {version: job_id for version, job_id in self.pending.items() if version <= job_set_version}
+        for version in added:
+            del self.pending[version]
+        if not added:
+            return 0
+
+        # A stored set can be advanced only if every change after its version was a queued creation
+        oldest = job_set_version
+        while oldest in added:
+            oldest -= 1
+        async with AsyncSessionLocal() as session:
+            eligible = await self._load_entries(session, oldest, job_set_version)
+
+        updated = 0
+        batch_size = max(1, settings.incremental_match_batch_size)
+        for start in range(0, len(eligible), batch_size):
+            updated += await self._merge_batch(eligible[start:start + batch_size], added, job_set_version)
+            await asyncio.sleep(0)
+        self.batches += 1
+        self.jobs_merged += len(added)
+        self.entries_updated += updated
+        self.last_batch_seconds = round(time.perf_counter() - started, 3)
+        print(f"✅ Merged {len(added)} new jobs into {updated} stored match results in {self.last_batch_seconds}s")
+        return updated
+
+    async def _load_entries(self, session, oldest: int, job_set_version: int) -> List[Dict[str, Any]]:
+        """Keyword result sets from `oldest` up to the current version, computed from each resume's latest parse"""
+        latest = (
+            select(ResumeParse.resume_id, func.max(ResumeParse.version).label("version"))
+            .group_by(ResumeParse.resume_id)
+            .subquery()
+        )
+        # Every row of a set carries the same versions and filters; the first one stands for the set
+        result = await session.execute(
+            select(
+                MatchResult.resume_id,
+                MatchResult.filters_key,
+                MatchResult.top_n,
+                MatchResult.parse_version,
+                MatchResult.job_set_version,
+                MatchResult.filters,
+            )
+            .join(latest, and_(MatchResult.resume_id == latest.c.resume_id, MatchResult.parse_version == latest.c.version))
+            .where(
+                MatchResult.rank == 0,
+                MatchResult.job_set_version >= oldest,
+                MatchResult.job_set_version < job_set_version,
+            )
+        )
+        entries = []
+        plain_key = filters_key(None)
+        for resume_id, key, top_n, parse_version, version, filters in result.all():
+            # Rows from before filters were stored can't be re-filtered; semantic results aren't additive
+            if (filters is None and key != plain_key) or (filters or {}).get("mode", "keyword") != "keyword":
+                self.entries_skipped += 1
+                continue
+            entries.append({
+                "resume_id": resume_id,
+                "filters_key": key,
+                "top_n": top_n,
+                "parse_version": parse_version,
+                "job_set_version": version,
+                "filters": filters or {},
+            })
+        return entries
+
+    async def _merge_batch(self, entries: List[Dict[str, Any]], added: Dict[int, int], job_set_version: int) -> int:
+        async with AsyncSessionLocal() as session:
+            # Entries were selected on the latest parse version, so these are the latest parses
+            parses = await session.execute(
+                select(ResumeParse.resume_id, ResumeParse.version, ResumeParse.extracted_fields)
+                .where(
+                    tuple_(ResumeParse.resume_id, ResumeParse.version).in_(
+                        {(entry["resume_id"], entry["parse_version"]) for entry in entries}
+                    )
+                )
+            )
+            latest = {resume_id: (version, fields or {}) for resume_id, version, fields in parses.all()}
+            keys: Set[EntryKey] = {(entry["resume_id"], entry["filters_key"], entry["top_n"]) for entry in entries}
+            stored_rows = await session.execute(
+                select(
+                    MatchResult.resume_id,
+                    MatchResult.filters_key,
+                    MatchResult.top_n,
+                    MatchResult.job_id,
+                    MatchResult.score,
+                    MatchResult.highlights,
+                    MatchResult.template_recommendation,
+                )
+                .where(MatchResult.resume_id.in_({key[0] for key in keys}))
+                .order_by(MatchResult.rank)
+            )
+            stored: Dict[EntryKey, List[Dict[str, Any]]] = {}
+            for resume_id, key, top_n, job_id, score, highlights, template in stored_rows.all():
+                if (resume_id, key, top_n) in keys:
+                    stored.setdefault((resume_id, key, top_n), []).append({
+                        "job_id": job_id,
+                        "score": score,
+                        "highlights": highlights or [],
+                        "template_recommendation": template,
+                    })
+
+            groups: Dict[Tuple[str, int], List[Dict[str, Any]]] = {}
+            for entry in entries:
+                groups.setdefault((entry["filters_key"], entry["top_n"]), []).append(entry)
+            updated = 0
+            for (key, top_n), group in groups.items():
+                filters = group[0]["filters"]
+                index = await self._index_for(session, filters, [added[version] for version in sorted(added)])
+                if index is None:
+                    self.entries_skipped += len(group)
+                    continue
+                location = filters.get("location") or None
+                merged = []
+                for entry in group:
+                    # Only the queued creations between the stored version and now are missing from it
+                    missing = {added[version] for version in added if version > entry["job_set_version"]}
+                    version, fields = latest[entry["resume_id"]]
+                    scored = index.match(fields, top_n, location, missing)
+                    merged.append((entry["resume_id"], version, merge_top_n(stored.get((entry["resume_id"], key, top_n), []), scored, top_n)))
+                await match_cache.put_many(session, merged, job_set_version, filters, top_n)
+                updated += len(merged)
+            await session.commit()
+        return updated
+
+    async def _index_for(self, session, filters: Dict[str, Any], job_ids: List[int]) -> Optional[MatchIndex]:
+        """Inverted index over the new jobs that pass the facet filters"""
+        try:
+            conditions = facet_conditions(filters)
+        except ValueError:
+            return None
+        if conditions:
+            result = await session.execute(
+                select(JobMatchFeatures.job_id).where(JobMatchFeatures.job_id.in_(job_ids), *conditions)
+            )
+            job_ids = list(result.scalars().all())
+        index = MatchIndex()
+        for job_id, record in await load_active_features(session, job_ids):
+            index._add(job_id, record)
+        index.loaded = True
+        return index
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "enabled": self.enabled,
+            "pending": len(self.pending),
+            "running": bool(self.runner and not self.runner.done()),
+            "batches": self.batches,
+            "jobs_merged": self.jobs_merged,
+            "entries_updated": self.entries_updated,
+            "entries_skipped": self.entries_skipped,
+            "last_batch_seconds": self.last_batch_seconds,
+        }
+
+
+# Global instance
+incremental_matcher = IncrementalMatcher()
@@ -0,0 +1,316 @@
+from app.services.skill_lexicon import skill_lexicon
+from typing import Dict, Any, List, Optional, Tuple
+import re
+
+# Deterministic job posting extraction. Every field comes with a confidence in
+# [0, 1] so the caller can skip the LLM for templated postings and pass the
+# rest along as hints.
+
+EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+APPLY_HINT_PATTERN = re.compile(r"(?:投递|简历|邮箱|发送至|发至|投至|apply|resume|cv|hr|招聘)", re.IGNORECASE)
+
+# Labelled values must start on the label's own line: an empty "公司：" must not
+# pick up the next line as its value
+LABELLED_TITLE_PATTERN = re.compile(
+    r"(?:岗位名称|职位名称|招聘岗位|招聘职位|岗位|职位)[ \t　]*[:：][ \t　]*([^\s，,；;。][^\n，,；;。]{1,39})"
+)
+LABELLED_COMPANY_PATTERN = re.compile(
+    r"(?:公司名称|企业名称|招聘单位|用人单位|单位名称|公司|单位)[ \t　]*[:：][ \t　]*([^\s，,；;。][^\n，,；;。]{1,39})"
+)
+BRACKET_HEADING_PATTERN = re.compile(r"^\s*【([^】]{2,30})】\s*([^\n]{2,40})?", re.MULTILINE)
+COMPANY_NAME_PATTERN = re.compile(
+    r"([\u4e00-\u9fffA-Za-z0-9（）()·&]{2,30}?(?:有限责任公司|股份有限公司|有限公司|集团|银行|证券|研究院|研究所|大学|医院))"
+)
+ROLE_PATTERN = re.compile(
+    r"(?:工程师|设计师|分析师|经理|专员|主管|助理|顾问|研究员|实习生|管培生|管理培训生|储备干部|运营|产品|开发|算法|教师|编辑)"
+)
+
+SALARY_PATTERNS: List[Tuple[re.Pattern, float]] = [
+    (re.compile(r"(?:薪资|薪酬|待遇|月薪|日薪|工资)\s*[:：]?\s*([^\n，,；;。]{2,30})"), 0.9),
+    (re.compile(r"(\d+(?:\.\d+)?\s*[kK千]?\s*[-~至到]\s*\d+(?:\.\d+)?\s*[kK千万]\s*(?:[·*xX×]\s*\d{1,2}\s*薪)?)"), 0.85),
+    (re.compile(r"(\d+(?:\.\d+)?\s*[-~至到]\s*\d+(?:\.\d+)?\s*(?:元)?\s*/\s*(?:天|日|月|时|小时))"), 0.85),
+    (re.compile(r"(\d+(?:\.\d+)?\s*元?\s*/\s*(?:天|日|月|时|小时))"), 0.75),
+    (re.compile(r"(面议)"), 0.7),
+]
+
+LABELLED_LOCATION_PATTERN = re.compile(
+    r"(?:工作地点|工作城市|办公地点|实习地点|地点|城市|base)[ \t　]*[:：][ \t　]*([^\s，,；;。][^\n，,；;。]{1,29})", re.IGNORECASE
+)
+KNOWN_CITIES = [
+    "北京", "上海", "广州", "深圳", "杭州", "南京", "苏州", "成都", "武汉", "西安", "重庆", "天津",
+    "长沙", "郑州", "青岛", "厦门", "合肥", "济南", "宁波", "大连", "沈阳", "福州", "珠海", "东莞",
+    "香港", "澳门", "台北", "新加坡", "远程",
+]
+
+EDUCATION_PATTERN = re.compile(r"((?:博士|硕士|研究生|本科|学士|大专|专科|高中)(?:及以上|以上|或以上)?(?:学历)?)")
+EXPERIENCE_PATTERNS: List[Tuple[re.Pattern, float]] = [
+    (re.compile(r"(?:工作经验|经验)\s*[:：]\s*([^\n，,；;。]{2,20})"), 0.9),
+    (re.compile(r"(\d+\s*[-~至到]\s*\d+\s*年(?:以上)?(?:工作)?经验?)"), 0.85),
+    (re.compile(r"(\d+\s*年以上(?:工作|相关)?经验?)"), 0.85),
+    (re.compile(r"(应届(?:毕业)?生?|经验不限|无经验要求|在校生|\d{2,4}\s*届)"), 0.8),
+]
+PUBLISHED_PATTERN = re.compile(r"(?:发布(?:时间|日期)|发布于)\s*[:：]?\s*(\d{4})[-/.年](\d{1,2})[-/.月](\d{1,2})")
+
+# (suggested_industry, suggested_industry_code, keywords), named like the LLM prompt's examples
+INDUSTRY_KEYWORDS: List[Tuple[str, str, List[str]]] = [
+    ("金融", "finance", ["银行", "证券", "基金", "保险", "期货", "信托", "投行", "金融", "支付"]),
+    ("教育", "education", ["教育", "学校", "大学", "学院", "培训", "教师", "老师", "课程"]),
+    ("医疗/健康", "healthcare", ["医院", "医疗", "医药", "药业", "制药", "生物", "临床", "健康"]),
+    ("制造业", "manufacturing", ["制造", "工厂", "汽车", "机械", "半导体", "芯片", "电子"]),
+    ("咨询", "consulting", ["咨询", "会计师事务所", "律师事务所", "审计"]),
+    ("传媒", "media", ["传媒", "媒体", "广告", "影视", "出版", "新闻"]),
+    ("房地产", "real_estate", ["房地产", "地产", "物业", "建筑"]),
+    ("互联网/科技", "internet", [
+        "互联网", "科技", "软件", "网络", "信息技术", "字节跳动", "腾讯", "阿里巴巴", "百度", "美团",
+        "京东", "网易", "快手", "拼多多", "小米", "后端", "前端", "算法", "客户端", "产品经理",
+    ]),
+]
+
+SKILL_COLORS = {
+    "Python": "#3776ab",
+    "JavaScript": "#f7df1e",
+    "Java": "#007396",
+    "机器学习": "#ff6f61",
+    "深度学习": "#ff6f61",
+    "数据分析": "#36a2eb",
+    "Photoshop": "#ff6b9d",
+    "Figma": "#ff6b9d",
+}
+
+
+OPEN_BRACKETS = "【[(（"
+CLOSE_BRACKETS = "】])）"
+EDGE_PUNCTUATION = ":：-—|"
+
+
+def _bracket_pairs(value: str) -> Tuple[Dict[int, int], List[int]]:
+    """Positions of matched opening -> closing brackets, and of the unmatched ones"""
+    pairs: Dict[int, int] = {}
+    stack: List[int] = []
+    unmatched: List[int] = []
+    for index, char in enumerate(value):
+        if char in OPEN_BRACKETS:
+            stack.append(index)
+        elif char in CLOSE_BRACKETS:
+            if stack:
+                pairs[stack.pop()] = index
+            else:
+                unmatched.append(index)
+    return pairs, unmatched + stack
+
+
+def _clean(value: str) -> str:
+    """
+    Trim whitespace, edge punctuation and brackets that wrap the whole value
+    ("【腾讯】") or are left unpaired at its edges; a parenthetical suffix such
+    as "后端开发工程师（校招）" keeps both of its brackets
+    """
+    value = value.strip().strip(EDGE_PUNCTUATION).strip()
+    while value:
+        pairs, unmatched = _bracket_pairs(value)
+        last = len(value) - 1
+        if 0 in unmatched:
+            value = value[1:]
+        elif last in unmatched:
+            value = value[:-1]
+        elif pairs.get(0) == last:
+            value = value[1:-1]
+        else:
+            break
+        value = value.strip().strip(EDGE_PUNCTUATION).strip()
+    return value
+
+
+def _extract_email(text: str) -> Tuple[Optional[str], float]:
+    candidates = []
+    for match in EMAIL_PATTERN.finditer(text):
+        window = text[max(0, match.start() - 20):match.start()]
+        candidates.append((match.group(0), bool(APPLY_HINT_PATTERN.search(window))))
+    if not candidates:
+        return None, 0.0
+    hinted = [email for email, has_hint in candidates if has_hint]
+    if hinted:
+        return hinted[0], 0.95
+    unique = {email.lower() for email, _ in candidates}
+    return candidates[0][0], 0.85 if len(unique) == 1 else 0.5
+
+
+def _extract_title(text: str) -> Tuple[Optional[str], float]:
+    match = LABELLED_TITLE_PATTERN.search(text)
+    if match:
+        return _clean(match.group(1)), 0.9
+    heading = BRACKET_HEADING_PATTERN.search(text)
+    if heading and heading.group(2) and ROLE_PATTERN.search(heading.group(2)):
+        return _clean(heading.group(2)), 0.8
+    for line in text.splitlines()[:8]:
+        stripped = _clean(line)
+        if 2 <= len(stripped) <= 30 and ROLE_PATTERN.search(stripped) and not re.search(r"[:：]", stripped):
+            return stripped, 0.55
+    return None, 0.0
+
+
+def _extract_company(text: str) -> Tuple[Optional[str], float]:
+    match = LABELLED_COMPANY_PATTERN.search(text)
+    if match:
+        return _clean(match.group(1)), 0.9
+    heading = BRACKET_HEADING_PATTERN.search(text)
+    if heading and not ROLE_PATTERN.search(heading.group(1)):
+        return _clean(heading.group(1)), 0.8
+    match = COMPANY_NAME_PATTERN.search(text)
+    if match:
+        return _clean(match.group(1)), 0.7
+    return None, 0.0
+
+
+def _classify_industry(company: Optional[str], title: Optional[str], text: str) -> Tuple[Optional[str], Optional[str], float]:
+    """
+    Keyword industry guess as (suggested_industry, suggested_industry_code, confidence).
+    A keyword in the company name decides it; otherwise the industry whose
+    keywords occur most often in the posting wins.
+    """
+    scores = []
+    for name, code, keywords in INDUSTRY_KEYWORDS:
+        in_company = any(keyword in (company or "") for keyword in keywords)
+        score = sum(2 * (keyword in (title or "")) + min(text.count(keyword), 3) for keyword in keywords)
+        scores.append((in_company, score, name, code))
+    scores.sort(key=lambda item: (item[0], item[1]), reverse=True)
+    (in_company, score, name, code), (_, runner_up, _, _) = scores[0], scores[1]
+    if in_company:
+        return name, code, 0.8
+    if not score:
+        return None, None, 0.0
+    return name, code, 0.6 if score >= 2 * max(runner_up, 1) else 0.4
+
+
+def _extract_first(patterns: List[Tuple[re.Pattern, float]], text: str) -> Tuple[Optional[str], float]:
+    for pattern, confidence in patterns:
+        match = pattern.search(text)
+        if match:
+            return _clean(match.group(1)), confidence
+    return None, 0.0
+
+
+def _extract_location(text: str) -> Tuple[Optional[str], float]:
+    match = LABELLED_LOCATION_PATTERN.search(text)
+    if match:
+        return _clean(match.group(1)), 0.9
+    found = [city for city in KNOWN_CITIES if city in text]
+    if len(found) == 1:
+        return found[0], 0.7
+    if found:
+        return "/".join(found[:3]), 0.5
+    return None, 0.0
+
+
+def _extract_skills(text: str) -> List[str]:
+    return skill_lexicon.extract(text)
+
+
+def extract_job_fields_local(raw_content: str) -> Dict[str, Any]:
+    """
+    Rule-based extraction of the LLMParseResponse fields.
+    Returns {"fields": {...}, "confidence": {field: 0..1}}; fields that were
+    not found are None (or empty) with confidence 0.
+    """
+    text = raw_content or ""
+    title, title_conf = _extract_title(text)
+    company, company_conf = _extract_company(text)
+    email, email_conf = _extract_email(text)
+    salary, salary_conf = _extract_first(SALARY_PATTERNS, text)
+    location, location_conf = _extract_location(text)
+    education_match = EDUCATION_PATTERN.search(text)
+    experience, experience_conf = _extract_first(EXPERIENCE_PATTERNS, text)
+    skills = _extract_skills(text)
+    industry, industry_code, industry_conf = _classify_industry(company, title, text)
+
+    published_at = None
+    published_match = PUBLISHED_PATTERN.search(text)
+    if published_match:
+        year, month, day = (int(part) for part in published_match.groups())
+        published_at = f"{year:04d}-{month:02d}-{day:02d}"
+
+    fields = {
+        "title": title,
+        "company_name": company,
+        "apply_email": email,
+        "suggested_industry": industry,
+        "suggested_industry_code": industry_code,
+        "requirements": {
+            "education": education_match.group(1) if education_match else None,
+            "experience": experience,
+            "location": location,
+            "skills": skills,
+            "salary": salary,
+        },
+        "published_at": published_at,
+    }
+    confidence = {
+        "title": title_conf,
+        "company_name": company_conf,
+        "apply_email": email_conf,
+        "industry": industry_conf,
+        "education": 0.85 if education_match else 0.0,
+        "experience": experience_conf,
+        "location": location_conf,
+        "skills": 0.7 if skills else 0.0,
+        "salary": salary_conf,
+        "published_at": 0.8 if published_at else 0.0,
+    }
+    return {"fields": fields, "confidence": confidence}
+
+
+def fast_path_confidence(extraction: Dict[str, Any]) -> float:
+    """The fast path needs title, company and apply email; it is as sure as its weakest one"""
+    confidence = extraction["confidence"]
+    return min(confidence["title"], confidence["company_name"], confidence["apply_email"])
+
+
+def build_local_parse_result(extraction: Dict[str, Any]) -> Dict[str, Any]:
+    """Shape a local extraction like an LLM parse result"""
+    fields = extraction["fields"]
+    title = fields["title"]
+    skills = fields["requirements"]["skills"] or []
+    return {
+        "title": title,
+        "company_name": fields["company_name"],
+        "suggested_industry": fields["suggested_industry"],
+        "suggested_industry_code": fields["suggested_industry_code"],
+        "suggested_tags": [
+            {"name": skill, "category": "skill", "color": SKILL_COLORS.get(skill, "#1890ff")}
+            for skill in skills
+        ],
+        "apply_email": fields["apply_email"],
+        "email_subject_template": f"应聘{title}-{{{{name}}}}-{{{{school}}}}" if fields["apply_email"] else None,
+        "email_body_template": (
+            f"您好！\n\n我是{{{{name}}}}，希望应聘贵公司的{title}岗位，附件为我的简历，期待您的回复。\n\n此致\n敬礼\n{{{{name}}}}"
+            if fields["apply_email"] else None
+        ),
+        "requirements": {key: value for key, value in fields["requirements"].items() if value},
+        "published_at": fields["published_at"],
+        "parse_source": "local",
+        "field_confidence": extraction["confidence"],
+    }
+
+
+def build_prompt_hints(extraction: Dict[str, Any], min_confidence: float = 0.6) -> str:
+    """Render confidently extracted fields as a short hint block for the LLM prompt"""
+    fields = extraction["fields"]
+    confidence = extraction["confidence"]
+    requirements = fields["requirements"]
+    candidates = [
+        ("title", fields["title"]),
+        ("company_name", fields["company_name"]),
+        ("apply_email", fields["apply_email"]),
+        ("education", requirements["education"]),
+        ("experience", requirements["experience"]),
+        ("location", requirements["location"]),
+        ("salary", requirements["salary"]),
+        ("skills", "、".join(requirements["skills"]) if requirements["skills"] else None),
+        ("published_at", fields["published_at"]),
+    ]
+    lines = [
+        f"- {name}: {value}"
+        for name, value in candidates
+        if value and confidence.get(name, 0) >= min_confidence
+    ]
+    return "\n".join(lines)
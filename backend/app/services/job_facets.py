@@ -0,0 +1,142 @@
+from sqlalchemy import or_
+from app.models import JobMatchFeatures
+from app.services.job_extractor import KNOWN_CITIES
+from typing import Dict, Any, List, Optional, Tuple
+import re
+import unicodedata
+
+# Structured job facets parsed from the free-form `requirements` strings when a
+# job is written ("15k-25k·14薪", "200-300/天", "本科及以上", "3-5年经验") and
+# stored as indexed columns of job_match_features, so job listing and match
+# filters are plain range/equality conditions instead of JSON scans.
+
+# Education requirement ordinal; a posting naming several levels requires the lowest
+EDUCATION_LEVELS: List[Tuple[str, int]] = [
+    ("不限", 0), ("高中", 1), ("中专", 1), ("大专", 2), ("专科", 2), ("本科", 3), ("学士", 3),
+    ("bachelor", 3), ("硕士", 4), ("研究生", 4), ("master", 4), ("博士", 5), ("phd", 5),
+]
+# Experience bands by the minimum number of years asked for
+EXPERIENCE_BANDS = ["不限/应届", "1-3年", "3-5年", "5-10年", "10年以上"]
+EXPERIENCE_BAND_YEARS = [1, 3, 5, 10]
+NO_EXPERIENCE_PATTERN = re.compile(r"应届|在校|不限|无经验|无要求|毕业生|\d{2,4}\s*届")
+EXPERIENCE_YEARS_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(?:[-~至到]\s*\d+(?:\.\d+)?\s*)?年")
+
+SALARY_PERIODS = ("hour", "day", "month", "year")
+SALARY_BONUS_PATTERN = re.compile(r"[·*x×]\s*\d{1,2}\s*薪")
+SALARY_NUMBER_PATTERN = re.compile(r"(\d+(?:\.\d+)?)\s*(k|千|w|万)?")
+SALARY_UNITS = {"k": 1000, "千": 1000, "w": 10000, "万": 10000}
+SALARY_PERIOD_PATTERNS: List[Tuple[re.Pattern, str]] = [
+    (re.compile(r"/\s*(?:小时|时|h)\b|时薪|每小时"), "hour"),
+    (re.compile(r"/\s*(?:天|日)|日薪|每天"), "day"),
+    (re.compile(r"/\s*年|年薪|每年"), "year"),
+]
+
+
+def location_code(location: Optional[str]) -> Optional[str]:
+    """Normalized city for a free-form location ("北京市海淀区" -> "北京")"""
+    if not location:
+        return None
+    for city in KNOWN_CITIES:
+        if city in location:
+            return city
+    return location.strip().lower()[:50] or None
+
+
+def _normalize(text: Any) -> str:
+    return unicodedata.normalize("NFKC", text).lower() if isinstance(text, str) else ""
+
+
+def parse_salary(text: Any) -> Tuple[Optional[int], Optional[int], Optional[str]]:
+    """(min, max, period) in yuan; "面议" and unparseable strings give (None, None, None)"""
+    text = SALARY_BONUS_PATTERN.sub("", _normalize(text))
+    numbers = SALARY_NUMBER_PATTERN.findall(text)[:2]
+    if not numbers:
+        return None, None, None
+    # "15-25k": a unit on the upper bound also applies to the lower one
+    last_unit = numbers[-1][1]
+    values = [float(number) * SALARY_UNITS.get(unit or last_unit, 1) for number, unit in numbers]
+    low, high = min(values), max(values)
+    period = next((name for pattern, name in SALARY_PERIOD_PATTERNS if pattern.search(text)), "month")
+    return int(round(low)), int(round(high)), period
+
+
+def parse_education_level(text: Any) -> Optional[int]:
+    text = _normalize(text)
+    levels = [level for name, level in EDUCATION_LEVELS if name in text]
+    return min(levels) if levels else None
+
+
+def parse_experience_band(text: Any) -> Optional[int]:
+    text = _normalize(text)
+    match = EXPERIENCE_YEARS_PATTERN.search(text)
+    if match:
+        years = float(match.group(1))
+        return sum(1 for threshold in EXPERIENCE_BAND_YEARS if years >= threshold)
+    if NO_EXPERIENCE_PATTERN.search(text):
+        return 0
+    return None
+
+
+def build_job_facets(requirements: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    requirements = requirements if isinstance(requirements, dict) else {}
+    salary_min, salary_max, salary_period = parse_salary(requirements.get("salary"))
+    return {
+        "salary_min": salary_min,
+        "salary_max": salary_max,
+        "salary_period": salary_period,
+        "education_level": parse_education_level(requirements.get("education")),
+        "experience_band": parse_experience_band(requirements.get("experience")),
+    }
+
+
+def _ordinal(value: Any, parser) -> Optional[int]:
+    """Filter values may be ordinals or the text they stand for ("本科", "3-5年")"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, int) or (isinstance(value, str) and value.strip().isdigit()):
+        return int(value)
+    return parser(value)
+
+
+def facet_conditions(filters: Optional[Dict[str, Any]]) -> List[Any]:
+    """
+    SQL conditions on job_match_features for the facet filters:
+    city, salary_period, salary_min / salary_max (overlap with the job's
+    range, monthly unless salary_period says otherwise), education_level / experience_band (equality) and
+    education_max / experience_max (jobs asking for at most that, or for
+    nothing in particular). Raises ValueError for unusable values.
+    """
+    filters = filters or {}
+    conditions = []
+    if filters.get("city"):
+        conditions.append(JobMatchFeatures.location_code == location_code(str(filters["city"])))
+    period = filters.get("salary_period")
+    if not period and (filters.get("salary_min") is not None or filters.get("salary_max") is not None):
+        # Amounts are only comparable within one period; a bare range means monthly pay
+        period = "month"
+    if period:
+        if period not in SALARY_PERIODS:
+            raise ValueError(f"salary_period must be one of {', '.join(SALARY_PERIODS)}")
+        conditions.append(JobMatchFeatures.salary_period == period)
+    for key, column, compare in (
+        ("salary_min", JobMatchFeatures.salary_max, lambda column, value: column >= value),
+        ("salary_max", JobMatchFeatures.salary_min, lambda column, value: column <= value),
+    ):
+        if filters.get(key) is not None:
+            try:
+                conditions.append(compare(column, int(filters[key])))
+            except (TypeError, ValueError):
+                raise ValueError(f"{key} must be an integer")
+    for key, column, parser, at_most in (
+        ("education_level", JobMatchFeatures.education_level, parse_education_level, False),
+        ("education_max", JobMatchFeatures.education_level, parse_education_level, True),
+        ("experience_band", JobMatchFeatures.experience_band, parse_experience_band, False),
+        ("experience_max", JobMatchFeatures.experience_band, parse_experience_band, True),
+    ):
+        if filters.get(key) is None or filters.get(key) == "":
+            continue
+        value = _ordinal(filters[key], parser)
+        if value is None:
+            raise ValueError(f"Unrecognized {key}: {filters[key]}")
+        conditions.append(or_(column <= value, column.is_(None)) if at_most else column == value)
+    return conditions
@@ -0,0 +1,146 @@
+from sqlalchemy import select, text, func, literal_column, and_, or_, table, column, event
+from sqlalchemy.engine import Connection
+from sqlalchemy.ext.asyncio import AsyncConnection
+from app.models import Job
+from typing import Dict, Any, List, Optional, Iterable
+import re
+import time
+
+# Full-text job search on an SQLite FTS5 table keyed by job id. FTS5's
+# unicode61 tokenizer would keep a whole run of Chinese characters as one
+# token, so text is segmented here first: every CJK run becomes its
+# overlapping bigrams (plus the last character alone) and a Chinese query
+# becomes a phrase of its bigrams, which matches any substring of two or more
+# characters. The built-in trigram tokenizer can't match two-character words
+# like "后端", the most common kind of Chinese query. The table is kept in
+# sync by ORM events on Job, so every write path that goes through the
+# session (not bulk UPDATE/DELETE statements) updates it in the same flush.
+
+SEARCH_TABLE = "job_search"
+search_table = table(SEARCH_TABLE, column("rowid"))
+# bm25 weights of the title, company (company + industry) and body (requirements + raw text) columns
+BM25_WEIGHTS = (10.0, 4.0, 1.0)
+CJK_RANGES = "\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+CJK_RUN_PATTERN = re.compile(f"[{CJK_RANGES}]+")
+# Latin/digit words stop at CJK characters, so "Python后端" splits like the indexed text does
+QUERY_TERM_PATTERN = re.compile(f"[{CJK_RANGES}]+|[^\\W_{CJK_RANGES}]+")
+MAX_QUERY_TERMS = 16
+# Columns searched by the LIKE fallback on databases without FTS5
+FALLBACK_COLUMNS = (Job.title, Job.company_name, Job.industry_name, Job.raw_content)
+INSERT_DOCUMENT = text(f"INSERT INTO {SEARCH_TABLE} (rowid, title, company, body) VALUES (:id, :title, :company, :body)")
+DELETE_DOCUMENT = text(f"DELETE FROM {SEARCH_TABLE} WHERE rowid = :id")
+DOCUMENT_COLUMNS = (Job.id, Job.title, Job.company_name, Job.industry_name, Job.requirements, Job.raw_content)
+
+
+def _bigrams(run: str) -> List[str]:
+    return [run[i:i + 2] for i in range(len(run) - 1)] + [run[-1]]
+
+
+def segment(value: Optional[str]) -> str:
+    """Text as indexed: CJK runs replaced by their bigrams, everything else left to the tokenizer"""
+    if not value:
+        return ""
+    return CJK_RUN_PATTERN.sub(lambda match: " " + " ".join(_bigrams(match.group())) + " ", value)
+
+
+def _strings(value: Any) -> Iterable[str]:
+    if isinstance(value, str):
+        yield value
+    elif isinstance(value, dict):
+        for item in value.values():
+            yield from _strings(item)
+    elif isinstance(value, (list, tuple)):
+        for item in value:
+            yield from _strings(item)
+
+
+def search_document(job: Job) -> Dict[str, str]:
+    return {
+        "title": segment(job.title),
+        "company": segment(" ".join(filter(None, [job.company_name, job.industry_name]))),
+        "body": segment(" ".join([*_strings(job.requirements), job.raw_content or ""])),
+    }
+
+
+def query_terms(query: Optional[str]) -> List[str]:
+    """Lower-cased query terms, split like the indexed text: Latin/digit words and CJK runs"""
+    return QUERY_TERM_PATTERN.findall((query or "").lower())[:MAX_QUERY_TERMS]
+
+
+def match_expression(query: Optional[str]) -> Optional[str]:
+    """
+    FTS5 MATCH expression requiring every query term ("Python 后端 北京"):
+    Latin words as tokens, Chinese runs as bigram phrases, a single Chinese
+    character as a prefix. None when the query has no searchable term.
+    """
+    terms = []
+    for term in query_terms(query):
+        if CJK_RUN_PATTERN.fullmatch(term):
+            terms.append(f'"{term}"*' if len(term) == 1 else '"' + " ".join(_bigrams(term)[:-1]) + '"')
+        else:
+            terms.append(f'"{term}"')
+    return " AND ".join(terms) or None
+
+
+class JobSearchIndex:
+    """FTS5 index of jobs, written in the same flush as the job itself"""
+
+    def __init__(self):
+        # FTS5 only exists on SQLite; other databases fall back to LIKE filters
+        self.available = False
+        self.sync_seconds = 0.0
+
+    async def ensure_table(self, conn: AsyncConnection) -> int:
+        """Create the table if needed and index jobs missing from it; returns how many were added"""
+        self.available = conn.dialect.name == "sqlite"
+        if not self.available:
+            return 0
+        started = time.perf_counter()
+        await conn.exec_driver_sql(
+            f"CREATE VIRTUAL TABLE IF NOT EXISTS {SEARCH_TABLE} "
+            "USING fts5(title, company, body, tokenize='unicode61 remove_diacritics 2')"
+        )
+        result = await conn.execute(select(*DOCUMENT_COLUMNS).where(Job.id.not_in(select(search_table.c.rowid))))
+        jobs = result.all()
+        if jobs:
+            await conn.execute(INSERT_DOCUMENT, [{"id": job.id, **search_document(job)} for job in jobs])
+        self.sync_seconds = round(time.perf_counter() - started, 3)
+        return len(jobs)
+
+    def index_job(self, connection: Connection, job_id: int):
+        """Re-index a job from its flushed row on the flush's own connection; a deleted job is dropped"""
+        if not self.available:
+            return
+        connection.execute(DELETE_DOCUMENT, {"id": job_id})
+        job = connection.execute(select(*DOCUMENT_COLUMNS).where(Job.id == job_id)).first()
+        if job is not None:
+            connection.execute(INSERT_DOCUMENT, {"id": job.id, **search_document(job)})
+
+    def apply(self, query, q: str):
+        """Restrict a select(Job) to jobs matching `q`, best BM25 first; None when `q` has no searchable term"""
+        expression = match_expression(q)
+        if expression is None:
+            return None
+        if not self.available:
+            # Same terms as the MATCH expression: each one must appear in some column
+            return query.where(and_(*(
+                or_(*(column.ilike(f"%{term}%") for column in FALLBACK_COLUMNS))
+                for term in query_terms(q)
+            ))).order_by(Job.created_at.desc(), Job.id.desc())
+        return (
+            query
+            .join(search_table, search_table.c.rowid == Job.id)
+            .where(text(f"{SEARCH_TABLE} MATCH :match").bindparams(match=expression))
+            .order_by(func.bm25(literal_column(SEARCH_TABLE), *BM25_WEIGHTS), Job.id.desc())
+        )
+
+
+# Global instance
+job_search = JobSearchIndex()
+
+
+@event.listens_for(Job, "after_insert")
+@event.listens_for(Job, "after_update")
+@event.listens_for(Job, "after_delete")
+def _sync_search_document(mapper, connection: Connection, target: Job):
+    job_search.index_job(connection, target.id)
@@ -0,0 +1,219 @@
+from typing import Dict, Any, List, Optional
+import json
+import re
+
+# Tolerant parsing of model output. Almost-valid JSON (code fences, trailing
+# commas, single quotes, Python literals, a truncated tail) is repaired
+# locally and coerced against the parse schema, so a malformed answer does not
+# cost another LLM round-trip.
+
+FENCE_PATTERN = re.compile(r"```(?:json|JSON)?")
+SMART_QUOTES = str.maketrans({"“": '"', "”": '"', "‘": "'", "’": "'"})
+LIST_SPLIT_PATTERN = re.compile(r"\s*[,，、;；/|]\s*")
+TAG_CATEGORIES = ["skill", "job_type", "company", "position"]
+DEFAULT_TAG_COLOR = "#1890ff"
+DANGLING_KEY_PATTERN = re.compile(r'([{,])\s*"(?:[^"\\]|\\.)*"\s*$')
+
+
+def _extract_object_text(text: str) -> str:
+    """Drop code fences and chatter around the outermost JSON object"""
+    text = FENCE_PATTERN.sub("", text or "").strip()
+    start = text.find("{")
+    if start == -1:
+        return text
+    end = text.rfind("}")
+    # Keep everything after the opening brace when the closing one is missing (truncated output)
+    return text[start:end + 1] if end > start else text[start:]
+
+
+def _normalize_tokens(text: str) -> str:
+    """
+    Re-emit the text with single-quoted strings turned into double-quoted ones,
+    // and /* */ comments removed, Python/JS literals mapped to JSON and
+    trailing commas dropped. String contents are left untouched.
+    """
+    out: List[str] = []
+    i = 0
+    length = len(text)
+    while i < length:
+        ch = text[i]
+        if ch in "\"'":
+            quote = ch
+            i += 1
+            buffer = []
+            while i < length and text[i] != quote:
+                if text[i] == "\\" and i + 1 < length:
+                    escaped = text[i + 1]
+                    # \' is not a JSON escape
+                    buffer.append("'" if escaped == "'" else "\\" + escaped)
+                    i += 2
+                    continue
+                if text[i] == '"' and quote == "'":
+                    buffer.append('\\"')
+                elif text[i] == "\n":
+                    buffer.append("\\n")
+                else:
+                    buffer.append(text[i])
+                i += 1
+            closed = i < length
+            out.append('"' + "".join(buffer) + ('"' if closed else ""))
+            i += 1
+            continue
+        if text.startswith("//", i):
+            newline = text.find("\n", i)
+            i = length if newline == -1 else newline
+            continue
+        if text.startswith("/*", i):
+            close = text.find("*/", i + 2)
+            i = length if close == -1 else close + 2
+            continue
+        word = re.match(r"[A-Za-z_]+", text[i:])
+        if word:
+            token = word.group(0)
+            out.append({"None": "null", "True": "true", "False": "false", "undefined": "null", "NaN": "null"}.get(token, token))
+            i += len(token)
+            continue
+        if ch in "}]":
+            # Trailing comma before a closer
+            while out and out[-1].isspace():
+                out.pop()
+            if out and out[-1] == ",":
+                out.pop()
+        out.append(ch)
+        i += 1
+    return "".join(out)
+
+
+def _close_truncated(text: str) -> str:
+    """Close an unterminated string and any open objects/arrays, dropping a dangling key or comma"""
+    stack: List[str] = []
+    in_string = False
+    escape = False
+    for ch in text:
+        if in_string:
+            if escape:
+                escape = False
+            elif ch == "\\":
+                escape = True
+            elif ch == '"':
+                in_string = False
+            continue
+        if ch == '"':
+            in_string = True
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack:
+            stack.pop()
+    if in_string:
+        if escape:
+            text = text[:-1]
+        text += '"'
+    if not stack:
+        return text
+
+    text = text.rstrip()
+    # {"a": 1, "b"   -> drop the dangling key;   {"a":   -> null value;   [1, 2,   -> drop comma
+    if stack[-1] == "}" and DANGLING_KEY_PATTERN.search(text):
+        text = DANGLING_KEY_PATTERN.sub(r"\1", text)
+    if text.endswith(":"):
+        text += " null"
+    text = text.rstrip().rstrip(",")
+    return text + "".join(reversed(stack))
+
+
+def repair_json(text: str) -> Any:
+    """Parse model output as JSON, repairing common defects; raises ValueError if it cannot"""
+    if text is None:
+        raise ValueError("Empty response from LLM")
+    try:
+        return json.loads(text)
+    except ValueError:
+        pass
+    # Curly quotes are usually Chinese string content ("它说“你好”"); they are
+    # only read as JSON quotes when the text does not parse without that
+    candidates = [_extract_object_text(source) for source in (text, text.translate(SMART_QUOTES))]
+    attempts = [attempt for candidate in candidates for attempt in (candidate, _normalize_tokens(candidate))]
+    attempts += [_close_truncated(_normalize_tokens(candidate)) for candidate in candidates]
+    error = None
+    for attempt in attempts:
+        try:
+            return json.loads(attempt, strict=False)
+        except ValueError as e:
+            error = e
+    raise ValueError(f"Could not repair JSON output: {error}") from error
+
+
+def _coerce_string(value: Any) -> Optional[str]:
+    if value is None:
+        return None
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    if isinstance(value, list):
+        parts = [_coerce_string(item) for item in value]
+        joined = "、".join(part for part in parts if part)
+        return joined or None
+    if isinstance(value, dict):
+        return json.dumps(value, ensure_ascii=False)
+    return str(value)
+
+
+def _coerce_string_list(value: Any) -> List[str]:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [part for part in LIST_SPLIT_PATTERN.split(value.strip()) if part]
+    if isinstance(value, list):
+        return [text for text in (_coerce_string(item) for item in value) if text]
+    return [str(value)]
+
+
+def _coerce_tags(value: Any) -> List[Dict[str, str]]:
+    tags = []
+    items = _coerce_string_list(value) if isinstance(value, str) else (value or [])
+    if not isinstance(items, list):
+        items = [items]
+    for item in items:
+        if isinstance(item, str):
+            item = {"name": item}
+        if not isinstance(item, dict) or not _coerce_string(item.get("name")):
+            continue
+        category = _coerce_string(item.get("category"))
+        tags.append({
+            "name": _coerce_string(item["name"]),
+            "category": category if category in TAG_CATEGORIES else "skill",
+            "color": _coerce_string(item.get("color")) or DEFAULT_TAG_COLOR,
+        })
+    return tags
+
+
+def _coerce_value(value: Any, spec: Dict[str, Any]) -> Any:
+    kind = spec.get("type")
+    if kind == "string":
+        return _coerce_string(value)
+    if kind == "array":
+        if spec.get("items", {}).get("type") == "object":
+            return _coerce_tags(value)
+        return _coerce_string_list(value)
+    if kind == "object":
+        return coerce_to_schema(value if isinstance(value, dict) else {}, spec)
+    return value
+
+
+def coerce_to_schema(data: Any, schema: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Coerce a parsed object against a JSON-schema "object" spec: unknown keys
+    are dropped, values are converted to the declared types and missing
+    properties are filled with None / [] / {}. Required fields are not
+    invented; callers decide what to do when they are empty.
+    """
+    if isinstance(data, list) and data and isinstance(data[0], dict):
+        # Some models wrap the object in a list
+        data = data[0]
+    if not isinstance(data, dict):
+        raise ValueError(f"Expected a JSON object, got {type(data).__name__}")
+    result = {}
+    for name, spec in schema.get("properties", {}).items():
+        result[name] = _coerce_value(data.get(name), spec)
+    return result
+
@@ -0,0 +1,97 @@
+from typing import Dict, Any, List, Tuple, Optional
+import json
+
+
+class PartialJSONObject:
+    """
+    Incrementally scan a JSON object that arrives in streamed fragments.
+    feed() returns the top-level (key, value) pairs whose values became
+    complete with that fragment; text before the first "{" (e.g. a ```json
+    fence) is skipped.
+    """
+
+    def __init__(self):
+        self.buffer = ""
+        self.fields: Dict[str, Any] = {}
+        self.done = False
+        self._pos = 0
+        self._started = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._expect = "key"  # key -> key_string -> colon -> value -> in_value
+        self._key: Optional[str] = None
+        self._key_start = 0
+        self._value_start: Optional[int] = None
+
+    def feed(self, text: str) -> List[Tuple[str, Any]]:
+        self.buffer += text
+        completed: List[Tuple[str, Any]] = []
+        while self._pos < len(self.buffer) and not self.done:
+            ch = self.buffer[self._pos]
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                self._pos += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expect == "key_string":
+                        self._key = json.loads(self.buffer[self._key_start:self._pos + 1])
+                        self._expect = "colon"
+                self._pos += 1
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expect == "key":
+                    self._key_start = self._pos
+                    self._expect = "key_string"
+                elif self._depth == 1 and self._expect == "value":
+                    self._value_start = self._pos
+                    self._expect = "in_value"
+            elif ch in "{[":
+                if self._depth == 1 and self._expect == "value":
+                    self._value_start = self._pos
+                    self._expect = "in_value"
+                self._depth += 1
+            elif ch in "}]":
+                self._depth -= 1
+                if self._depth == 0:
+                    self._complete_field(completed)
+                    self.done = True
+            elif self._depth == 1 and ch == ":" and self._expect == "colon":
+                self._expect = "value"
+            elif self._depth == 1 and ch == ",":
+                self._complete_field(completed)
+                self._expect = "key"
+            elif self._depth == 1 and self._expect == "value" and not ch.isspace():
+                self._value_start = self._pos
+                self._expect = "in_value"
+            self._pos += 1
+        return completed
+
+    def _complete_field(self, completed: List[Tuple[str, Any]]):
+        if self._key is not None and self._value_start is not None:
+            raw_value = self.buffer[self._value_start:self._pos].strip()
+            try:
+                value = json.loads(raw_value)
+            except ValueError:
+                value = None
+            else:
+                self.fields[self._key] = value
+                completed.append((self._key, value))
+        self._key = None
+        self._value_start = None
+
+
+def sse_event(event: str, data: Any) -> str:
+    """Format one Server-Sent Events message"""
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
@@ -0,0 +1,364 @@
+from openai import RateLimitError, APIConnectionError, APITimeoutError, InternalServerError, APIStatusError
+from app.config import settings
+from app.services.prompt_budget import count_tokens
+from typing import Dict, Any, Callable, Awaitable, Optional, TypeVar
+import asyncio
+import random
+import time
+
+T = TypeVar("T")
+
+
+class LLMRateLimitError(Exception):
+    """Provider kept answering 429 after all retries; not a capability problem"""
+
+
+class LLMUnavailableError(Exception):
+    """Provider is failing (5xx, timeouts, connection errors) or the circuit is open"""
+
+
+class TokenBucket:
+    """Continuously refilling bucket holding up to `per_minute` units; 0 disables it"""
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self.tokens = float(per_minute)
+        self.rate = per_minute / 60.0
+        self.updated_at = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    async def acquire(self, amount: float = 1.0):
+        if self.capacity <= 0:
+            return
+        # A single request larger than the bucket only waits for a full bucket
+        amount = min(amount, self.capacity)
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.rate)
+
+    def adjust(self, delta: float):
+        """Charge (or refund) the difference between estimated and actual usage"""
+        if self.capacity <= 0:
+            return
+        self._refill()
+        self.tokens = min(self.capacity, self.tokens - delta)
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit: +1 per limit's worth of successes, halved on throttling"""
+
+    def __init__(self, initial: int, minimum: int, maximum: int):
+        self.limit = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self._condition = asyncio.Condition()
+
+    async def acquire(self):
+        async with self._condition:
+            while self.in_flight >= max(self.minimum, int(self.limit)):
+                await self._condition.wait()
+            self.in_flight += 1
+
+    async def release(self):
+        async with self._condition:
+            self.in_flight -= 1
+            self._condition.notify_all()
+
+    def on_success(self):
+        self.limit = min(self.maximum, self.limit + 1.0 / max(self.limit, 1.0))
+
+    def on_throttle(self):
+        self.limit = max(float(self.minimum), self.limit / 2)
+
+
+class CircuitBreaker:
+    """Opens after consecutive provider failures; lets one probe through after the cooldown"""
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.open_count = 0
+        self._probe_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == "closed":
+            return True
+        if self.state == "open" and time.monotonic() - self.opened_at >= self.cooldown_seconds:
+            self.state = "half_open"
+        if self.state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return True
+        return False
+
+    @property
+    def probing(self) -> bool:
+        """Half open with the single probe still out"""
+        return self.state == "half_open" and self._probe_in_flight
+
+    def release_probe(self):
+        """The probe ended without an answer (e.g. it was cancelled); let the next call probe"""
+        self._probe_in_flight = False
+
+    def record_success(self):
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._probe_in_flight = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.open_count += 1
+                print(f"🔌 LLM circuit opened after {self.consecutive_failures} failures")
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+
+def _retry_after_seconds(error: Exception) -> Optional[float]:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        if headers.get("retry-after-ms"):
+            return float(headers["retry-after-ms"]) / 1000
+        if headers.get("retry-after"):
+            return float(headers["retry-after"])
+    except (TypeError, ValueError):
+        return None
+    return None
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    return isinstance(error, RateLimitError) or (
+        isinstance(error, APIStatusError) and error.status_code == 429
+    )
+
+
+def is_provider_error(error: Exception) -> bool:
+    return isinstance(error, (APIConnectionError, APITimeoutError, InternalServerError)) or (
+        isinstance(error, APIStatusError) and error.status_code >= 500
+    )
+
+
+def _chunk_text(chunk: Any) -> str:
+    """Text a streamed chat completion chunk carries (content or function call arguments)"""
+    choices = getattr(chunk, "choices", None)
+    if not choices:
+        return ""
+    delta = choices[0].delta
+    function_call = getattr(delta, "function_call", None)
+    return (getattr(delta, "content", None) or "") + (getattr(function_call, "arguments", None) or "")
+
+
+class GovernedStream:
+    """
+    A streamed response that keeps its governor's concurrency slot until it
+    is exhausted, fails or is closed, so long stream bodies count against the
+    limit like any other call. Collects the usage the provider reports (or an
+    estimate from the streamed text) and settles the token bucket on close;
+    `on_close(stream)` runs once afterwards.
+    """
+
+    def __init__(self, governor: "LLMGovernor", stream: Any, estimated_tokens: int = 0):
+        self.governor = governor
+        self.stream = stream
+        self.estimated_tokens = estimated_tokens
+        self.usage = None
+        self.completion_tokens = 0
+        self.completed = False
+        self.error: Optional[BaseException] = None
+        self.on_close: Optional[Callable[["GovernedStream"], Any]] = None
+        self._closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self) -> Any:
+        try:
+            chunk = await self.stream.__anext__()
+        except StopAsyncIteration:
+            self.completed = True
+            await self.aclose()
+            raise
+        except BaseException as e:
+            self.error = e
+            if is_provider_error(e):
+                self.governor.provider_failures += 1
+                self.governor.breaker.record_failure()
+            await self.aclose()
+            raise
+        if getattr(chunk, "usage", None) is not None:
+            self.usage = chunk.usage
+        self.completion_tokens += count_tokens(_chunk_text(chunk))
+        return chunk
+
+    async def __aenter__(self) -> "GovernedStream":
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.aclose()
+
+    async def aclose(self):
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            close = getattr(self.stream, "close", None) or getattr(self.stream, "aclose", None)
+            if close is not None and not self.completed:
+                await close()
+        finally:
+            await self.governor.limiter.release()
+            total = getattr(self.usage, "total_tokens", None)
+            if total:
+                self.governor.token_bucket.adjust(total - self.estimated_tokens)
+            if self.on_close is not None:
+                self.on_close(self)
+
+
+class LLMGovernor:
+    """
+    Gate for every LLM call: request/token buckets, AIMD concurrency,
+    jittered exponential retry honoring Retry-After, and a circuit breaker.
+    Capability errors (400s such as an unsupported response_format) pass
+    straight through so the caller can change mode.
+    """
+
+    def __init__(self):
+        self.request_bucket = TokenBucket(settings.llm_requests_per_minute)
+        self.token_bucket = TokenBucket(settings.llm_tokens_per_minute)
+        self.limiter = AdaptiveConcurrencyLimiter(
+            initial=settings.llm_max_concurrency,
+            minimum=settings.llm_min_concurrency,
+            maximum=settings.llm_max_concurrency
+        )
+        self.breaker = CircuitBreaker(
+            failure_threshold=settings.llm_breaker_failure_threshold,
+            cooldown_seconds=settings.llm_breaker_cooldown_seconds
+        )
+        self.max_retries = settings.llm_max_retries
+        self.base_delay = settings.llm_retry_base_delay
+        self.max_delay = settings.llm_retry_max_delay
+        self.calls = 0
+        self.retries = 0
+        self.throttled = 0
+        self.provider_failures = 0
+        self.rejected = 0
+
+    def _backoff(self, attempt: int, error: Exception) -> float:
+        retry_after = _retry_after_seconds(error)
+        if retry_after is not None:
+            return min(self.max_delay, retry_after) + random.uniform(0, self.base_delay)
+        # Full jitter keeps a burst of throttled callers from retrying in lockstep
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+    async def call(
+        self,
+        fn: Callable[[], Awaitable[T]],
+        estimated_tokens: int = 0,
+        call_info: Optional[Dict[str, Any]] = None,
+        stream: bool = False
+    ) -> T:
+        """
+        Run fn under the limits; call_info["retries"] is kept up to date for the caller.
+        With `stream`, fn opens a streamed response, which is returned as a
+        GovernedStream holding the concurrency slot until it is exhausted or closed.
+        """
+        attempt = 0
+        while True:
+            if not self.breaker.allow():
+                self.rejected += 1
+                raise LLMUnavailableError("LLM provider circuit is open, failing fast")
+            # allow() only lets a call through a half-open breaker as its probe
+            probe = self.breaker.state == "half_open"
+
+            try:
+                await self.request_bucket.acquire(1)
+                await self.token_bucket.acquire(estimated_tokens)
+                await self.limiter.acquire()
+                self.calls += 1
+                held = False
+                try:
+                    result = await fn()
+                    if stream:
+                        result = GovernedStream(self, result, estimated_tokens)
+                        held = True
+                finally:
+                    if not held:
+                        await self.limiter.release()
+            except Exception as e:
+                if is_rate_limit_error(e):
+                    self.throttled += 1
+                    self.limiter.on_throttle()
+                    # Throttling is no evidence of health: leave the failure count
+                    # alone, only free a half-open probe for the next call
+                    if probe:
+                        self.breaker.release_probe()
+                    if attempt >= self.max_retries:
+                        raise LLMRateLimitError(f"Rate limited after {attempt + 1} attempts: {e}") from e
+                elif is_provider_error(e):
+                    self.provider_failures += 1
+                    self.breaker.record_failure()
+                    if attempt >= self.max_retries or self.breaker.state == "open":
+                        raise LLMUnavailableError(f"LLM provider unavailable: {e}") from e
+                else:
+                    self.breaker.record_success()
+                    raise
+                delay = self._backoff(attempt, e)
+                attempt += 1
+                self.retries += 1
+                if call_info is not None:
+                    call_info["retries"] = attempt
+                print(f"⏳ LLM call failed ({type(e).__name__}), retry {attempt}/{self.max_retries} in {delay:.1f}s")
+                # The concurrency slot is already released, so backoff doesn't hold it
+                await asyncio.sleep(delay)
+                continue
+            except BaseException:
+                # Cancelled (a lost hedge, a client gone away): the probe proved nothing
+                if probe:
+                    self.breaker.release_probe()
+                raise
+
+            self.limiter.on_success()
+            self.breaker.record_success()
+            if stream:
+                # Token usage is settled when the stream is closed
+                return result
+            usage = getattr(result, "usage", None)
+            if usage is not None and getattr(usage, "total_tokens", None):
+                self.token_bucket.adjust(usage.total_tokens - estimated_tokens)
+            return result
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "concurrency_limit": round(self.limiter.limit, 2),
+            "in_flight": self.limiter.in_flight,
+            "circuit_state": self.breaker.state,
+            "circuit_open_count": self.breaker.open_count,
+            "calls": self.calls,
+            "retries": self.retries,
+            "throttled": self.throttled,
+            "provider_failures": self.provider_failures,
+            "rejected_by_circuit": self.rejected,
+            "requests_per_minute": int(self.request_bucket.capacity),
+            "tokens_per_minute": int(self.token_bucket.capacity),
+        }
+
+
+def estimate_tokens(messages: list, max_output_tokens: int = 800) -> int:
+    """Prompt size plus the expected completion, for the token bucket"""
+    return sum(count_tokens(message.get("content") or "") for message in messages) + max_output_tokens
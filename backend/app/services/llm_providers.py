@@ -0,0 +1,212 @@
+from openai import AsyncOpenAI
+from app.config import settings
+from app.services.llm_governor import LLMGovernor, LLMRateLimitError, LLMUnavailableError
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple, Callable, Awaitable, TypeVar
+import asyncio
+import random
+import time
+
+T = TypeVar("T")
+
+
+class LLMProvider:
+    """One OpenAI-compatible endpoint with its own client, governor and latency history"""
+
+    def __init__(self, name: str, base_url: str, model: str, api_key: str, weight: float = 1.0):
+        self.name = name
+        self.base_url = base_url
+        self.model = model
+        self.api_key = api_key
+        self.weight = max(float(weight), 0.01)
+        # Retries are owned by the governor so backoff and circuit state stay in one place
+        self.client = AsyncOpenAI(api_key=api_key, base_url=base_url, max_retries=0)
+        self.governor = LLMGovernor()
+        self.latencies: deque = deque(maxlen=settings.llm_hedge_latency_window)
+        self.wins = 0
+        self.failures = 0
+
+    @property
+    def healthy(self) -> bool:
+        """Closed breaker, or half open and free to take the next probe"""
+        breaker = self.governor.breaker
+        return breaker.state != "open" and not breaker.probing
+
+    def record_latency(self, latency: float):
+        self.latencies.append(latency)
+
+    def percentile(self, fraction: float) -> Optional[float]:
+        if not self.latencies:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(round(fraction * (len(ordered) - 1))))]
+
+    def hedge_delay(self) -> float:
+        """Wait this long for the provider before sending a hedged duplicate"""
+        if len(self.latencies) < settings.llm_hedge_min_samples:
+            return settings.llm_hedge_default_delay
+        return max(settings.llm_hedge_min_delay, self.percentile(0.95))
+
+    def info(self) -> Dict[str, Any]:
+        p50 = self.percentile(0.5)
+        p95 = self.percentile(0.95)
+        return {
+            "name": self.name,
+            "base_url": self.base_url,
+            "model": self.model,
+            "weight": self.weight,
+            "healthy": self.healthy,
+            "samples": len(self.latencies),
+            "latency_p50": round(p50, 3) if p50 is not None else None,
+            "latency_p95": round(p95, 3) if p95 is not None else None,
+            "hedge_delay": round(self.hedge_delay(), 3),
+            "wins": self.wins,
+            "failures": self.failures,
+            "governor": self.governor.get_stats(),
+        }
+
+
+def build_providers() -> List[LLMProvider]:
+    """The OPENAI_* endpoint first (when configured), then the LLM_PROVIDERS entries"""
+    providers = []
+    if settings.openai_api_key and settings.openai_api_key != "your-api-key-here":
+        providers.append(LLMProvider("default", settings.openai_base_url, settings.openai_model, settings.openai_api_key))
+    for index, entry in enumerate(settings.llm_providers):
+        if not entry.get("base_url") or not entry.get("model"):
+            print(f"⚠️ Skipping LLM provider #{index}: base_url and model are required")
+            continue
+        providers.append(LLMProvider(
+            name=entry.get("name") or f"provider-{index + 1}",
+            base_url=entry["base_url"],
+            model=entry["model"],
+            api_key=entry.get("api_key") or settings.openai_api_key,
+            weight=entry.get("weight", 1.0)
+        ))
+    return providers
+
+
+class ProviderPool:
+    """
+    Routes each call to a provider by health, observed latency and weight.
+    When the primary has not answered within its rolling p95, a hedged
+    duplicate goes to the next best provider; the first valid result wins
+    and the other request is cancelled. Rate limits and outages on the
+    primary fail over at once; other errors (e.g. an unsupported
+    response_format) are returned as-is so the caller can change mode.
+    """
+
+    def __init__(self, providers: List[LLMProvider]):
+        self.providers = providers
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.failovers = 0
+
+    def ranked(self) -> List[LLMProvider]:
+        """Primary first (weighted pick favouring fast, healthy providers), then fallbacks by speed"""
+        healthy = [provider for provider in self.providers if provider.healthy]
+        candidates = healthy or list(self.providers)
+        if len(candidates) <= 1:
+            return candidates + [provider for provider in self.providers if provider not in candidates]
+
+        def speed(provider: LLMProvider) -> float:
+            p50 = provider.percentile(0.5)
+            # Unmeasured providers look fast so they get sampled
+            return max(p50, 0.05) if p50 is not None else 0.05
+
+        scores = [provider.weight / speed(provider) for provider in candidates]
+        primary = random.choices(candidates, weights=scores, k=1)[0]
+        others = sorted(
+            (provider for provider in candidates if provider is not primary),
+            key=lambda provider: speed(provider) / provider.weight
+        )
+        return [primary] + others + [provider for provider in self.providers if provider not in candidates]
+
+    async def call(
+        self,
+        fn: Callable[[LLMProvider], Awaitable[T]],
+        hedge: bool = True,
+        providers: Optional[List[LLMProvider]] = None,
+        track_latency: bool = True
+    ) -> Tuple[T, LLMProvider]:
+        """
+        Run fn against the best provider (or `providers` in that order), hedging
+        or failing over to the next one. Without `track_latency` the caller
+        records latency itself (a stream is only done once its body arrived).
+        """
+        ranked = list(providers) if providers else self.ranked()
+        if not ranked:
+            raise ValueError("LLM client not configured. Please set API key.")
+        primary = ranked[0]
+        backups = ranked[1:]
+
+        async def attempt(provider: LLMProvider) -> Tuple[T, LLMProvider, float]:
+            started = time.perf_counter()
+            try:
+                result = await fn(provider)
+            except asyncio.CancelledError:
+                # A hedge loser is cancelled moments after it starts, so its elapsed
+                # time is no response time. It only bounds the latency from below,
+                # which is news only when it is beyond the provider's current p95.
+                elapsed = time.perf_counter() - started
+                p95 = provider.percentile(0.95)
+                if track_latency and p95 is not None and elapsed > p95:
+                    provider.record_latency(elapsed)
+                raise
+            except Exception:
+                provider.failures += 1
+                raise
+            latency = time.perf_counter() - started
+            if track_latency:
+                provider.record_latency(latency)
+            return result, provider, latency
+
+        tasks: Dict[asyncio.Task, LLMProvider] = {asyncio.ensure_future(attempt(primary)): primary}
+        hedge_enabled = hedge and settings.llm_hedge_enabled and bool(backups)
+        hedged = False
+        first_error: Optional[BaseException] = None
+        try:
+            timeout = primary.hedge_delay() if hedge_enabled else None
+            while tasks:
+                done, _ = await asyncio.wait(tasks.keys(), timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+                timeout = None
+                if not done:
+                    # Primary is slower than its p95: send a hedged duplicate
+                    backup = backups.pop(0)
+                    self.hedged += 1
+                    hedged = True
+                    print(f"🏁 Hedging LLM call from {primary.name} to {backup.name}")
+                    tasks[asyncio.ensure_future(attempt(backup))] = backup
+                    continue
+                for task in done:
+                    provider = tasks.pop(task)
+                    error = task.exception()
+                    if error is None:
+                        result, winner, _ = task.result()
+                        winner.wins += 1
+                        if hedged and winner is not primary:
+                            self.hedge_wins += 1
+                        return result, winner
+                    if first_error is None:
+                        first_error = error
+                    # Provider trouble fails over; capability errors belong to the caller
+                    if isinstance(error, (LLMRateLimitError, LLMUnavailableError)) and backups and not tasks:
+                        backup = backups.pop(0)
+                        self.failovers += 1
+                        print(f"🔀 LLM provider {provider.name} failed ({type(error).__name__}), failing over to {backup.name}")
+                        tasks[asyncio.ensure_future(attempt(backup))] = backup
+            raise first_error
+        finally:
+            # Cancelling a loser ends its governor call, which releases a half-open probe it held
+            for task in tasks:
+                task.cancel()
+                # The loser may have failed just before being cancelled
+                task.add_done_callback(lambda finished: finished.cancelled() or finished.exception())
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            "hedge_enabled": settings.llm_hedge_enabled,
+            "hedged_calls": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "failovers": self.failovers,
+            "providers": [provider.info() for provider in self.providers],
+        }
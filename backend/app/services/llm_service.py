@@ -1,8 +1,174 @@
-from openai import AsyncOpenAI
 from app.config import settings
-from typing import Dict, Any, List, Optional
+from app.services.parse_cache import parse_cache, build_cache_key
+from app.services.json_stream import PartialJSONObject
+from app.services.llm_governor import (
+    estimate_tokens, is_provider_error, is_rate_limit_error, GovernedStream, LLMRateLimitError, LLMUnavailableError
+)
+from app.services.llm_providers import LLMProvider, ProviderPool, build_providers
+from app.services.llm_telemetry import llm_telemetry
+from app.services.prompt_budget import compact_text, count_tokens, prompt_budget_for
+from app.services.json_repair import repair_json, coerce_to_schema
+from app.services.skill_lexicon import skill_lexicon
+from app.services.match_index import job_match_features, resume_match_tokens, score_match
+from app.services.job_extractor import (
+    extract_job_fields_local, fast_path_confidence, build_local_parse_result, build_prompt_hints
+)
+from typing import Dict, Any, List, Optional, Tuple, AsyncIterator, Callable, Awaitable
+import asyncio
+import copy
+import hashlib
 import json
 import re
+import time
+
+# Function schema for structured job posting output
+JOB_PARSE_FUNCTION_SCHEMA = {
+    "name": "parse_job_posting",
+    "description": "Extract structured information from a job posting",
+    "parameters": {
+        "type": "object",
+        "properties": {
+            "title": {
+                "type": "string",
+                "description": "Job title/position name"
+            },
+            "company_name": {
+                "type": "string",
+                "description": "Company name"
+            },
+            "suggested_industry": {
+                "type": "string",
+                "description": "Industry category (e.g., '互联网/科技', '金融', '教育')"
+            },
+            "suggested_industry_code": {
+                "type": "string",
+                "description": "Industry code in English lowercase (e.g., 'internet', 'finance', 'education')"
+            },
+            "suggested_tags": {
+                "type": "array",
+                "description": "Suggested tags for the job",
+                "items": {
+                    "type": "object",
+                    "properties": {
+                        "name": {"type": "string"},
+                        "category": {
+                            "type": "string",
+                            "enum": ["skill", "job_type", "company", "position"]
+                        },
+                        "color": {"type": "string"}
+                    },
+                    "required": ["name", "category"]
+                }
+            },
+            "apply_email": {
+                "type": "string",
+                "description": "Email address for application"
+            },
+            "email_subject_template": {
+                "type": "string",
+                "description": "Suggested email subject template with placeholders like {{name}}, {{position}}"
+            },
+            "email_body_template": {
+                "type": "string",
+                "description": "Suggested email body template with placeholders"
+            },
+            "requirements": {
+                "type": "object",
+                "properties": {
+                    "education": {"type": "string"},
+                    "experience": {"type": "string"},
+                    "location": {"type": "string"},
+                    "skills": {
+                        "type": "array",
+                        "items": {"type": "string"}
+                    },
+                    "salary": {"type": "string"}
+                }
+            },
+            "published_at": {
+                "type": "string",
+                "description": "Publication date in ISO format if mentioned"
+            }
+        },
+        "required": ["title", "company_name"]
+    }
+}
+
+JOB_PARSE_SYSTEM_PROMPT = """你是一个专业的招聘信息解析助手。你的任务是从原始文本中提取结构化的招聘信息。
+
+**重要规则：**
+1. **核心必填项**：必须准确提取 **职位名称（title）** 和 **公司名称（company_name）**。这是最关键的信息。
+2. **邮箱提取（重要）**：仔细查找文中的 **投递邮箱（apply_email）**。这通常是必填项，请务必提取。如果文中出现多个邮箱，优先提取HR或招聘专用的邮箱。
+3. **行业分类**：推断行业分类（suggested_industry）并生成英文小写代码（suggested_industry_code）。
+4. **智能标签**：生成相关标签（suggested_tags），包括技能、职位类型、公司特征等。
+5. **颜色分配**：为技能标签分配合适的颜色（Python用#3776ab，Java用#007396等）。
+6. **邮件模板**：如果有投递邮箱，必须生成邮件主题和正文模板，方便用户直接投递。
+7. **职位要求**：提取结构化的职位要求（学历、经验、地点、技能、薪资）。
+
+**标签颜色参考：**
+- Python: #3776ab
+- JavaScript: #f7df1e
+- Java: #007396
+- AI/机器学习: #ff6f61
+- 数据分析: #36a2eb
+- 设计: #ff6b9d
+- 实习: #52c41a
+- 远程: #1890ff
+"""
+
+# Locally extracted fields handed to the model so it can confirm them and focus on the rest
+JOB_PARSE_HINT_TEMPLATE = """
+本地规则已识别出以下字段（请核对后直接采用，重点补全其余字段）：
+{hints}
+"""
+
+# Bump JOB_PARSE_SCHEMA_VERSION for output changes the prompt text does not capture;
+# edits to the prompt or schema change the version on their own.
+JOB_PARSE_SCHEMA_VERSION = 2
+JOB_PARSE_PROMPT_VERSION = hashlib.sha256(
+    json.dumps(
+        [JOB_PARSE_SCHEMA_VERSION, JOB_PARSE_SYSTEM_PROMPT, JOB_PARSE_FUNCTION_SCHEMA, JOB_PARSE_HINT_TEMPLATE],
+        ensure_ascii=False,
+        sort_keys=True
+    ).encode("utf-8")
+).hexdigest()[:16]
+
+RESUME_PARSE_SYSTEM_PROMPT = "你是专业简历解析助手，只输出JSON对象"
+
+STRUCTURED_OUTPUT_MODES = ["function", "json", "plain"]
+STRUCTURED_OUTPUT_MODE_LABELS = {"function": "Function", "json": "JSON", "plain": "Plain"}
+
+STREAMED_JOB_FIELDS = [
+    "title", "company_name", "apply_email", "requirements", "suggested_industry", "suggested_industry_code",
+    "suggested_tags", "email_subject_template", "email_body_template", "published_at",
+]
+
+
+def _field_events(values: Dict[str, Any], source: str) -> List[Dict[str, Any]]:
+    return [
+        {"event": "field", "field": field, "value": values[field], "source": source}
+        for field in STREAMED_JOB_FIELDS
+        if values.get(field) not in (None, "", [], {})
+    ]
+
+
+def _call_outcome(error: Exception) -> str:
+    if isinstance(error, LLMRateLimitError):
+        return "rate_limited"
+    if isinstance(error, LLMUnavailableError):
+        return "unavailable"
+    return "error"
+
+
+def _confident_local_fields(extraction: Dict[str, Any], min_confidence: float = 0.8) -> Dict[str, Any]:
+    fields = extraction["fields"]
+    confidence = extraction["confidence"]
+    return {
+        key: fields[key]
+        for key in ["title", "company_name", "apply_email"]
+        if fields.get(key) and confidence[key] >= min_confidence
+    }
+
 
 class LLMService:
     def __init__(self):
@@ -10,20 +176,28 @@ class LLMService:
         self.model = settings.openai_model
         self.base_url = settings.openai_base_url
         self.api_key = settings.openai_api_key
+        self._learned_modes: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._single_flight_leaders = 0
+        self._single_flight_coalesced = 0
         self._init_client()
     
     def _init_client(self):
-        """Initialize OpenAI client from .env configuration"""
-        if self.api_key and self.api_key != "your-api-key-here":
-            try:
-                self.client = AsyncOpenAI(
-                    api_key=self.api_key,
-                    base_url=self.base_url
-                )
-                print(f"✅ LLM Client initialized - Model: {self.model}, Base URL: {self.base_url}")
-            except Exception as e:
-                print(f"❌ Failed to initialize OpenAI client: {e}")
-                self.client = None
+        """Initialize the OpenAI-compatible providers from .env configuration"""
+        try:
+            providers = build_providers()
+        except Exception as e:
+            print(f"❌ Failed to initialize OpenAI client: {e}")
+            providers = []
+        self.provider_pool = ProviderPool(providers)
+        if providers:
+            # The first provider is reported as the configured one; modes and cache keys follow the provider that answers
+            primary = providers[0]
+            self.client = primary.client
+            self.model = primary.model
+            self.base_url = primary.base_url
+            for provider in providers:
+                print(f"✅ LLM Client initialized - Provider: {provider.name}, Model: {provider.model}, Base URL: {provider.base_url}")
         else:
             print(f"⚠️ LLM not configured. Please set OPENAI_API_KEY in .env file")
             self.client = None
@@ -39,168 +213,665 @@ class LLMService:
     
     async def parse_job_posting(self, raw_content: str, source_type: str = "手动") -> Dict[str, Any]:
         """
-        Parse raw job posting text using LLM with structured output
+        Parse raw job posting text using LLM with structured output.
+        Templated postings the local extractor is confident about skip the LLM;
+        results are served from the persistent parse cache when the same
+        normalized content was already parsed with the current model and prompt.
         """
+        extraction = extract_job_fields_local(raw_content)
+        if settings.job_fast_path_enabled and fast_path_confidence(extraction) >= settings.job_fast_path_threshold:
+            llm_telemetry.record_served("parse_job_posting", "local")
+            return build_local_parse_result(extraction)
+
         if not self.client:
             raise ValueError("LLM client not configured. Please set API key.")
-        
-        # Define the function schema for structured output
-        function_schema = {
-            "name": "parse_job_posting",
-            "description": "Extract structured information from a job posting",
-            "parameters": {
-                "type": "object",
-                "properties": {
-                    "title": {
-                        "type": "string",
-                        "description": "Job title/position name"
-                    },
-                    "company_name": {
-                        "type": "string",
-                        "description": "Company name"
-                    },
-                    "suggested_industry": {
-                        "type": "string",
-                        "description": "Industry category (e.g., '互联网/科技', '金融', '教育')"
-                    },
-                    "suggested_industry_code": {
-                        "type": "string",
-                        "description": "Industry code in English lowercase (e.g., 'internet', 'finance', 'education')"
-                    },
-                    "suggested_tags": {
-                        "type": "array",
-                        "description": "Suggested tags for the job",
-                        "items": {
-                            "type": "object",
-                            "properties": {
-                                "name": {"type": "string"},
-                                "category": {
-                                    "type": "string",
-                                    "enum": ["skill", "job_type", "company", "position"]
-                                },
-                                "color": {"type": "string"}
-                            },
-                            "required": ["name", "category"]
-                        }
-                    },
-                    "apply_email": {
-                        "type": "string",
-                        "description": "Email address for application"
-                    },
-                    "email_subject_template": {
-                        "type": "string",
-                        "description": "Suggested email subject template with placeholders like {{name}}, {{position}}"
-                    },
-                    "email_body_template": {
-                        "type": "string",
-                        "description": "Suggested email body template with placeholders"
-                    },
-                    "requirements": {
-                        "type": "object",
-                        "properties": {
-                            "education": {"type": "string"},
-                            "experience": {"type": "string"},
-                            "location": {"type": "string"},
-                            "skills": {
-                                "type": "array",
-                                "items": {"type": "string"}
-                            },
-                            "salary": {"type": "string"}
-                        }
-                    },
-                    "published_at": {
-                        "type": "string",
-                        "description": "Publication date in ISO format if mentioned"
-                    }
-                },
-                "required": ["title", "company_name"]
-            }
-        }
-        
-        # Craft the prompt
-        system_prompt = """你是一个专业的招聘信息解析助手。你的任务是从原始文本中提取结构化的招聘信息。
 
-**重要规则：**
-1. **核心必填项**：必须准确提取 **职位名称（title）** 和 **公司名称（company_name）**。这是最关键的信息。
-2. **邮箱提取（重要）**：仔细查找文中的 **投递邮箱（apply_email）**。这通常是必填项，请务必提取。如果文中出现多个邮箱，优先提取HR或招聘专用的邮箱。
-3. **行业分类**：推断行业分类（suggested_industry）并生成英文小写代码（suggested_industry_code）。
-4. **智能标签**：生成相关标签（suggested_tags），包括技能、职位类型、公司特征等。
-5. **颜色分配**：为技能标签分配合适的颜色（Python用#3776ab，Java用#007396等）。
-6. **邮件模板**：如果有投递邮箱，必须生成邮件主题和正文模板，方便用户直接投递。
-7. **职位要求**：提取结构化的职位要求（学历、经验、地点、技能、薪资）。
+        cache_keys = self._job_cache_keys(raw_content, source_type)
+        cached = await self._cached_job_parse(cache_keys)
+        if cached is not None:
+            llm_telemetry.record_served("parse_job_posting", "cache")
+            return cached
 
-**标签颜色参考：**
-- Python: #3776ab
-- JavaScript: #f7df1e
-- Java: #007396
-- AI/机器学习: #ff6f61
-- 数据分析: #36a2eb
-- 设计: #ff6b9d
-- 实习: #52c41a
-- 远程: #1890ff
-"""
-        
-        user_prompt = f"""请解析以下招聘信息：
+        return await self._single_flight(
+            f"job:{cache_keys[0]}",
+            lambda: self._parse_and_cache_job_posting(raw_content, source_type, extraction)
+        )
 
-来源类型：{source_type}
+    def _job_cache_keys(self, raw_content: str, source_type: str) -> List[str]:
+        """Parse cache keys under every configured model; a parse is stored under the model that answered it"""
+        models = list(dict.fromkeys(provider.model for provider in self.provider_pool.providers)) or [self.model]
+        return [build_cache_key(raw_content, source_type, model, JOB_PARSE_PROMPT_VERSION) for model in models]
 
-原始内容：
-{raw_content}
-"""
-        
+    async def _cached_job_parse(self, cache_keys: List[str]) -> Optional[Dict[str, Any]]:
+        for cache_key in cache_keys:
+            cached = await parse_cache.get(cache_key)
+            if cached is not None:
+                return cached
+        return None
+
+    def _new_route(self) -> Dict[str, Any]:
+        """
+        Provider ranking shared by the calls of one parse; _create_completion
+        records the provider that answered under "provider"
+        """
+        return {"providers": self.provider_pool.ranked(), "provider": None}
+
+    async def _parse_and_cache_job_posting(
+        self,
+        raw_content: str,
+        source_type: str,
+        extraction: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        route = self._new_route()
+        result = await self._parse_job_posting_with_llm(raw_content, source_type, build_prompt_hints(extraction), route)
+        return await self._finish_job_parse(result, extraction, raw_content, source_type, route)
+
+    async def _finish_job_parse(
+        self,
+        result: Dict[str, Any],
+        extraction: Dict[str, Any],
+        raw_content: str,
+        source_type: str,
+        route: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        if isinstance(result, dict):
+            self._fill_from_local_extraction(result, extraction)
+            if result.get("requirements"):
+                result["requirements"] = skill_lexicon.normalize_requirements(result["requirements"])
+            result["parse_source"] = "llm"
+        # Only cache results that carry the required fields, so a bad parse is retried next time
+        if isinstance(result, dict) and result.get("title") and result.get("company_name"):
+            model = route["provider"].model if route.get("provider") else self.model
+            await parse_cache.put(
+                build_cache_key(raw_content, source_type, model, JOB_PARSE_PROMPT_VERSION),
+                result,
+                model=model,
+                prompt_version=JOB_PARSE_PROMPT_VERSION,
+                source_type=source_type
+            )
+        return result
+
+    async def stream_job_posting(self, raw_content: str, source_type: str = "手动") -> AsyncIterator[Dict[str, Any]]:
+        """
+        Parse a job posting while reporting fields as soon as they are known.
+        Yields {"event": "field", "field", "value", "source"} updates (source is
+        local/cache/llm) and finally {"event": "final", "result": {...}}.
+        Falls back to the non-streaming mode chain if streaming fails.
+        """
+        extraction = extract_job_fields_local(raw_content)
+        if settings.job_fast_path_enabled and fast_path_confidence(extraction) >= settings.job_fast_path_threshold:
+            llm_telemetry.record_served("parse_job_posting", "local")
+            result = build_local_parse_result(extraction)
+            for event in _field_events(result, "local"):
+                yield event
+            yield {"event": "final", "result": result}
+            return
+
+        if not self.client:
+            raise ValueError("LLM client not configured. Please set API key.")
+
+        cache_keys = self._job_cache_keys(raw_content, source_type)
+        cached = await self._cached_job_parse(cache_keys)
+        if cached is not None:
+            llm_telemetry.record_served("parse_job_posting", "cache")
+            for event in _field_events(cached, "cache"):
+                yield event
+            yield {"event": "final", "result": cached}
+            return
+
+        # Confident local fields are the fastest first answer while the model warms up
+        local_fields = _confident_local_fields(extraction)
+        for event in _field_events(local_fields, "local"):
+            yield event
+
+        sent = dict(local_fields)
+        result = None
+        async for event in self._single_flight_stream(
+            f"job:{cache_keys[0]}",
+            lambda queue: self._stream_and_cache_job_posting(raw_content, source_type, extraction, queue)
+        ):
+            if event["event"] == "result":
+                result = event["result"]
+            elif sent.get(event["field"]) != event["value"]:
+                sent[event["field"]] = event["value"]
+                yield event
+        # A joined parse or the non-streaming fallback reports its fields here
+        for event in _field_events(result, "llm"):
+            if sent.get(event["field"]) != event["value"]:
+                yield event
+        yield {"event": "final", "result": result}
+
+    async def _stream_and_cache_job_posting(
+        self,
+        raw_content: str,
+        source_type: str,
+        extraction: Dict[str, Any],
+        queue: asyncio.Queue
+    ) -> Dict[str, Any]:
+        """
+        Streamed counterpart of _parse_and_cache_job_posting: puts field events
+        on `queue` as the model's answer arrives and returns the finished result.
+        Falls back to the non-streaming mode chain if streaming fails, starting
+        after the streamed mode when the model rejected it.
+        """
+        hints = build_prompt_hints(extraction)
+        user_prompt = self._build_job_user_prompt(raw_content, source_type, hints)
+        scanner = PartialJSONObject()
+        result = None
+        start_mode = None
+        route = self._new_route()
         try:
-            # First try with Function Calling (Tools)
-            response = await self.client.chat.completions.create(
+            async for delta in self._stream_structured_output(JOB_PARSE_SYSTEM_PROMPT, user_prompt, JOB_PARSE_FUNCTION_SCHEMA, route):
+                for key, value in scanner.feed(delta):
+                    if value not in (None, "", [], {}):
+                        queue.put_nowait({"event": "field", "field": key, "value": value, "source": "llm"})
+            if scanner.done:
+                result = coerce_to_schema(scanner.fields, JOB_PARSE_FUNCTION_SCHEMA["parameters"])
+            elif scanner.buffer.strip():
+                # The stream ended early; a repaired tail still beats a new request
+                result = self._load_model_json(scanner.buffer, JOB_PARSE_FUNCTION_SCHEMA, "parse_job_posting")
+            if result is not None:
+                llm_telemetry.record_served("parse_job_posting", f"{route['mode']}_stream")
+        except (LLMRateLimitError, LLMUnavailableError):
+            raise
+        except Exception as e:
+            print(f"⚠️ Streaming parse failed: {e}, falling back to non-streaming parse")
+            index = STRUCTURED_OUTPUT_MODES.index(route["mode"]) if route.get("mode") else -1
+            capability_error = not (is_provider_error(e) or is_rate_limit_error(e))
+            if capability_error and not scanner.buffer and 0 <= index < len(STRUCTURED_OUTPUT_MODES) - 1:
+                # The model rejected the streamed mode outright; don't repeat it
+                start_mode = STRUCTURED_OUTPUT_MODES[index + 1]
+
+        if result is None:
+            result = await self._parse_job_posting_with_llm(raw_content, source_type, hints, route, start_mode)
+        return await self._finish_job_parse(result, extraction, raw_content, source_type, route)
+
+    async def _stream_structured_output(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        schema: Dict,
+        route: Dict[str, Any]
+    ) -> AsyncIterator[str]:
+        """Stream the raw JSON text of a structured answer in the route's primary's preferred mode"""
+        mode = self._preferred_mode(route["providers"][0] if route["providers"] else None)
+        route["mode"] = mode
+        if mode == "function":
+            stream = await self._create_completion(
+                "parse_job_posting", "function",
+                route=route,
                 model=self.model,
                 messages=[
                     {"role": "system", "content": system_prompt},
                     {"role": "user", "content": user_prompt}
                 ],
-                functions=[function_schema],
-                function_call={"name": "parse_job_posting"},
-                temperature=0.1 # Lower temperature for more deterministic output
+                functions=[schema],
+                function_call={"name": schema["name"]},
+                temperature=0.1,
+                stream=True
             )
-            
-            # Extract the function call result
-            message = response.choices[0].message
-            if message.function_call:
-                result = json.loads(message.function_call.arguments)
-                return result
-            else:
-                # Fallback to JSON Mode if function calling fails (common with some models like DeepSeek)
-                print("⚠️ Function calling failed, falling back to JSON Mode...")
-                return await self._parse_with_json_mode(system_prompt, user_prompt, function_schema)
-                
+            async with stream:
+                async for chunk in stream:
+                    if not chunk.choices:
+                        continue
+                    function_call = chunk.choices[0].delta.function_call
+                    if function_call and function_call.arguments:
+                        yield function_call.arguments
+            return
+
+        extra = {"response_format": {"type": "json_object"}} if mode == "json" else {}
+        stream = await self._create_completion(
+            "parse_job_posting", mode,
+            route=route,
+            model=self.model,
+            messages=[
+                {"role": "system", "content": self._json_structure_system_prompt(system_prompt, schema, plain=mode == "plain")},
+                {"role": "user", "content": user_prompt}
+            ],
+            temperature=0.1,
+            stream=True,
+            **extra
+        )
+        async with stream:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+
+    async def _create_completion(self, operation: str, mode: str, route: Optional[Dict[str, Any]] = None, **kwargs) -> Any:
+        """
+        Every chat completion is routed through the provider pool (health and
+        latency based routing, hedging, failover) and each provider's governor
+        (rate limits, retries, circuit breaker), and recorded in the LLM
+        telemetry. Streams fail over but are not hedged, and are recorded once
+        they are exhausted or closed; callers close them with `async with`. With a
+        `route` (see _new_route) its ranking is used and the answering provider
+        is stored in it.
+        """
+        providers = route["providers"] if route else None
+        stream = bool(kwargs.get("stream"))
+        # A stream can fail over while it is being opened but is never hedged; its
+        # latency is recorded once the whole body has arrived (see _record_stream)
+        response, provider = await self.provider_pool.call(
+            lambda provider: self._governed_completion(provider, operation, mode, kwargs),
+            hedge=not stream,
+            providers=providers,
+            track_latency=not stream
+        )
+        if route is not None:
+            route["provider"] = provider
+        return response
+
+    async def _governed_completion(
+        self,
+        provider: LLMProvider,
+        operation: str,
+        mode: str,
+        kwargs: Dict[str, Any],
+        call_info: Optional[Dict[str, Any]] = None
+    ) -> Any:
+        request = {**kwargs, "model": provider.model}
+        estimated = estimate_tokens(request["messages"], request.get("max_tokens") or 800)
+        call_info = call_info if call_info is not None else {"retries": 0}
+        started = time.perf_counter()
+        try:
+            response = await provider.governor.call(
+                lambda: provider.client.chat.completions.create(**request),
+                estimated,
+                call_info,
+                stream=bool(request.get("stream"))
+            )
+        except asyncio.CancelledError:
+            # Lost a hedge race or the caller went away
+            llm_telemetry.record(
+                operation, provider.model, mode, time.perf_counter() - started,
+                retries=call_info["retries"], outcome="cancelled"
+            )
+            raise
         except Exception as e:
-            print(f"❌ Function calling failed: {e}, attempting JSON mode...")
+            llm_telemetry.record(
+                operation, provider.model, mode, time.perf_counter() - started,
+                retries=call_info["retries"], outcome=_call_outcome(e)
+            )
+            raise
+
+        if request.get("stream"):
+            prompt_tokens = sum(count_tokens(message.get("content") or "") for message in request["messages"])
+            response.on_close = lambda closed: self._record_stream(
+                closed, provider, operation, mode, started, call_info["retries"], prompt_tokens
+            )
+            return response
+        usage = getattr(response, "usage", None)
+        llm_telemetry.record(
+            operation, provider.model, mode, time.perf_counter() - started,
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or 0,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or 0,
+            retries=call_info["retries"]
+        )
+        return response
+
+    def _record_stream(
+        self,
+        stream: GovernedStream,
+        provider: LLMProvider,
+        operation: str,
+        mode: str,
+        started: float,
+        retries: int,
+        prompt_tokens: int = 0
+    ):
+        """
+        Telemetry for a streamed call, once its GovernedStream is exhausted,
+        failed or closed. Token counts are the usage the provider reported,
+        else estimates from the prompt and the streamed text.
+        """
+        if stream.completed:
+            outcome = "success"
+        elif stream.error is None or isinstance(stream.error, asyncio.CancelledError):
+            outcome = "cancelled"
+        else:
+            outcome = _call_outcome(stream.error)
+        usage = stream.usage
+        llm_telemetry.record(
+            operation, provider.model, mode, time.perf_counter() - started,
+            prompt_tokens=getattr(usage, "prompt_tokens", 0) or prompt_tokens,
+            completion_tokens=getattr(usage, "completion_tokens", 0) or stream.completion_tokens,
+            retries=retries,
+            outcome=outcome
+        )
+        if outcome == "success":
+            provider.record_latency(time.perf_counter() - started)
+
+    def get_provider_info(self) -> Dict[str, Any]:
+        """Health, latency and hedging counters for every configured provider"""
+        return self.provider_pool.get_info()
+
+    def _join_flight(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Tuple[asyncio.Future, bool]:
+        """The in-flight task for `key`, started from `factory` when there is none; True when this caller leads"""
+        task = self._inflight.get(key)
+        if task is not None:
+            self._single_flight_coalesced += 1
+            return task, False
+        task = asyncio.ensure_future(factory())
+        self._inflight[key] = task
+        self._single_flight_leaders += 1
+
+        def _release(finished: asyncio.Future):
+            if self._inflight.get(key) is finished:
+                del self._inflight[key]
+            # Mark the exception as retrieved in case every waiter went away
+            if not finished.cancelled():
+                finished.exception()
+
+        task.add_done_callback(_release)
+        return task, True
+
+    async def _single_flight(self, key: str, factory: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Coalesce concurrent calls with the same key onto one in-flight task.
+        Every caller gets its own copy of the same result, or the same exception;
+        a caller being cancelled does not cancel the shared task for the others.
+        """
+        task, _ = self._join_flight(key, factory)
+        result = await asyncio.shield(task)
+        # Every caller, the leader included, gets its own copy of the shared
+        # result, so no caller can mutate what the others receive
+        return copy.deepcopy(result)
+
+    async def _single_flight_stream(
+        self,
+        key: str,
+        producer: Callable[[asyncio.Queue], Awaitable[Any]]
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        _single_flight for a streamed parse. The leader runs `producer(queue)`,
+        which puts progress events on the queue and returns the result, and
+        gets those events as they arrive; callers joining an identical parse
+        (streamed or not) only get its result. Ends with {"event": "result", "result": copy}.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+
+        async def produce():
             try:
-                # Second attempt: JSON mode
-                return await self._parse_with_json_mode(system_prompt, user_prompt, function_schema)
-            except Exception as json_error:
-                print(f"❌ JSON mode failed: {json_error}, attempting plain text mode...")
+                return await producer(queue)
+            finally:
+                queue.put_nowait(None)
+
+        task, leader = self._join_flight(key, produce)
+        if leader:
+            while True:
+                event = await queue.get()
+                if event is None:
+                    break
+                yield event
+        result = await asyncio.shield(task)
+        yield {"event": "result", "result": copy.deepcopy(result)}
+
+    def get_coalescing_stats(self) -> Dict[str, Any]:
+        """Counters for single-flight request coalescing"""
+        return {
+            "in_flight": len(self._inflight),
+            "executed_calls": self._single_flight_leaders,
+            "coalesced_calls": self._single_flight_coalesced,
+        }
+
+    async def iter_parse_job_postings(
+        self,
+        items: List[Tuple[str, str]],
+        concurrency: int
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Parse many (raw_content, source_type) pairs with at most `concurrency`
+        LLM calls in flight. Yields {"index", "result"} or {"index", "error"}
+        in completion order; pending work is cancelled if the consumer stops early.
+        """
+        semaphore = asyncio.Semaphore(max(1, concurrency))
+
+        async def parse_one(index: int, raw_content: str, source_type: str) -> Dict[str, Any]:
+            async with semaphore:
                 try:
-                    # Third attempt: Plain text mode
-                    return await self._parse_with_plain_text(system_prompt, user_prompt, function_schema)
-                except Exception as plain_error:
-                    raise Exception(f"All parsing methods failed: Function={str(e)} | JSON={str(json_error)} | Plain={str(plain_error)}")
+                    result = await self.parse_job_posting(raw_content=raw_content, source_type=source_type)
+                    return {"index": index, "result": result}
+                except Exception as e:
+                    return {"index": index, "error": str(e)}
+
+        tasks = [
+            asyncio.create_task(parse_one(index, raw_content, source_type))
+            for index, (raw_content, source_type) in enumerate(items)
+        ]
+        try:
+            for finished in asyncio.as_completed(tasks):
+                yield await finished
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
 
-    async def _parse_with_json_mode(self, system_prompt: str, user_prompt: str, schema: Dict) -> Dict[str, Any]:
+    def _fill_from_local_extraction(self, result: Dict[str, Any], extraction: Dict[str, Any]):
+        """Fill fields the model left empty with confidently extracted local values"""
+        fields = extraction["fields"]
+        confidence = extraction["confidence"]
+        for key in ["title", "company_name", "apply_email", "published_at"]:
+            if not result.get(key) and fields.get(key) and confidence[key] >= 0.6:
+                result[key] = fields[key]
+        if not result.get("suggested_industry") and fields["suggested_industry"] and confidence["industry"] >= 0.6:
+            result["suggested_industry"] = fields["suggested_industry"]
+            result["suggested_industry_code"] = fields["suggested_industry_code"]
+        requirements = result.get("requirements")
+        if not isinstance(requirements, dict):
+            requirements = {}
+        for key, value in fields["requirements"].items():
+            if not requirements.get(key) and value and confidence[key] >= 0.6:
+                requirements[key] = value
+        if requirements:
+            result["requirements"] = requirements
+
+    def _compact_prompt_text(self, text: str, kind: str, operation: str) -> str:
+        """Fit raw posting/resume text into the model's token budget and record the savings"""
+        if not settings.prompt_budget_enabled:
+            return text
+        compacted, stats = compact_text(text, prompt_budget_for(self.model, kind), kind)
+        llm_telemetry.record_prompt_budget(operation, stats)
+        return compacted
+
+    def _build_job_user_prompt(self, raw_content: str, source_type: str, hints: str = "") -> str:
+        raw_content = self._compact_prompt_text(raw_content, "job", "parse_job_posting")
+        user_prompt = f"""请解析以下招聘信息：
+
+来源类型：{source_type}
+
+原始内容：
+{raw_content}
+"""
+        if hints:
+            user_prompt += JOB_PARSE_HINT_TEMPLATE.format(hints=hints)
+        return user_prompt
+
+    async def _parse_job_posting_with_llm(
+        self,
+        raw_content: str,
+        source_type: str,
+        hints: str = "",
+        route: Optional[Dict[str, Any]] = None,
+        start_mode: Optional[str] = None
+    ) -> Dict[str, Any]:
         """
-        Second attempt: Using JSON mode (for models that support response_format)
+        Run the function-calling / JSON mode / plain text fallback chain,
+        starting from `start_mode` or else the mode last known to work for the
+        primary provider's base_url + model; a working mode is remembered for
+        the provider that answered
+        """
+        system_prompt = JOB_PARSE_SYSTEM_PROMPT
+        function_schema = JOB_PARSE_FUNCTION_SCHEMA
+        user_prompt = self._build_job_user_prompt(raw_content, source_type, hints)
+
+        route = route if route is not None else self._new_route()
+        primary = route["providers"][0] if route["providers"] else None
+        start_mode = start_mode or self._preferred_mode(primary)
+        errors = []
+        for mode in STRUCTURED_OUTPUT_MODES[STRUCTURED_OUTPUT_MODES.index(start_mode):]:
+            try:
+                result = await self._parse_with_mode(mode, system_prompt, user_prompt, function_schema, route)
+            except (LLMRateLimitError, LLMUnavailableError):
+                # Throttling or an outage says nothing about what the model supports
+                raise
+            except Exception as e:
+                print(f"❌ {STRUCTURED_OUTPUT_MODE_LABELS[mode]} mode failed: {e}")
+                errors.append(f"{STRUCTURED_OUTPUT_MODE_LABELS[mode]}={str(e)}")
+                continue
+            # Learn on a full probe or when the remembered mode stopped working;
+            # plain successes of the remembered mode keep the original probe time.
+            answered = route["provider"] or primary
+            known_mode = self._preferred_mode(answered)
+            if mode != known_mode or known_mode == STRUCTURED_OUTPUT_MODES[0]:
+                self._remember_mode(mode, answered)
+            llm_telemetry.record_served("parse_job_posting", mode)
+            return result
+
+        self._forget_mode(primary)
+        raise Exception(f"All parsing methods failed: {' | '.join(errors)}")
+
+    async def _parse_with_mode(
+        self,
+        mode: str,
+        system_prompt: str,
+        user_prompt: str,
+        schema: Dict,
+        route: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        if mode == "function":
+            return await self._parse_with_function_call(system_prompt, user_prompt, schema, route)
+        if mode == "json":
+            return await self._parse_with_json_mode(system_prompt, user_prompt, schema, route)
+        return await self._parse_with_plain_text(system_prompt, user_prompt, schema, route)
+
+    def _mode_key(self, provider: Optional[LLMProvider] = None) -> Tuple[str, str]:
+        if provider is None:
+            return (self.base_url, self.model)
+        return (provider.base_url, provider.model)
+
+    def _preferred_mode(self, provider: Optional[LLMProvider] = None) -> str:
+        """Mode to try first on `provider`: settings override, then a fresh learned mode, else a full probe"""
+        override = settings.llm_structured_output_mode
+        if override in STRUCTURED_OUTPUT_MODES:
+            return override
+        learned = self._learned_modes.get(self._mode_key(provider))
+        if learned and time.monotonic() - learned["learned_at"] < settings.llm_mode_reprobe_seconds:
+            return learned["mode"]
+        return STRUCTURED_OUTPUT_MODES[0]
+
+    def _remember_mode(self, mode: str, provider: Optional[LLMProvider] = None):
+        if settings.llm_structured_output_mode in STRUCTURED_OUTPUT_MODES:
+            return
+        key = self._mode_key(provider)
+        previous = self._learned_modes.get(key)
+        if not previous or previous["mode"] != mode:
+            print(f"🧠 Structured output mode for {key[1]} @ {key[0]}: {mode}")
+        self._learned_modes[key] = {"mode": mode, "learned_at": time.monotonic()}
+
+    def _forget_mode(self, provider: Optional[LLMProvider] = None):
+        self._learned_modes.pop(self._mode_key(provider), None)
+
+    def get_mode_info(self) -> Dict[str, Any]:
+        """Structured output mode per (base_url, model) as learned so far"""
+        now = time.monotonic()
+        return {
+            "override": settings.llm_structured_output_mode,
+            "reprobe_seconds": settings.llm_mode_reprobe_seconds,
+            "learned": [
+                {
+                    "base_url": base_url,
+                    "model": model,
+                    "mode": entry["mode"],
+                    "age_seconds": round(now - entry["learned_at"], 1),
+                }
+                for (base_url, model), entry in self._learned_modes.items()
+            ],
+        }
+
+    async def _parse_with_function_call(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        schema: Dict,
+        route: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        First attempt: Using function calling
+        """
+        response = await self._create_completion(
+            "parse_job_posting", "function",
+            route=route,
+            model=self.model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": user_prompt}
+            ],
+            functions=[schema],
+            function_call={"name": schema["name"]},
+            temperature=0.1 # Lower temperature for more deterministic output
+        )
+
+        # Some models (e.g. DeepSeek) accept the request but answer without a function call
+        message = response.choices[0].message
+        if not message.function_call:
+            raise ValueError("Model returned no function call")
+        return self._load_model_json(message.function_call.arguments, schema, "parse_job_posting")
+
+    def _load_model_json(self, text: str, schema: Optional[Dict] = None, operation: str = "parse_job_posting") -> Dict[str, Any]:
         """
+        Parse model output, repairing almost-valid JSON locally and coercing it
+        against the function schema; only a failed repair raises (and so
+        costs a fallback request)
+        """
+        try:
+            data = json.loads(text)
+            outcome = "clean"
+        except (TypeError, ValueError):
+            try:
+                data = repair_json(text)
+            except ValueError:
+                llm_telemetry.record_repair(operation, "failed")
+                raise
+            outcome = "repaired"
+        llm_telemetry.record_repair(operation, outcome)
+        if schema is not None:
+            return coerce_to_schema(data, schema["parameters"])
+        if not isinstance(data, dict):
+            raise ValueError(f"Expected a JSON object, got {type(data).__name__}")
+        return data
+
+    def _json_structure_system_prompt(self, system_prompt: str, schema: Dict, plain: bool = False) -> str:
+        """System prompt for the JSON and plain text modes, which describe the schema inline"""
         json_structure_prompt = f"""
 请必须以严格的 JSON 格式输出，不要包含任何 markdown 格式化或其他文本。
 输出应符合以下 JSON 结构：
-{json.dumps(schema['parameters']['properties'], indent=2, ensure_ascii=False)}
+{json.dumps(schema['parameters']['properties'], separators=(",", ":"), ensure_ascii=False)}
 
 必要字段：title, company_name
 如果找不到字段，请留空或为null。
 """
-        
-        full_system_prompt = system_prompt + "\n" + json_structure_prompt
+        if plain:
+            json_structure_prompt += """
+**重要**：直接返回JSON字符串，不要添加```json标记或其他格式。
+"""
+        return system_prompt + "\n" + json_structure_prompt
+
+    async def _parse_with_json_mode(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        schema: Dict,
+        route: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
+        """
+        Second attempt: Using JSON mode (for models that support response_format)
+        """
+        full_system_prompt = self._json_structure_system_prompt(system_prompt, schema)
 
         try:
-            response = await self.client.chat.completions.create(
+            response = await self._create_completion(
+                "parse_job_posting", "json",
+                route=route,
                 model=self.model,
                 messages=[
                     {"role": "system", "content": full_system_prompt},
@@ -214,31 +885,28 @@ class LLMService:
             if not content:
                 raise ValueError("Empty response from LLM in JSON mode")
                 
-            return json.loads(content)
+            return self._load_model_json(content, schema, "parse_job_posting")
         except Exception as e:
             # If JSON mode is not supported, raise to trigger plain text fallback
             if "json mode" in str(e).lower() or "not supported" in str(e).lower():
                 raise Exception(f"JSON mode not supported: {e}")
             raise
 
-    async def _parse_with_plain_text(self, system_prompt: str, user_prompt: str, schema: Dict) -> Dict[str, Any]:
+    async def _parse_with_plain_text(
+        self,
+        system_prompt: str,
+        user_prompt: str,
+        schema: Dict,
+        route: Optional[Dict[str, Any]] = None
+    ) -> Dict[str, Any]:
         """
         Third attempt: Using plain text mode (universal fallback)
         """
-        json_structure_prompt = f"""
-请必须以严格的 JSON 格式输出，不要包含任何 markdown 格式化或其他文本。
-输出应符合以下 JSON 结构：
-{json.dumps(schema['parameters']['properties'], indent=2, ensure_ascii=False)}
-
-必要字段：title, company_name
-如果找不到字段，请留空或为null。
-
-**重要**：直接返回JSON字符串，不要添加```json标记或其他格式。
-"""
-        
-        full_system_prompt = system_prompt + "\n" + json_structure_prompt
+        full_system_prompt = self._json_structure_system_prompt(system_prompt, schema, plain=True)
 
-        response = await self.client.chat.completions.create(
+        response = await self._create_completion(
+            "parse_job_posting", "plain",
+            route=route,
             model=self.model,
             messages=[
                 {"role": "system", "content": full_system_prompt},
@@ -250,18 +918,9 @@ class LLMService:
         content = response.choices[0].message.content
         if not content:
             raise ValueError("Empty response from LLM")
-        
-        # Clean up the content - remove markdown code blocks if present
-        content = content.strip()
-        if content.startswith("```json"):
-            content = content[7:]
-        if content.startswith("```"):
-            content = content[3:]
-        if content.endswith("```"):
-            content = content[:-3]
-        content = content.strip()
-            
-        return json.loads(content)
+
+        # Code fences and other near-misses are handled by the local repair
+        return self._load_model_json(content, schema, "parse_job_posting")
 
     async def test_connection(self) -> Dict[str, Any]:
         """Test LLM API connection"""
@@ -272,7 +931,8 @@ class LLMService:
             }
         
         try:
-            response = await self.client.chat.completions.create(
+            response = await self._create_completion(
+                "test_connection", "chat",
                 model=self.model,
                 messages=[{"role": "user", "content": "Hello"}],
                 max_tokens=10
@@ -304,34 +964,13 @@ class LLMService:
                 "raw_text": text_content
             }
 
-        prompt = f"""你是简历解析助手。请从下面简历文本中提取结构化字段，并返回JSON：
-字段：name,email,phone,skills(数组),education(数组),experiences(数组),keywords(数组)
-简历文本：\n{text_content[:12000]}
-"""
-
         try:
-            response = await self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": "你是专业简历解析助手，只输出JSON对象"},
-                    {"role": "user", "content": prompt}
-                ],
-                response_format={"type": "json_object"},
-                temperature=0.1
+            parsed = await self._single_flight(
+                self._resume_flight_key(text_content),
+                lambda: self._request_resume_fields(text_content)
             )
-            content = response.choices[0].message.content or "{}"
-            parsed = json.loads(content)
-            normalized = {
-                "name": parsed.get("name") or extracted.get("name"),
-                "email": parsed.get("email") or extracted.get("email"),
-                "phone": parsed.get("phone") or extracted.get("phone"),
-                "skills": parsed.get("skills") or extracted.get("skills", []),
-                "education": parsed.get("education") or extracted.get("education", []),
-                "experiences": parsed.get("experiences") or extracted.get("experiences", []),
-                "keywords": parsed.get("keywords") or extracted.get("keywords", []),
-            }
             return {
-                "parsed_fields": normalized,
+                "parsed_fields": self._merge_resume_fields(parsed, extracted),
                 "raw_text": text_content
             }
         except Exception:
@@ -340,44 +979,122 @@ class LLMService:
                 "raw_text": text_content
             }
 
+    def _resume_flight_key(self, text_content: str) -> str:
+        return "resume:" + hashlib.sha256(f"{self.model}\n{text_content}".encode("utf-8")).hexdigest()
+
+    async def stream_resume(self, text_content: str) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Parse resume text while reporting fields as soon as they are known.
+        Yields {"event": "field", ...} updates and finally
+        {"event": "final", "result": {"parsed_fields", "raw_text"}}.
+        """
+        extracted = self._extract_resume_fields_local(text_content)
+        local_fields = {key: extracted.get(key) for key in ["name", "email", "phone"]}
+        for key, value in local_fields.items():
+            if value:
+                yield {"event": "field", "field": key, "value": value, "source": "local"}
+
+        parsed = None
+        if self.client:
+            sent = dict(local_fields)
+            try:
+                async for event in self._single_flight_stream(
+                    self._resume_flight_key(text_content),
+                    lambda queue: self._stream_resume_fields(text_content, queue)
+                ):
+                    if event["event"] == "result":
+                        parsed = event["result"]
+                    elif sent.get(event["field"]) != event["value"]:
+                        sent[event["field"]] = event["value"]
+                        yield event
+            except Exception as e:
+                print(f"⚠️ Streaming resume parse failed: {e}")
+            # A joined parse reports its fields here
+            for key, value in (parsed or {}).items():
+                if value not in (None, "", [], {}) and sent.get(key) != value:
+                    yield {"event": "field", "field": key, "value": value, "source": "llm"}
+
+        parsed_fields = self._merge_resume_fields(parsed, extracted) if parsed is not None else extracted
+        yield {"event": "final", "result": {"parsed_fields": parsed_fields, "raw_text": text_content}}
+
+    async def _stream_resume_fields(self, text_content: str, queue: asyncio.Queue) -> Dict[str, Any]:
+        """Streamed counterpart of _request_resume_fields, putting field events on `queue`"""
+        scanner = PartialJSONObject()
+        stream = await self._create_completion(
+            "parse_resume", "json",
+            model=self.model,
+            messages=[
+                {"role": "system", "content": RESUME_PARSE_SYSTEM_PROMPT},
+                {"role": "user", "content": self._build_resume_prompt(text_content)}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.1,
+            stream=True
+        )
+        async with stream:
+            async for chunk in stream:
+                if not chunk.choices or not chunk.choices[0].delta.content:
+                    continue
+                for key, value in scanner.feed(chunk.choices[0].delta.content):
+                    if value not in (None, "", [], {}):
+                        queue.put_nowait({"event": "field", "field": key, "value": value, "source": "llm"})
+        if scanner.done:
+            return scanner.fields
+        if scanner.buffer.strip():
+            return self._load_model_json(scanner.buffer, operation="parse_resume")
+        raise ValueError("Empty streamed resume parse")
+
+    def _merge_resume_fields(self, parsed: Dict[str, Any], extracted: Dict[str, Any]) -> Dict[str, Any]:
+        return {
+            "name": parsed.get("name") or extracted.get("name"),
+            "email": parsed.get("email") or extracted.get("email"),
+            "phone": parsed.get("phone") or extracted.get("phone"),
+            "skills": skill_lexicon.normalize(parsed.get("skills")) or extracted.get("skills", []),
+            "education": parsed.get("education") or extracted.get("education", []),
+            "experiences": parsed.get("experiences") or extracted.get("experiences", []),
+            "keywords": parsed.get("keywords") or extracted.get("keywords", []),
+        }
+
+    def _build_resume_prompt(self, text_content: str) -> str:
+        if settings.prompt_budget_enabled:
+            text_content = self._compact_prompt_text(text_content, "resume", "parse_resume")
+        else:
+            text_content = text_content[:12000]
+        return f"""你是简历解析助手。请从下面简历文本中提取结构化字段，并返回JSON：
+字段：name,email,phone,skills(数组),education(数组),experiences(数组),keywords(数组)
+简历文本：\n{text_content}
+"""
+
+    async def _request_resume_fields(self, text_content: str) -> Dict[str, Any]:
+        response = await self._create_completion(
+            "parse_resume", "json",
+            model=self.model,
+            messages=[
+                {"role": "system", "content": RESUME_PARSE_SYSTEM_PROMPT},
+                {"role": "user", "content": self._build_resume_prompt(text_content)}
+            ],
+            response_format={"type": "json_object"},
+            temperature=0.1
+        )
+        content = response.choices[0].message.content or "{}"
+        return self._load_model_json(content, operation="parse_resume")
+
     def match_resume_to_jobs(self, resume_fields: Dict[str, Any], jobs: List[Dict[str, Any]], top_n: int = 3) -> List[Dict[str, Any]]:
         """
         Keyword-based matching with score 0-100.
+        Scores every given job; /api/ai/match uses the inverted match index instead.
         """
-        resume_skills = set(s.lower() for s in (resume_fields.get("skills") or []))
-        resume_keywords = set(k.lower() for k in (resume_fields.get("keywords") or []))
-        merged_tokens = resume_skills | resume_keywords
+        merged_tokens = resume_match_tokens(resume_fields)
 
         results: List[Dict[str, Any]] = []
         for job in jobs:
-            requirements = job.get("requirements") or {}
-            job_skills = set(s.lower() for s in (requirements.get("skills") or []))
-            title_tokens = set(re.findall(r"[\w\u4e00-\u9fff]+", (job.get("title") or "").lower()))
-            location = (requirements.get("location") or "").lower()
-
-            skill_hits = merged_tokens & job_skills
-            title_hits = merged_tokens & title_tokens
-
-            base = 30
-            skill_score = min(50, len(skill_hits) * 15)
-            title_score = min(15, len(title_hits) * 5)
-            loc_score = 5 if location and location in merged_tokens else 0
-            score = min(100, base + skill_score + title_score + loc_score)
-
-            highlights = []
-            if skill_hits:
-                highlights.append(f"技能匹配: {', '.join(list(skill_hits)[:5])}")
-            if title_hits:
-                highlights.append(f"职位关键词匹配: {', '.join(list(title_hits)[:3])}")
-            if not highlights:
-                highlights.append("基础关键词相关")
-
-            results.append({
-                "job_id": job.get("id"),
-                "score": float(score),
-                "highlights": highlights,
-                "template_recommendation": "template_1" if score >= 85 else "template_2"
-            })
+            features = job_match_features(job.get("title"), job.get("requirements"))
+            results.append(score_match(
+                job.get("id"),
+                merged_tokens & features["skills"],
+                merged_tokens & features["title_tokens"],
+                bool(features["location"]) and features["location"] in merged_tokens
+            ))
 
         results.sort(key=lambda x: x["score"], reverse=True)
         return results[:top_n]
@@ -387,12 +1104,7 @@ class LLMService:
         phone_match = re.search(r"(?:\+?86[- ]?)?1[3-9]\d{9}", text_content)
         name_match = re.search(r"姓名[:：\s]*([\u4e00-\u9fff]{2,4})", text_content)
 
-        known_skills = [
-            "python", "java", "javascript", "typescript", "react", "vue", "sql", "fastapi", "django", "flask",
-            "机器学习", "深度学习", "nlp", "数据分析", "pytorch", "tensorflow", "docker", "kubernetes"
-        ]
-        lowered = text_content.lower()
-        skills = [s for s in known_skills if s in lowered]
+        skills = skill_lexicon.extract(text_content)
 
         education = []
         for marker in ["博士", "硕士", "本科", "大专", "高中"]:
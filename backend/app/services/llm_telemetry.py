@@ -0,0 +1,208 @@
+from app.config import settings
+from collections import deque, defaultdict
+from typing import Dict, Any, List, Optional, Tuple
+import time
+
+# Upper bounds (seconds) of the latency histogram buckets; +Inf is implicit
+LATENCY_BUCKETS = [0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 20.0, 30.0, 60.0]
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return round(sorted_values[index], 3)
+
+
+def _labels(**labels: Any) -> str:
+    rendered = []
+    for key, value in labels.items():
+        escaped = str(value).replace("\\", "\\\\").replace('"', '\\"')
+        rendered.append(f'{key}="{escaped}"')
+    return "{" + ",".join(rendered) + "}"
+
+
+class LLMTelemetry:
+    """
+    Per-call LLM telemetry: cumulative counters and latency histograms for the
+    metrics endpoint, plus a rolling window of recent calls for summaries.
+    """
+
+    def __init__(self, window_size: int):
+        self.started_at = time.time()
+        self.recent: deque = deque(maxlen=window_size)
+        self.requests: Dict[Tuple[str, str, str, str], int] = defaultdict(int)
+        self.prompt_tokens: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.completion_tokens: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.retries: Dict[str, int] = defaultdict(int)
+        self.served: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.repairs: Dict[Tuple[str, str], int] = defaultdict(int)
+        self.prompt_budget: Dict[str, Dict[str, int]] = defaultdict(
+            lambda: {"prompts": 0, "original_tokens": 0, "sent_tokens": 0, "saved_tokens": 0}
+        )
+        # (operation, mode) -> non-cumulative count per bucket, +Inf last
+        self.histograms: Dict[Tuple[str, str], List[int]] = {}
+        self.latency_sums: Dict[Tuple[str, str], float] = defaultdict(float)
+
+    def record(
+        self,
+        operation: str,
+        model: str,
+        mode: str,
+        latency: float,
+        prompt_tokens: int = 0,
+        completion_tokens: int = 0,
+        retries: int = 0,
+        outcome: str = "success"
+    ):
+        """Record one LLM call (including its retries) as seen by the caller"""
+        self.requests[(operation, model, mode, outcome)] += 1
+        self.prompt_tokens[(operation, model)] += prompt_tokens
+        self.completion_tokens[(operation, model)] += completion_tokens
+        self.retries[operation] += retries
+
+        key = (operation, mode)
+        buckets = self.histograms.setdefault(key, [0] * (len(LATENCY_BUCKETS) + 1))
+        for index, bound in enumerate(LATENCY_BUCKETS):
+            if latency <= bound:
+                buckets[index] += 1
+                break
+        else:
+            buckets[-1] += 1
+        self.latency_sums[key] += latency
+
+        self.recent.append({
+            "at": time.time(),
+            "operation": operation,
+            "model": model,
+            "mode": mode,
+            "latency": latency,
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "retries": retries,
+            "outcome": outcome,
+        })
+
+    def record_served(self, operation: str, source: str):
+        """Count which path answered a parse request (local, cache, function, json, plain)"""
+        self.served[(operation, source)] += 1
+
+    def record_repair(self, operation: str, outcome: str):
+        """Count model outputs that parsed clean, were repaired locally or could not be repaired"""
+        self.repairs[(operation, outcome)] += 1
+
+    def record_prompt_budget(self, operation: str, stats: Dict[str, int]):
+        """Count tokens saved by prompt compaction"""
+        totals = self.prompt_budget[operation]
+        totals["prompts"] += 1
+        for key in ["original_tokens", "sent_tokens", "saved_tokens"]:
+            totals[key] += stats[key]
+
+    def _cost(self, prompt_tokens: int, completion_tokens: int) -> float:
+        return (
+            prompt_tokens / 1000 * settings.llm_prompt_cost_per_1k
+            + completion_tokens / 1000 * settings.llm_completion_cost_per_1k
+        )
+
+    def get_summary(self) -> Dict[str, Any]:
+        """Rolling summary over the most recent calls, grouped by operation"""
+        groups: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+        for call in self.recent:
+            groups[call["operation"]].append(call)
+
+        operations = {}
+        for operation, calls in groups.items():
+            latencies = sorted(call["latency"] for call in calls)
+            prompt_tokens = sum(call["prompt_tokens"] for call in calls)
+            completion_tokens = sum(call["completion_tokens"] for call in calls)
+            outcomes: Dict[str, int] = defaultdict(int)
+            modes: Dict[str, int] = defaultdict(int)
+            for call in calls:
+                outcomes[call["outcome"]] += 1
+                modes[call["mode"]] += 1
+            operations[operation] = {
+                "calls": len(calls),
+                "latency_p50": _percentile(latencies, 0.5),
+                "latency_p95": _percentile(latencies, 0.95),
+                "latency_max": round(latencies[-1], 3),
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "retries": sum(call["retries"] for call in calls),
+                "estimated_cost": round(self._cost(prompt_tokens, completion_tokens), 6),
+                "outcomes": dict(outcomes),
+                "modes": dict(modes),
+            }
+
+        window_seconds = time.time() - self.recent[0]["at"] if self.recent else 0
+        total_prompt = sum(self.prompt_tokens.values())
+        total_completion = sum(self.completion_tokens.values())
+        return {
+            "window_calls": len(self.recent),
+            "window_seconds": round(window_seconds, 1),
+            "operations": operations,
+            "served_by": {f"{operation}:{source}": count for (operation, source), count in self.served.items()},
+            "json_output": {f"{operation}:{outcome}": count for (operation, outcome), count in self.repairs.items()},
+            "prompt_budget": {
+                operation: {
+                    **totals,
+                    "avg_saved_tokens": round(totals["saved_tokens"] / totals["prompts"], 1) if totals["prompts"] else 0,
+                }
+                for operation, totals in self.prompt_budget.items()
+            },
+            "totals": {
+                "calls": sum(self.requests.values()),
+                "prompt_tokens": total_prompt,
+                "completion_tokens": total_completion,
+                "estimated_cost": round(self._cost(total_prompt, total_completion), 6),
+                "since": self.started_at,
+            },
+        }
+
+    def render_prometheus(self) -> str:
+        """Counters and latency histograms in the Prometheus text exposition format"""
+        lines = [
+            "# HELP llm_requests_total LLM calls by operation, model, mode and outcome",
+            "# TYPE llm_requests_total counter",
+        ]
+        for (operation, model, mode, outcome), count in sorted(self.requests.items()):
+            lines.append(f"llm_requests_total{_labels(operation=operation, model=model, mode=mode, outcome=outcome)} {count}")
+
+        lines += ["# HELP llm_prompt_tokens_total Prompt tokens reported by the provider", "# TYPE llm_prompt_tokens_total counter"]
+        for (operation, model), count in sorted(self.prompt_tokens.items()):
+            lines.append(f"llm_prompt_tokens_total{_labels(operation=operation, model=model)} {count}")
+
+        lines += ["# HELP llm_completion_tokens_total Completion tokens reported by the provider", "# TYPE llm_completion_tokens_total counter"]
+        for (operation, model), count in sorted(self.completion_tokens.items()):
+            lines.append(f"llm_completion_tokens_total{_labels(operation=operation, model=model)} {count}")
+
+        lines += ["# HELP llm_retries_total Retries made by the LLM call governor", "# TYPE llm_retries_total counter"]
+        for operation, count in sorted(self.retries.items()):
+            lines.append(f"llm_retries_total{_labels(operation=operation)} {count}")
+
+        lines += ["# HELP llm_parse_served_total Parse requests by the path that answered them", "# TYPE llm_parse_served_total counter"]
+        for (operation, source), count in sorted(self.served.items()):
+            lines.append(f"llm_parse_served_total{_labels(operation=operation, source=source)} {count}")
+
+        lines += ["# HELP llm_json_output_total Model outputs by parse outcome (clean, repaired, failed)", "# TYPE llm_json_output_total counter"]
+        for (operation, outcome), count in sorted(self.repairs.items()):
+            lines.append(f"llm_json_output_total{_labels(operation=operation, outcome=outcome)} {count}")
+
+        lines += ["# HELP llm_prompt_tokens_saved_total Estimated tokens removed by prompt compaction", "# TYPE llm_prompt_tokens_saved_total counter"]
+        for operation, totals in sorted(self.prompt_budget.items()):
+            lines.append(f"llm_prompt_tokens_saved_total{_labels(operation=operation)} {totals['saved_tokens']}")
+
+        lines += ["# HELP llm_request_duration_seconds LLM call latency including retries", "# TYPE llm_request_duration_seconds histogram"]
+        for (operation, mode), buckets in sorted(self.histograms.items()):
+            cumulative = 0
+            for bound, count in zip(LATENCY_BUCKETS, buckets):
+                cumulative += count
+                lines.append(f"llm_request_duration_seconds_bucket{_labels(operation=operation, mode=mode, le=bound)} {cumulative}")
+            cumulative += buckets[-1]
+            lines.append(f"llm_request_duration_seconds_bucket{_labels(operation=operation, mode=mode, le='+Inf')} {cumulative}")
+            lines.append(f"llm_request_duration_seconds_sum{_labels(operation=operation, mode=mode)} {self.latency_sums[(operation, mode)]:.6f}")
+            lines.append(f"llm_request_duration_seconds_count{_labels(operation=operation, mode=mode)} {cumulative}")
+        return "\n".join(lines) + "\n"
+
+
+# Global instance
+llm_telemetry = LLMTelemetry(window_size=settings.llm_stats_window)
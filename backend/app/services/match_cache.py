@@ -0,0 +1,160 @@
+from sqlalchemy import select, update, delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.models import MatchResult, MatchState
+from typing import Dict, Any, List, Optional, Tuple
+import hashlib
+import json
+
+# Match results double as a cache. Each (resume, filters, top_n) keeps one
+# ranked set of MatchResult rows tagged with the resume parse version and the
+# job-set version it was computed from; a request with the same versions is
+# answered from those rows, anything else recomputes and replaces them.
+
+JOB_SET_VERSION = "job_set_version"
+
+
+def clean_filters(filters: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Match filters without empty values, which count as absent"""
+    return {key: value for key, value in (filters or {}).items() if value not in (None, "", [], {})}
+
+
+def filters_key(filters: Optional[Dict[str, Any]]) -> str:
+    """Stable hash of the match filters; empty values count as absent"""
+    payload = json.dumps(clean_filters(filters), sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+async def get_job_set_version(db: AsyncSession) -> int:
+    result = await db.execute(select(MatchState.value).where(MatchState.name == JOB_SET_VERSION))
+    return result.scalar() or 0
+
+
+async def bump_job_set_version(db: AsyncSession):
+    """Increment the job-set version in the caller's transaction; job writes that can change rankings call this"""
+    result = await db.execute(
+        update(MatchState)
+        .where(MatchState.name == JOB_SET_VERSION)
+        .values(value=MatchState.value + 1)
+    )
+    if not result.rowcount:
+        db.add(MatchState(name=JOB_SET_VERSION, value=1))
+
+
+class MatchCache:
+    """Versioned match results stored in match_results, replaced in place on recompute"""
+
+    def __init__(self):
+        self.enabled = settings.match_cache_enabled
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+
+    async def get(
+        self,
+        db: AsyncSession,
+        resume_id: int,
+        parse_version: int,
+        job_set_version: int,
+        filters: Optional[Dict[str, Any]],
+        top_n: int
+    ) -> Optional[List[Dict[str, Any]]]:
+        if not self.enabled:
+            return None
+        result = await db.execute(
+            select(
+                MatchResult.job_id,
+                MatchResult.score,
+                MatchResult.highlights,
+                MatchResult.template_recommendation,
+                MatchResult.parse_version,
+                MatchResult.job_set_version,
+            )
+            .where(
+                MatchResult.resume_id == resume_id,
+                MatchResult.filters_key == filters_key(filters),
+                MatchResult.top_n == top_n,
+            )
+            .order_by(MatchResult.rank)
+        )
+        rows = result.all()
+        if not rows or any(row.parse_version != parse_version or row.job_set_version != job_set_version for row in rows):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return [
+            {
+                "job_id": row.job_id,
+                "score": row.score,
+                "highlights": row.highlights or [],
+                "template_recommendation": row.template_recommendation,
+            }
+            for row in rows
+        ]
+
+    async def put(
+        self,
+        db: AsyncSession,
+        resume_id: int,
+        parse_version: int,
+        job_set_version: int,
+        filters: Optional[Dict[str, Any]],
+        top_n: int,
+        results: List[Dict[str, Any]]
+    ):
+        await self.put_many(db, [(resume_id, parse_version, results)], job_set_version, filters, top_n)
+
+    async def put_many(
+        self,
+        db: AsyncSession,
+        entries: List[Tuple[int, int, List[Dict[str, Any]]]],
+        job_set_version: int,
+        filters: Optional[Dict[str, Any]],
+        top_n: int
+    ) -> int:
+        """Replace the stored results of each (resume_id, parse_version, results) entry in the caller's transaction; returns rows written"""
+        key = filters_key(filters)
+        stored_filters = clean_filters(filters) or None
+        rows = [
+            {
+                "resume_id": resume_id,
+                "job_id": item["job_id"],
+                "score": item["score"],
+                "reason_snippet": "；".join(item.get("highlights", [])),
+                "highlights": item.get("highlights", []),
+                "template_recommendation": item.get("template_recommendation"),
+                "parse_version": parse_version,
+                "job_set_version": job_set_version,
+                "filters_key": key,
+                "filters": stored_filters,
+                "top_n": top_n,
+                "rank": rank,
+            }
+            for resume_id, parse_version, results in entries
+            for rank, item in enumerate(results)
+        ]
+        await db.execute(
+            delete(MatchResult).where(
+                MatchResult.resume_id.in_([resume_id for resume_id, _, _ in entries]),
+                MatchResult.filters_key == key,
+                MatchResult.top_n == top_n,
+            )
+        )
+        if rows:
+            await db.execute(insert(MatchResult), rows)
+        self.writes += len(entries)
+        return len(rows)
+
+    def get_stats(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+            "writes": self.writes,
+        }
+
+
+# Global instance
+match_cache = MatchCache()
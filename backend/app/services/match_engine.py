@@ -0,0 +1,288 @@
+from app.config import settings
+from app.services.match_index import MatchIndex, match_index, resume_match_tokens, score_match, BASE_SCORE
+from typing import Dict, Any, List, Optional, Set
+import time
+
+try:
+    import numpy as np
+except ImportError:  # optional; matching falls back to the inverted index
+    np = None
+
+# Vectorized match scoring. Active jobs are kept as sparse token-incidence
+# matrices (COO row/column arrays over one shared vocabulary) for skills,
+# title tokens and location; a resume becomes a 0/1 query vector and the
+# skill/title/location hit counts of all jobs are a single weighted bincount
+# each. Top-N uses argpartition instead of sorting every job.
+
+ENGINES = ("index", "vector")
+# Changed jobs are patched into the matrices unless they (or the dead entries
+# they leave behind) exceed this share of all jobs, which makes a rebuild cheaper
+PATCH_MAX_SHARE = 0.25
+PATCH_MIN_JOBS = 64
+
+
+class VectorMatchEngine:
+    """
+    Incidence matrices derived from the match index. Jobs changed since the
+    last build are patched in place (their old entries are pointed at an
+    always-zero column and new ones appended); a full rebuild only happens
+    when the index was reloaded or too many dead entries have piled up.
+    """
+
+    def __init__(self, index: MatchIndex):
+        self.index = index
+        self.built_version: Optional[int] = None
+        self.build_seconds = 0.0
+        self.builds = 0
+        self.patches = 0
+        self.patched_jobs = 0
+
+    @property
+    def available(self) -> bool:
+        return np is not None
+
+    def _ensure_built(self):
+        if self.built_version == self.index.version:
+            return
+        changed = self.index.changes_since(self.built_version) if self.built_version is not None else None
+        if changed is None or len(changed) > max(PATCH_MIN_JOBS, len(self.rows) * PATCH_MAX_SHARE):
+            self._build()
+            return
+        self._patch(changed)
+        entries = len(self.skill_cols) + len(self.title_cols)
+        too_many_dead_entries = self.dead_entries > max(PATCH_MIN_JOBS, entries * PATCH_MAX_SHARE)
+        too_many_dead_rows = self.dead_rows > max(PATCH_MIN_JOBS, len(self.rows) * PATCH_MAX_SHARE)
+        if too_many_dead_entries or too_many_dead_rows:
+            self._build()
+
+    def _build(self):
+        started = time.perf_counter()
+        job_ids = sorted(self.index.features)
+        # Column 0 is never part of a query; removed entries and jobs without a location point at it
+        self.vocabulary: Dict[str, int] = {}
+        self.location_codes: Dict[Any, int] = {}
+        self.rows: Dict[int, int] = {}
+        self.dead_entries = 0
+        self.dead_rows = 0
+        skill_rows, skill_cols, title_rows, title_cols = [], [], [], []
+        location_cols, raw_location_codes = [], []
+        for row, job_id in enumerate(job_ids):
+            self.rows[job_id] = row
+            skills, titles, location_col, raw_location_code = self._encode(self.index.features[job_id])
+            skill_rows.extend([row] * len(skills))
+            skill_cols.extend(skills)
+            title_rows.extend([row] * len(titles))
+            title_cols.extend(titles)
+            location_cols.append(location_col)
+            raw_location_codes.append(raw_location_code)
+
+        self.job_ids = np.array(job_ids, dtype=np.int64)
+        self.alive = np.ones(len(job_ids), dtype=bool)
+        self.skill_rows = np.array(skill_rows, dtype=np.int64)
+        self.skill_cols = np.array(skill_cols, dtype=np.int64)
+        self.title_rows = np.array(title_rows, dtype=np.int64)
+        self.title_cols = np.array(title_cols, dtype=np.int64)
+        self.location_cols = np.array(location_cols, dtype=np.int64)
+        self.raw_location_codes = np.array(raw_location_codes, dtype=np.int64)
+        self.built_version = self.index.version
+        self.builds += 1
+        self.build_seconds = round(time.perf_counter() - started, 3)
+
+    def _column(self, token: str) -> int:
+        return self.vocabulary.setdefault(token, len(self.vocabulary) + 1)
+
+    def _encode(self, features: Dict[str, Any]):
+        """Skill columns, title columns, location column and raw location code of one job"""
+        location = features["location"]
+        return (
+            [self._column(token) for token in features["skills"]],
+            [self._column(token) for token in features["title_tokens"]],
+            self._column(location) if location else 0,
+            self.location_codes.setdefault(features["raw_location"], len(self.location_codes)),
+        )
+
+    def _patch(self, changed: Set[int]):
+        """Rewrite only the rows of changed jobs"""
+        dropped = [self.rows[job_id] for job_id in changed if job_id in self.rows]
+        if dropped:
+            rows = np.array(dropped, dtype=np.int64)
+            for entry_rows, entry_cols in ((self.skill_rows, self.skill_cols), (self.title_rows, self.title_cols)):
+                stale = np.isin(entry_rows, rows) & (entry_cols != 0)
+                entry_cols[stale] = 0
+                self.dead_entries += int(stale.sum())
+            self.dead_rows += int(self.alive[rows].sum())
+            self.alive[rows] = False
+
+        new_ids, skill_rows, skill_cols, title_rows, title_cols = [], [], [], [], []
+        for job_id in sorted(changed):
+            features = self.index.features.get(job_id)
+            if features is None:
+                continue
+            row = self.rows.get(job_id)
+            if row is None:
+                row = self.rows[job_id] = len(self.job_ids) + len(new_ids)
+                new_ids.append(job_id)
+                self.location_cols = np.append(self.location_cols, 0)
+                self.raw_location_codes = np.append(self.raw_location_codes, 0)
+                self.alive = np.append(self.alive, False)
+            skills, titles, location_col, raw_location_code = self._encode(features)
+            skill_rows.extend([row] * len(skills))
+            skill_cols.extend(skills)
+            title_rows.extend([row] * len(titles))
+            title_cols.extend(titles)
+            self.location_cols[row] = location_col
+            self.raw_location_codes[row] = raw_location_code
+            if not self.alive[row]:
+                self.alive[row] = True
+                if row < len(self.job_ids):
+                    self.dead_rows -= 1
+
+        self.job_ids = np.concatenate([self.job_ids, np.array(new_ids, dtype=np.int64)])
+        self.skill_rows = np.concatenate([self.skill_rows, np.array(skill_rows, dtype=np.int64)])
+        self.skill_cols = np.concatenate([self.skill_cols, np.array(skill_cols, dtype=np.int64)])
+        self.title_rows = np.concatenate([self.title_rows, np.array(title_rows, dtype=np.int64)])
+        self.title_cols = np.concatenate([self.title_cols, np.array(title_cols, dtype=np.int64)])
+        self.built_version = self.index.version
+        self.patches += 1
+        self.patched_jobs += len(changed)
+
+    def match(
+        self,
+        resume_fields: Dict[str, Any],
+        top_n: int = 3,
+        location: Optional[str] = None,
+        job_ids: Optional[Set[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """Same results as MatchIndex.match, scored with matrix operations"""
+        self._ensure_built()
+        job_count = len(self.job_ids)
+        if job_count == 0 or top_n <= 0:
+            return []
+
+        tokens = resume_match_tokens(resume_fields)
+        query = np.zeros(len(self.vocabulary) + 1, dtype=np.int64)
+        columns = [self.vocabulary[token] for token in tokens if token in self.vocabulary]
+        if columns:
+            query[columns] = 1
+
+        skill_counts = np.bincount(self.skill_rows, weights=query[self.skill_cols], minlength=job_count).astype(np.int64)
+        title_counts = np.bincount(self.title_rows, weights=query[self.title_cols], minlength=job_count).astype(np.int64)
+        location_hits = query[self.location_cols]
+        scores = np.minimum(
+            100,
+            BASE_SCORE + np.minimum(50, skill_counts * 15) + np.minimum(15, title_counts * 5) + location_hits * 5
+        )
+
+        # Higher score first, then lower job id, folded into one integer key;
+        # patched-in jobs are appended, so rows are not in job id order
+        max_id = int(self.job_ids.max())
+        keys = scores * (max_id + 1) + (max_id - self.job_ids)
+        allowed = self.alive if self.dead_rows else None
+        if location:
+            code = self.location_codes.get(location)
+            at_location = self.raw_location_codes == code if code is not None else np.zeros(job_count, dtype=bool)
+            allowed = at_location if allowed is None else allowed & at_location
+        if job_ids is not None:
+            listed = np.isin(self.job_ids, np.fromiter(job_ids, dtype=self.job_ids.dtype, count=len(job_ids)))
+            allowed = listed if allowed is None else allowed & listed
+        if allowed is not None:
+            keys = np.where(allowed, keys, -1)
+            available = int(allowed.sum())
+        else:
+            available = job_count
+        top_n = min(top_n, available)
+        if top_n == 0:
+            return []
+        picked = np.argpartition(-keys, top_n - 1)[:top_n]
+        picked = picked[np.argsort(-keys[picked])]
+
+        results = []
+        for row in picked.tolist():
+            job_id = int(self.job_ids[row])
+            features = self.index.features[job_id]
+            results.append(score_match(
+                job_id,
+                tokens & features["skills"],
+                tokens & features["title_tokens"],
+                bool(location_hits[row])
+            ))
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        if not self.available:
+            return {"available": False}
+        return {
+            "available": True,
+            "built_version": self.built_version,
+            "builds": self.builds,
+            "build_seconds": self.build_seconds,
+            "patches": self.patches,
+            "patched_jobs": self.patched_jobs,
+        }
+
+
+class MatchEngine:
+    """
+    Picks the scoring engine for /api/ai/match. With `match_engine_compare`
+    both engines run on every request and mismatches and timings are counted.
+    """
+
+    def __init__(self, index: MatchIndex):
+        self.index = index
+        self.vector = VectorMatchEngine(index)
+        self.compared = 0
+        self.mismatches = 0
+        self.seconds = {engine: 0.0 for engine in ENGINES}
+
+    @property
+    def engine(self) -> str:
+        if settings.match_engine == "vector" and self.vector.available:
+            return "vector"
+        return "index"
+
+    def _run(
+        self,
+        engine: str,
+        resume_fields: Dict[str, Any],
+        top_n: int,
+        location: Optional[str],
+        job_ids: Optional[Set[int]]
+    ) -> List[Dict[str, Any]]:
+        started = time.perf_counter()
+        if engine == "vector":
+            results = self.vector.match(resume_fields, top_n, location, job_ids)
+        else:
+            results = self.index.match(resume_fields, top_n, location, job_ids)
+        self.seconds[engine] += time.perf_counter() - started
+        return results
+
+    def match(
+        self,
+        resume_fields: Dict[str, Any],
+        top_n: int = 3,
+        location: Optional[str] = None,
+        job_ids: Optional[Set[int]] = None
+    ) -> List[Dict[str, Any]]:
+        engine = self.engine
+        results = self._run(engine, resume_fields, top_n, location, job_ids)
+        if settings.match_engine_compare and self.vector.available:
+            other = self._run("index" if engine == "vector" else "vector", resume_fields, top_n, location, job_ids)
+            self.compared += 1
+            if [(r["job_id"], r["score"]) for r in results] != [(r["job_id"], r["score"]) for r in other]:
+                self.mismatches += 1
+                print(f"⚠️ Match engines disagree: {engine}={[(r['job_id'], r['score']) for r in results]} other={[(r['job_id'], r['score']) for r in other]}")
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "engine": self.engine,
+            "compare": settings.match_engine_compare,
+            "compared": self.compared,
+            "mismatches": self.mismatches,
+            "seconds": {engine: round(value, 3) for engine, value in self.seconds.items()},
+            "vector": self.vector.get_stats(),
+        }
+
+
+# Global instance
+match_engine = MatchEngine(match_index)
@@ -0,0 +1,129 @@
+from sqlalchemy import select, delete, or_
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.models import Job, JobMatchFeatures
+from app.services.job_facets import location_code, build_job_facets
+from app.services.skill_lexicon import skill_lexicon
+from app.services.match_cache import bump_job_set_version
+from typing import Dict, Any, List, Optional, Tuple
+import hashlib
+import json
+import re
+
+# Per-job match features, computed when a job is written and stored in the
+# job_match_features side table. Matching reads only this table instead of
+# hydrating full Job rows (raw_content, email templates, ...).
+
+# Bump when the feature derivation changes; older rows are recomputed on the next index load
+FEATURE_VERSION = 2
+TITLE_TOKEN_PATTERN = re.compile(r"[\w一-鿿]+")
+
+
+def build_job_features(title: Optional[str], requirements: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """The persisted feature record of a job (plain lists, JSON friendly)"""
+    requirements = requirements if isinstance(requirements, dict) else {}
+    skills = sorted({s.lower() for s in (requirements.get("skills") or []) if isinstance(s, str)})
+    raw_location = requirements.get("location") if isinstance(requirements.get("location"), str) else None
+    return {
+        "skills": skills,
+        "skill_ids": sorted(skill_lexicon.skill_ids[s] for s in skills if s in skill_lexicon.skill_ids),
+        "title_tokens": sorted(set(TITLE_TOKEN_PATTERN.findall((title or "").lower()))),
+        "location": (raw_location or "").lower() or None,
+        "raw_location": raw_location,
+        "location_code": location_code(raw_location),
+        **build_job_facets(requirements),
+    }
+
+
+def match_fingerprint(job: Job, record: Dict[str, Any]) -> str:
+    """Hash of everything keyword and semantic matching read from a job"""
+    payload = json.dumps(
+        [record, job.status == "active", job.title, job.requirements, job.raw_content],
+        sort_keys=True, ensure_ascii=False, default=str
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def features_for_scoring(record: Dict[str, Any]) -> Dict[str, Any]:
+    """Sets and lower-cased location used by the scorers"""
+    return {
+        "skills": set(record.get("skills") or []),
+        "title_tokens": set(record.get("title_tokens") or []),
+        "location": record.get("location") or "",
+        "raw_location": record.get("raw_location"),
+    }
+
+
+async def save_job_features(db: AsyncSession, job: Job) -> Dict[str, Any]:
+    """
+    Compute and upsert a job's feature row in the caller's transaction; returns
+    the record. Cached matches are invalidated only when the job is new, or
+    its match-relevant content changed while it was (or now is) active;
+    editing the company name or email template of a job keeps them.
+    """
+    record = build_job_features(job.title, job.requirements)
+    active = job.status == "active"
+    fingerprint = match_fingerprint(job, record)
+    existing = await db.get(JobMatchFeatures, job.id)
+    # Creations always bump: the incremental matcher keys queued jobs by the version they produced
+    affects_matches = existing is None or (
+        existing.fingerprint != fingerprint and (active or existing.is_active)
+    )
+    await db.merge(JobMatchFeatures(
+        job_id=job.id,
+        is_active=active,
+        feature_version=FEATURE_VERSION,
+        fingerprint=fingerprint,
+        **record
+    ))
+    if affects_matches:
+        await bump_job_set_version(db)
+    return record
+
+
+async def delete_job_features(db: AsyncSession, job_id: int):
+    """Delete a job's feature row; an inactive job was in no ranking, so cached matches stay valid"""
+    result = await db.execute(select(JobMatchFeatures.is_active).where(JobMatchFeatures.job_id == job_id))
+    was_active = result.scalar()
+    await db.execute(delete(JobMatchFeatures).where(JobMatchFeatures.job_id == job_id))
+    if was_active is not False:
+        await bump_job_set_version(db)
+
+
+async def backfill_job_features(db: AsyncSession) -> int:
+    """Create missing or outdated feature rows (jobs written before the table existed); returns how many"""
+    result = await db.execute(
+        select(Job, JobMatchFeatures.job_id)
+        .outerjoin(JobMatchFeatures, JobMatchFeatures.job_id == Job.id)
+        .where(or_(JobMatchFeatures.job_id.is_(None), JobMatchFeatures.feature_version < FEATURE_VERSION))
+    )
+    rows = result.all()
+    for job, existing in rows:
+        record = build_job_features(job.title, job.requirements)
+        row = JobMatchFeatures(
+            job_id=job.id,
+            is_active=job.status == "active",
+            feature_version=FEATURE_VERSION,
+            fingerprint=match_fingerprint(job, record),
+            **record
+        )
+        if existing is None:
+            db.add(row)
+        else:
+            await db.merge(row)
+    if rows:
+        await bump_job_set_version(db)
+        await db.commit()
+    return len(rows)
+
+
+async def load_active_features(db: AsyncSession, job_ids: Optional[List[int]] = None) -> List[Tuple[int, Dict[str, Any]]]:
+    """(job_id, record) for every active job (or only those in `job_ids`), read from the side table only"""
+    columns = ["skills", "skill_ids", "title_tokens", "location", "raw_location", "location_code"]
+    query = (
+        select(JobMatchFeatures.job_id, *(getattr(JobMatchFeatures, column) for column in columns))
+        .where(JobMatchFeatures.is_active.is_(True))
+    )
+    if job_ids is not None:
+        query = query.where(JobMatchFeatures.job_id.in_(job_ids))
+    result = await db.execute(query)
+    return [(row[0], dict(zip(columns, row[1:]))) for row in result.all()]
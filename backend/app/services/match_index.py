@@ -0,0 +1,247 @@
+from app.database import AsyncSessionLocal
+from app.services.match_features import (
+    build_job_features, features_for_scoring, backfill_job_features, load_active_features
+)
+from typing import Dict, Any, List, Optional, Set, Tuple
+import asyncio
+import time
+
+# In-memory inverted index for resume-to-job matching. Every active job is
+# posted under its normalized skills, title tokens and location, so a match
+# request only scores the jobs that share a token with the resume; all other
+# jobs have the baseline score and are only used to fill up top_n.
+
+BASE_SCORE = 30
+# Recent changes kept for derived structures that patch rows instead of rebuilding
+JOURNAL_LIMIT = 4096
+
+
+def job_match_features(title: Optional[str], requirements: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """Lower-cased skills, title tokens and location a job is matched on"""
+    return features_for_scoring(build_job_features(title, requirements))
+
+
+def resume_match_tokens(resume_fields: Dict[str, Any]) -> Set[str]:
+    skills = {s.lower() for s in (resume_fields.get("skills") or []) if isinstance(s, str)}
+    keywords = {k.lower() for k in (resume_fields.get("keywords") or []) if isinstance(k, str)}
+    return skills | keywords
+
+
+def score_match(job_id: Any, skill_hits: Set[str], title_hits: Set[str], location_hit: bool) -> Dict[str, Any]:
+    """Keyword score 0-100: base 30, up to 50 for skills, 15 for title words, 5 for location"""
+    skill_score = min(50, len(skill_hits) * 15)
+    title_score = min(15, len(title_hits) * 5)
+    loc_score = 5 if location_hit else 0
+    score = min(100, BASE_SCORE + skill_score + title_score + loc_score)
+
+    highlights = []
+    if skill_hits:
+        highlights.append(f"技能匹配: {', '.join(list(skill_hits)[:5])}")
+    if title_hits:
+        highlights.append(f"职位关键词匹配: {', '.join(list(title_hits)[:3])}")
+    if not highlights:
+        highlights.append("基础关键词相关")
+
+    return {
+        "job_id": job_id,
+        "score": float(score),
+        "highlights": highlights,
+        "template_recommendation": "template_1" if score >= 85 else "template_2"
+    }
+
+
+class MatchIndex:
+    """
+    Token -> job id postings for active jobs. Loaded lazily from the
+    job_match_features side table on first use and kept current by job_router
+    on create, update and delete.
+    """
+
+    def __init__(self):
+        self.features: Dict[int, Dict[str, Any]] = {}
+        self.skill_postings: Dict[str, Set[int]] = {}
+        self.title_postings: Dict[str, Set[int]] = {}
+        self.location_postings: Dict[str, Set[int]] = {}
+        self.loaded = False
+        self.loading = False
+        self._pending: List[Tuple[int, Optional[Dict[str, Any]], bool]] = []
+        self._order: Optional[List[int]] = None
+        # Bumped on every change so derived structures know when to update;
+        # the journal says which jobs changed since a given version
+        self.version = 0
+        self.journal: List[Tuple[int, int]] = []
+        self.journal_floor = 0
+        self._lock = asyncio.Lock()
+        self.matches = 0
+        self.candidates_scored = 0
+        self.load_seconds = 0.0
+
+    async def ensure_loaded(self):
+        if self.loaded:
+            return
+        async with self._lock:
+            if self.loaded:
+                return
+            self.loading = True
+            started = time.perf_counter()
+            try:
+                async with AsyncSessionLocal() as session:
+                    backfilled = await backfill_job_features(session)
+                    if backfilled:
+                        print(f"✅ Computed match features for {backfilled} jobs")
+                    rows = await load_active_features(session)
+                self._clear()
+                for job_id, record in rows:
+                    self._add(job_id, record)
+                # Changes committed while the snapshot was being read
+                for job_id, record, active in self._pending:
+                    self._apply(job_id, record, active)
+                self.loaded = True
+            finally:
+                self.loading = False
+                self._pending = []
+            self.load_seconds = round(time.perf_counter() - started, 3)
+            print(f"✅ Match index loaded - {len(self.features)} active jobs in {self.load_seconds}s")
+
+    def invalidate(self):
+        """Drop the index; it is rebuilt from the database on the next match"""
+        self.loaded = False
+        self._clear()
+
+    def upsert(self, job_id: int, record: Optional[Dict[str, Any]], active: bool):
+        """Apply a job's saved feature record (see match_features.save_job_features)"""
+        if self.loading:
+            self._pending.append((job_id, record, active))
+        elif self.loaded:
+            self._apply(job_id, record, active)
+
+    def remove(self, job_id: int):
+        self.upsert(job_id, None, False)
+
+    def changes_since(self, version: int) -> Optional[Set[int]]:
+        """Ids of jobs added, updated or removed after `version`; None when the journal doesn't reach back that far"""
+        if version < self.journal_floor:
+            return None
+        return {job_id for changed_at, job_id in self.journal if changed_at > version}
+
+    def _record(self, job_id: int):
+        self.version += 1
+        self.journal.append((self.version, job_id))
+        if len(self.journal) > JOURNAL_LIMIT:
+            del self.journal[:JOURNAL_LIMIT // 2]
+            self.journal_floor = self.journal[0][0] - 1
+
+    def _apply(self, job_id: int, record: Optional[Dict[str, Any]], active: bool):
+        self._remove(job_id)
+        if active and record is not None:
+            self._add(job_id, record)
+
+    def _clear(self):
+        self.features = {}
+        self.skill_postings = {}
+        self.title_postings = {}
+        self.location_postings = {}
+        self._order = None
+        self.version += 1
+        self.journal = []
+        self.journal_floor = self.version
+
+    def _add(self, job_id: int, record: Dict[str, Any]):
+        features = features_for_scoring(record)
+        self.features[job_id] = features
+        for token in features["skills"]:
+            self.skill_postings.setdefault(token, set()).add(job_id)
+        for token in features["title_tokens"]:
+            self.title_postings.setdefault(token, set()).add(job_id)
+        if features["location"]:
+            self.location_postings.setdefault(features["location"], set()).add(job_id)
+        self._order = None
+        self._record(job_id)
+
+    def _remove(self, job_id: int):
+        features = self.features.pop(job_id, None)
+        if not features:
+            return
+        for postings, tokens in (
+            (self.skill_postings, features["skills"]),
+            (self.title_postings, features["title_tokens"]),
+            (self.location_postings, [features["location"]] if features["location"] else []),
+        ):
+            for token in tokens:
+                ids = postings.get(token)
+                if ids is not None:
+                    ids.discard(job_id)
+                    if not ids:
+                        del postings[token]
+        self._order = None
+        self._record(job_id)
+
+    def match(
+        self,
+        resume_fields: Dict[str, Any],
+        top_n: int = 3,
+        location: Optional[str] = None,
+        job_ids: Optional[Set[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Same results as LLMService.match_resume_to_jobs over all active jobs
+        (optionally only those whose location equals `location` and whose id
+        is in `job_ids`), but only jobs sharing a token with the resume are scored.
+        """
+        tokens = resume_match_tokens(resume_fields)
+        skill_hits: Dict[int, Set[str]] = {}
+        title_hits: Dict[int, Set[str]] = {}
+        location_hits: Set[int] = set()
+        for token in tokens:
+            for job_id in self.skill_postings.get(token, ()):
+                skill_hits.setdefault(job_id, set()).add(token)
+            for job_id in self.title_postings.get(token, ()):
+                title_hits.setdefault(job_id, set()).add(token)
+            location_hits.update(self.location_postings.get(token, ()))
+
+        candidates = set(skill_hits) | set(title_hits) | location_hits
+        if location:
+            candidates = {job_id for job_id in candidates if self.features[job_id]["raw_location"] == location}
+        if job_ids is not None:
+            candidates &= job_ids
+        self.matches += 1
+        self.candidates_scored += len(candidates)
+
+        scored = [
+            score_match(job_id, skill_hits.get(job_id, set()), title_hits.get(job_id, set()), job_id in location_hits)
+            for job_id in candidates
+        ]
+        # Ties keep job id order, like the full scan over jobs in table order
+        scored.sort(key=lambda item: (-item["score"], item["job_id"]))
+        results = scored[:top_n]
+
+        if len(results) < top_n:
+            if self._order is None:
+                self._order = sorted(self.features)
+            for job_id in self._order:
+                if len(results) >= top_n:
+                    break
+                if job_id in candidates:
+                    continue
+                if location and self.features[job_id]["raw_location"] != location:
+                    continue
+                if job_ids is not None and job_id not in job_ids:
+                    continue
+                results.append(score_match(job_id, set(), set(), False))
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "loaded": self.loaded,
+            "jobs": len(self.features),
+            "skill_tokens": len(self.skill_postings),
+            "title_tokens": len(self.title_postings),
+            "locations": len(self.location_postings),
+            "load_seconds": self.load_seconds,
+            "matches": self.matches,
+            "avg_candidates_scored": round(self.candidates_scored / self.matches, 1) if self.matches else 0.0,
+        }
+
+
+# Global instance
+match_index = MatchIndex()
@@ -0,0 +1,64 @@
+from sqlalchemy import tuple_, literal
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+import base64
+import json
+
+# Keyset (cursor) pagination for list endpoints. A page is ordered by a
+# unique key such as (created_at, id) and the cursor is the key of its last
+# row, so the next page is a range seek on a composite index instead of an
+# OFFSET scan: deep pages cost the same as the first one, and rows inserted
+# meanwhile never shift or repeat items across pages. Cursors are opaque
+# url-safe strings; clients only pass back the `next_cursor` they were given.
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    payload = json.dumps([value.isoformat() if isinstance(value, datetime) else value for value in values])
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, keys: Sequence[Any]) -> List[Any]:
+    """Key values of a cursor, converted to the python types of `keys`; raises ValueError when malformed"""
+    try:
+        values = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+    except Exception:
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != len(keys):
+        raise ValueError("Invalid cursor")
+    decoded = []
+    for key, value in zip(keys, values):
+        python_type = key.type.python_type
+        try:
+            if value is None:
+                decoded.append(None)
+            elif python_type is datetime:
+                decoded.append(datetime.fromisoformat(value))
+            elif python_type in (int, str) and isinstance(value, python_type):
+                decoded.append(value)
+            else:
+                raise ValueError
+        except (TypeError, ValueError):
+            raise ValueError("Invalid cursor")
+    return decoded
+
+
+def keyset_query(query, keys: Sequence[Any], cursor: Optional[str], descending: bool = False):
+    """Order `query` by `keys` (the last one unique, e.g. id) and start after `cursor` when given"""
+    query = query.order_by(*(key.desc() if descending else key.asc() for key in keys))
+    if cursor:
+        values = decode_cursor(cursor, keys)
+        row = tuple_(*keys)
+        after = tuple_(*(literal(value, key.type) for key, value in zip(keys, values)))
+        query = query.where(row < after if descending else row > after)
+    return query
+
+
+def keyset_page(rows: List[Any], limit: int, attributes: Sequence[str]) -> Tuple[List[Any], Optional[str]]:
+    """Split rows fetched with limit + 1 into the page and the cursor of the next one (None on the last page)"""
+    if limit < 1:
+        # An empty page has no last row to continue from
+        raise ValueError("limit must be at least 1")
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor([getattr(rows[-1], attribute) for attribute in attributes])
@@ -0,0 +1,206 @@
+from sqlalchemy import select, delete, func
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import JobParseCache
+from datetime import datetime, timedelta
+from typing import Dict, Any, Optional
+import hashlib
+import json
+import re
+import time
+import unicodedata
+
+# Expired entries are swept at most this often; size overflow trims right away
+EXPIRY_SWEEP_SECONDS = 3600
+# An over-budget table is trimmed to this share of the budget, so the next
+# trim is many writes away instead of on every put
+TRIM_TARGET = 0.9
+
+
+def normalize_raw_content(raw_content: str) -> str:
+    """Normalize posting text so reposts of the same content share a cache key"""
+    text = unicodedata.normalize("NFKC", raw_content or "")
+    text = re.sub(r"\r\n?", "\n", text)
+    text = re.sub(r"[ \t　]+", " ", text)
+    text = re.sub(r"\s*\n\s*", "\n", text)
+    return text.strip()
+
+
+def build_cache_key(raw_content: str, source_type: str, model: str, prompt_version: str) -> str:
+    payload = json.dumps(
+        [prompt_version, model, source_type or "", normalize_raw_content(raw_content)],
+        ensure_ascii=False
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class ParseCache:
+    """
+    Persistent cache of job posting parse results.
+    Entries expire after `parse_cache_ttl_days` and the table is trimmed to
+    `parse_cache_max_entries` and `parse_cache_max_bytes` by least-recent hit.
+    Writes keep approximate table totals, so eviction only queries the table
+    when a budget is crossed or the hourly expiry sweep is due.
+    """
+
+    def __init__(self):
+        self.enabled = settings.parse_cache_enabled
+        self.max_entries = settings.parse_cache_max_entries
+        self.max_bytes = settings.parse_cache_max_bytes
+        self.ttl = timedelta(days=settings.parse_cache_ttl_days)
+        # Approximate entry count and result bytes, loaded on the first write
+        self.entries: Optional[int] = None
+        self.total_bytes: Optional[int] = None
+        self.next_sweep = 0.0
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+        self.evictions = 0
+
+    async def get(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        if not self.enabled:
+            return None
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    select(JobParseCache).where(JobParseCache.cache_key == cache_key)
+                )
+                entry = result.scalar_one_or_none()
+                now = datetime.utcnow()
+                if not entry or entry.created_at < now - self.ttl:
+                    self.misses += 1
+                    return None
+                entry.hit_count = (entry.hit_count or 0) + 1
+                entry.last_hit_at = now
+                await session.commit()
+                self.hits += 1
+                return entry.result
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ Parse cache lookup failed: {e}")
+            return None
+
+    async def put(
+        self,
+        cache_key: str,
+        result: Dict[str, Any],
+        model: str,
+        prompt_version: str,
+        source_type: Optional[str] = None
+    ):
+        if not self.enabled:
+            return
+        try:
+            async with AsyncSessionLocal() as session:
+                existing = await session.execute(
+                    select(JobParseCache).where(JobParseCache.cache_key == cache_key)
+                )
+                entry = existing.scalar_one_or_none()
+                now = datetime.utcnow()
+                size_bytes = len(json.dumps(result, ensure_ascii=False).encode("utf-8"))
+                if entry:
+                    added_entries, added_bytes = 0, size_bytes - (entry.size_bytes or 0)
+                    entry.result = result
+                    entry.size_bytes = size_bytes
+                    entry.created_at = now
+                    entry.last_hit_at = now
+                else:
+                    added_entries, added_bytes = 1, size_bytes
+                    session.add(
+                        JobParseCache(
+                            cache_key=cache_key,
+                            model=model,
+                            prompt_version=prompt_version,
+                            source_type=source_type,
+                            result=result,
+                            size_bytes=size_bytes,
+                            created_at=now,
+                            last_hit_at=now,
+                        )
+                    )
+                await session.flush()
+                if self.entries is None:
+                    await self._load_totals(session)
+                else:
+                    self.entries += added_entries
+                    self.total_bytes += added_bytes
+                if self._over_budget() or time.monotonic() >= self.next_sweep:
+                    await self._evict(session, now)
+                await session.commit()
+        except Exception as e:
+            self.errors += 1
+            print(f"⚠️ Parse cache write failed: {e}")
+
+    def _over_budget(self, share: float = 1.0) -> bool:
+        return self.entries > self.max_entries * share or self.total_bytes > self.max_bytes * share
+
+    async def _load_totals(self, session):
+        result = await session.execute(
+            select(func.count(JobParseCache.id), func.coalesce(func.sum(JobParseCache.size_bytes), 0))
+        )
+        self.entries, self.total_bytes = result.one()
+
+    async def _evict(self, session, now: datetime):
+        expired = await session.execute(
+            delete(JobParseCache).where(JobParseCache.created_at < now - self.ttl)
+        )
+        self.evictions += expired.rowcount or 0
+        self.next_sweep = time.monotonic() + EXPIRY_SWEEP_SECONDS
+
+        await self._load_totals(session)
+        if not self._over_budget():
+            return
+        entries, total_bytes = self.entries, self.total_bytes
+        stale_ids = []
+        rows = await session.execute(
+            select(JobParseCache.id, JobParseCache.size_bytes).order_by(JobParseCache.last_hit_at)
+        )
+        for entry_id, size_bytes in rows:
+            if entries <= self.max_entries * TRIM_TARGET and total_bytes <= self.max_bytes * TRIM_TARGET:
+                break
+            stale_ids.append(entry_id)
+            entries -= 1
+            total_bytes -= size_bytes or 0
+        if stale_ids:
+            trimmed = await session.execute(
+                delete(JobParseCache).where(JobParseCache.id.in_(stale_ids))
+            )
+            self.evictions += trimmed.rowcount or 0
+        self.entries, self.total_bytes = entries, total_bytes
+
+    async def clear(self) -> int:
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(delete(JobParseCache))
+            await session.commit()
+            self.entries, self.total_bytes = 0, 0
+            return result.rowcount or 0
+
+    async def get_stats(self) -> Dict[str, Any]:
+        entries = 0
+        total_bytes = 0
+        try:
+            async with AsyncSessionLocal() as session:
+                result = await session.execute(
+                    select(func.count(JobParseCache.id), func.coalesce(func.sum(JobParseCache.size_bytes), 0))
+                )
+                entries, total_bytes = result.one()
+        except Exception as e:
+            print(f"⚠️ Parse cache stats failed: {e}")
+        lookups = self.hits + self.misses
+        return {
+            "enabled": self.enabled,
+            "entries": entries,
+            "size_bytes": total_bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "ttl_days": self.ttl.days,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0,
+            "evictions": self.evictions,
+            "errors": self.errors,
+        }
+
+
+# Global instance
+parse_cache = ParseCache()
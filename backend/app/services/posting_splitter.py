@@ -0,0 +1,149 @@
+from typing import List, Tuple
+import re
+
+# Aggregated 公众号 articles list many postings in one blob. The splitter cuts
+# such a blob into single-posting chunks with local heuristics only, so each
+# chunk can be parsed by the LLM on its own.
+
+EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+SEPARATOR_PATTERN = re.compile(r"^\s*[-=*_~—·•]{3,}\s*$")
+# 【腾讯】 / ## 腾讯 / 1、腾讯 / （1）腾讯 / 一、腾讯 / 01 腾讯 / 第3家：腾讯 / No.3 腾讯
+HEADING_MARKER_PATTERN = re.compile(
+    r"^\s*(?:"
+    r"【[^】]{1,40}】"
+    r"|#{1,6}\s+"
+    r"|[一二三四五六七八九十百]{1,3}\s*[、.．:：]"
+    r"|\d{1,3}\s*[、.．:：)）]"
+    r"|[（(]\s*\d{1,3}\s*[)）]"
+    r"|0\d\s+"
+    r"|第\s*[\d一二三四五六七八九十百]{1,3}\s*[个家条位]?\s*[:：、.．]?"
+    r"|No\.?\s*\d{1,3}"
+    r")"
+)
+COMPANY_PATTERN = re.compile(
+    r"(?:有限公司|有限责任公司|股份公司|集团|银行|证券|基金|保险|研究院|研究所|设计院|大学|学院|医院"
+    r"|科技|网络|信息技术|公司|工作室|事务所|Inc\.?|Ltd\.?|Co\.,?|Corp\.?|Group)",
+    re.IGNORECASE
+)
+POSITION_PATTERN = re.compile(
+    r"(?:招聘|工程师|开发|研发|算法|测试|运维|产品|运营|设计师|设计|分析师|经理|专员|主管|助理|顾问|研究员"
+    r"|实习生|实习|管培生|管理培训生|储备干部|校招|社招|岗位|职位|HR|销售|编辑|教师|老师)",
+    re.IGNORECASE
+)
+# Role nouns strong enough to mark a heading; verbs like 开发/测试 also show up in duty lists
+ROLE_PATTERN = re.compile(
+    r"(?:招聘|工程师|设计师|分析师|经理|专员|主管|助理|顾问|研究员|实习生|管培生|管理培训生|储备干部"
+    r"|校招|社招|岗|职位|教师|老师|编辑|Engineer|Intern|Manager)",
+    re.IGNORECASE
+)
+LIST_ITEM_PATTERN = re.compile(r"^\s*(?:\d{1,3}\s*[、.．)）]|[（(]\s*\d{1,3}\s*[)）]|[-•·*]\s)")
+# Section headings that appear inside a single posting and must not start a new chunk
+SECTION_PATTERN = re.compile(
+    r"(?:要求|职责|描述|内容|福利|待遇|薪资|方式|地点|时间|流程|说明|简介|介绍|亮点|优势|备注|截止|邮箱|联系)"
+)
+
+HEADING_MAX_CHARS = 40
+MIN_CHUNK_CHARS = 30
+
+
+def _is_posting_heading(line: str) -> bool:
+    """A short line that names a company or position and is not an in-posting section title"""
+    stripped = line.strip()
+    if not stripped or len(stripped) > HEADING_MAX_CHARS:
+        return False
+    if SECTION_PATTERN.search(stripped):
+        return False
+    return bool(COMPANY_PATTERN.search(stripped) or ROLE_PATTERN.search(stripped))
+
+
+def _is_boundary(line: str, previous_line: str) -> bool:
+    stripped = line.strip()
+    previous = previous_line.strip()
+    if HEADING_MARKER_PATTERN.match(stripped) and _is_posting_heading(stripped):
+        # Numbered lines following a "职责：" title or another list item are list entries
+        in_list = previous.endswith((":", "：")) or bool(LIST_ITEM_PATTERN.match(previous))
+        if not (LIST_ITEM_PATTERN.match(stripped) and in_list):
+            return True
+    # A bare company line such as "XX科技有限公司" (labelled lines like "公司：XX" stay in-posting)
+    if (
+        len(stripped) <= HEADING_MAX_CHARS
+        and ":" not in stripped and "：" not in stripped
+        and COMPANY_PATTERN.search(stripped)
+        and not SECTION_PATTERN.search(stripped)
+        and re.search(r"(?:公司|集团|银行|研究院|研究所|大学|学院|医院|Inc\.?|Ltd\.?|Corp\.?|Group)$", stripped, re.IGNORECASE)
+    ):
+        return True
+    # The apply email usually closes a posting; a heading-like line right after it opens the next one
+    if previous_line and EMAIL_PATTERN.search(previous_line) and _is_posting_heading(stripped):
+        return True
+    return False
+
+
+def _has_posting_signal(chunk: str) -> bool:
+    return bool(EMAIL_PATTERN.search(chunk) or POSITION_PATTERN.search(chunk))
+
+
+def split_job_postings(raw_content: str, max_chunks: int = 50) -> Tuple[List[str], int]:
+    """
+    Split a raw_content blob into candidate single-posting chunks.
+    Boundaries come from separator lines, numbered/bracketed headings naming a
+    company or position, bare company-name lines and the line after an apply
+    email. Returns the first `max_chunks` chunks and how many postings were
+    left out beyond them; ([raw_content], 0) when the text does not look like
+    several postings.
+    """
+    text = (raw_content or "").replace("\r\n", "\n").replace("\r", "\n")
+    lines = text.split("\n")
+
+    chunks: List[List[str]] = [[]]
+    previous_line = ""
+    for line in lines:
+        if SEPARATOR_PATTERN.match(line):
+            if chunks[-1]:
+                chunks.append([])
+            continue
+        if line.strip() and chunks[-1] and _is_boundary(line, previous_line):
+            chunks.append([])
+        chunks[-1].append(line)
+        if line.strip():
+            previous_line = line
+
+    merged: List[str] = []
+    carry = ""
+    for lines_in_chunk in chunks:
+        chunk = "\n".join(lines_in_chunk).strip()
+        if not chunk:
+            continue
+        if carry:
+            chunk, carry = f"{carry}\n{chunk}", ""
+        # Fragments too short to be a posting: a lone heading belongs to the text
+        # after it, anything else (footers, stray lines) to the posting before it
+        if len(chunk) < MIN_CHUNK_CHARS:
+            first_line = chunk.split("\n", 1)[0]
+            if _is_posting_heading(first_line) and (
+                HEADING_MARKER_PATTERN.match(first_line) or COMPANY_PATTERN.search(first_line)
+            ):
+                carry = chunk
+                continue
+            if merged:
+                merged[-1] = f"{merged[-1]}\n{chunk}"
+                continue
+        merged.append(chunk)
+    if carry:
+        if merged:
+            merged[-1] = f"{merged[-1]}\n{carry}"
+        else:
+            merged.append(carry)
+
+    # An article intro before the first heading ("本期整理了以下公司的招聘信息…") neither
+    # opens like a posting nor carries an apply email; a first posting that
+    # applies by link or phone still starts with its heading
+    if len(merged) > 1 and not EMAIL_PATTERN.search(merged[0]):
+        first_line = merged[0].split("\n", 1)[0]
+        if not _is_posting_heading(first_line):
+            merged = merged[1:]
+
+    postings = [chunk for chunk in merged if _has_posting_signal(chunk)]
+    if len(postings) < 2:
+        return [raw_content], 0
+    return postings[:max_chunks], max(0, len(postings) - max_chunks)
@@ -0,0 +1,166 @@
+from app.config import settings
+from typing import Dict, Any, List, Tuple
+import re
+
+# Token budgeting for parse prompts. Raw postings and resumes are cleaned of
+# boilerplate (share prompts, QR-code captions, footers, repeated whitespace)
+# and, when still over budget, cut down section by section so the contact,
+# skills, experience and requirements parts survive.
+
+BOILERPLATE_PATTERNS = [
+    re.compile(p) for p in [
+        r"(?:长按|扫描|扫码|识别).{0,12}二维码",
+        r"二维码.{0,12}(?:关注|加入|添加|识别)",
+        r"(?:点击|戳).{0,8}(?:阅读原文|蓝字|关注|下方|上方|名片)",
+        r"(?:欢迎|记得|帮忙).{0,6}(?:转发|分享|点赞|在看|关注|星标)",
+        r"(?:点赞|在看|分享|转发).{0,4}(?:三连|支持|一下)",
+        r"(?:关注|置顶|星标).{0,6}公众号",
+        r"往期(?:推荐|回顾|精选)|推荐阅读|相关阅读|猜你喜欢",
+        r"^\s*(?:免责声明|版权声明|声明)\s*[:：]",
+        r"^\s*(?:来源|原标题|编辑|排版|校对|责编|图片来源)\s*[:：]",
+        r"(?:侵权|侵删|如有侵权)",
+        r"^\s*(?:▲|△|↑|↓|👇|👆)+\s*\S{0,20}\s*$",
+    ]
+]
+SEPARATOR_LINE_PATTERN = re.compile(r"^\s*[-=*_~—·•.。…]{3,}\s*$")
+EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_PATTERN = re.compile(r"(?<!\d)1[3-9]\d{9}(?!\d)|\d{3,4}-\d{7,8}")
+HEADING_PATTERN = re.compile(
+    r"^\s*(?:【[^】]{1,20}】|[一二三四五六七八九十]{1,2}\s*[、.．]|#{1,6}\s|[^\s：:，,。]{2,12}\s*[:：]\s*$)"
+)
+
+# Sections worth their tokens, per prompt kind; anything else is kept only while budget allows
+HIGH_SIGNAL_KEYWORDS = {
+    "job": [
+        "职责", "要求", "任职", "岗位", "职位", "招聘", "薪资", "薪酬", "待遇", "地点", "城市", "base",
+        "投递", "邮箱", "简历", "联系", "截止", "学历", "经验", "技能", "公司", "单位",
+    ],
+    "resume": [
+        "联系", "电话", "手机", "邮箱", "技能", "专业技能", "经历", "经验", "实习", "工作", "项目",
+        "教育", "学历", "学校", "证书", "获奖", "荣誉",
+    ],
+}
+LOW_SIGNAL_KEYWORDS = [
+    "公司简介", "公司介绍", "企业简介", "企业介绍", "关于我们", "团队介绍", "发展历程", "企业文化",
+    "自我评价", "兴趣爱好", "个人爱好",
+]
+
+
+def count_tokens(text: str) -> int:
+    """Rough token count: ~1 token per CJK char, ~4 chars per token otherwise"""
+    if not text:
+        return 0
+    cjk = sum(1 for ch in text if "一" <= ch <= "鿿")
+    return cjk + (len(text) - cjk + 3) // 4
+
+
+def clean_boilerplate(text: str) -> str:
+    """Drop share prompts, QR-code captions, footers, separator lines, duplicate lines and extra whitespace"""
+    lines = []
+    seen = set()
+    for line in (text or "").replace("\r\n", "\n").replace("\r", "\n").split("\n"):
+        stripped = re.sub(r"[ \t　\xa0]+", " ", line).strip()
+        if not stripped:
+            if lines and lines[-1]:
+                lines.append("")
+            continue
+        if SEPARATOR_LINE_PATTERN.match(stripped):
+            continue
+        # Keep lines carrying contact details even if they sit next to boilerplate
+        has_contact = EMAIL_PATTERN.search(stripped) or PHONE_PATTERN.search(stripped)
+        if not has_contact and any(pattern.search(stripped) for pattern in BOILERPLATE_PATTERNS):
+            continue
+        if len(stripped) > 8 and stripped in seen:
+            continue
+        seen.add(stripped)
+        lines.append(stripped)
+    return "\n".join(lines).strip()
+
+
+def _is_heading(line: str, kind: str) -> bool:
+    if HEADING_PATTERN.match(line):
+        return True
+    # Bare section titles such as "教育背景" / "项目经历"
+    keywords = HIGH_SIGNAL_KEYWORDS.get(kind, []) + LOW_SIGNAL_KEYWORDS
+    return len(line) <= 10 and not re.search(r"[，,。；;\d]", line) and any(keyword in line for keyword in keywords)
+
+
+def _split_sections(text: str, kind: str) -> List[List[str]]:
+    sections: List[List[str]] = [[]]
+    for line in text.split("\n"):
+        if not line:
+            if sections[-1]:
+                sections.append([])
+            continue
+        if _is_heading(line, kind) and sections[-1]:
+            sections.append([])
+        sections[-1].append(line)
+    return [section for section in sections if section]
+
+
+def _section_priority(section: List[str], kind: str, index: int) -> int:
+    """0 = must keep, 1 = high signal, 2 = normal, 3 = low signal"""
+    body = "\n".join(section)
+    if EMAIL_PATTERN.search(body) or PHONE_PATTERN.search(body):
+        return 0
+    heading = section[0][:30]
+    if any(keyword in heading for keyword in LOW_SIGNAL_KEYWORDS):
+        return 3
+    # The opening lines usually name the position / candidate
+    if index == 0 or any(keyword in heading for keyword in HIGH_SIGNAL_KEYWORDS.get(kind, [])):
+        return 1
+    return 2
+
+
+def _truncate_to_tokens(text: str, budget: int) -> str:
+    if count_tokens(text) <= budget:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if count_tokens(text[:middle]) <= budget:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low].rstrip()
+
+
+def prompt_budget_for(model: str, kind: str) -> int:
+    """Token budget for the raw text of a job/resume prompt; per-model overrides win"""
+    override = settings.prompt_budget_model_overrides.get(model, {})
+    if kind in override:
+        return int(override[kind])
+    return settings.prompt_budget_resume_tokens if kind == "resume" else settings.prompt_budget_job_tokens
+
+
+def compact_text(text: str, budget: int, kind: str = "job") -> Tuple[str, Dict[str, Any]]:
+    """
+    Fit text into `budget` tokens. Returns (compacted_text, stats) where stats
+    has original_tokens, sent_tokens and saved_tokens.
+    """
+    original_tokens = count_tokens(text)
+    cleaned = clean_boilerplate(text)
+    if count_tokens(cleaned) > budget:
+        sections = _split_sections(cleaned, kind)
+        costs = [count_tokens("\n".join(section)) + 1 for section in sections]
+        order = sorted(range(len(sections)), key=lambda i: (_section_priority(sections[i], kind, i), i))
+        kept: Dict[int, str] = {}
+        remaining = budget
+        for index in order:
+            if remaining <= 0:
+                break
+            body = "\n".join(sections[index])
+            if costs[index] <= remaining:
+                kept[index] = body
+                remaining -= costs[index]
+            elif _section_priority(sections[index], kind, index) <= 1:
+                # A high-signal section is worth keeping in part
+                kept[index] = _truncate_to_tokens(body, remaining - 1)
+                remaining = 0
+        cleaned = "\n\n".join(kept[index] for index in sorted(kept))
+    sent_tokens = count_tokens(cleaned)
+    return cleaned, {
+        "original_tokens": original_tokens,
+        "sent_tokens": sent_tokens,
+        "saved_tokens": max(0, original_tokens - sent_tokens),
+    }
@@ -0,0 +1,541 @@
+from sqlalchemy import select
+from app.config import settings
+from app.database import AsyncSessionLocal
+from app.models import Job
+from app.services.match_index import MatchIndex, resume_match_tokens, score_match
+from app.services.skill_lexicon import skill_lexicon
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Set, Tuple, Callable
+import asyncio
+import json
+import os
+import re
+import time
+import unicodedata
+import zlib
+
+try:
+    import numpy as np
+except ImportError:  # optional; semantic matching is unavailable without it
+    np = None
+
+# Offline semantic matching. Texts are embedded locally: character 2/3-grams
+# plus the canonical lexicon skills they mention (so "ML" and "机器学习" share
+# a feature) are hashed into a fixed number of buckets, weighted by TF-IDF and
+# projected onto a truncated SVD basis fitted on the job corpus. Job vectors
+# are kept in an append-only file that is memory-mapped on load and grouped
+# into k-means lists (IVF), so a query only scores the lists nearest to it.
+
+# Bump when the features or the file layout change; older indexes are rebuilt
+EMBEDDING_VERSION = 1
+HASH_BUCKETS = 1 << 16
+SKILL_WEIGHT = 3.0
+MAX_RAW_CHARS = 2000
+# Jobs sampled to fit the SVD basis, and the nonzeros multiplied per chunk while fitting
+FIT_SAMPLE = 5000
+FIT_CHUNK_NNZ = 50000
+POWER_ITERATIONS = 1
+# Below this many jobs every vector is scored and no lists are built
+MIN_IVF_JOBS = 2000
+KMEANS_SAMPLE = 20000
+KMEANS_ITERATIONS = 8
+# Share of the final score taken from the keyword score; the rest is cosine similarity
+KEYWORD_WEIGHT = 0.5
+RESUME_SKIP_FIELDS = {"name", "email", "phone"}
+WHITESPACE_PATTERN = re.compile(r"\s+")
+TOMBSTONE = -1
+
+if np is not None:
+    HASH_MULTIPLIERS = np.array([0x9E3779B97F4A7C15, 0xC2B2AE3D27D4EB4F, 0x165667B19E3779F9], dtype=np.uint64)
+    TRIGRAM_SALT = np.uint64(0x27D4EB2F165667C5)
+    HASH_SHIFT = np.uint64(40)
+
+
+def _flatten(value: Any) -> List[str]:
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, dict):
+        return [text for item in value.values() for text in _flatten(item)]
+    if isinstance(value, (list, tuple)):
+        return [text for item in value for text in _flatten(item)]
+    if value is None or isinstance(value, bool):
+        return []
+    return [str(value)]
+
+
+def job_text(title: Optional[str], requirements: Any, raw_content: Optional[str]) -> str:
+    # The title is repeated to weigh it above the free-form posting text
+    return "\n".join(filter(None, [title, title, *_flatten(requirements), (raw_content or "")[:MAX_RAW_CHARS]]))
+
+
+def resume_text(resume_fields: Any) -> str:
+    fields = resume_fields if isinstance(resume_fields, dict) else {}
+    return "\n".join(_flatten({key: value for key, value in fields.items() if key not in RESUME_SKIP_FIELDS}))
+
+
+def hashed_features(text: str) -> Tuple["np.ndarray", "np.ndarray"]:
+    """Sorted hash buckets of a text and their log-scaled term frequencies"""
+    text = WHITESPACE_PATTERN.sub(" ", unicodedata.normalize("NFKC", text or "").lower()).strip()
+    ids = np.zeros(0, dtype=np.int64)
+    tf = np.zeros(0, dtype=np.float64)
+    if len(text) >= 2:
+        codes = np.frombuffer(text.encode("utf-32-le"), dtype=np.uint32).astype(np.uint64)
+        hashes = [codes[:-1] * HASH_MULTIPLIERS[0] + codes[1:] * HASH_MULTIPLIERS[1]]
+        if len(codes) >= 3:
+            hashes.append(
+                codes[:-2] * HASH_MULTIPLIERS[0] + codes[1:-1] * HASH_MULTIPLIERS[1]
+                + codes[2:] * HASH_MULTIPLIERS[2] + TRIGRAM_SALT
+            )
+        buckets = ((np.concatenate(hashes) * HASH_MULTIPLIERS[2]) >> HASH_SHIFT) % np.uint64(HASH_BUCKETS)
+        ids, counts = np.unique(buckets.astype(np.int64), return_counts=True)
+        tf = 1.0 + np.log(counts)
+    skills = skill_lexicon.extract(text)
+    if skills:
+        skill_ids = [zlib.crc32(f"skill:{skill.lower()}".encode("utf-8")) % HASH_BUCKETS for skill in skills]
+        ids, inverse = np.unique(np.concatenate([ids, skill_ids]).astype(np.int64), return_inverse=True)
+        tf = np.bincount(inverse, weights=np.concatenate([tf, np.full(len(skill_ids), SKILL_WEIGHT)]))
+    return ids, tf
+
+
+def _sparse_dot(indptr: "np.ndarray", indices: "np.ndarray", data: "np.ndarray", dense: "np.ndarray") -> "np.ndarray":
+    """CSR matrix times dense matrix, in chunks of about FIT_CHUNK_NNZ nonzeros"""
+    rows = len(indptr) - 1
+    out = np.zeros((rows, dense.shape[1]))
+    start = 0
+    while start < rows:
+        stop = int(np.searchsorted(indptr, indptr[start] + FIT_CHUNK_NNZ, side="right")) - 1
+        stop = min(rows, max(stop, start + 1))
+        low, high = indptr[start], indptr[stop]
+        if high > low:
+            products = data[low:high, None] * dense[indices[low:high]]
+            sums = np.vstack([np.zeros((1, dense.shape[1])), np.cumsum(products, axis=0)])
+            bounds = indptr[start:stop + 1] - low
+            out[start:stop] = sums[bounds[1:]] - sums[bounds[:-1]]
+        start = stop
+    return out
+
+
+class SemanticModel:
+    """IDF weights and SVD basis (HASH_BUCKETS x dimensions) that turn texts into unit vectors"""
+
+    def __init__(self, idf: "np.ndarray", components: "np.ndarray"):
+        self.idf = idf
+        self.components = components
+
+    @property
+    def dimensions(self) -> int:
+        return self.components.shape[1]
+
+    def embed_features(self, ids: "np.ndarray", tf: "np.ndarray") -> "np.ndarray":
+        vector = np.zeros(self.dimensions, dtype=np.float32)
+        if len(ids):
+            weights = tf * self.idf[ids]
+            vector = (weights @ self.components[ids]).astype(np.float32)
+        norm = float(np.linalg.norm(vector))
+        return vector / norm if norm > 0 else vector
+
+    def embed(self, text: str) -> "np.ndarray":
+        return self.embed_features(*hashed_features(text))
+
+    @classmethod
+    def fit(cls, docs: List[Tuple["np.ndarray", "np.ndarray"]], dimensions: int, seed: int = 0) -> "SemanticModel":
+        """IDF over all documents, then a randomized truncated SVD of a sample's TF-IDF matrix"""
+        rng = np.random.default_rng(seed)
+        df = np.zeros(HASH_BUCKETS)
+        for ids, _ in docs:
+            df[ids] += 1
+        idf = (np.log((1 + len(docs)) / (1 + df)) + 1).astype(np.float32)
+
+        sample = docs
+        if len(docs) > FIT_SAMPLE:
+            sample = [docs[i] for i in sorted(rng.choice(len(docs), FIT_SAMPLE, replace=False))]
+        indptr = np.zeros(len(sample) + 1, dtype=np.int64)
+        indptr[1:] = np.cumsum([len(ids) for ids, _ in sample])
+        indices = np.concatenate([ids for ids, _ in sample]) if sample else np.zeros(0, dtype=np.int64)
+        data = []
+        for ids, tf in sample:
+            weights = tf * idf[ids]
+            norm = np.linalg.norm(weights)
+            data.append(weights / norm if norm > 0 else weights)
+        data = np.concatenate(data) if data else np.zeros(0)
+
+        # Transpose (CSC of the sample) for A^T products
+        order = np.argsort(indices, kind="stable")
+        row_ids = np.repeat(np.arange(len(sample)), np.diff(indptr))
+        t_indptr = np.zeros(HASH_BUCKETS + 1, dtype=np.int64)
+        t_indptr[1:] = np.cumsum(np.bincount(indices, minlength=HASH_BUCKETS))
+        t_indices, t_data = row_ids[order], data[order]
+
+        width = min(dimensions + 10, max(1, len(sample)))
+        basis, _ = np.linalg.qr(_sparse_dot(indptr, indices, data, rng.standard_normal((HASH_BUCKETS, width))))
+        for _ in range(POWER_ITERATIONS):
+            basis, _ = np.linalg.qr(_sparse_dot(t_indptr, t_indices, t_data, basis))
+            basis, _ = np.linalg.qr(_sparse_dot(indptr, indices, data, basis))
+        # A^T Q = U S V^T; the columns of U are the top right singular vectors of A
+        left, singular, _ = np.linalg.svd(_sparse_dot(t_indptr, t_indices, t_data, basis), full_matrices=False)
+        keep = min(dimensions, int((singular > singular[0] * 1e-6).sum()) if len(singular) and singular[0] > 0 else 0)
+        return cls(idf, np.ascontiguousarray(left[:, :max(keep, 1)], dtype=np.float32))
+
+
+def _kmeans(vectors: "np.ndarray", lists: int, seed: int = 0) -> "np.ndarray":
+    """Spherical k-means centroids (unit vectors) of the job vectors"""
+    rng = np.random.default_rng(seed)
+    sample = vectors
+    if len(vectors) > KMEANS_SAMPLE:
+        sample = vectors[np.sort(rng.choice(len(vectors), KMEANS_SAMPLE, replace=False))]
+    centroids = sample[rng.choice(len(sample), lists, replace=False)].copy()
+    for _ in range(KMEANS_ITERATIONS):
+        assigned = np.argmax(sample @ centroids.T, axis=1)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assigned, sample)
+        norms = np.linalg.norm(sums, axis=1)
+        filled = norms > 0
+        centroids[filled] = sums[filled] / norms[filled, None]
+    return centroids.astype(np.float32)
+
+
+class SemanticIndex:
+    """
+    Job vectors persisted under `semantic_index_dir`. Built (or loaded and
+    caught up with jobs changed since the last sync) on first use, then kept
+    current by job_router; changes are appended to the vector file and old
+    rows are left as dead entries until the next rebuild.
+    """
+
+    def __init__(self):
+        self.directory = Path(settings.semantic_index_dir)
+        self.model: Optional[SemanticModel] = None
+        self.centroids: Optional["np.ndarray"] = None
+        self.vectors = None
+        self.meta: Dict[str, Any] = {}
+        self.row_job = None
+        self.row_list = None
+        self.active = None
+        self.job_row: Dict[int, int] = {}
+        self.mapped_rows = 0
+        self.loaded = False
+        self.loading = False
+        self._pending: List[Tuple[int, Optional[str], bool]] = []
+        self._lock = asyncio.Lock()
+        self.searches = 0
+        self.candidates_scored = 0
+        self.build_seconds = 0.0
+        self.load_seconds = 0.0
+
+    @property
+    def available(self) -> bool:
+        return np is not None
+
+    @property
+    def rows(self) -> int:
+        return 0 if self.row_job is None else len(self.row_job)
+
+    def _path(self, name: str) -> Path:
+        return self.directory / name
+
+    async def ensure_loaded(self, rebuild: bool = False):
+        if self.loaded and not rebuild:
+            return
+        async with self._lock:
+            if self.loaded and not rebuild:
+                return
+            self.loaded = False
+            self.loading = True
+            started = time.perf_counter()
+            try:
+                synced_at = datetime.utcnow()
+                if rebuild or not await asyncio.to_thread(self._load_files):
+                    async with AsyncSessionLocal() as session:
+                        result = await session.execute(
+                            select(Job.id, Job.title, Job.requirements, Job.raw_content)
+                            .where(Job.status == "active")
+                            .order_by(Job.id)
+                        )
+                        jobs = result.all()
+                    await asyncio.to_thread(self._build_files, jobs, synced_at)
+                else:
+                    await self._sync(synced_at)
+                # Changes committed while the index was being loaded
+                for job_id, text, active in self._pending:
+                    self._apply(job_id, text, active)
+                self.loaded = True
+            finally:
+                self.loading = False
+                self._pending = []
+            self.load_seconds = round(time.perf_counter() - started, 3)
+            print(f"✅ Semantic index ready - {len(self.job_row)} jobs, {self.rows} rows in {self.load_seconds}s")
+
+    def _load_files(self) -> bool:
+        """Open a persisted index (vectors memory-mapped); False when missing or outdated"""
+        try:
+            meta = json.loads(self._path("meta.json").read_text(encoding="utf-8"))
+            if meta.get("version") != EMBEDDING_VERSION or meta.get("buckets") != HASH_BUCKETS:
+                return False
+            idf = np.load(self._path("idf.npy"))
+            components = np.load(self._path("components.npy"), mmap_mode="r")
+            centroids = np.load(self._path("centroids.npy")) if meta.get("lists") else None
+            rows = np.fromfile(self._path("rows.i64"), dtype=np.int64)
+            vector_rows = self._path("vectors.f32").stat().st_size // (4 * components.shape[1])
+        except (OSError, ValueError) as e:
+            if self._path("meta.json").exists():
+                print(f"⚠️ Semantic index at {self.directory} is unreadable, rebuilding: {e}")
+            return False
+        # An append interrupted between the two files leaves them uneven; cut both to the common length
+        count = min(len(rows) // 2, vector_rows)
+        if count * 2 != len(rows) or count != vector_rows:
+            os.truncate(self._path("rows.i64"), count * 2 * 8)
+            os.truncate(self._path("vectors.f32"), count * 4 * components.shape[1])
+        rows = rows[:count * 2].reshape(-1, 2)
+        self.meta = meta
+        self.model = SemanticModel(idf, components)
+        self.centroids = centroids
+        self.row_job = rows[:, 0].copy()
+        self.row_list = rows[:, 1].astype(np.int32)
+        self.active = np.zeros(len(rows), dtype=bool)
+        latest = len(rows) - 1 - np.unique(self.row_job[::-1], return_index=True)[1]
+        alive = np.sort(latest[self.row_list[latest] != TOMBSTONE])
+        self.active[alive] = True
+        self.job_row = dict(zip(self.row_job[alive].tolist(), alive.tolist()))
+        self.vectors = None
+        self.mapped_rows = 0
+        return True
+
+    def _build_files(self, jobs: List[Tuple[int, str, Any, Optional[str]]], synced_at: datetime):
+        started = time.perf_counter()
+        docs = [hashed_features(job_text(title, requirements, raw_content)) for _, title, requirements, raw_content in jobs]
+        model = SemanticModel.fit(docs, settings.semantic_dimensions) if docs else None
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._path("meta.json").unlink(missing_ok=True)
+        if model is None:
+            self.model = None
+            self.job_row = {}
+            self.row_job = self.row_list = self.active = None
+            self.vectors = None
+            self.mapped_rows = 0
+            print("⚠️ No active jobs, semantic index left empty")
+            return
+
+        vectors = np.vstack([model.embed_features(*doc) for doc in docs]).astype(np.float32)
+        lists = 0
+        centroids = None
+        assigned = np.zeros(len(vectors), dtype=np.int64)
+        if len(vectors) >= MIN_IVF_JOBS:
+            lists = int(min(1024, np.sqrt(len(vectors))))
+            centroids = _kmeans(vectors, lists)
+            assigned = np.concatenate([
+                np.argmax(vectors[start:start + 10000] @ centroids.T, axis=1)
+                for start in range(0, len(vectors), 10000)
+            ])
+        np.save(self._path("idf.npy"), model.idf)
+        np.save(self._path("components.npy"), model.components)
+        if centroids is not None:
+            np.save(self._path("centroids.npy"), centroids)
+        vectors.tofile(self._path("vectors.f32"))
+        job_ids = np.array([job[0] for job in jobs], dtype=np.int64)
+        np.stack([job_ids, assigned]).T.astype(np.int64).tofile(self._path("rows.i64"))
+        self.build_seconds = round(time.perf_counter() - started, 3)
+        self._write_meta({
+            "version": EMBEDDING_VERSION,
+            "buckets": HASH_BUCKETS,
+            "dimensions": model.dimensions,
+            "lists": lists,
+            "fitted_jobs": len(docs),
+            "built_at": synced_at.isoformat(),
+            "build_seconds": self.build_seconds,
+            "synced_at": synced_at.isoformat(),
+        })
+        self._load_files()
+
+    def _write_meta(self, meta: Dict[str, Any]):
+        temp = self._path("meta.json.tmp")
+        temp.write_text(json.dumps(meta, ensure_ascii=False, indent=2), encoding="utf-8")
+        temp.replace(self._path("meta.json"))
+        self.meta = meta
+
+    async def _sync(self, synced_at: datetime):
+        """Catch a loaded index up with jobs created, changed or deleted since it was last synced"""
+        since = datetime.fromisoformat(self.meta["synced_at"])
+        async with AsyncSessionLocal() as session:
+            result = await session.execute(select(Job.id, Job.updated_at).where(Job.status == "active"))
+            active = result.all()
+            active_ids = {job_id for job_id, _ in active}
+            changed = [
+                job_id for job_id, updated_at in active
+                if job_id not in self.job_row or (updated_at is not None and updated_at >= since)
+            ]
+            texts = {}
+            for start in range(0, len(changed), 500):
+                result = await session.execute(
+                    select(Job.id, Job.title, Job.requirements, Job.raw_content)
+                    .where(Job.id.in_(changed[start:start + 500]))
+                )
+                texts.update({row[0]: job_text(row[1], row[2], row[3]) for row in result.all()})
+        removed = [job_id for job_id in self.job_row if job_id not in active_ids]
+        if changed:
+            vectors = await asyncio.to_thread(lambda: np.vstack([self.model.embed(texts[job_id]) for job_id in changed]))
+            self._append(changed, vectors)
+        if removed:
+            self._append(removed, None)
+        if changed or removed:
+            print(f"✅ Semantic index caught up - {len(changed)} jobs embedded, {len(removed)} removed")
+        self._write_meta({**self.meta, "synced_at": synced_at.isoformat()})
+
+    def upsert(self, job_id: int, text: Optional[str], active: bool):
+        """Embed a written job (see job_text); inactive or deleted jobs are dropped"""
+        if self.loading:
+            self._pending.append((job_id, text, active))
+        elif self.loaded:
+            self._apply(job_id, text, active)
+
+    def remove(self, job_id: int):
+        self.upsert(job_id, None, False)
+
+    def _apply(self, job_id: int, text: Optional[str], active: bool):
+        if active and text is not None:
+            if self.model is None:
+                # First job after an empty build: fit on the next match
+                self.loaded = False
+                return
+            self._append([job_id], self.model.embed(text)[None, :])
+        elif job_id in self.job_row:
+            self._append([job_id], None)
+
+    def _append(self, job_ids: List[int], vectors: Optional["np.ndarray"]):
+        """Append rows for the jobs (tombstones when vectors is None) to the files and the in-memory state"""
+        count = len(job_ids)
+        if vectors is None:
+            vectors = np.zeros((count, self.model.dimensions), dtype=np.float32)
+            lists = np.full(count, TOMBSTONE, dtype=np.int64)
+        elif self.centroids is not None:
+            lists = np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int64)
+        else:
+            lists = np.zeros(count, dtype=np.int64)
+        ids = np.array(job_ids, dtype=np.int64)
+        with open(self._path("vectors.f32"), "ab") as f:
+            f.write(np.ascontiguousarray(vectors, dtype=np.float32).tobytes())
+        with open(self._path("rows.i64"), "ab") as f:
+            f.write(np.stack([ids, lists]).T.astype(np.int64).tobytes())
+
+        first = self.rows
+        for job_id in job_ids:
+            previous = self.job_row.pop(job_id, None)
+            if previous is not None:
+                self.active[previous] = False
+        self.row_job = np.concatenate([self.row_job, ids])
+        self.row_list = np.concatenate([self.row_list, lists.astype(np.int32)])
+        self.active = np.concatenate([self.active, lists != TOMBSTONE])
+        for offset, (job_id, list_id) in enumerate(zip(job_ids, lists.tolist())):
+            if list_id != TOMBSTONE:
+                self.job_row[job_id] = first + offset
+
+    def _map(self):
+        if self.mapped_rows != self.rows:
+            self.vectors = np.memmap(self._path("vectors.f32"), dtype=np.float32, mode="r", shape=(self.rows, self.model.dimensions))
+            self.mapped_rows = self.rows
+
+    def search(self, query: "np.ndarray", k: int, allowed: Optional[Callable[[int], bool]] = None) -> List[Tuple[int, float]]:
+        """Up to k (job_id, cosine similarity) pairs, most similar first"""
+        if not self.job_row or k <= 0:
+            return []
+        self._map()
+        if self.centroids is not None and len(self.job_row) >= MIN_IVF_JOBS:
+            nprobe = max(1, min(settings.semantic_nprobe, len(self.centroids)))
+            probes = np.argpartition(-(self.centroids @ query), nprobe - 1)[:nprobe]
+            rows = np.flatnonzero(self.active & np.isin(self.row_list, probes))
+            similarities = np.asarray(self.vectors[rows]) @ query
+        else:
+            # Exact scan straight over the mapped file, without gathering rows first
+            rows = np.flatnonzero(self.active)
+            similarities = (np.asarray(self.vectors) @ query)[rows]
+        self.searches += 1
+        self.candidates_scored += len(rows)
+
+        results = []
+        for position in np.argsort(-similarities, kind="stable").tolist():
+            job_id = int(self.row_job[rows[position]])
+            if allowed and not allowed(job_id):
+                continue
+            results.append((job_id, float(similarities[position])))
+            if len(results) >= k:
+                break
+        return results
+
+    @staticmethod
+    def _score(job_id: int, similarity: float, tokens: set, features: Dict[str, Any]) -> Dict[str, Any]:
+        keyword = score_match(
+            job_id,
+            tokens & features["skills"],
+            tokens & features["title_tokens"],
+            bool(features["location"]) and features["location"] in tokens
+        )
+        score = round(KEYWORD_WEIGHT * keyword["score"] + (1 - KEYWORD_WEIGHT) * 100 * max(0.0, similarity), 1)
+        highlights = [f"语义相似度: {similarity:.2f}"] + [h for h in keyword["highlights"] if h != "基础关键词相关"]
+        return {
+            "job_id": job_id,
+            "score": score,
+            "highlights": highlights,
+            "template_recommendation": "template_1" if score >= 85 else "template_2"
+        }
+
+    def match(
+        self,
+        resume_fields: Dict[str, Any],
+        top_n: int,
+        location: Optional[str],
+        index: MatchIndex,
+        job_ids: Optional[Set[int]] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        The `semantic_candidates` jobs nearest to the resume, re-ranked by a
+        blend of keyword score and similarity; topped up with keyword matches
+        when fewer than top_n are found.
+        """
+        tokens = resume_match_tokens(resume_fields)
+        features = index.features
+        results = []
+        query = self.model.embed(resume_text(resume_fields)) if self.model is not None else None
+        if query is not None and query.any():
+            def allowed(job_id: int) -> bool:
+                return (
+                    job_id in features
+                    and (not location or features[job_id]["raw_location"] == location)
+                    and (job_ids is None or job_id in job_ids)
+                )
+
+            for job_id, similarity in self.search(query, max(top_n, settings.semantic_candidates), allowed):
+                results.append(self._score(job_id, similarity, tokens, features[job_id]))
+        results.sort(key=lambda item: (-item["score"], item["job_id"]))
+        results = results[:top_n]
+        if len(results) < top_n:
+            seen = {item["job_id"] for item in results}
+            for item in index.match(resume_fields, top_n + len(seen), location, job_ids):
+                if len(results) >= top_n:
+                    break
+                if item["job_id"] not in seen:
+                    results.append(self._score(item["job_id"], 0.0, tokens, features[item["job_id"]]))
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        if not self.available:
+            return {"available": False}
+        return {
+            "available": True,
+            "loaded": self.loaded,
+            "directory": str(self.directory),
+            "jobs": len(self.job_row),
+            "rows": self.rows,
+            "dimensions": self.model.dimensions if self.model is not None else None,
+            "lists": self.meta.get("lists", 0),
+            "nprobe": settings.semantic_nprobe,
+            "fitted_jobs": self.meta.get("fitted_jobs"),
+            "built_at": self.meta.get("built_at"),
+            "build_seconds": self.meta.get("build_seconds"),
+            "load_seconds": self.load_seconds,
+            "searches": self.searches,
+            "avg_candidates_scored": round(self.candidates_scored / self.searches, 1) if self.searches else 0.0,
+        }
+
+
+# Global instance
+semantic_index = SemanticIndex()
@@ -0,0 +1,158 @@
+from app.config import settings
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+import json
+import re
+
+# Skill / keyword lexicon with synonyms ("k8s" -> "Kubernetes", "py" -> "Python").
+# All terms are compiled once into a single trie-shaped regex, so extraction is
+# one left-to-right pass over the text however large the lexicon grows. Latin
+# terms only match on token boundaries; CJK terms match anywhere.
+
+BUILTIN_LEXICON_PATH = Path(__file__).with_name("skill_lexicon.json")
+SEPARATOR_PATTERN = re.compile(r"[\s_\-]+")
+# "Spring Boot" also matches "SpringBoot" / "spring-boot"
+SEPARATOR_REGEX = r"[ \t_\-]?"
+# A hyphen between letters joins one word ("go-to", "e-commerce"), so it is no
+# boundary, except before suffixes such as "Python-based" or "Java-related"
+HYPHEN_SUFFIXES = r"(?:based|backed|driven|related|like|native|powered)\b"
+BOUNDARY_BEFORE = r"(?<![A-Za-z0-9+#.])(?<![A-Za-z0-9]-)"
+BOUNDARY_AFTER = rf"(?![A-Za-z0-9+#]|-(?!{HYPHEN_SUFFIXES})[A-Za-z0-9])"
+# Single Latin letters ("C", "R") are too ambiguous for free text; their synonyms ("C语言") still match
+MIN_LATIN_TERM_LENGTH = 2
+# Skills that are also everyday English words. In English text they only count
+# when capitalized ("Go", not "go"), and never when followed by a word that makes
+# them a verb ("Excel at ..."); next to Chinese ("会用excel") any case counts.
+AMBIGUOUS_TERMS = {
+    "go": {"to", "ahead", "back", "beyond", "live", "on", "through"},
+    "excel": {"at", "in", "as", "beyond"},
+}
+NEXT_WORD_PATTERN = re.compile(r"[ \t]*([A-Za-z]+)")
+END = ""
+
+
+def _term_key(term: str) -> str:
+    return SEPARATOR_PATTERN.sub("", term.strip().lower())
+
+
+def _is_latin(ch: str) -> bool:
+    return ch.isascii() and ch.isalnum()
+
+
+def _is_ambiguous_use(text: str, match: re.Match, key: str) -> bool:
+    """True when an ambiguous skill name is used as a plain word rather than the skill"""
+    stopwords = AMBIGUOUS_TERMS.get(key)
+    if stopwords is None:
+        return False
+    before = text[:match.start()].rstrip()[-1:]
+    after = text[match.end():].lstrip()[:1]
+    if match.group(0).islower() and not any("一" <= ch <= "鿿" for ch in before + after):
+        return True
+    next_word = NEXT_WORD_PATTERN.match(text, match.end())
+    return bool(next_word) and next_word.group(1).lower() in stopwords
+
+
+def _node_pattern(node: Dict[str, Any]) -> str:
+    branches = [
+        (SEPARATOR_REGEX if ch == " " else re.escape(ch)) + _node_pattern(child)
+        for ch, child in sorted(node.items())
+        if ch != END
+    ]
+    if not branches:
+        return node[END]
+    body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+    if END in node:
+        # Longer terms are tried first, so "JavaScript" wins over "Java"
+        return f"(?:{body}|{node[END]})" if node[END] else f"(?:{body})?"
+    return body
+
+
+def load_lexicon_entries(extra_path: str = "") -> Dict[str, List[str]]:
+    """Built-in lexicon merged with an optional JSON file of {"Canonical": ["synonym", ...]}"""
+    entries: Dict[str, List[str]] = json.loads(BUILTIN_LEXICON_PATH.read_text(encoding="utf-8"))
+    if extra_path:
+        try:
+            extra = json.loads(Path(extra_path).read_text(encoding="utf-8"))
+            for name, synonyms in extra.items():
+                entries[name] = entries.get(name, []) + list(synonyms or [])
+        except (OSError, ValueError, AttributeError) as e:
+            print(f"⚠️ Failed to load skill lexicon {extra_path}: {e}")
+    return entries
+
+
+class SkillLexicon:
+    """Canonical skill names plus a compiled matcher for all their spellings"""
+
+    def __init__(self, entries: Dict[str, List[str]]):
+        self.canonical: Dict[str, str] = {}
+        self.skill_count = len(entries)
+        # Compact ids in lexicon order, stored with precomputed job features
+        self.skill_ids: Dict[str, int] = {name.lower(): index for index, name in enumerate(entries)}
+        trie: Dict[str, Any] = {}
+        for name, synonyms in entries.items():
+            for term in [name, *synonyms]:
+                key = _term_key(term)
+                if not key or key in self.canonical:
+                    continue
+                self.canonical[key] = name
+                if key.isascii() and len(key) < MIN_LATIN_TERM_LENGTH:
+                    continue
+                spelled = SEPARATOR_PATTERN.sub(" ", term.strip().lower())
+                node = trie
+                for ch in spelled:
+                    node = node.setdefault(ch, {})
+                node[END] = BOUNDARY_AFTER if _is_latin(spelled[-1]) or spelled[-1] in "+#" else ""
+        self.term_count = len(self.canonical)
+        self.pattern = self._compile(trie)
+
+    @staticmethod
+    def _compile(trie: Dict[str, Any]) -> Optional[re.Pattern]:
+        latin = {ch: child for ch, child in trie.items() if _is_latin(ch)}
+        other = {ch: child for ch, child in trie.items() if not _is_latin(ch)}
+        parts = []
+        if latin:
+            parts.append(BOUNDARY_BEFORE + _node_pattern(latin))
+        if other:
+            parts.append(_node_pattern(other))
+        return re.compile("|".join(parts), re.IGNORECASE) if parts else None
+
+    def extract(self, text: str) -> List[str]:
+        """Canonical skills mentioned in the text, in order of first appearance"""
+        if not text or not self.pattern:
+            return []
+        found: Dict[str, None] = {}
+        for match in self.pattern.finditer(text):
+            key = _term_key(match.group(0))
+            name = self.canonical.get(key)
+            if name and not _is_ambiguous_use(text, match, key):
+                found.setdefault(name, None)
+        return list(found)
+
+    def normalize(self, skills: Any) -> List[str]:
+        """Map a skill list (from the model or a user) onto canonical names; unknown entries are kept as written"""
+        if isinstance(skills, str):
+            skills = [skills]
+        normalized: Dict[str, str] = {}
+        for skill in skills or []:
+            if not isinstance(skill, str) or not skill.strip():
+                continue
+            name = self.canonical.get(_term_key(skill), skill.strip())
+            normalized.setdefault(name.lower(), name)
+        return list(normalized.values())
+
+    def normalize_requirements(self, requirements: Any) -> Any:
+        """Copy of a job requirements dict with canonical skills"""
+        if not isinstance(requirements, dict) or not requirements.get("skills"):
+            return requirements
+        return {**requirements, "skills": self.normalize(requirements["skills"])}
+
+    def get_info(self) -> Dict[str, Any]:
+        return {
+            "skills": self.skill_count,
+            "terms": self.term_count,
+            "extra_path": settings.skill_lexicon_path or None,
+        }
+
+
+# Global instance
+skill_lexicon = SkillLexicon(load_lexicon_entries(settings.skill_lexicon_path))
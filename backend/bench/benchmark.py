@@ -0,0 +1,164 @@
+"""
+Offline parsing benchmark: drives /api/jobs/parse and /api/resumes/upload
+at several concurrency levels and reports throughput, p50/p95/p99 latency
+and LLM calls per item (read from the stand-in's /stats endpoint).
+
+    python -m bench.llm_standin --port 9100 &
+    OPENAI_BASE_URL=http://127.0.0.1:9100/v1 OPENAI_API_KEY=standin uvicorn app.main:app --port 8000 &
+    python -m bench.benchmark --api http://127.0.0.1:8000 --standin http://127.0.0.1:9100 --concurrency 1,4,16
+"""
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+import argparse
+import asyncio
+import json
+import time
+import uuid
+import httpx
+
+DEFAULT_CORPUS = Path(__file__).parent / "fixtures" / "corpus.jsonl"
+
+
+def load_corpus(path: str) -> Dict[str, List[str]]:
+    corpus: Dict[str, List[str]] = {"job": [], "resume": []}
+    for line in Path(path).read_text(encoding="utf-8").splitlines():
+        if not line.strip():
+            continue
+        entry = json.loads(line)
+        if entry.get("kind") in corpus and entry.get("input"):
+            corpus[entry["kind"]].append(entry["input"])
+    return corpus
+
+
+def percentile(sorted_values: List[float], fraction: float) -> Optional[float]:
+    if not sorted_values:
+        return None
+    return sorted_values[min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))]
+
+
+async def standin_calls(client: httpx.AsyncClient, standin: Optional[str]) -> Optional[int]:
+    if not standin:
+        return None
+    try:
+        response = await client.get(f"{standin.rstrip('/')}/stats")
+        return response.json()["calls"]
+    except (httpx.HTTPError, KeyError, ValueError):
+        return None
+
+
+async def parse_job(client: httpx.AsyncClient, api: str, text: str) -> bool:
+    response = await client.post(f"{api}/api/jobs/parse", json={"raw_content": text, "source_type": "benchmark"})
+    return response.status_code == 200
+
+
+async def upload_resume(client: httpx.AsyncClient, api: str, text: str) -> bool:
+    response = await client.post(
+        f"{api}/api/resumes/upload",
+        params={"user_id": "benchmark"},
+        files={"file": ("resume.txt", text.encode("utf-8"), "text/plain")}
+    )
+    return response.status_code == 200 and response.json().get("status") == "parsed"
+
+
+async def run_level(
+    client: httpx.AsyncClient,
+    args: argparse.Namespace,
+    kind: str,
+    texts: List[str],
+    concurrency: int
+) -> Dict[str, Any]:
+    # Unique suffixes keep the parse cache and request coalescing from hiding LLM cost
+    items = [
+        f"{texts[index % len(texts)]}\n\n#{uuid.uuid4().hex[:8]}" if args.unique else texts[index % len(texts)]
+        for index in range(args.requests)
+    ]
+    action = parse_job if kind == "job" else upload_resume
+    semaphore = asyncio.Semaphore(concurrency)
+    latencies: List[float] = []
+    failures = 0
+
+    async def one(text: str):
+        nonlocal failures
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                ok = await action(client, args.api.rstrip("/"), text)
+            except httpx.HTTPError:
+                ok = False
+            latencies.append(time.perf_counter() - started)
+            if not ok:
+                failures += 1
+
+    calls_before = await standin_calls(client, args.standin)
+    started = time.perf_counter()
+    await asyncio.gather(*(one(text) for text in items))
+    elapsed = time.perf_counter() - started
+    calls_after = await standin_calls(client, args.standin)
+
+    latencies.sort()
+    calls = calls_after - calls_before if calls_before is not None and calls_after is not None else None
+    return {
+        "kind": kind,
+        "concurrency": concurrency,
+        "items": len(items),
+        "failures": failures,
+        "seconds": round(elapsed, 3),
+        "throughput": round(len(items) / elapsed, 2) if elapsed else None,
+        "p50": round(percentile(latencies, 0.5), 3),
+        "p95": round(percentile(latencies, 0.95), 3),
+        "p99": round(percentile(latencies, 0.99), 3),
+        "llm_calls_per_item": round(calls / len(items), 2) if calls is not None else None,
+    }
+
+
+def print_table(rows: List[Dict[str, Any]]):
+    columns = ["kind", "concurrency", "items", "failures", "seconds", "throughput", "p50", "p95", "p99", "llm_calls_per_item"]
+    widths = {column: max(len(column), *(len(str(row[column])) for row in rows)) for column in columns}
+    print("  ".join(column.rjust(widths[column]) for column in columns))
+    for row in rows:
+        print("  ".join(str(row[column]).rjust(widths[column]) for column in columns))
+
+
+async def run(args: argparse.Namespace) -> List[Dict[str, Any]]:
+    corpus = load_corpus(args.corpus)
+    kinds = ["job", "resume"] if args.kind == "both" else [args.kind]
+    levels = [int(level) for level in args.concurrency.split(",") if level.strip()]
+    rows = []
+    limits = httpx.Limits(max_connections=max(levels) * 2, max_keepalive_connections=max(levels) * 2)
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as client:
+        for kind in kinds:
+            if not corpus[kind]:
+                print(f"⚠️ No {kind} fixtures in {args.corpus}, skipping")
+                continue
+            for concurrency in levels:
+                row = await run_level(client, args, kind, corpus[kind], concurrency)
+                print(f"✅ {kind} x{concurrency}: {row['throughput']} items/s, p95 {row['p95']}s")
+                rows.append(row)
+    return rows
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Benchmark job and resume parsing against a running API")
+    parser.add_argument("--api", default="http://127.0.0.1:8000", help="backend base URL")
+    parser.add_argument("--standin", default="http://127.0.0.1:9100", help="LLM stand-in base URL for call counts ('' to skip)")
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS))
+    parser.add_argument("--kind", choices=["job", "resume", "both"], default="both")
+    parser.add_argument("--concurrency", default="1,4,16", help="comma separated concurrency levels")
+    parser.add_argument("--requests", type=int, default=50, help="items per concurrency level")
+    parser.add_argument("--unique", action=argparse.BooleanOptionalAction, default=True, help="make every item unique to bypass caching")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    rows = asyncio.run(run(args))
+    if args.json:
+        print(json.dumps(rows, ensure_ascii=False, indent=2))
+    elif rows:
+        print_table(rows)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,324 @@
+"""
+Local OpenAI-compatible stand-in for LLM experiments without an API key.
+
+Replays completions from a fixture corpus (bench/fixtures/corpus.jsonl),
+supports function calling, response_format=json_object, plain text and
+streaming, and can inject latency, 5xx errors and 429s. With --record it
+proxies to a real provider and appends the answers to the corpus.
+
+    python -m bench.llm_standin --port 9100 --latency-ms 800 --rate-limit-rate 0.05
+
+Then point the backend at it:
+
+    OPENAI_BASE_URL=http://127.0.0.1:9100/v1 OPENAI_API_KEY=standin uvicorn app.main:app
+"""
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+from app.services.job_extractor import extract_job_fields_local, build_local_parse_result
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import re
+import time
+import uuid
+import httpx
+import uvicorn
+
+DEFAULT_CORPUS = Path(__file__).parent / "fixtures" / "corpus.jsonl"
+EMAIL_PATTERN = re.compile(r"[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Za-z]{2,}")
+PHONE_PATTERN = re.compile(r"1[3-9]\d{9}")
+# Fixture inputs are matched by a prefix of their whitespace-free text, so
+# prompts that trim or compact the tail of a posting still hit
+MATCH_PREFIX_CHARS = 60
+
+
+def _squash(text: str) -> str:
+    return re.sub(r"\s+", "", text or "")
+
+
+def _user_message(messages: List[Dict[str, Any]]) -> str:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return message.get("content") or ""
+    return ""
+
+
+def _request_key(body: Dict[str, Any]) -> str:
+    return hashlib.sha256(_squash(_user_message(body.get("messages", []))).encode("utf-8")).hexdigest()
+
+
+def _estimate_tokens(text: str) -> int:
+    cjk = sum(1 for ch in text if "一" <= ch <= "鿿")
+    return cjk + (len(text) - cjk) // 4
+
+
+class StandIn:
+    def __init__(self, args: argparse.Namespace):
+        self.args = args
+        self.corpus_path = Path(args.corpus)
+        self.fixtures: List[Dict[str, Any]] = []
+        self.recorded: Dict[str, Dict[str, Any]] = {}
+        self.stats: Dict[str, Any] = {}
+        self.reset_stats()
+        self.load_corpus()
+
+    def reset_stats(self):
+        self.stats = {
+            "calls": 0,
+            "by_mode": {"function": 0, "json": 0, "plain": 0},
+            "streamed": 0,
+            "fixture_hits": 0,
+            "fixture_misses": 0,
+            "injected_errors": 0,
+            "injected_rate_limits": 0,
+            "prompt_tokens": 0,
+            "completion_tokens": 0,
+        }
+
+    def load_corpus(self):
+        if not self.corpus_path.exists():
+            return
+        for line in self.corpus_path.read_text(encoding="utf-8").splitlines():
+            if not line.strip():
+                continue
+            entry = json.loads(line)
+            if entry.get("key"):
+                self.recorded[entry["key"]] = entry
+            else:
+                entry["_match"] = _squash(entry["input"])[:MATCH_PREFIX_CHARS]
+                self.fixtures.append(entry)
+        print(f"📼 Loaded {len(self.fixtures)} fixtures and {len(self.recorded)} recordings from {self.corpus_path}")
+
+    def lookup(self, body: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        recorded = self.recorded.get(_request_key(body))
+        if recorded:
+            return recorded["completion"]
+        prompt = _squash(_user_message(body.get("messages", [])))
+        for entry in self.fixtures:
+            if entry["_match"] and entry["_match"] in prompt:
+                return entry["completion"]
+        return None
+
+    def synthesize(self, body: Dict[str, Any]) -> Any:
+        """Answer unknown prompts from local rules so any posting or resume gets a plausible reply"""
+        prompt = _user_message(body.get("messages", []))
+        if "招聘信息" in prompt:
+            raw = prompt.split("原始内容：", 1)[-1]
+            result = build_local_parse_result(extract_job_fields_local(raw))
+            result.pop("parse_source", None)
+            result.pop("field_confidence", None)
+            return result
+        if "简历" in prompt:
+            email = EMAIL_PATTERN.search(prompt)
+            phone = PHONE_PATTERN.search(prompt)
+            return {
+                "name": None,
+                "email": email.group(0) if email else None,
+                "phone": phone.group(0) if phone else None,
+                "skills": [],
+                "education": [],
+                "experiences": [],
+                "keywords": [],
+            }
+        return "Hello from the LLM stand-in."
+
+    async def inject_faults(self) -> Optional[JSONResponse]:
+        args = self.args
+        delay = max(0.0, random.gauss(args.latency_ms, args.latency_jitter_ms)) / 1000
+        if args.stall_rate and random.random() < args.stall_rate:
+            delay += args.stall_ms / 1000
+        await asyncio.sleep(delay)
+        if args.rate_limit_rate and random.random() < args.rate_limit_rate:
+            self.stats["injected_rate_limits"] += 1
+            return JSONResponse(
+                status_code=429,
+                headers={"retry-after": str(args.retry_after)},
+                content={"error": {"message": "Rate limit reached (stand-in)", "type": "rate_limit_error", "code": "rate_limit_exceeded"}}
+            )
+        if args.error_rate and random.random() < args.error_rate:
+            self.stats["injected_errors"] += 1
+            return JSONResponse(
+                status_code=500,
+                content={"error": {"message": "Internal error (stand-in)", "type": "server_error", "code": None}}
+            )
+        return None
+
+    async def record(self, body: Dict[str, Any], mode: str) -> Any:
+        """Forward to the real provider and keep the parsed answer for later replays"""
+        async with httpx.AsyncClient(timeout=120) as client:
+            response = await client.post(
+                f"{self.args.upstream.rstrip('/')}/chat/completions",
+                headers={"Authorization": f"Bearer {self.args.upstream_key}"},
+                json={**body, "stream": False}
+            )
+        response.raise_for_status()
+        message = response.json()["choices"][0]["message"]
+        text = (message.get("function_call") or {}).get("arguments") if mode == "function" else message.get("content")
+        try:
+            completion = json.loads(re.sub(r"^```(?:json)?|```$", "", (text or "").strip()).strip())
+        except ValueError:
+            completion = text
+        key = _request_key(body)
+        entry = {"key": key, "completion": completion}
+        self.recorded[key] = entry
+        with self.corpus_path.open("a", encoding="utf-8") as corpus:
+            corpus.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        return completion
+
+
+def _mode_of(body: Dict[str, Any]) -> str:
+    if body.get("functions") or body.get("tools"):
+        return "function"
+    if (body.get("response_format") or {}).get("type") == "json_object":
+        return "json"
+    return "plain"
+
+
+def _render(completion: Any, mode: str) -> str:
+    if isinstance(completion, str):
+        return completion
+    text = json.dumps(completion, ensure_ascii=False)
+    # Plain-mode answers come fenced, like many chat models return them
+    return f"```json\n{text}\n```" if mode == "plain" else text
+
+
+def create_app(standin: StandIn) -> FastAPI:
+    app = FastAPI(title="LLM stand-in")
+    args = standin.args
+
+    @app.get("/v1/models")
+    async def list_models():
+        return {"object": "list", "data": [{"id": args.model, "object": "model", "owned_by": "standin"}]}
+
+    @app.get("/stats")
+    async def get_stats():
+        return standin.stats
+
+    @app.post("/stats/reset")
+    async def reset_stats():
+        standin.reset_stats()
+        return standin.stats
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        mode = _mode_of(body)
+        standin.stats["calls"] += 1
+        standin.stats["by_mode"][mode] += 1
+
+        if mode == "function" and args.no_function_calling:
+            return JSONResponse(status_code=400, content={"error": {"message": "functions not supported by this model", "type": "invalid_request_error"}})
+        if mode == "json" and args.no_json_mode:
+            return JSONResponse(status_code=400, content={"error": {"message": "response_format json_object not supported", "type": "invalid_request_error"}})
+
+        fault = await standin.inject_faults()
+        if fault is not None:
+            return fault
+
+        completion = standin.lookup(body)
+        if completion is not None:
+            standin.stats["fixture_hits"] += 1
+        elif args.record:
+            completion = await standin.record(body, mode)
+        else:
+            standin.stats["fixture_misses"] += 1
+            completion = standin.synthesize(body)
+
+        text = _render(completion, mode)
+        prompt_tokens = sum(_estimate_tokens(m.get("content") or "") for m in body.get("messages", []))
+        completion_tokens = _estimate_tokens(text)
+        standin.stats["prompt_tokens"] += prompt_tokens
+        standin.stats["completion_tokens"] += completion_tokens
+        function_name = ((body.get("function_call") or {}).get("name")
+                         or ((body.get("functions") or [{}])[0]).get("name"))
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:24]}"
+        created = int(time.time())
+
+        if body.get("stream"):
+            standin.stats["streamed"] += 1
+            return StreamingResponse(
+                _stream_chunks(text, mode, function_name, completion_id, created, body.get("model", args.model), args.chunk_delay_ms),
+                media_type="text/event-stream"
+            )
+
+        if mode == "function":
+            message = {"role": "assistant", "content": None, "function_call": {"name": function_name, "arguments": text}}
+            finish_reason = "function_call"
+        else:
+            message = {"role": "assistant", "content": text}
+            finish_reason = "stop"
+        return {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": created,
+            "model": body.get("model", args.model),
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": {
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "total_tokens": prompt_tokens + completion_tokens,
+            },
+        }
+
+    return app
+
+
+async def _stream_chunks(text: str, mode: str, function_name: Optional[str], completion_id: str, created: int, model: str, chunk_delay_ms: float):
+    def chunk(delta: Dict[str, Any], finish_reason: Optional[str] = None) -> str:
+        payload = {
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": created,
+            "model": model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }
+        return f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+
+    if mode == "function":
+        yield chunk({"role": "assistant", "function_call": {"name": function_name, "arguments": ""}})
+    else:
+        yield chunk({"role": "assistant", "content": ""})
+    for start in range(0, len(text), 16):
+        piece = text[start:start + 16]
+        await asyncio.sleep(chunk_delay_ms / 1000)
+        if mode == "function":
+            yield chunk({"function_call": {"arguments": piece}})
+        else:
+            yield chunk({"content": piece})
+    yield chunk({}, "function_call" if mode == "function" else "stop")
+    yield "data: [DONE]\n\n"
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="OpenAI-compatible LLM stand-in with record/replay and fault injection")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--corpus", default=str(DEFAULT_CORPUS), help="fixture corpus (JSONL)")
+    parser.add_argument("--model", default="standin-model")
+    parser.add_argument("--latency-ms", type=float, default=300.0, help="mean injected latency")
+    parser.add_argument("--latency-jitter-ms", type=float, default=100.0, help="standard deviation of the latency")
+    parser.add_argument("--stall-rate", type=float, default=0.0, help="share of calls that stall")
+    parser.add_argument("--stall-ms", type=float, default=20000.0, help="extra latency of a stalled call")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of calls answered with HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="share of calls answered with HTTP 429")
+    parser.add_argument("--retry-after", type=float, default=1.0, help="Retry-After seconds sent with 429s")
+    parser.add_argument("--chunk-delay-ms", type=float, default=20.0, help="delay between streamed chunks")
+    parser.add_argument("--no-function-calling", action="store_true", help="reject function calling with HTTP 400")
+    parser.add_argument("--no-json-mode", action="store_true", help="reject response_format=json_object with HTTP 400")
+    parser.add_argument("--record", action="store_true", help="proxy unknown prompts upstream and append them to the corpus")
+    parser.add_argument("--upstream", default="https://api.openai.com/v1", help="provider base URL used with --record")
+    parser.add_argument("--upstream-key", default="", help="provider API key used with --record")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    args = parse_args(argv)
+    uvicorn.run(create_app(StandIn(args)), host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
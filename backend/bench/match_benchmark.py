@@ -0,0 +1,126 @@
+"""
+Offline matching benchmark: builds a synthetic set of active jobs in memory
+and times the full scan (LLMService.match_resume_to_jobs), the inverted
+index and the vectorized engine on the same resumes, checking that all three
+rank jobs identically.
+
+    python -m bench.match_benchmark --jobs 50000 --resumes 200 --top-n 10
+"""
+from typing import Dict, Any, List, Optional
+import argparse
+import json
+import random
+import time
+
+from app.services.llm_service import llm_service
+from app.services.match_index import MatchIndex
+from app.services.match_features import build_job_features
+from app.services.match_engine import VectorMatchEngine
+from app.services.skill_lexicon import skill_lexicon
+
+CITIES = ["北京", "上海", "广州", "深圳", "杭州", "成都", "武汉", "南京", None]
+TITLE_WORDS = ["后端", "前端", "算法", "数据", "产品", "运营", "测试", "开发", "工程师", "实习生", "经理", "分析师"]
+
+
+def build_jobs(count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    skills = sorted(set(skill_lexicon.canonical.values()))
+    return [
+        {
+            "id": job_id,
+            "title": "".join(rng.sample(TITLE_WORDS, 2)) + rng.choice(["工程师", "实习生", "专员"]),
+            "requirements": {"skills": rng.sample(skills, rng.randint(0, 6)), "location": rng.choice(CITIES)},
+        }
+        for job_id in range(1, count + 1)
+    ]
+
+
+def build_resumes(count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    skills = sorted(set(skill_lexicon.canonical.values()))
+    return [
+        {
+            "skills": rng.sample(skills, rng.randint(2, 10)),
+            "keywords": rng.sample(TITLE_WORDS, 2) + [rng.choice(CITIES[:-1])],
+        }
+        for _ in range(count)
+    ]
+
+
+def ranking(results: List[Dict[str, Any]]) -> List[tuple]:
+    return [(item["job_id"], item["score"]) for item in results]
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    jobs = build_jobs(args.jobs, rng)
+    resumes = build_resumes(args.resumes, rng)
+
+    index = MatchIndex()
+    started = time.perf_counter()
+    for job in jobs:
+        index._add(job["id"], build_job_features(job["title"], job["requirements"]))
+    index.loaded = True
+    index_build = time.perf_counter() - started
+
+    vector = VectorMatchEngine(index)
+    vector_build = None
+    if not vector.available:
+        print("⚠️ NumPy is not installed, skipping the vector engine")
+        vector = None
+    else:
+        started = time.perf_counter()
+        vector._ensure_built()
+        vector_build = time.perf_counter() - started
+
+    engines = {"index": index.match}
+    if vector:
+        engines["vector"] = vector.match
+    if args.scan:
+        engines["scan"] = lambda resume, top_n, location: llm_service.match_resume_to_jobs(resume, jobs, top_n)
+    timings: Dict[str, List[float]] = {name: [] for name in engines}
+    mismatches = 0
+    for resume in resumes:
+        rankings = {}
+        for name, match in engines.items():
+            started = time.perf_counter()
+            rankings[name] = ranking(match(resume, args.top_n, None))
+            timings[name].append(time.perf_counter() - started)
+        if len({json.dumps(value) for value in rankings.values()}) > 1:
+            mismatches += 1
+
+    def summary(values: List[float]) -> Dict[str, float]:
+        values = sorted(values)
+        return {
+            "mean_ms": round(sum(values) / len(values) * 1000, 3),
+            "p95_ms": round(values[min(len(values) - 1, int(0.95 * (len(values) - 1)))] * 1000, 3),
+        }
+
+    return {
+        "jobs": args.jobs,
+        "resumes": args.resumes,
+        "top_n": args.top_n,
+        "build_seconds": {
+            "index": round(index_build, 3),
+            "vector": round(vector_build, 3) if vector_build is not None else None,
+        },
+        "engines": {name: summary(values) for name, values in timings.items()},
+        "mismatches": mismatches,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Compare match scoring engines on synthetic jobs")
+    parser.add_argument("--jobs", type=int, default=50000)
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--top-n", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--scan", action=argparse.BooleanOptionalAction, default=True, help="also time the full per-job scan")
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    result = run(parse_args(argv))
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
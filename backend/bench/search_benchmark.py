@@ -0,0 +1,132 @@
+"""
+Full-text job search benchmark: writes a synthetic job table and its FTS5
+index into a temporary SQLite database and times /api/jobs/search queries
+(BM25 ranking, optional status and city filters, first page) for a mix of
+Chinese, English and mixed queries.
+
+    python -m bench.search_benchmark --jobs 100000 --repeat 20
+"""
+from typing import Dict, Any, List, Optional
+import argparse
+import asyncio
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+
+from sqlalchemy import select, insert
+from sqlalchemy.ext.asyncio import create_async_engine
+
+from app.database import Base
+from app.models import Job, JobMatchFeatures
+from app.services.job_search import JobSearchIndex
+from app.services.job_facets import facet_conditions
+from app.services.match_features import build_job_features, FEATURE_VERSION
+
+TITLE_WORDS = ["后端", "前端", "算法", "数据", "产品", "运营", "测试", "开发", "嵌入式", "客户端", "安全", "运维"]
+COMPANIES = ["字节跳动", "腾讯", "阿里巴巴", "美团", "京东", "百度", "网易", "小米", "快手", "拼多多"]
+SKILLS = ["Python", "Java", "Go", "C++", "SQL", "React", "Vue", "Kubernetes", "Docker", "Spark", "PyTorch", "Redis"]
+CITIES = ["北京", "上海", "广州", "深圳", "杭州", "成都"]
+FILLER = ["负责核心业务系统的设计与开发", "参与需求评审和技术方案讨论", "有良好的沟通能力和团队合作精神",
+          "优先考虑有相关实习经历者", "提供有竞争力的薪资和导师制培养", "熟悉常用数据结构与算法", "能保证每周实习四天以上"]
+QUERIES = [
+    ({"q": "后端"}, {}),
+    ({"q": "Python"}, {}),
+    ({"q": "数据 实习"}, {}),
+    ({"q": "算法工程师 PyTorch"}, {}),
+    ({"q": "字节跳动 前端"}, {"status": "active"}),
+    ({"q": "后端"}, {"status": "active", "city": "北京"}),
+    ({"q": "Kubernetes 运维"}, {"city": "上海"}),
+    ({"q": "导师制"}, {}),
+]
+
+
+def build_jobs(count: int, rng: random.Random) -> List[Dict[str, Any]]:
+    jobs = []
+    for job_id in range(1, count + 1):
+        skills = rng.sample(SKILLS, rng.randint(1, 4))
+        jobs.append({
+            "id": job_id,
+            "title": "".join(rng.sample(TITLE_WORDS, 2)) + rng.choice(["工程师", "实习生", "专员"]),
+            "company_name": rng.choice(COMPANIES),
+            "industry_name": "互联网",
+            "status": "active" if rng.random() < 0.8 else "inactive",
+            "requirements": {"skills": skills, "location": rng.choice(CITIES), "salary": f"{rng.randint(8, 30)}k-{rng.randint(31, 50)}k"},
+            "raw_content": "，".join(rng.sample(FILLER, 3) + [f"熟悉{skill}" for skill in skills]),
+        })
+    return jobs
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    jobs = build_jobs(args.jobs, rng)
+    with tempfile.TemporaryDirectory() as directory:
+        engine = create_async_engine(f"sqlite+aiosqlite:///{Path(directory) / 'search.db'}")
+        search = JobSearchIndex()
+        started = time.perf_counter()
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all)
+            await conn.execute(insert(Job), jobs)
+            await conn.execute(insert(JobMatchFeatures), [
+                {
+                    "job_id": job["id"],
+                    "is_active": job["status"] == "active",
+                    "feature_version": FEATURE_VERSION,
+                    **build_job_features(job["title"], job["requirements"]),
+                }
+                for job in jobs
+            ])
+            await search.ensure_table(conn)
+        index_seconds = search.sync_seconds
+        load_seconds = time.perf_counter() - started
+
+        results = []
+        async with engine.connect() as conn:
+            for params, filters in QUERIES:
+                query = select(Job.id)
+                if filters.get("status"):
+                    query = query.where(Job.status == filters["status"])
+                conditions = facet_conditions({key: value for key, value in filters.items() if key != "status"})
+                if conditions:
+                    query = query.join(JobMatchFeatures, JobMatchFeatures.job_id == Job.id).where(*conditions)
+                query = search.apply(query, params["q"]).limit(args.limit)
+                timings = []
+                for _ in range(args.repeat):
+                    started = time.perf_counter()
+                    rows = (await conn.execute(query)).all()
+                    timings.append(time.perf_counter() - started)
+                timings.sort()
+                results.append({
+                    "query": params["q"],
+                    "filters": filters,
+                    "hits": len(rows),
+                    "median_ms": round(timings[len(timings) // 2] * 1000, 2),
+                    "max_ms": round(timings[-1] * 1000, 2),
+                })
+        await engine.dispose()
+    return {
+        "jobs": args.jobs,
+        "load_seconds": round(load_seconds, 2),
+        "index_seconds": index_seconds,
+        "limit": args.limit,
+        "queries": results,
+    }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Time FTS5 job search with BM25 ranking and filters on synthetic jobs")
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--limit", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    result = asyncio.run(run(parse_args(argv)))
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,137 @@
+"""
+Offline semantic matching benchmark: builds a synthetic job corpus whose
+postings spell skills with lexicon synonyms, fits and writes a semantic index
+in a temporary directory and reports build time, query latency of the IVF
+search against an exact scan, ANN recall and how often the job a resume was
+derived from is retrieved.
+
+    python -m bench.semantic_benchmark --jobs 100000 --resumes 200
+"""
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Any, List, Optional
+import argparse
+import json
+import random
+import tempfile
+import time
+
+import numpy as np
+
+from app.config import settings
+from app.services.semantic_index import SemanticIndex, MIN_IVF_JOBS, resume_text
+from app.services.skill_lexicon import load_lexicon_entries
+
+TITLE_WORDS = ["后端", "前端", "算法", "数据", "产品", "运营", "测试", "开发", "工程师", "实习生", "经理", "分析师"]
+CITIES = ["北京", "上海", "广州", "深圳", "杭州", "成都"]
+FILLER = ["负责核心业务系统的设计与开发", "参与需求评审和技术方案讨论", "有良好的沟通能力和团队合作精神",
+          "优先考虑有相关实习经历者", "工作地点可协商", "提供有竞争力的薪资和导师制培养"]
+
+
+def spell(name: str, synonyms: Dict[str, List[str]], rng: random.Random) -> str:
+    return rng.choice([name, *synonyms.get(name, [])])
+
+
+def build_jobs(count: int, synonyms: Dict[str, List[str]], rng: random.Random) -> List[Dict[str, Any]]:
+    names = sorted(synonyms)
+    jobs = []
+    for job_id in range(1, count + 1):
+        skills = rng.sample(names, rng.randint(2, 6))
+        jobs.append({
+            "id": job_id,
+            "title": "".join(rng.sample(TITLE_WORDS, 2)) + rng.choice(["工程师", "实习生", "专员"]),
+            "requirements": {"skills": skills, "location": rng.choice(CITIES)},
+            "raw_content": "，".join(rng.sample(FILLER, 3) + [f"熟悉{spell(skill, synonyms, rng)}" for skill in skills]),
+        })
+    return jobs
+
+
+def build_resumes(count: int, jobs: List[Dict[str, Any]], synonyms: Dict[str, List[str]], rng: random.Random) -> List[Dict[str, Any]]:
+    """Resumes written from a random job with other spellings of its skills; the job is the expected hit"""
+    resumes = []
+    for job in rng.sample(jobs, count):
+        resumes.append({
+            "target": job["id"],
+            "fields": {
+                "skills": [spell(skill, synonyms, rng) for skill in job["requirements"]["skills"]],
+                "keywords": [job["title"][:2], job["requirements"]["location"]],
+            },
+        })
+    return resumes
+
+
+def run(args: argparse.Namespace) -> Dict[str, Any]:
+    rng = random.Random(args.seed)
+    synonyms = load_lexicon_entries()
+    jobs = build_jobs(args.jobs, synonyms, rng)
+    resumes = build_resumes(args.resumes, jobs, synonyms, rng)
+
+    with tempfile.TemporaryDirectory() as directory:
+        settings.semantic_nprobe = args.nprobe
+        index = SemanticIndex()
+        index.directory = Path(directory)
+        started = time.perf_counter()
+        index._build_files(
+            [(job["id"], job["title"], job["requirements"], job["raw_content"]) for job in jobs],
+            datetime.utcnow()
+        )
+        build_seconds = time.perf_counter() - started
+
+        timings = {"ivf": [], "exact": []}
+        recall = []
+        target_hits = {"ivf": 0, "exact": 0}
+        for resume in resumes:
+            query = index.model.embed(resume_text(resume["fields"]))
+            started = time.perf_counter()
+            approximate = index.search(query, args.top_k)
+            timings["ivf"].append(time.perf_counter() - started)
+
+            started = time.perf_counter()
+            rows = np.flatnonzero(index.active)
+            similarities = np.asarray(index.vectors[rows]) @ query
+            exact = index.row_job[rows[np.argsort(-similarities, kind="stable")[:args.top_k]]].tolist()
+            timings["exact"].append(time.perf_counter() - started)
+
+            found = {job_id for job_id, _ in approximate}
+            recall.append(len(found & set(exact)) / max(1, len(exact)))
+            target_hits["ivf"] += resume["target"] in found
+            target_hits["exact"] += resume["target"] in exact
+
+        def summary(values: List[float]) -> Dict[str, float]:
+            values = sorted(values)
+            return {
+                "mean_ms": round(sum(values) / len(values) * 1000, 3),
+                "p95_ms": round(values[min(len(values) - 1, int(0.95 * (len(values) - 1)))] * 1000, 3),
+            }
+
+        return {
+            "jobs": args.jobs,
+            "resumes": args.resumes,
+            "top_k": args.top_k,
+            "dimensions": index.model.dimensions,
+            "lists": index.meta.get("lists", 0),
+            "nprobe": args.nprobe if args.jobs >= MIN_IVF_JOBS else None,
+            "build_seconds": round(build_seconds, 3),
+            "search": {name: summary(values) for name, values in timings.items()},
+            "ann_recall": round(sum(recall) / len(recall), 4),
+            "target_in_top_k": {name: round(hits / len(resumes), 4) for name, hits in target_hits.items()},
+        }
+
+
+def parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Build a semantic index over synthetic jobs and measure ANN recall and latency")
+    parser.add_argument("--jobs", type=int, default=100000)
+    parser.add_argument("--resumes", type=int, default=200)
+    parser.add_argument("--top-k", type=int, default=200)
+    parser.add_argument("--nprobe", type=int, default=settings.semantic_nprobe)
+    parser.add_argument("--seed", type=int, default=7)
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None):
+    result = run(parse_args(argv))
+    print(json.dumps(result, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+import json
+
+from fastapi.testclient import TestClient
+
+from bench.benchmark import load_corpus, percentile
+from bench.llm_standin import DEFAULT_CORPUS, StandIn, create_app, parse_args
+
+FUNCTIONS = [{"name": "extract_job_info", "parameters": {"type": "object"}}]
+
+
+def standin_client(*flags):
+    args = parse_args(["--latency-ms", "0", "--latency-jitter-ms", "0", "--chunk-delay-ms", "0", *flags])
+    standin = StandIn(args)
+    return standin, TestClient(create_app(standin))
+
+
+def job_input():
+    return load_corpus(str(DEFAULT_CORPUS))["job"][0]
+
+
+def chat(client, prompt, **body):
+    return client.post("/v1/chat/completions", json={"model": "m", "messages": [{"role": "user", "content": prompt}], **body})
+
+
+def test_fixture_is_replayed_as_a_function_call():
+    standin, client = standin_client()
+    # The prompt wraps the posting, and only its prefix has to match
+    prompt = f"请从以下招聘信息中提取字段。\n原始内容：{job_input()[:80]}"
+    response = chat(client, prompt, functions=FUNCTIONS, function_call={"name": "extract_job_info"})
+
+    assert response.status_code == 200
+    message = response.json()["choices"][0]["message"]
+    assert message["function_call"]["name"] == "extract_job_info"
+    assert json.loads(message["function_call"]["arguments"])["title"] == "后端开发工程师（2026届校招）"
+    assert standin.stats["fixture_hits"] == 1
+    assert standin.stats["by_mode"]["function"] == 1
+
+
+def test_unknown_postings_are_answered_from_local_rules():
+    standin, client = standin_client()
+    prompt = "请解析这条招聘信息。\n原始内容：岗位：数据分析师\n公司名称：某某银行\n投递邮箱：hr@bank.example.com"
+    response = chat(client, prompt, response_format={"type": "json_object"})
+
+    answer = json.loads(response.json()["choices"][0]["message"]["content"])
+    assert answer["title"] == "数据分析师"
+    assert standin.stats["fixture_misses"] == 1
+
+
+def test_streamed_answer_reassembles_to_the_plain_text():
+    _, client = standin_client()
+    response = chat(client, "你好", stream=True)
+
+    lines = [line[len("data: "):] for line in response.text.splitlines() if line.startswith("data: ")]
+    assert lines[-1] == "[DONE]"
+    text = "".join(json.loads(line)["choices"][0]["delta"].get("content") or "" for line in lines[:-1])
+    assert text == "Hello from the LLM stand-in."
+
+
+def test_faults_and_capability_rejections_are_injected():
+    standin, client = standin_client("--rate-limit-rate", "1", "--retry-after", "2", "--no-json-mode")
+    throttled = chat(client, "你好")
+    assert throttled.status_code == 429
+    assert throttled.headers["retry-after"] == "2.0"
+    assert chat(client, "你好", response_format={"type": "json_object"}).status_code == 400
+    assert standin.stats["injected_rate_limits"] == 1
+
+    assert client.post("/stats/reset").json()["calls"] == 0
+
+
+def test_percentile_picks_the_nearest_rank():
+    values = [0.1 * index for index in range(1, 11)]
+    assert percentile([], 0.5) is None
+    assert percentile(values, 0.5) == values[4]
+    assert percentile(values, 0.99) == values[-1]
+    assert percentile(values, 0) == values[0]
@@ -0,0 +1,49 @@
+import time
+
+from app.services import bulk_match
+from app.services.bulk_match import BulkMatchRunner, BulkMatchTask
+from app.services.match_cache import filters_key
+
+
+def test_task_keeps_every_match_filter():
+    filters = {"location": "北京", "city": "北京", "salary_min": 10000, "education_max": "本科", "experience_band": ""}
+    task = BulkMatchTask(None, 5, filters)
+    assert task.location == "北京"
+    assert task.filters == {"location": "北京", "city": "北京", "salary_min": 10000, "education_max": "本科"}
+    # Stored under the same key /api/ai/match computes for the request's filters
+    assert filters_key(task.filters) == filters_key(filters)
+    assert task.to_dict()["filters"] == task.filters
+
+
+def finished_task(runner: BulkMatchRunner, age: float) -> BulkMatchTask:
+    task = BulkMatchTask(None, 3)
+    task.status = "completed"
+    task.finished = time.perf_counter() - age
+    runner.tasks[task.id] = task
+    return task
+
+
+def test_finished_tasks_expire_after_ttl(monkeypatch):
+    monkeypatch.setattr(bulk_match.settings, "bulk_match_task_ttl_seconds", 60)
+    monkeypatch.setattr(bulk_match.settings, "bulk_match_max_tasks", 100)
+    runner = BulkMatchRunner()
+    old = finished_task(runner, 120)
+    recent = finished_task(runner, 5)
+    running = BulkMatchTask(None, 3)
+    runner.tasks[running.id] = running
+    assert runner.get(old.id) is None
+    assert {task.id for task in runner.list()} == {recent.id, running.id}
+
+
+def test_oldest_finished_tasks_are_dropped_beyond_the_cap(monkeypatch):
+    monkeypatch.setattr(bulk_match.settings, "bulk_match_task_ttl_seconds", 3600)
+    monkeypatch.setattr(bulk_match.settings, "bulk_match_max_tasks", 2)
+    runner = BulkMatchRunner()
+    running = BulkMatchTask(None, 3)
+    runner.tasks[running.id] = running
+    oldest = finished_task(runner, 30)
+    newest = finished_task(runner, 10)
+    runner.prune()
+    # Running tasks are never dropped
+    assert set(runner.tasks) == {running.id, newest.id}
+    assert oldest.id not in runner.tasks
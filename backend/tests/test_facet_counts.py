@@ -0,0 +1,65 @@
+import asyncio
+
+from app.services import facet_counts as facet_module
+from app.services.facet_counts import FacetCounts
+
+
+def counting(cache: FacetCounts, on_count=None):
+    calls = []
+
+    async def count(db, job_ids):
+        calls.append(1)
+        if on_count:
+            on_count()
+        return {"total": len(calls)}
+
+    cache._count = count
+    return calls
+
+
+def test_results_are_cached_per_filter_combination():
+    cache = FacetCounts()
+    calls = counting(cache)
+
+    async def scenario():
+        first = await cache.get(None, {"status": "active", "city": None}, lambda excluded: None)
+        again = await cache.get(None, {"status": "active", "city": ""}, lambda excluded: None)
+        other = await cache.get(None, {"status": "inactive"}, lambda excluded: None)
+        return first, again, other
+
+    first, again, other = asyncio.run(scenario())
+    assert first is again
+    assert other["total"] == 2
+    assert len(calls) == 2
+
+
+def test_invalidate_drops_cached_counts():
+    cache = FacetCounts()
+    calls = counting(cache)
+    asyncio.run(cache.get(None, {}, lambda excluded: None))
+    cache.invalidate()
+    asyncio.run(cache.get(None, {}, lambda excluded: None))
+    assert len(calls) == 2
+
+
+def test_counts_computed_across_a_write_are_not_stored():
+    cache = FacetCounts()
+    # A job write lands while the counts are being computed
+    calls = counting(cache, on_count=lambda: cache.invalidate() if len(calls) == 1 else None)
+    asyncio.run(cache.get(None, {}, lambda excluded: None))
+    assert not cache.entries
+    asyncio.run(cache.get(None, {}, lambda excluded: None))
+    assert len(calls) == 2 and len(cache.entries) == 1
+
+
+def test_least_recently_used_entries_are_evicted(monkeypatch):
+    monkeypatch.setattr(facet_module.settings, "facet_cache_max_entries", 2)
+    cache = FacetCounts()
+    counting(cache)
+
+    async def scenario():
+        for status in ("a", "b", "a", "c"):
+            await cache.get(None, {"status": status}, lambda excluded: None)
+
+    asyncio.run(scenario())
+    assert list(cache.entries) == [(("status", "a"),), (("status", "c"),)]
@@ -0,0 +1,17 @@
+from app.services.incremental_match import merge_top_n
+
+
+def item(job_id, score):
+    return {"job_id": job_id, "score": score}
+
+
+def test_merge_keeps_the_best_top_n_with_job_id_ties():
+    stored = [item(1, 90), item(4, 70), item(2, 60)]
+    added = [item(7, 80), item(3, 60), item(9, 10)]
+    merged = merge_top_n(stored, added, 4)
+    assert [entry["job_id"] for entry in merged] == [1, 7, 4, 2]
+
+
+def test_rescored_job_replaces_its_stored_entry():
+    merged = merge_top_n([item(1, 50), item(2, 40)], [item(2, 95)], 3)
+    assert merged == [item(2, 95), item(1, 50)]
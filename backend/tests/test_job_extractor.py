@@ -0,0 +1,69 @@
+import pytest
+
+from app.config import settings
+from app.services.job_extractor import (
+    _clean,
+    extract_job_fields_local,
+    fast_path_confidence,
+    build_local_parse_result,
+)
+
+
+@pytest.mark.parametrize("raw, expected", [
+    ("后端开发工程师（校招）", "后端开发工程师（校招）"),
+    ("产品经理(实习)", "产品经理(实习)"),
+    ("【腾讯】", "腾讯"),
+    ("（北京）", "北京"),
+    ("：算法工程师 |", "算法工程师"),
+    ("测试开发工程师）", "测试开发工程师"),
+    ("【后端开发", "后端开发"),
+    ("（校招）后端开发（北京）", "（校招）后端开发（北京）"),
+    ("【【字节跳动】】", "字节跳动"),
+])
+def test_clean_keeps_balanced_brackets(raw, expected):
+    assert _clean(raw) == expected
+
+
+@pytest.mark.parametrize("title", ["后端开发工程师（校招）", "产品经理(实习)", "前端开发工程师（2026届校招）"])
+def test_fast_path_keeps_parenthetical_title_suffix(title):
+    raw = f"岗位：{title}\n公司名称：某某科技有限公司\n工作地点：北京\n简历投递邮箱：hr@example.com"
+    extraction = extract_job_fields_local(raw)
+    assert fast_path_confidence(extraction) >= settings.job_fast_path_threshold
+    result = build_local_parse_result(extraction)
+    assert result["title"] == title
+    assert result["company_name"] == "某某科技有限公司"
+    assert result["apply_email"] == "hr@example.com"
+
+
+def test_bracket_heading_company_is_unwrapped():
+    extraction = extract_job_fields_local("【字节跳动】后端开发实习生\n投递邮箱：campus@bytedance.com")
+    assert extraction["fields"]["company_name"] == "字节跳动"
+    assert extraction["fields"]["title"] == "后端开发实习生"
+
+
+def test_empty_company_label_does_not_take_the_next_line():
+    extraction = extract_job_fields_local("岗位：后端开发工程师\n公司：\n工作地点：北京\n投递邮箱：hr@example.com")
+    assert extraction["fields"]["company_name"] != "工作地点：北京"
+    assert extraction["confidence"]["company_name"] < 0.9
+    assert fast_path_confidence(extraction) < settings.job_fast_path_threshold
+
+
+def test_empty_title_label_does_not_take_the_next_line():
+    extraction = extract_job_fields_local("岗位：\n单位名称：某某科技有限公司\n投递邮箱：hr@example.com")
+    assert extraction["fields"]["title"] is None
+
+
+@pytest.mark.parametrize("raw, industry, code", [
+    ("岗位：柜员\n公司名称：招商银行股份有限公司\n投递邮箱：hr@cmbchina.com", "金融", "finance"),
+    ("岗位：后端开发工程师\n公司名称：某某科技有限公司\n投递邮箱：hr@example.com", "互联网/科技", "internet"),
+    ("岗位：数学教师\n单位名称：北京市第一中学\n负责初中数学课程教学\n投递邮箱：hr@example.com", "教育", "education"),
+])
+def test_fast_path_fills_industry_like_the_llm_path(raw, industry, code):
+    result = build_local_parse_result(extract_job_fields_local(raw))
+    assert (result["suggested_industry"], result["suggested_industry_code"]) == (industry, code)
+
+
+def test_unknown_industry_stays_empty():
+    result = build_local_parse_result(extract_job_fields_local("岗位：助理\n公司名称：某某有限公司\n投递邮箱：hr@example.com"))
+    assert result["suggested_industry"] is None
+    assert result["suggested_industry_code"] is None
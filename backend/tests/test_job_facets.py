@@ -0,0 +1,56 @@
+import pytest
+
+from app.services.job_facets import (
+    facet_conditions,
+    location_code,
+    parse_education_level,
+    parse_experience_band,
+    parse_salary,
+)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("15k-25k·14薪", (15000, 25000, "month")),
+    ("15-25k", (15000, 25000, "month")),
+    ("1.5-2万", (15000, 20000, "month")),
+    ("200-300/天", (200, 300, "day")),
+    ("30-50万/年", (300000, 500000, "year")),
+    ("8000元/月", (8000, 8000, "month")),
+    ("面议", (None, None, None)),
+    (None, (None, None, None)),
+])
+def test_parse_salary(text, expected):
+    assert parse_salary(text) == expected
+
+
+def test_education_and_experience_ordinals():
+    assert parse_education_level("本科及以上，硕士优先") == 3
+    assert parse_education_level("学历不限") == 0
+    assert parse_education_level("") is None
+    assert parse_experience_band("应届生") == 0
+    assert parse_experience_band("3-5年经验") == 2
+    assert parse_experience_band("10年以上") == 4
+    assert parse_experience_band("有相关经验") is None
+
+
+def test_location_code():
+    assert location_code("北京市海淀区") == "北京"
+    assert location_code(" Remote ") == "remote"
+    assert location_code(None) is None
+
+
+def test_facet_conditions():
+    assert facet_conditions(None) == []
+    # A bare salary bound compares monthly pay: period + overlap condition
+    assert len(facet_conditions({"salary_min": 10000})) == 2
+    assert len(facet_conditions({"city": "上海", "education_max": "本科", "experience_band": "3-5年"})) == 3
+
+
+@pytest.mark.parametrize("filters", [
+    {"salary_period": "week"},
+    {"salary_min": "lots"},
+    {"education_level": "幼儿园"},
+])
+def test_facet_conditions_reject_unusable_values(filters):
+    with pytest.raises(ValueError):
+        facet_conditions(filters)
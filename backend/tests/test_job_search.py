@@ -0,0 +1,145 @@
+import asyncio
+import sqlite3
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.main import app
+from app.models import CartItem, Delivery, Job, Tag, job_tags
+from app.services.job_search import SEARCH_TABLE, job_search, match_expression, search_document, segment
+
+
+@pytest.fixture
+def search_db():
+    connection = sqlite3.connect(":memory:")
+    connection.execute(
+        f"CREATE VIRTUAL TABLE {SEARCH_TABLE} USING fts5(title, company, body, tokenize='unicode61 remove_diacritics 2')"
+    )
+    jobs = [
+        Job(id=1, title="Python后端开发工程师", company_name="字节跳动", industry_name="互联网",
+            requirements={"skills": ["Python", "Redis"]}, raw_content="负责抖音服务端开发"),
+        Job(id=2, title="Java开发实习生", company_name="阿里巴巴", industry_name="互联网",
+            requirements={"skills": ["Java"]}, raw_content="参与淘宝交易系统建设，base 杭州"),
+        Job(id=3, title="前端工程师", company_name="腾讯", industry_name="互联网",
+            requirements={"skills": ["React"]}, raw_content="熟悉 JavaScript，北京"),
+    ]
+    connection.executemany(
+        f"INSERT INTO {SEARCH_TABLE} (rowid, title, company, body) VALUES (:id, :title, :company, :body)",
+        [{"id": job.id, **search_document(job)} for job in jobs],
+    )
+    yield connection
+    connection.close()
+
+
+def search(connection, query):
+    expression = match_expression(query)
+    rows = connection.execute(
+        f"SELECT rowid FROM {SEARCH_TABLE} WHERE {SEARCH_TABLE} MATCH ? ORDER BY rowid", (expression,)
+    ).fetchall()
+    return [row[0] for row in rows]
+
+
+def test_segment_turns_cjk_runs_into_bigrams():
+    assert segment("Python后端开发").split() == ["Python", "后端", "端开", "开发", "发"]
+    assert segment("") == ""
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Python后端", '"python" AND "后端"'),
+    ("Java开发 北京", '"java" AND "开发" AND "北京"'),
+    ("后端开发", '"后端 端开 开发"'),
+    ("前", '"前"*'),
+    ("C++", '"c"'),
+])
+def test_query_terms_split_like_indexed_text(query, expected):
+    assert match_expression(query) == expected
+
+
+def test_query_without_searchable_terms():
+    assert match_expression("  ——！ ") is None
+    assert match_expression(None) is None
+
+
+@pytest.mark.parametrize("query, expected", [
+    ("Python后端", [1]),
+    ("python 后端", [1]),
+    ("Java开发", [2]),
+    ("开发", [1, 2]),
+    ("服务端", [1]),
+    ("淘宝 杭州", [2]),
+    ("前", [3]),
+    ("Go后端", []),
+])
+def test_mixed_latin_and_cjk_queries_match(search_db, query, expected):
+    assert search(search_db, query) == expected
+
+
+@pytest.fixture
+def job_db(tmp_path, monkeypatch):
+    # ensure_table flips the global index on; restore it for other tests
+    monkeypatch.setattr(job_search, "available", False)
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'jobs.db'}")
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def setup():
+        async with engine.begin() as conn:
+            # Deleting a job loads its tags, cart items and deliveries
+            tables = [Job.__table__, Tag.__table__, job_tags, CartItem.__table__, Delivery.__table__]
+            await conn.run_sync(lambda sync_conn: [table.create(sync_conn) for table in tables])
+        async with sessions() as db:
+            db.add(Job(id=1, title="Python后端开发工程师", company_name="字节跳动", raw_content="负责抖音服务端开发"))
+            await db.commit()
+
+    asyncio.run(setup())
+    yield engine, sessions
+    asyncio.run(engine.dispose())
+
+
+async def found(db, q):
+    return [job.id for job in (await db.execute(job_search.apply(select(Job), q))).scalars()]
+
+
+def test_session_writes_keep_the_index_in_sync(job_db):
+    engine, sessions = job_db
+
+    async def scenario():
+        async with engine.begin() as conn:
+            # Jobs written before the table existed are indexed on startup
+            assert await job_search.ensure_table(conn) == 1
+        async with sessions() as db:
+            db.add(Job(id=2, title="Java开发实习生", company_name="阿里巴巴", raw_content="base 杭州"))
+            await db.commit()
+            created = await found(db, "Java 杭州")
+
+            job = await db.get(Job, 1)
+            job.title = "Go后端开发工程师"
+            await db.commit()
+            updated = await found(db, "Go后端"), await found(db, "Python后端")
+
+            await db.delete(await db.get(Job, 2))
+            await db.commit()
+            deleted = await found(db, "开发")
+        return created, updated, deleted
+
+    assert asyncio.run(scenario()) == ([2], ([1], []), [1])
+
+
+def test_like_fallback_requires_every_segmented_term(job_db):
+    _, sessions = job_db
+
+    async def scenario():
+        async with sessions() as db:
+            db.add(Job(id=2, title="前端工程师", company_name="腾讯", raw_content="熟悉 JavaScript，北京"))
+            await db.commit()
+            # Without FTS5 the terms are matched as substrings, not as one raw string
+            return await found(db, "python后端"), await found(db, "工程师 北京"), await found(db, "Go后端")
+
+    assert job_search.available is False
+    assert asyncio.run(scenario()) == ([1], [2], [])
+
+
+@pytest.mark.parametrize("params", [{"q": "后端", "limit": 1000}, {"q": "后端", "limit": 0}, {"q": "后端", "skip": -1}])
+def test_search_rejects_out_of_range_paging(params):
+    assert TestClient(app).get("/api/jobs/search", params=params).status_code == 422
@@ -0,0 +1,35 @@
+import pytest
+
+from app.services.json_repair import coerce_to_schema, repair_json
+from app.services.llm_service import JOB_PARSE_FUNCTION_SCHEMA
+
+
+@pytest.mark.parametrize("text, expected", [
+    ('```json\n{"a": 1,}\n```', {"a": 1}),
+    ("{'a': 'x', 'b': None, 'c': True}", {"a": "x", "b": None, "c": True}),
+    ('好的，结果如下：{"a": [1, 2,]} 以上', {"a": [1, 2]}),
+    ('{"a": 1, // comment\n "b": "x"}', {"a": 1, "b": "x"}),
+    ('{"b": "它说“你好”",}', {"b": "它说“你好”"}),
+    ('{“title”: “后端”}', {"title": "后端"}),
+    ('{"title": "后端", "skills": ["Py', {"title": "后端", "skills": ["Py"]}),
+    ('{"a": 1, "b"', {"a": 1}),
+    ('{"a": 1, "b":', {"a": 1, "b": None}),
+])
+def test_repairs_almost_valid_model_output(text, expected):
+    assert repair_json(text) == expected
+
+
+@pytest.mark.parametrize("text", [None, "no json here", "{]"])
+def test_unrepairable_output_raises(text):
+    with pytest.raises(ValueError):
+        repair_json(text)
+
+
+def test_coerce_to_schema_fills_and_normalizes_fields():
+    data = {"title": ["后端开发"], "suggested_tags": "Python, Go", "requirements": {"skills": "Python、Go"}}
+    result = coerce_to_schema(data, JOB_PARSE_FUNCTION_SCHEMA["parameters"])
+    assert result["title"] == "后端开发"
+    assert result["company_name"] is None
+    assert [tag["name"] for tag in result["suggested_tags"]] == ["Python", "Go"]
+    assert result["requirements"]["skills"] == ["Python", "Go"]
+    assert result["requirements"]["salary"] is None
@@ -0,0 +1,54 @@
+import json
+
+from app.services.json_stream import PartialJSONObject, sse_event
+
+
+def feed_all(fragments):
+    scanner = PartialJSONObject()
+    emitted = []
+    for fragment in fragments:
+        emitted.append(scanner.feed(fragment))
+    return scanner, emitted
+
+
+def test_fields_are_emitted_once_their_value_is_complete():
+    scanner, emitted = feed_all(['{"title": "后端', '开发", "skills": ["Py', 'thon", "Go"]', ', "salary": 15', "000}"])
+    assert emitted == [
+        [],
+        [("title", "后端开发")],
+        [],
+        [("skills", ["Python", "Go"])],
+        [("salary", 15000)],
+    ]
+    assert scanner.done
+    assert scanner.fields == {"title": "后端开发", "skills": ["Python", "Go"], "salary": 15000}
+
+
+def test_nested_objects_are_emitted_as_one_top_level_field():
+    scanner, emitted = feed_all(['{"requirements": {"education": "本科", ', '"skills": ["SQL"]}, "apply_email": null}'])
+    assert emitted[0] == []
+    assert emitted[1] == [("requirements", {"education": "本科", "skills": ["SQL"]}), ("apply_email", None)]
+
+
+def test_braces_commas_and_escaped_quotes_inside_strings():
+    text = json.dumps({"title": 'a "quoted" {title}, really', "company_name": "x"}, ensure_ascii=False)
+    scanner = PartialJSONObject()
+    fields = [pair for char in text for pair in scanner.feed(char)]
+    assert fields == [("title", 'a "quoted" {title}, really'), ("company_name", "x")]
+
+
+def test_text_before_the_object_is_skipped():
+    scanner, emitted = feed_all(["```json\n", '{"title": "x"}', "\n```"])
+    assert emitted[1] == [("title", "x")]
+    assert scanner.done
+
+
+def test_incomplete_stream_keeps_the_buffer_for_repair():
+    scanner, _ = feed_all(['{"title": "x", "company_name": "y'])
+    assert not scanner.done
+    assert scanner.fields == {"title": "x"}
+    assert scanner.buffer.endswith('"y')
+
+
+def test_sse_event_format():
+    assert sse_event("field", {"value": "后端"}) == 'event: field\ndata: {"value": "后端"}\n\n'
@@ -0,0 +1,298 @@
+import asyncio
+import time
+
+import httpx
+import openai
+import pytest
+
+from app.services.llm_governor import (
+    AdaptiveConcurrencyLimiter,
+    CircuitBreaker,
+    LLMGovernor,
+    LLMRateLimitError,
+    LLMUnavailableError,
+    TokenBucket,
+)
+
+REQUEST = httpx.Request("POST", "http://llm.test/v1/chat/completions")
+
+
+def rate_limit_error() -> openai.RateLimitError:
+    return openai.RateLimitError("slow down", response=httpx.Response(429, request=REQUEST), body=None)
+
+
+def server_error() -> openai.InternalServerError:
+    return openai.InternalServerError("boom", response=httpx.Response(500, request=REQUEST), body=None)
+
+
+def build_governor(concurrency: int = 4, failure_threshold: int = 2, cooldown: float = 0.0, retries: int = 2) -> LLMGovernor:
+    governor = LLMGovernor()
+    governor.limiter = AdaptiveConcurrencyLimiter(initial=concurrency, minimum=1, maximum=concurrency)
+    governor.breaker = CircuitBreaker(failure_threshold=failure_threshold, cooldown_seconds=cooldown)
+    governor.request_bucket.capacity = 0
+    governor.token_bucket.capacity = 0
+    governor.max_retries = retries
+    governor._backoff = lambda attempt, error: 0.0
+    return governor
+
+
+def test_breaker_opens_and_lets_one_probe_through():
+    breaker = CircuitBreaker(failure_threshold=2, cooldown_seconds=0.0)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.allow()
+    assert breaker.probing
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == "open"
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == "closed"
+    assert not breaker.probing
+
+
+def test_open_breaker_fails_fast_during_cooldown():
+    governor = build_governor(failure_threshold=1, cooldown=60.0)
+    governor.breaker.record_failure()
+
+    async def never_called():
+        raise AssertionError("an open breaker must not call the provider")
+
+    with pytest.raises(LLMUnavailableError):
+        asyncio.run(governor.call(never_called))
+    assert governor.rejected == 1
+
+
+def test_cancelled_probe_releases_the_breaker():
+    governor = build_governor(failure_threshold=1, cooldown=0.0)
+    governor.breaker.record_failure()
+
+    async def scenario():
+        started = asyncio.Event()
+
+        async def hang():
+            started.set()
+            await asyncio.sleep(60)
+
+        probe = asyncio.create_task(governor.call(hang))
+        await started.wait()
+        assert governor.breaker.probing
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+        assert not governor.breaker.probing
+        assert governor.limiter.in_flight == 0
+
+        async def answer():
+            return "ok"
+
+        return await governor.call(answer)
+
+    assert asyncio.run(scenario()) == "ok"
+    assert governor.breaker.state == "closed"
+
+
+def test_provider_errors_open_the_breaker_and_stop_retrying():
+    governor = build_governor(failure_threshold=2, cooldown=60.0, retries=5)
+    calls = 0
+
+    async def failing():
+        nonlocal calls
+        calls += 1
+        raise server_error()
+
+    with pytest.raises(LLMUnavailableError):
+        asyncio.run(governor.call(failing))
+    assert calls == 2
+    assert governor.breaker.state == "open"
+
+
+def test_rate_limit_retries_then_gives_up():
+    governor = build_governor(retries=2)
+    info = {"retries": 0}
+
+    async def throttled():
+        raise rate_limit_error()
+
+    with pytest.raises(LLMRateLimitError):
+        asyncio.run(governor.call(throttled, call_info=info))
+    assert info["retries"] == 2
+    assert governor.throttled == 3
+    # 429s mean the provider is up
+    assert governor.breaker.state == "closed"
+
+
+def test_backoff_does_not_hold_a_concurrency_slot():
+    governor = build_governor(concurrency=1, retries=1)
+    governor._backoff = lambda attempt, error: 0.2
+    order = []
+
+    async def scenario():
+        first_attempts = 0
+
+        async def throttled_once():
+            nonlocal first_attempts
+            first_attempts += 1
+            if first_attempts == 1:
+                raise rate_limit_error()
+            order.append("first")
+            return "first"
+
+        async def second():
+            order.append("second")
+            return "second"
+
+        first_task = asyncio.create_task(governor.call(throttled_once))
+        await asyncio.sleep(0.05)
+        # The first call is backing off; its slot must be free for others
+        assert governor.limiter.in_flight == 0
+        await asyncio.wait_for(governor.call(second), timeout=0.1)
+        await first_task
+
+    asyncio.run(scenario())
+    assert order == ["second", "first"]
+
+
+def test_limiter_is_additive_increase_multiplicative_decrease():
+    limiter = AdaptiveConcurrencyLimiter(initial=8, minimum=1, maximum=10)
+    limiter.on_throttle()
+    assert limiter.limit == 4
+    for _ in range(4):
+        limiter.on_success()
+    assert limiter.limit == pytest.approx(5, abs=0.2)
+    for _ in range(100):
+        limiter.on_success()
+    assert limiter.limit == 10
+    for _ in range(10):
+        limiter.on_throttle()
+    assert limiter.limit == 1
+
+
+def test_token_bucket_waits_for_refill_and_accepts_corrections():
+    bucket = TokenBucket(per_minute=600)
+
+    async def scenario():
+        await bucket.acquire(600)
+        started = time.monotonic()
+        await bucket.acquire(5)
+        return time.monotonic() - started
+
+    waited = asyncio.run(scenario())
+    # 10 units per second: 5 units take about half a second
+    assert 0.4 <= waited < 1.0
+    bucket.adjust(-1000)
+    assert bucket.tokens == bucket.capacity
+
+
+def test_disabled_bucket_never_waits():
+    bucket = TokenBucket(per_minute=0)
+    asyncio.run(bucket.acquire(10 ** 6))
+
+
+def test_rate_limit_is_not_counted_as_a_success():
+    governor = build_governor(failure_threshold=3, retries=0)
+    governor.breaker.record_failure()
+    governor.breaker.record_failure()
+
+    async def throttled():
+        raise rate_limit_error()
+
+    with pytest.raises(LLMRateLimitError):
+        asyncio.run(governor.call(throttled))
+    assert governor.breaker.consecutive_failures == 2
+
+
+def test_rate_limited_probe_keeps_the_breaker_half_open():
+    governor = build_governor(failure_threshold=1, cooldown=0.0, retries=0)
+    governor.breaker.record_failure()
+
+    async def throttled():
+        raise rate_limit_error()
+
+    with pytest.raises(LLMRateLimitError):
+        asyncio.run(governor.call(throttled))
+    assert governor.breaker.state == "half_open"
+    # The probe is free again for the next call
+    assert not governor.breaker.probing
+
+
+class FakeStream:
+    def __init__(self, chunks, error=None):
+        self.chunks = list(chunks)
+        self.error = error
+        self.closed = False
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.sleep(0)
+        if self.chunks:
+            return self.chunks.pop(0)
+        if self.error:
+            raise self.error
+        raise StopAsyncIteration
+
+    async def close(self):
+        self.closed = True
+
+
+def test_stream_holds_its_slot_until_exhausted():
+    governor = build_governor(concurrency=1)
+    closed = []
+
+    async def scenario():
+        async def open_stream():
+            return FakeStream(["a", "b"])
+
+        stream = await governor.call(open_stream, stream=True)
+        stream.on_close = closed.append
+        assert governor.limiter.in_flight == 1
+        second = asyncio.create_task(governor.call(open_stream, stream=True))
+        await asyncio.sleep(0.05)
+        # The second stream waits for the first one's slot
+        assert not second.done()
+        assert [chunk async for chunk in stream] == ["a", "b"]
+        other = await asyncio.wait_for(second, timeout=1)
+        await other.aclose()
+
+    asyncio.run(scenario())
+    assert governor.limiter.in_flight == 0
+    assert len(closed) == 1 and closed[0].completed
+
+
+def test_closing_a_stream_early_releases_its_slot():
+    governor = build_governor(concurrency=1)
+    source = FakeStream(["a", "b", "c"])
+
+    async def scenario():
+        async def open_stream():
+            return source
+
+        async with await governor.call(open_stream, stream=True) as stream:
+            async for _ in stream:
+                break
+        assert governor.limiter.in_flight == 0
+
+    asyncio.run(scenario())
+    assert source.closed
+
+
+def test_provider_error_mid_stream_counts_as_a_failure():
+    governor = build_governor(concurrency=1, failure_threshold=1, cooldown=60.0)
+
+    async def scenario():
+        async def open_stream():
+            return FakeStream(["a"], error=server_error())
+
+        stream = await governor.call(open_stream, stream=True)
+        with pytest.raises(openai.InternalServerError):
+            async for _ in stream:
+                pass
+        assert stream.error is not None and not stream.completed
+
+    asyncio.run(scenario())
+    assert governor.limiter.in_flight == 0
+    assert governor.breaker.state == "open"
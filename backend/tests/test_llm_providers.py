@@ -0,0 +1,162 @@
+import asyncio
+
+import pytest
+
+from app.services import llm_providers
+from app.services.llm_governor import CircuitBreaker, LLMUnavailableError
+from app.services.llm_providers import LLMProvider, ProviderPool
+
+
+def build_provider(name: str) -> LLMProvider:
+    provider = LLMProvider(name, f"http://{name}.test/v1", f"model-{name}", "key")
+    provider.governor.breaker = CircuitBreaker(failure_threshold=1, cooldown_seconds=0.0)
+    provider.governor.request_bucket.capacity = 0
+    provider.governor.token_bucket.capacity = 0
+    return provider
+
+
+def test_half_open_provider_with_probe_out_is_not_healthy():
+    provider = build_provider("a")
+    provider.governor.breaker.record_failure()
+    assert not provider.healthy
+    assert provider.governor.breaker.allow()
+    assert not provider.healthy
+    provider.governor.breaker.release_probe()
+    assert provider.healthy
+
+
+def test_hedge_loser_releases_its_breaker_probe(monkeypatch):
+    monkeypatch.setattr(llm_providers.settings, "llm_hedge_enabled", True)
+    monkeypatch.setattr(llm_providers.settings, "llm_hedge_default_delay", 0.05)
+    monkeypatch.setattr(llm_providers.settings, "llm_hedge_min_samples", 1000)
+    primary = build_provider("slow")
+    backup = build_provider("fast")
+    # The slow provider just came out of its cooldown, so its next call is the probe
+    primary.governor.breaker.record_failure()
+    pool = ProviderPool([primary, backup])
+
+    async def call(provider: LLMProvider):
+        async def request():
+            if provider is primary:
+                await asyncio.sleep(60)
+            return provider.name
+
+        return await provider.governor.call(request)
+
+    async def scenario():
+        result, winner = await pool.call(call, providers=[primary, backup])
+        assert primary.governor.breaker.probing
+        # Let the cancelled loser unwind
+        await asyncio.sleep(0.01)
+        return result, winner
+
+    result, winner = asyncio.run(scenario())
+    assert (result, winner) == ("fast", backup)
+    assert pool.hedged == 1 and pool.hedge_wins == 1
+    assert not primary.governor.breaker.probing
+    assert primary.governor.breaker.state == "half_open"
+    assert primary.healthy
+    assert primary.governor.limiter.in_flight == 0
+
+
+def test_ranked_puts_unhealthy_providers_last():
+    healthy = build_provider("up")
+    down = build_provider("down")
+    down.governor.breaker.cooldown_seconds = 60.0
+    down.governor.breaker.record_failure()
+    pool = ProviderPool([down, healthy])
+    assert pool.ranked() == [healthy, down]
+
+
+def no_hedging(monkeypatch):
+    monkeypatch.setattr(llm_providers.settings, "llm_hedge_enabled", False)
+
+
+def test_outage_on_primary_fails_over(monkeypatch):
+    no_hedging(monkeypatch)
+    primary, backup = build_provider("a"), build_provider("b")
+    pool = ProviderPool([primary, backup])
+
+    async def call(provider):
+        if provider is primary:
+            raise LLMUnavailableError("down")
+        return provider.name
+
+    result, winner = asyncio.run(pool.call(call, providers=[primary, backup]))
+    assert (result, winner) == ("b", backup)
+    assert pool.failovers == 1
+    assert primary.failures == 1
+
+
+def test_capability_errors_are_returned_to_the_caller(monkeypatch):
+    no_hedging(monkeypatch)
+    primary, backup = build_provider("a"), build_provider("b")
+    pool = ProviderPool([primary, backup])
+    called = []
+
+    async def call(provider):
+        called.append(provider.name)
+        raise ValueError("response_format is not supported")
+
+    with pytest.raises(ValueError):
+        asyncio.run(pool.call(call, providers=[primary, backup]))
+    assert called == ["a"]
+    assert pool.failovers == 0
+
+
+def test_hedge_delay_follows_observed_p95(monkeypatch):
+    monkeypatch.setattr(llm_providers.settings, "llm_hedge_min_samples", 5)
+    monkeypatch.setattr(llm_providers.settings, "llm_hedge_min_delay", 0.5)
+    monkeypatch.setattr(llm_providers.settings, "llm_hedge_default_delay", 8.0)
+    provider = build_provider("a")
+    assert provider.hedge_delay() == 8.0
+    for latency in (1.0, 1.2, 1.1, 0.9, 3.0):
+        provider.record_latency(latency)
+    assert provider.hedge_delay() == 3.0
+    provider.latencies.clear()
+    for _ in range(5):
+        provider.record_latency(0.1)
+    assert provider.hedge_delay() == 0.5
+
+
+def test_cancelled_hedge_loser_does_not_look_fast(monkeypatch):
+    monkeypatch.setattr(llm_providers.settings, "llm_hedge_enabled", True)
+    monkeypatch.setattr(llm_providers.settings, "llm_hedge_min_samples", 1)
+    monkeypatch.setattr(llm_providers.settings, "llm_hedge_min_delay", 0.01)
+    primary, backup = build_provider("a"), build_provider("b")
+    primary.record_latency(0.05)
+    backup.record_latency(1.0)
+    pool = ProviderPool([primary, backup])
+
+    async def call(provider):
+        # The primary is stuck; the backup answers shortly after being hedged in
+        await asyncio.sleep(0.3 if provider is primary else 0.02)
+        return provider.name
+
+    result, winner = asyncio.run(pool.call(call, providers=[primary, backup]))
+    assert (result, winner) == ("b", backup)
+    # The primary was cancelled after ~0.07s, beyond its 0.05s p95: kept as a lower bound
+    assert len(primary.latencies) == 2 and primary.latencies[-1] > 0.05
+
+
+def test_cancelled_attempt_below_p95_is_not_recorded(monkeypatch):
+    no_hedging(monkeypatch)
+    provider = build_provider("a")
+    for _ in range(3):
+        provider.record_latency(2.0)
+    pool = ProviderPool([provider])
+
+    async def scenario():
+        async def slow(provider):
+            await asyncio.sleep(1)
+
+        task = asyncio.create_task(pool.call(slow, providers=[provider]))
+        await asyncio.sleep(0.02)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(scenario())
+    assert list(provider.latencies) == [2.0, 2.0, 2.0]
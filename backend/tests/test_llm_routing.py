@@ -0,0 +1,62 @@
+import asyncio
+from types import SimpleNamespace
+
+from app.services import llm_service as llm_module
+from app.services.llm_governor import LLMUnavailableError
+from app.services.llm_providers import LLMProvider, ProviderPool
+from app.services.llm_service import LLMService
+
+# Neither a templated posting (no fast path) nor anything the local extractor is sure of
+RAW_POSTING = "我们团队在找一位同学一起做推荐系统，感兴趣可以聊聊"
+
+
+def function_call_response(arguments: str):
+    message = SimpleNamespace(function_call=SimpleNamespace(arguments=arguments), content=None)
+    return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=None)
+
+
+def build_service(monkeypatch):
+    primary = LLMProvider("a", "http://a.test/v1", "model-a", "key")
+    fallback = LLMProvider("b", "http://b.test/v1", "model-b", "key")
+    service = LLMService()
+    service.provider_pool = ProviderPool([primary, fallback])
+    service.client = primary.client
+    service.model = primary.model
+    service.base_url = primary.base_url
+    monkeypatch.setattr(service.provider_pool, "ranked", lambda: [primary, fallback])
+    monkeypatch.setattr(llm_module.settings, "llm_structured_output_mode", "auto")
+
+    async def governed_completion(provider, operation, mode, kwargs, call_info=None):
+        if provider is primary:
+            raise LLMUnavailableError("down")
+        return function_call_response('{"title": "推荐算法工程师", "company_name": "某公司"}')
+
+    monkeypatch.setattr(service, "_governed_completion", governed_completion)
+    return service, primary, fallback
+
+
+def test_mode_and_cache_key_follow_the_provider_that_answered(monkeypatch):
+    service, primary, fallback = build_service(monkeypatch)
+    stored = {}
+
+    async def cache_get(cache_key):
+        return stored.get(cache_key)
+
+    async def cache_put(cache_key, result, model, prompt_version, source_type=None):
+        stored[cache_key] = {"model": model, **result}
+
+    monkeypatch.setattr(llm_module.parse_cache, "get", cache_get)
+    monkeypatch.setattr(llm_module.parse_cache, "put", cache_put)
+
+    result = asyncio.run(service.parse_job_posting(RAW_POSTING))
+
+    assert result["title"] == "推荐算法工程师"
+    assert service._learned_modes[("http://b.test/v1", "model-b")]["mode"] == "function"
+    assert ("http://a.test/v1", "model-a") not in service._learned_modes
+    key_b = llm_module.build_cache_key(RAW_POSTING, "手动", "model-b", llm_module.JOB_PARSE_PROMPT_VERSION)
+    assert stored[key_b]["model"] == "model-b"
+    assert len(stored) == 1
+
+    # Stored under the fallback's model, the parse is still found while A is primary
+    cached = asyncio.run(service.parse_job_posting(RAW_POSTING))
+    assert cached["model"] == "model-b"
@@ -0,0 +1,61 @@
+from fastapi.testclient import TestClient
+
+from app import main
+from app.main import app
+from app.services.llm_telemetry import LLMTelemetry
+
+
+def build_telemetry() -> LLMTelemetry:
+    telemetry = LLMTelemetry(window_size=100)
+    telemetry.record("parse_job_posting", "model-a", "function", 0.3, prompt_tokens=100, completion_tokens=40)
+    telemetry.record("parse_job_posting", "model-a", "function", 1.5, prompt_tokens=120, completion_tokens=60, retries=2)
+    telemetry.record("parse_job_posting", "model-a", "function", 90.0, outcome="unavailable")
+    telemetry.record_served("parse_job_posting", "cache")
+    return telemetry
+
+
+def metric_lines(text: str):
+    return [line for line in text.splitlines() if line and not line.startswith("#")]
+
+
+def test_counters_are_rendered_with_labels():
+    lines = metric_lines(build_telemetry().render_prometheus())
+    assert 'llm_requests_total{operation="parse_job_posting",model="model-a",mode="function",outcome="success"} 2' in lines
+    assert 'llm_requests_total{operation="parse_job_posting",model="model-a",mode="function",outcome="unavailable"} 1' in lines
+    assert 'llm_prompt_tokens_total{operation="parse_job_posting",model="model-a"} 220' in lines
+    assert 'llm_retries_total{operation="parse_job_posting"} 2' in lines
+    assert 'llm_parse_served_total{operation="parse_job_posting",source="cache"} 1' in lines
+
+
+def test_histogram_buckets_are_cumulative_and_end_with_inf():
+    lines = metric_lines(build_telemetry().render_prometheus())
+    buckets = [line for line in lines if line.startswith("llm_request_duration_seconds_bucket")]
+    counts = [int(line.rsplit(" ", 1)[1]) for line in buckets]
+    assert counts == sorted(counts)
+    assert 'le="0.5"} 1' in buckets[2]
+    assert 'le="2.5"} 2' in buckets[4]
+    assert buckets[-1].endswith('le="+Inf"} 3')
+    assert 'llm_request_duration_seconds_count{operation="parse_job_posting",mode="function"} 3' in lines
+    assert 'llm_request_duration_seconds_sum{operation="parse_job_posting",mode="function"} 91.800000' in lines
+
+
+def test_every_metric_has_help_and_type():
+    text = build_telemetry().render_prometheus()
+    names = {line.split("{")[0] for line in metric_lines(text)}
+    for name in names:
+        family = name.rsplit("_bucket", 1)[0].rsplit("_sum", 1)[0].rsplit("_count", 1)[0]
+        assert f"# TYPE {family} " in text
+
+
+def test_label_values_are_escaped():
+    telemetry = LLMTelemetry(window_size=10)
+    telemetry.record("parse", 'we"ird\\model', "json", 0.1)
+    assert 'model="we\\"ird\\\\model"' in telemetry.render_prometheus()
+
+
+def test_metrics_endpoint_serves_the_text_format(monkeypatch):
+    monkeypatch.setattr(main, "llm_telemetry", build_telemetry())
+    response = TestClient(app).get("/metrics")
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain")
+    assert "llm_requests_total" in response.text
@@ -0,0 +1,138 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import Job, JobMatchFeatures, MatchResult, MatchState
+from app.services.match_cache import MatchCache, bump_job_set_version, filters_key, get_job_set_version
+from app.services.match_features import delete_job_features, save_job_features
+
+RESULTS = [
+    {"job_id": 7, "score": 80.0, "highlights": ["技能匹配: python"], "template_recommendation": "template_2"},
+    {"job_id": 3, "score": 50.0, "highlights": [], "template_recommendation": "template_2"},
+]
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'matches.db'}")
+
+    async def create():
+        async with engine.begin() as conn:
+            tables = [Job.__table__, JobMatchFeatures.__table__, MatchState.__table__, MatchResult.__table__]
+            await conn.run_sync(lambda sync_conn: [table.create(sync_conn) for table in tables])
+
+    asyncio.run(create())
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+@pytest.fixture
+def cache():
+    cache = MatchCache()
+    cache.enabled = True
+    return cache
+
+
+def test_empty_filters_share_a_key():
+    assert filters_key(None) == filters_key({}) == filters_key({"location": "", "skills": []})
+    assert filters_key({"location": "北京"}) != filters_key(None)
+
+
+def test_put_then_get_returns_the_ranked_results(sessions, cache):
+    async def scenario():
+        async with sessions() as db:
+            await cache.put(db, 1, 2, 5, {"location": "北京"}, 3, RESULTS)
+            await db.commit()
+            return (
+                await cache.get(db, 1, 2, 5, {"location": "北京"}, 3),
+                await cache.get(db, 1, 2, 5, None, 3),
+                await cache.get(db, 1, 2, 5, {"location": "北京"}, 5),
+            )
+
+    hit, other_filters, other_top_n = asyncio.run(scenario())
+    assert hit == RESULTS
+    assert other_filters is None and other_top_n is None
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+@pytest.mark.parametrize("parse_version, job_set_version", [(3, 5), (2, 6)])
+def test_version_mismatch_is_a_miss(sessions, cache, parse_version, job_set_version):
+    async def scenario():
+        async with sessions() as db:
+            await cache.put(db, 1, 2, 5, None, 3, RESULTS)
+            await db.commit()
+            return await cache.get(db, 1, parse_version, job_set_version, None, 3)
+
+    assert asyncio.run(scenario()) is None
+    assert cache.misses == 1
+
+
+def test_recompute_replaces_the_stored_set(sessions, cache):
+    async def scenario():
+        async with sessions() as db:
+            await cache.put(db, 1, 2, 5, None, 3, RESULTS)
+            await cache.put(db, 1, 2, 6, None, 3, RESULTS[:1])
+            await db.commit()
+            rows = (await db.execute(select(func.count(MatchResult.id)))).scalar()
+            return rows, await cache.get(db, 1, 2, 6, None, 3)
+
+    rows, hit = asyncio.run(scenario())
+    assert rows == 1
+    assert hit == RESULTS[:1]
+
+
+def test_disabled_cache_never_answers(sessions, cache):
+    cache.enabled = False
+
+    async def scenario():
+        async with sessions() as db:
+            await cache.put(db, 1, 2, 5, None, 3, RESULTS)
+            return await cache.get(db, 1, 2, 5, None, 3)
+
+    assert asyncio.run(scenario()) is None
+
+
+def test_only_match_relevant_job_writes_bump_the_job_set_version(sessions):
+    async def scenario():
+        versions = []
+        async with sessions() as db:
+            async def write(job):
+                await save_job_features(db, job)
+                await db.commit()
+                versions.append(await get_job_set_version(db))
+
+            active = Job(id=1, title="后端开发", company_name="某某科技", status="active",
+                         requirements={"skills": ["Python"]}, raw_content="招聘后端")
+            closed = Job(id=2, title="测试", company_name="某某科技", status="closed", requirements={})
+            db.add_all([active, closed])
+            await db.flush()
+            await write(active)                               # created: 1
+            await write(closed)                               # created, even if inactive: 2
+            active.company_name = "某某集团"
+            active.email_subject_template = "应聘-{name}"
+            await write(active)                               # not read by matching: 2
+            active.requirements = {"skills": ["Python", "Go"]}
+            await write(active)                               # skills changed: 3
+            active.raw_content = "招聘后端，Go 优先"
+            await write(active)                               # semantic text changed: 4
+            closed.title = "测试开发"
+            await write(closed)                               # inactive before and after: 4
+            closed.status = "active"
+            await write(closed)                               # activated: 5
+            active.status = "closed"
+            await write(active)                               # deactivated: 6
+
+            await delete_job_features(db, 1)                  # was inactive: 6
+            await db.commit()
+            versions.append(await get_job_set_version(db))
+            await delete_job_features(db, 2)                  # was active: 7
+            await db.commit()
+            versions.append(await get_job_set_version(db))
+            await bump_job_set_version(db)
+            await db.commit()
+            versions.append(await get_job_set_version(db))
+        return versions
+
+    assert asyncio.run(scenario()) == [1, 2, 2, 3, 4, 4, 5, 6, 6, 7, 8]
@@ -0,0 +1,97 @@
+import random
+
+import pytest
+
+from app.services.match_engine import VectorMatchEngine, np
+from app.services.match_features import build_job_features
+from app.services.match_index import MatchIndex
+
+pytestmark = pytest.mark.skipif(np is None, reason="numpy is not installed")
+
+SKILLS = ["Python", "Java", "Go", "MySQL", "Redis", "React", "SQL", "Docker"]
+TITLES = ["后端开发", "前端开发", "数据分析", "运维工程师", "Python 工程师"]
+LOCATIONS = ["北京", "上海", "深圳", None]
+RESUMES = [
+    {"skills": ["Python", "MySQL"], "keywords": ["后端", "北京"]},
+    {"skills": ["React"], "keywords": ["前端开发", "上海"]},
+    {"skills": [], "keywords": []},
+    {"skills": ["Go", "Redis", "Docker", "SQL"], "keywords": ["运维工程师", "深圳"]},
+]
+
+
+def random_job(rng):
+    requirements = {"skills": rng.sample(SKILLS, rng.randint(0, 4))}
+    location = rng.choice(LOCATIONS)
+    if location:
+        requirements["location"] = location
+    return build_job_features(rng.choice(TITLES), requirements)
+
+
+def build(rng, count=30):
+    index = MatchIndex()
+    index.loaded = True
+    for job_id in range(1, count + 1):
+        index.upsert(job_id, random_job(rng), True)
+    return index, VectorMatchEngine(index)
+
+
+def ranking(results):
+    # Highlights list hits in set order, so only ids and scores are compared (as MatchEngine does)
+    return [(item["job_id"], item["score"]) for item in results]
+
+
+def assert_same_rankings(index, engine):
+    for resume in RESUMES:
+        for top_n in (1, 3, 10, 100):
+            assert ranking(engine.match(resume, top_n)) == ranking(index.match(resume, top_n))
+        for location in ("北京", "杭州"):
+            assert ranking(engine.match(resume, 5, location=location)) == ranking(index.match(resume, 5, location=location))
+        job_ids = set(list(index.features)[::3])
+        assert ranking(engine.match(resume, 5, job_ids=job_ids)) == ranking(index.match(resume, 5, job_ids=job_ids))
+
+
+def test_vector_engine_ranks_like_the_inverted_index():
+    index, engine = build(random.Random(7))
+    assert_same_rankings(index, engine)
+
+
+def test_job_writes_patch_rows_instead_of_rebuilding():
+    rng = random.Random(11)
+    index, engine = build(rng)
+    engine.match(RESUMES[0])
+    assert engine.builds == 1
+
+    index.upsert(3, random_job(rng), True)      # update
+    index.remove(5)                             # delete
+    index.upsert(31, random_job(rng), True)     # new job
+    index.upsert(8, random_job(rng), False)     # deactivated
+    assert_same_rankings(index, engine)
+
+    index.upsert(5, random_job(rng), True)      # back again, in its old row
+    index.upsert(0, random_job(rng), True)      # appended, but ranks before job 1 on ties
+    assert_same_rankings(index, engine)
+    assert engine.builds == 1
+    assert engine.patches == 2
+    assert engine.alive.sum() == len(index.features)
+
+
+def test_many_changes_fall_back_to_a_rebuild():
+    rng = random.Random(3)
+    index, engine = build(rng, count=100)
+    engine.match(RESUMES[0])
+    for job_id in range(1, 81):
+        index.upsert(job_id, random_job(rng), True)
+    assert_same_rankings(index, engine)
+    assert engine.builds == 2
+    assert engine.patches == 0
+
+
+def test_reloaded_index_is_rebuilt():
+    rng = random.Random(5)
+    index, engine = build(rng)
+    engine.match(RESUMES[0])
+    index.invalidate()
+    index.loaded = True
+    index.upsert(1, random_job(rng), True)
+    assert_same_rankings(index, engine)
+    assert engine.builds == 2
@@ -0,0 +1,98 @@
+import asyncio
+
+import pytest
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import Job, JobMatchFeatures, MatchState
+from app.services.match_features import (
+    FEATURE_VERSION, backfill_job_features, build_job_features, delete_job_features, load_active_features,
+    save_job_features,
+)
+from app.services.skill_lexicon import skill_lexicon
+
+
+def test_features_are_normalized_for_matching_and_filtering():
+    record = build_job_features("Python 后端开发工程师", {
+        "skills": ["Python", "MySQL", "炼丹"],
+        "location": "北京市海淀区",
+        "salary": "15k-25k",
+        "education": "本科及以上",
+        "experience": "3-5年",
+    })
+
+    assert record["skills"] == ["mysql", "python", "炼丹"]
+    # Skills outside the lexicon have no id
+    assert record["skill_ids"] == sorted([skill_lexicon.skill_ids["python"], skill_lexicon.skill_ids["mysql"]])
+    assert record["title_tokens"] == ["python", "后端开发工程师"]
+    assert (record["raw_location"], record["location_code"]) == ("北京市海淀区", "北京")
+    assert (record["salary_min"], record["salary_max"], record["salary_period"]) == (15000, 25000, "month")
+    assert (record["education_level"], record["experience_band"]) == (3, 2)
+
+
+def test_missing_requirements_give_empty_features():
+    record = build_job_features(None, None)
+    assert record["skills"] == [] and record["title_tokens"] == []
+    assert record["location"] is None and record["location_code"] is None
+
+
+@pytest.fixture
+def sessions(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'features.db'}")
+
+    async def create():
+        async with engine.begin() as conn:
+            tables = [Job.__table__, JobMatchFeatures.__table__, MatchState.__table__]
+            await conn.run_sync(lambda sync_conn: [table.create(sync_conn) for table in tables])
+
+    asyncio.run(create())
+    yield async_sessionmaker(engine, expire_on_commit=False)
+    asyncio.run(engine.dispose())
+
+
+def job(job_id, title, skills, status="active"):
+    return Job(id=job_id, title=title, company_name="某某科技", status=status,
+               requirements={"skills": skills, "location": "上海"})
+
+
+def test_saved_features_are_read_back_without_the_job_rows(sessions):
+    async def scenario():
+        async with sessions() as db:
+            jobs = [job(1, "后端开发", ["Python"]), job(2, "前端开发", ["React"]), job(3, "测试", ["Java"], "closed")]
+            db.add_all(jobs)
+            await db.flush()
+            for item in jobs:
+                await save_job_features(db, item)
+            await db.commit()
+
+            # An edit overwrites the row in place
+            jobs[0].requirements = {"skills": ["Go"], "location": "上海"}
+            await save_job_features(db, jobs[0])
+            await delete_job_features(db, 2)
+            await db.commit()
+            return await load_active_features(db), await load_active_features(db, job_ids=[2, 3])
+
+    active, listed = asyncio.run(scenario())
+    assert [(job_id, record["skills"]) for job_id, record in active] == [(1, ["go"])]
+    assert active[0][1]["location_code"] == "上海"
+    # Deleted and inactive jobs are never loaded
+    assert listed == []
+
+
+def test_backfill_creates_missing_and_outdated_rows(sessions):
+    async def scenario():
+        async with sessions() as db:
+            db.add_all([job(1, "后端开发", ["Python"]), job(2, "前端开发", ["React"])])
+            await db.flush()
+            await save_job_features(db, (await db.get(Job, 2)))
+            await db.execute(update(JobMatchFeatures).values(feature_version=FEATURE_VERSION - 1, skills=[]))
+            await db.commit()
+
+            created = await backfill_job_features(db)
+            again = await backfill_job_features(db)
+            rows = (await db.execute(select(JobMatchFeatures.job_id, JobMatchFeatures.skills))).all()
+            return created, again, sorted(rows)
+
+    created, again, rows = asyncio.run(scenario())
+    assert (created, again) == (2, 0)
+    assert rows == [(1, ["python"]), (2, ["react"])]
@@ -0,0 +1,86 @@
+from app.services.match_features import build_job_features
+from app.services.match_index import MatchIndex
+
+JOBS = {
+    1: ("后端开发工程师", {"skills": ["Python", "MySQL"], "location": "北京"}),
+    2: ("前端开发工程师", {"skills": ["JavaScript", "React"], "location": "上海"}),
+    3: ("数据分析师", {"skills": ["Python", "SQL"], "location": "北京"}),
+    4: ("产品经理", {"skills": [], "location": "深圳"}),
+}
+RESUME = {"skills": ["Python", "MySQL"], "keywords": ["后端", "北京"]}
+
+
+def loaded_index(jobs=JOBS) -> MatchIndex:
+    index = MatchIndex()
+    index.loaded = True
+    for job_id, (title, requirements) in jobs.items():
+        index.upsert(job_id, build_job_features(title, requirements), True)
+    return index
+
+
+def ranking(results):
+    return [(item["job_id"], item["score"]) for item in results]
+
+
+def test_top_n_ranks_by_score_then_job_id():
+    index = loaded_index()
+    # Job 1: two skills + "北京"; job 3: one skill + "北京"
+    assert ranking(index.match(RESUME, top_n=2)) == [(1, 65.0), (3, 50.0)]
+
+
+def test_jobs_without_shared_tokens_fill_up_top_n_in_id_order():
+    index = loaded_index()
+    results = index.match(RESUME, top_n=4)
+    assert ranking(results) == [(1, 65.0), (3, 50.0), (2, 30.0), (4, 30.0)]
+    assert results[-1]["highlights"] == ["基础关键词相关"]
+    # Only the two jobs sharing a token were scored
+    assert index.candidates_scored == 2
+
+
+def test_location_and_job_id_filters():
+    index = loaded_index()
+    assert ranking(index.match(RESUME, top_n=5, location="北京")) == [(1, 65.0), (3, 50.0)]
+    assert ranking(index.match(RESUME, top_n=5, job_ids={2, 3})) == [(3, 50.0), (2, 30.0)]
+
+
+def test_update_moves_the_job_between_postings():
+    index = loaded_index()
+    index.upsert(2, build_job_features("后端开发", {"skills": ["Python", "MySQL"], "location": "北京"}), True)
+
+    assert index.skill_postings["python"] == {1, 2, 3}
+    assert "react" not in index.skill_postings
+    assert "上海" not in index.location_postings
+    assert ranking(index.match(RESUME, top_n=2)) == [(1, 65.0), (2, 65.0)]
+
+
+def test_removed_and_inactive_jobs_leave_no_postings():
+    index = loaded_index()
+    index.remove(1)
+    index.upsert(3, build_job_features("数据分析师", {"skills": ["Python"]}), False)
+
+    assert set(index.features) == {2, 4}
+    assert "python" not in index.skill_postings and "mysql" not in index.skill_postings
+    assert "北京" not in index.location_postings
+    assert ranking(index.match(RESUME, top_n=3)) == [(2, 30.0), (4, 30.0)]
+
+
+def test_index_matches_a_fresh_build_after_a_series_of_changes():
+    index = loaded_index()
+    index.remove(2)
+    index.upsert(5, build_job_features("Python 工程师", {"skills": ["Python", "Docker"], "location": "上海"}), True)
+    index.upsert(4, build_job_features("产品经理", {"skills": ["SQL"], "location": "深圳"}), True)
+
+    fresh = loaded_index({job_id: JOBS[job_id] for job_id in (1, 3)} | {
+        4: ("产品经理", {"skills": ["SQL"], "location": "深圳"}),
+        5: ("Python 工程师", {"skills": ["Python", "Docker"], "location": "上海"}),
+    })
+    assert index.skill_postings == fresh.skill_postings
+    assert index.title_postings == fresh.title_postings
+    assert index.location_postings == fresh.location_postings
+    assert ranking(index.match(RESUME, top_n=4)) == ranking(fresh.match(RESUME, top_n=4))
+
+
+def test_changes_before_the_index_is_loaded_are_ignored():
+    index = MatchIndex()
+    index.upsert(1, build_job_features("后端", {"skills": ["Python"]}), True)
+    assert index.features == {}
@@ -0,0 +1,132 @@
+import asyncio
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, select, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+
+from app.database import Base, get_db
+from app.main import app
+from app.models import Industry, Job, Tag
+from app.services.pagination import decode_cursor, encode_cursor, keyset_page, keyset_query
+
+
+def rows(*ids):
+    return [SimpleNamespace(id=value, created_at=datetime(2026, 1, 1)) for value in ids]
+
+
+def test_keyset_page_returns_cursor_of_last_row_when_more_remain():
+    page, cursor = keyset_page(rows(1, 2, 3), 2, ["created_at", "id"])
+    assert [row.id for row in page] == [1, 2]
+    assert decode_cursor(cursor, [Job.created_at, Job.id]) == [datetime(2026, 1, 1), 2]
+
+
+def test_keyset_page_last_page_has_no_cursor():
+    assert keyset_page(rows(1, 2), 2, ["id"]) == (rows(1, 2), None)
+    assert keyset_page([], 5, ["id"]) == ([], None)
+
+
+def test_keyset_page_rejects_empty_pages():
+    with pytest.raises(ValueError):
+        keyset_page(rows(1), 0, ["id"])
+
+
+@pytest.mark.parametrize("cursor", ["", "not-base64!", encode_cursor([1]), encode_cursor(["x", 1]), encode_cursor([1, "2"])])
+def test_malformed_cursors_are_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor, [Job.created_at, Job.id])
+
+
+@pytest.fixture
+def session():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as session:
+        yield session
+    engine.dispose()
+
+
+def test_keyset_walk_visits_every_row_once_despite_ties_and_inserts(session):
+    same_time = datetime(2026, 3, 1, 12, 0, 0)
+    for index in range(23):
+        session.add(Job(title=f"job {index}", company_name="A", created_at=same_time if index % 2 else datetime(2026, 3, index + 1)))
+    session.commit()
+    expected = [job.id for job in session.scalars(select(Job).order_by(Job.created_at.desc(), Job.id.desc()))]
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        query = keyset_query(select(Job), [Job.created_at, Job.id], cursor, descending=True)
+        page, cursor = keyset_page(session.scalars(query.limit(6)).all(), 5, ["created_at", "id"])
+        seen += [job.id for job in page]
+        if len(seen) == 5:
+            # A newer row written mid-walk must not shift later pages
+            session.add(Job(title="late", company_name="B", created_at=datetime(2030, 1, 1)))
+            session.commit()
+    assert seen == expected
+
+
+def test_ascending_keyset_on_single_key(session):
+    session.add_all([Tag(name=f"tag{index}", code=f"tag{index}", category="skill") for index in range(7)])
+    session.commit()
+    page, cursor = keyset_page(session.scalars(keyset_query(select(Tag), [Tag.id], "").limit(4)).all(), 3, ["id"])
+    rest, end = keyset_page(session.scalars(keyset_query(select(Tag), [Tag.id], cursor).limit(11)).all(), 10, ["id"])
+    assert [tag.id for tag in page + rest] == list(range(1, 8))
+    assert end is None
+
+
+@pytest.mark.parametrize("path", ["/api/jobs", "/api/tags", "/api/industries", "/api/deliveries"])
+def test_cursor_endpoints_reject_non_positive_limits(path):
+    client = TestClient(app)
+    for limit in (0, -1):
+        response = client.get(path, params={"cursor": "", "limit": limit})
+        assert response.status_code == 422
+
+
+def test_industries_without_a_sort_order_stay_on_the_keyset_walk(session):
+    # Rows written without sort_order (seed scripts, raw SQL) get 0, never NULL
+    session.execute(text("INSERT INTO industries (code, name, is_active) VALUES ('a', 'A', 1), ('b', 'B', 1)"))
+    session.add_all([Industry(code=f"i{index}", name=f"I{index}", sort_order=index % 3) for index in range(7)])
+    session.commit()
+    keys = [Industry.sort_order, Industry.id]
+    expected = [industry.id for industry in session.scalars(select(Industry).order_by(*keys))]
+
+    seen, cursor = [], ""
+    while cursor is not None:
+        query = keyset_query(select(Industry), keys, cursor)
+        page, cursor = keyset_page(session.scalars(query.limit(3)).all(), 2, ["sort_order", "id"])
+        seen += [industry.id for industry in page]
+    assert seen == expected
+    assert len(seen) == 9
+
+    with pytest.raises(IntegrityError):
+        session.execute(text("INSERT INTO industries (code, name, sort_order) VALUES ('c', 'C', NULL)"))
+
+
+def test_industry_sort_order_cannot_be_cleared(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'industries.db'}")
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Industry.__table__.create)
+        async with sessions() as db:
+            db.add(Industry(id=1, code="it", name="互联网", sort_order=5))
+            await db.commit()
+
+    async def override_db():
+        async with sessions() as db:
+            yield db
+
+    asyncio.run(setup())
+    app.dependency_overrides[get_db] = override_db
+    try:
+        client = TestClient(app)
+        assert client.put("/api/industries/1", json={"sort_order": None}).status_code == 400
+        assert client.put("/api/industries/1", json={"sort_order": 2}).json()["sort_order"] == 2
+    finally:
+        app.dependency_overrides.pop(get_db, None)
+        asyncio.run(engine.dispose())
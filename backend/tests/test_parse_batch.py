@@ -0,0 +1,48 @@
+import asyncio
+import json
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routers import job_router
+from app.services.llm_service import llm_service
+
+
+def parsed(raw_content):
+    return {"title": raw_content, "company_name": "某某科技", "requirements": {}}
+
+
+def test_batch_streams_one_line_per_item_with_bounded_concurrency(monkeypatch):
+    monkeypatch.setattr(job_router.settings, "parse_batch_concurrency", 2)
+    in_flight, peak = 0, 0
+
+    async def parse_job_posting(raw_content, source_type):
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if raw_content == "bad":
+            raise ValueError("model returned nothing")
+        return parsed(raw_content)
+
+    monkeypatch.setattr(llm_service, "parse_job_posting", parse_job_posting)
+    items = [{"raw_content": text} for text in ["a", "b", "bad", "c", "d"]]
+    response = TestClient(app).post("/api/jobs/parse/batch", json={"items": items, "concurrency": 8})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert sorted(line["index"] for line in lines) == [0, 1, 2, 3, 4]
+    by_index = {line["index"]: line for line in lines}
+    assert by_index[2] == {"index": 2, "success": False, "error": "model returned nothing"}
+    assert by_index[3]["success"] and by_index[3]["result"]["title"] == "c"
+    # The request asked for 8, but the server-side cap wins
+    assert peak == 2
+
+
+def test_batch_rejects_more_items_than_the_limit(monkeypatch):
+    monkeypatch.setattr(job_router.settings, "parse_batch_max_items", 2)
+    items = [{"raw_content": "x"}] * 3
+    response = TestClient(app).post("/api/jobs/parse/batch", json={"items": items})
+    assert response.status_code == 400
@@ -0,0 +1,121 @@
+import asyncio
+
+import pytest
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.models import JobParseCache
+from app.services import parse_cache as parse_cache_module
+from app.services.parse_cache import ParseCache, build_cache_key, normalize_raw_content
+
+
+@pytest.mark.parametrize("repost", [
+    "岗位：后端开发\r\n公司：某某科技\r\n投递：hr@example.com",
+    "岗位：后端开发\r公司：某某科技\r投递：hr@example.com",
+    "  岗位：后端开发  \n\n公司：某某科技\t\n投递：hr＠example.com  ",
+    "岗位：后端开发\n　\n公司：某某科技\n投递：hr@example.com\n",
+])
+def test_reposts_with_different_whitespace_share_a_key(repost):
+    original = "岗位：后端开发\n公司：某某科技\n投递：hr@example.com"
+    # NFKC folds full-width punctuation; line breaks all become \n
+    assert normalize_raw_content(repost) == "岗位:后端开发\n公司:某某科技\n投递:hr@example.com"
+    assert build_cache_key(repost, "手动", "m", "v1") == build_cache_key(original, "手动", "m", "v1")
+
+
+def test_normalization_keeps_words_and_lines_apart():
+    assert normalize_raw_content("后端 开发") != normalize_raw_content("后端开发")
+    assert normalize_raw_content("后端\n开发") != normalize_raw_content("后端 开发")
+
+
+def test_key_depends_on_model_prompt_version_and_source():
+    base = build_cache_key("text", "手动", "model-a", "v1")
+    assert base != build_cache_key("text", "手动", "model-b", "v1")
+    assert base != build_cache_key("text", "手动", "model-a", "v2")
+    assert base != build_cache_key("text", "邮件", "model-a", "v1")
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'cache.db'}")
+
+    async def create():
+        async with engine.begin() as conn:
+            await conn.run_sync(JobParseCache.__table__.create)
+
+    asyncio.run(create())
+    monkeypatch.setattr(parse_cache_module, "AsyncSessionLocal", async_sessionmaker(engine, expire_on_commit=False))
+    cache = ParseCache()
+    cache.enabled = True
+    cache.max_entries = 10
+    cache.max_bytes = 10 ** 6
+    yield cache
+    asyncio.run(engine.dispose())
+
+
+async def stored_keys(cache):
+    async with parse_cache_module.AsyncSessionLocal() as session:
+        return set((await session.execute(select(JobParseCache.cache_key))).scalars())
+
+
+def test_put_then_get_round_trips_and_counts_hits(cache):
+    async def scenario():
+        await cache.put("k", {"title": "后端"}, "m", "v1")
+        return await cache.get("k"), await cache.get("missing")
+
+    assert asyncio.run(scenario()) == ({"title": "后端"}, None)
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_entry_budget_trims_least_recently_hit_to_target(cache):
+    async def scenario():
+        for index in range(10):
+            await cache.put(f"k{index}", {"i": index}, "m", "v1")
+        # A hit keeps the oldest entry from being trimmed
+        await cache.get("k0")
+        await cache.put("k10", {"i": 10}, "m", "v1")
+        return await stored_keys(cache)
+
+    keys = asyncio.run(scenario())
+    assert len(keys) == 9
+    assert "k0" in keys and "k10" in keys
+    assert not {"k1", "k2"} & keys
+    assert cache.evictions == 2
+    assert cache.entries == 9
+
+
+def test_byte_budget_trims_large_results(cache):
+    cache.max_bytes = 1000
+    payload = {"body": "x" * 300}
+
+    async def scenario():
+        for index in range(4):
+            await cache.put(f"k{index}", payload, "m", "v1")
+        return await stored_keys(cache)
+
+    keys = asyncio.run(scenario())
+    assert keys == {"k2", "k3"}
+    assert cache.total_bytes <= cache.max_bytes * parse_cache_module.TRIM_TARGET
+
+
+def test_eviction_only_runs_when_a_budget_is_crossed_or_the_sweep_is_due(cache, monkeypatch):
+    runs = []
+    evict = cache._evict
+
+    async def counting_evict(session, now):
+        runs.append(now)
+        await evict(session, now)
+
+    monkeypatch.setattr(cache, "_evict", counting_evict)
+
+    async def scenario():
+        for index in range(8):
+            await cache.put(f"k{index}", {"i": index}, "m", "v1")
+        # Overwriting an entry doesn't change the count
+        await cache.put("k0", {"i": 0}, "m", "v1")
+        async with parse_cache_module.AsyncSessionLocal() as session:
+            return (await session.execute(select(func.count(JobParseCache.id)))).scalar()
+
+    assert asyncio.run(scenario()) == 8
+    # Only the first write's expiry sweep
+    assert len(runs) == 1
+    assert cache.entries == 8
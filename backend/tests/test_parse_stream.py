@@ -0,0 +1,216 @@
+import asyncio
+import json
+from types import SimpleNamespace
+
+import httpx
+import openai
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.database import Base, get_db
+from app.main import app
+from app.models import Resume, ResumeParse
+from app.routers import resume_router
+from app.services import llm_service as llm_service_module
+from app.services.llm_providers import LLMProvider, ProviderPool
+from app.services.llm_service import LLMService
+from app.services.llm_telemetry import llm_telemetry
+from app.services.parse_cache import parse_cache
+
+REQUEST = httpx.Request("POST", "http://llm.test/v1/chat/completions")
+# No apply email, so the local fast path never answers on its own
+POSTING = "岗位：后端开发工程师\n公司名称：某某科技有限公司\n工作地点：北京\n要求：熟悉 Python"
+ANSWER = {"title": "后端开发工程师", "company_name": "某某科技有限公司", "requirements": {"skills": ["Python"]}}
+
+
+def chunk(content=None, arguments=None):
+    delta = SimpleNamespace(
+        content=content,
+        function_call=SimpleNamespace(arguments=arguments) if arguments is not None else None,
+    )
+    return SimpleNamespace(choices=[SimpleNamespace(delta=delta)], usage=None)
+
+
+class FakeStream:
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        await asyncio.sleep(0.01)
+        if not self.chunks:
+            raise StopAsyncIteration
+        return self.chunks.pop(0)
+
+    async def close(self):
+        pass
+
+
+class FakeCompletions:
+    """Answers with ANSWER; `unsupported` modes are rejected with a 400"""
+
+    def __init__(self, answer, unsupported=()):
+        self.text = json.dumps(answer, ensure_ascii=False)
+        self.unsupported = set(unsupported)
+        self.calls = []
+
+    async def create(self, **kwargs):
+        mode = "function" if kwargs.get("functions") else "json" if kwargs.get("response_format") else "plain"
+        self.calls.append((mode, bool(kwargs.get("stream"))))
+        if mode in self.unsupported:
+            raise openai.BadRequestError(
+                f"{mode} is not supported", response=httpx.Response(400, request=REQUEST), body=None
+            )
+        pieces = [self.text[i:i + 12] for i in range(0, len(self.text), 12)]
+        if kwargs.get("stream"):
+            if mode == "function":
+                return FakeStream(chunk(arguments=piece) for piece in pieces)
+            return FakeStream(chunk(content=piece) for piece in pieces)
+        message = SimpleNamespace(content=self.text, function_call=SimpleNamespace(arguments=self.text))
+        usage = SimpleNamespace(prompt_tokens=10, completion_tokens=20, total_tokens=30)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+def fake_service(monkeypatch, answer=ANSWER, unsupported=()) -> LLMService:
+    monkeypatch.setattr(parse_cache, "enabled", False)
+    monkeypatch.setattr(llm_service_module.settings, "llm_structured_output_mode", "auto")
+    provider = LLMProvider("fake", "http://llm.test/v1", "model-a", "key")
+    completions = FakeCompletions(answer, unsupported)
+    provider.client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    provider.governor.request_bucket.capacity = 0
+    provider.governor.token_bucket.capacity = 0
+    service = LLMService()
+    service.provider_pool = ProviderPool([provider])
+    service.client = provider.client
+    service.completions = completions
+    return service
+
+
+async def collect(events):
+    return [event async for event in events]
+
+
+def test_job_stream_emits_fields_then_final_and_records_usage(monkeypatch):
+    service = fake_service(monkeypatch)
+    before = llm_telemetry.completion_tokens[("parse_job_posting", "model-a")]
+    events = asyncio.run(collect(service.stream_job_posting(POSTING)))
+
+    assert service.completions.calls == [("function", True)]
+    llm_fields = [event["field"] for event in events if event["event"] == "field" and event["source"] == "llm"]
+    assert "requirements" in llm_fields
+    assert events[-1]["event"] == "final"
+    assert events[-1]["result"]["title"] == "后端开发工程师"
+    # Streamed calls record (estimated) token usage too
+    assert llm_telemetry.completion_tokens[("parse_job_posting", "model-a")] > before
+    assert service.provider_pool.providers[0].governor.limiter.in_flight == 0
+
+
+def test_rejected_stream_mode_is_not_repeated_by_the_fallback(monkeypatch):
+    service = fake_service(monkeypatch, unsupported={"function"})
+    events = asyncio.run(collect(service.stream_job_posting(POSTING)))
+
+    # function (streamed) was rejected, so the non-streaming chain starts at json
+    assert service.completions.calls == [("function", True), ("json", False)]
+    assert events[-1]["result"]["company_name"] == "某某科技有限公司"
+    assert [entry["mode"] for entry in service.get_mode_info()["learned"]] == ["json"]
+
+
+def test_identical_streams_share_one_model_call(monkeypatch):
+    service = fake_service(monkeypatch)
+
+    async def scenario():
+        return await asyncio.gather(
+            collect(service.stream_job_posting(POSTING)),
+            collect(service.stream_job_posting(POSTING)),
+            service.parse_job_posting(POSTING),
+        )
+
+    leader, follower, plain = asyncio.run(scenario())
+    assert service.completions.calls == [("function", True)]
+    assert leader[-1]["result"] == follower[-1]["result"] == plain
+    # The follower still reports every field, just all at once
+    assert {event["field"] for event in follower if event["event"] == "field"} >= {"title", "company_name", "requirements"}
+
+
+def test_resume_stream_reports_llm_fields(monkeypatch):
+    answer = {"name": "张三", "skills": ["Python", "SQL"], "education": ["本科"]}
+    service = fake_service(monkeypatch, answer=answer)
+    events = asyncio.run(collect(service.stream_resume("姓名：张三\n技能：Python、SQL\n本科")))
+
+    assert service.completions.calls == [("json", True)]
+    assert ("skills", ["Python", "SQL"]) in [(event["field"], event["value"]) for event in events if event["event"] == "field"]
+    assert events[-1]["result"]["parsed_fields"]["skills"] == ["Python", "SQL"]
+
+
+def sse_events(text):
+    events = []
+    for block in text.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+def test_job_sse_endpoint(monkeypatch):
+    service = fake_service(monkeypatch)
+    monkeypatch.setattr("app.routers.job_router.llm_service", service)
+    response = TestClient(app).post("/api/jobs/parse/stream", json={"raw_content": POSTING})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    events = sse_events(response.text)
+    assert {name for name, _ in events[:-1]} == {"field"}
+    assert events[-1][0] == "final"
+    assert events[-1][1]["title"] == "后端开发工程师"
+
+
+def test_job_sse_endpoint_reports_errors_as_events(monkeypatch):
+    async def failing(raw_content, source_type):
+        raise ValueError("LLM client not configured. Please set API key.")
+        yield
+
+    monkeypatch.setattr("app.routers.job_router.llm_service.stream_job_posting", failing)
+    events = sse_events(TestClient(app).post("/api/jobs/parse/stream", json={"raw_content": POSTING}).text)
+    assert events == [("error", {"detail": "LLM client not configured. Please set API key."})]
+
+
+@pytest.fixture
+def resume_db(tmp_path, monkeypatch):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'resumes.db'}")
+    sessions = async_sessionmaker(engine, expire_on_commit=False)
+    resume_file = tmp_path / "resume.txt"
+    resume_file.write_text("姓名：张三\n技能：Python、SQL\n本科", encoding="utf-8")
+
+    async def setup():
+        async with engine.begin() as conn:
+            await conn.run_sync(Base.metadata.create_all, tables=[Resume.__table__, ResumeParse.__table__])
+        async with sessions() as session:
+            session.add(Resume(id=1, filename="resume.txt", storage_path=str(resume_file)))
+            await session.commit()
+
+    async def override_db():
+        async with sessions() as session:
+            yield session
+
+    asyncio.run(setup())
+    monkeypatch.setattr(resume_router, "AsyncSessionLocal", sessions)
+    app.dependency_overrides[get_db] = override_db
+    yield
+    app.dependency_overrides.pop(get_db, None)
+    asyncio.run(engine.dispose())
+
+
+def test_resume_sse_endpoint_streams_fields_and_saves_the_parse(monkeypatch, resume_db):
+    service = fake_service(monkeypatch, answer={"name": "张三", "skills": ["Python", "SQL"]})
+    monkeypatch.setattr(resume_router, "llm_service", service)
+    client = TestClient(app)
+    events = sse_events(client.post("/api/resumes/1/parse/stream").text)
+
+    assert ("field", {"field": "skills", "value": ["Python", "SQL"], "source": "llm"}) in events
+    name, final = events[-1]
+    assert name == "final"
+    assert final["version"] == 1 and final["status"] == "parsed"
+    assert final["parsed_fields"]["skills"] == ["Python", "SQL"]
+    assert client.post("/api/resumes/404/parse/stream").status_code == 404
@@ -0,0 +1,58 @@
+from app.services.posting_splitter import split_job_postings
+
+FIRST_WITHOUT_EMAIL = """1、字节跳动 后端开发实习生
+岗位职责：参与抖音服务端的开发与维护
+投递方式：扫描下方二维码或访问 https://jobs.bytedance.com/campus 投递
+2、腾讯 产品经理实习生
+岗位职责：负责微信支付相关产品的需求分析
+投递邮箱：campus@tencent.com
+3、美团 算法工程师
+岗位职责：负责配送调度算法的研发与优化
+投递邮箱：hr@meituan.com
+"""
+
+
+def test_first_posting_applying_by_link_is_kept():
+    chunks, dropped = split_job_postings(FIRST_WITHOUT_EMAIL)
+    assert dropped == 0
+    assert len(chunks) == 3
+    assert chunks[0].startswith("1、字节跳动 后端开发实习生")
+    assert "campus@tencent.com" in chunks[1]
+
+
+def test_article_intro_before_first_heading_is_dropped():
+    text = "各位同学好，本期为大家汇总了最近一周收集到的春招信息，欢迎转发给身边有需要的朋友们。\n" + FIRST_WITHOUT_EMAIL
+    chunks, _ = split_job_postings(text)
+    assert len(chunks) == 3
+    assert chunks[0].startswith("1、字节跳动")
+
+
+def test_numbered_duty_list_stays_in_its_posting():
+    text = """【腾讯】后端开发工程师
+岗位职责：
+1、负责后台服务的开发与维护工作
+2、参与系统架构设计
+投递邮箱：a@tencent.com
+【阿里巴巴】前端开发工程师
+负责淘宝前端页面开发，熟悉 React
+投递邮箱：b@alibaba-inc.com
+"""
+    chunks, _ = split_job_postings(text)
+    assert len(chunks) == 2
+    assert "2、参与系统架构设计" in chunks[0]
+
+
+def test_single_posting_is_returned_whole():
+    text = "招聘后端开发工程师，负责服务端开发，熟悉 Go 或 Java，简历投递 hr@example.com"
+    assert split_job_postings(text) == ([text], 0)
+
+
+def test_overflow_beyond_max_chunks_is_reported():
+    text = "".join(
+        f"{index}、某某科技有限公司 测试工程师\n负责自动化测试平台建设与维护\n投递邮箱：hr{index}@example.com\n"
+        for index in range(1, 6)
+    )
+    chunks, dropped = split_job_postings(text, max_chunks=3)
+    assert len(chunks) == 3
+    assert dropped == 2
+    assert "hr3@example.com" in chunks[2]
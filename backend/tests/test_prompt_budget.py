@@ -0,0 +1,88 @@
+import pytest
+
+from app.services import prompt_budget
+from app.services.prompt_budget import clean_boilerplate, compact_text, count_tokens, prompt_budget_for
+
+POSTING = "\n".join([
+    "【某某科技】后端开发工程师",
+    "工作地点：北京",
+    "",
+    "公司简介",
+    "某某科技成立于二零一零年，" * 20,
+    "",
+    "岗位职责：",
+    "负责交易系统的设计与开发，参与高并发服务的性能优化。",
+    "",
+    "任职要求：",
+    "熟悉 Python 或 Go，了解 MySQL、Redis 和 Kafka。",
+    "",
+    "投递邮箱：hr@example.com",
+])
+
+
+def test_cjk_counts_one_token_per_character():
+    assert count_tokens("") == 0
+    assert count_tokens("后端开发") == 4
+    assert count_tokens("abcdefgh") == 2
+    assert count_tokens("后端 dev") == 3
+
+
+def test_boilerplate_and_duplicates_are_dropped():
+    text = "岗位：后端开发\n长按识别二维码关注我们\n-----\n欢迎转发分享\n岗位职责：负责后端开发\n岗位职责：负责后端开发\n投递：hr@example.com"
+    assert clean_boilerplate(text) == "岗位：后端开发\n岗位职责：负责后端开发\n投递：hr@example.com"
+
+
+def test_text_within_budget_is_only_cleaned():
+    text, stats = compact_text("岗位：后端开发\n\n\n\n地点：北京", budget=100)
+    assert text == "岗位：后端开发\n\n地点：北京"
+    # Only the collapsed blank lines are saved
+    assert stats["saved_tokens"] <= 1
+
+
+@pytest.mark.parametrize("budget", [80, 120])
+def test_over_budget_posting_keeps_the_opening_contact_and_requirements(budget):
+    text, stats = compact_text(POSTING, budget=budget)
+
+    assert count_tokens(text) <= budget
+    assert stats["sent_tokens"] == count_tokens(text)
+    assert stats["saved_tokens"] == stats["original_tokens"] - stats["sent_tokens"] > 0
+    assert text.startswith("【某某科技】后端开发工程师")
+    assert "hr@example.com" in text
+    assert "任职要求" in text
+    # The company intro is the first thing to go
+    assert "公司简介" not in text
+
+
+def test_contact_details_outlive_the_other_sections():
+    text, _ = compact_text(POSTING, budget=40)
+    assert count_tokens(text) <= 40
+    assert "hr@example.com" in text
+    assert "公司简介" not in text
+
+
+def test_a_single_long_section_is_cut_at_the_budget_keeping_its_start():
+    body = "负责后端服务开发" + "，参与系统设计与性能优化" * 50
+    text, _ = compact_text(body, budget=30)
+
+    assert body.startswith(text)
+    assert count_tokens(text) <= 30
+    assert count_tokens(text) >= 25
+
+
+def test_truncation_does_not_split_past_the_budget_in_mixed_text():
+    body = "熟悉 Python、Go 和 Kubernetes，" * 30
+    text, _ = compact_text(body, budget=40)
+    assert body.startswith(text)
+    assert count_tokens(text) <= 40
+    # The cut lands at the budget rather than well short of it
+    assert count_tokens(text) >= 38
+
+
+def test_model_overrides_win_over_the_default_budgets(monkeypatch):
+    monkeypatch.setattr(prompt_budget.settings, "prompt_budget_job_tokens", 3000)
+    monkeypatch.setattr(prompt_budget.settings, "prompt_budget_resume_tokens", 4000)
+    monkeypatch.setattr(prompt_budget.settings, "prompt_budget_model_overrides", {"small-model": {"job": 800}})
+
+    assert prompt_budget_for("small-model", "job") == 800
+    assert prompt_budget_for("small-model", "resume") == 4000
+    assert prompt_budget_for("other-model", "job") == 3000
@@ -0,0 +1,101 @@
+from datetime import datetime
+
+import pytest
+
+from app.services.match_features import build_job_features
+from app.services.match_index import MatchIndex
+from app.services.semantic_index import SemanticIndex, job_text, np
+
+pytestmark = pytest.mark.skipif(np is None, reason="numpy is not installed")
+
+JOBS = [
+    (1, "后端开发工程师", {"skills": ["Python", "Django", "MySQL"], "location": "北京"}, "负责交易系统后端服务开发"),
+    (2, "前端开发工程师", {"skills": ["JavaScript", "React", "CSS"], "location": "上海"}, "负责网页与小程序前端开发"),
+    (3, "数据分析师", {"skills": ["SQL", "Excel", "Tableau"], "location": "北京"}, "负责业务数据分析与报表"),
+    (4, "机器学习工程师", {"skills": ["Python", "PyTorch", "机器学习"], "location": "深圳"}, "负责推荐算法模型训练"),
+    (5, "运维工程师", {"skills": ["Linux", "Docker", "Kubernetes"], "location": "上海"}, "负责集群部署与监控"),
+    (6, "产品经理", {"skills": ["Axure", "需求分析"], "location": "北京"}, "负责产品规划与需求文档"),
+]
+
+
+def text_of(job):
+    _, title, requirements, raw_content = job
+    return job_text(title, requirements, raw_content)
+
+
+@pytest.fixture
+def built(tmp_path):
+    index = SemanticIndex()
+    index.directory = tmp_path
+    index._build_files(JOBS, datetime.utcnow())
+    index.loaded = True
+    return index
+
+
+def nearest(index, text, k=1):
+    return [job_id for job_id, _ in index.search(index.model.embed(text), k)]
+
+
+def test_search_finds_the_closest_job(built):
+    assert nearest(built, "Kubernetes Docker 集群运维") == [5]
+    assert nearest(built, "React 前端页面开发") == [2]
+    assert len(nearest(built, "工程师", k=10)) == len(JOBS)
+
+
+def test_upsert_update_and_remove_keep_one_live_row_per_job(built):
+    added = job_text("Python 数据工程师", {"skills": ["Python", "SQL", "Spark"]}, "负责数据仓库开发")
+    built.upsert(7, added, True)
+    # The basis was fitted without it, but a job is still closest to its own text
+    assert nearest(built, added) == [7]
+
+    # Job 5 is rewritten as a frontend job; its old vector is left as a dead row
+    built.upsert(5, job_text("前端开发工程师", {"skills": ["Vue", "React"]}, "负责中后台前端开发"), True)
+    built.remove(2)
+    built.upsert(3, text_of(JOBS[2]), False)
+
+    assert set(built.job_row) == {1, 4, 5, 6, 7}
+    assert int(built.active.sum()) == len(built.job_row)
+    assert built.rows == len(JOBS) + 4
+    assert nearest(built, "React 前端页面开发") == [5]
+    assert 2 not in nearest(built, "React 前端页面开发", k=10)
+    assert 3 not in nearest(built, "SQL 数据分析 报表", k=10)
+
+
+def test_reloading_the_files_restores_the_same_index(built, tmp_path):
+    built.upsert(7, job_text("iOS 开发工程师", {"skills": ["Swift"]}, "负责 App 开发"), True)
+    built.remove(1)
+    query = built.model.embed("Python 后端开发")
+
+    reloaded = SemanticIndex()
+    reloaded.directory = tmp_path
+    assert reloaded._load_files()
+    assert reloaded.job_row == built.job_row
+    assert reloaded.search(query, 3) == pytest.approx(built.search(query, 3))
+
+
+def test_an_interrupted_append_is_cut_back_on_load(built, tmp_path):
+    with open(tmp_path / "rows.i64", "ab") as f:
+        f.write(np.array([99, 0], dtype=np.int64).tobytes())
+
+    reloaded = SemanticIndex()
+    reloaded.directory = tmp_path
+    assert reloaded._load_files()
+    assert 99 not in reloaded.job_row
+    assert reloaded.rows == len(JOBS)
+
+
+def test_match_returns_top_n_within_the_filters(built):
+    index = MatchIndex()
+    index.loaded = True
+    for job_id, title, requirements, _ in JOBS:
+        index.upsert(job_id, build_job_features(title, requirements), True)
+    resume = {"skills": ["Python", "MySQL"], "keywords": ["后端开发"]}
+
+    results = built.match(resume, 3, None, index)
+    assert [item["job_id"] for item in results][:1] == [1]
+    assert len(results) == 3
+    assert results == sorted(results, key=lambda item: (-item["score"], item["job_id"]))
+
+    in_beijing = built.match(resume, 5, "北京", index)
+    assert {item["job_id"] for item in in_beijing} == {1, 3, 6}
+    assert [item["job_id"] for item in built.match(resume, 5, None, index, job_ids={2, 4})] in ([4, 2], [2, 4])
@@ -0,0 +1,90 @@
+import asyncio
+
+import pytest
+
+from app.services.llm_service import LLMService
+
+
+@pytest.fixture
+def service():
+    return LLMService()
+
+
+def test_concurrent_identical_calls_reach_the_backend_once(service):
+    calls = []
+
+    async def backend():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {"title": "后端", "requirements": {"skills": ["Python"]}}
+
+    async def scenario():
+        return await asyncio.gather(*(service._single_flight("job:k", backend) for _ in range(5)))
+
+    results = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert all(result == results[0] for result in results)
+    stats = service.get_coalescing_stats()
+    assert (stats["executed_calls"], stats["coalesced_calls"], stats["in_flight"]) == (1, 4, 0)
+
+
+def test_every_caller_gets_an_independent_copy(service):
+    shared = {"title": "后端", "requirements": {"skills": ["Python"]}}
+
+    async def backend():
+        await asyncio.sleep(0.01)
+        return shared
+
+    async def leader():
+        result = await service._single_flight("job:k", backend)
+        # A leader mutating its result must not leak into what followers get
+        result["requirements"]["skills"].append("Leaked")
+        return result
+
+    async def follower():
+        await asyncio.sleep(0)
+        return await service._single_flight("job:k", backend)
+
+    async def scenario():
+        return await asyncio.gather(leader(), follower(), follower())
+
+    first, second, third = asyncio.run(scenario())
+    assert second["requirements"]["skills"] == ["Python"]
+    assert third["requirements"]["skills"] == ["Python"]
+    assert second is not third
+    assert first is not shared and shared["requirements"]["skills"] == ["Python"]
+
+
+def test_leader_exception_reaches_every_waiter(service):
+    calls = []
+
+    async def backend():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        raise ValueError("model returned nothing")
+
+    async def scenario():
+        return await asyncio.gather(
+            *(service._single_flight("job:k", backend) for _ in range(3)),
+            return_exceptions=True
+        )
+
+    errors = asyncio.run(scenario())
+    assert len(calls) == 1
+    assert [str(error) for error in errors] == ["model returned nothing"] * 3
+    assert service.get_coalescing_stats()["in_flight"] == 0
+
+
+def test_different_keys_do_not_coalesce(service):
+    calls = []
+
+    async def backend():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return {}
+
+    async def scenario():
+        await asyncio.gather(service._single_flight("job:a", backend), service._single_flight("job:b", backend))
+
+    asyncio.run(scenario())
+    assert len(calls) == 2
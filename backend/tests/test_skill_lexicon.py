@@ -0,0 +1,49 @@
+import pytest
+
+from app.services.skill_lexicon import SkillLexicon, load_lexicon_entries
+
+lexicon = SkillLexicon(load_lexicon_entries())
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("熟悉 k8s、py 和 SpringBoot", ["Kubernetes", "Python", "Spring Boot"]),
+    ("精通 JavaScript", ["JavaScript"]),
+    ("C++/Java", ["C++", "Java"]),
+    ("熟悉Go和Golang", ["Go"]),
+])
+def test_synonyms_map_to_canonical_names(text, expected):
+    assert lexicon.extract(text) == expected
+
+
+@pytest.mark.parametrize("text", [
+    "Own our go-to market strategy",
+    "Go to market with the sales team",
+    "You excel at communication",
+    "Candidates who excel in fast-paced teams",
+    "let us go",
+])
+def test_ambiguous_words_are_not_skills(text):
+    assert "Go" not in lexicon.extract(text)
+    assert "Excel" not in lexicon.extract(text)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("Backend services in Go and Rust", "Go"),
+    ("GO 开发经验", "Go"),
+    ("熟悉 go 语言", "Go"),
+    ("会用excel做报表", "Excel"),
+    ("Advanced Excel skills", "Excel"),
+    ("MS Excel", "Excel"),
+])
+def test_ambiguous_skills_still_match_as_skills(text, expected):
+    assert expected in lexicon.extract(text)
+
+
+def test_hyphen_joins_words_except_before_common_suffixes():
+    assert lexicon.extract("Python-based tooling, Java-related work") == ["Python", "Java"]
+    assert lexicon.extract("spring-boot") == ["Spring Boot"]
+    assert "Go" not in lexicon.extract("non-go zone")
+
+
+def test_normalize_keeps_unknown_skills_as_written():
+    assert lexicon.normalize(["k8s", "Kubernetes", " 炼丹 "]) == ["Kubernetes", "炼丹"]
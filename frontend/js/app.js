@@ -61,6 +61,40 @@ const api = {
       method: 'POST',
       body: { raw_content: rawContent, source_type: sourceType },
     }),
+  // 批量解析：服务端按完成顺序逐行返回 NDJSON，每解析完一条回调一次 onItem
+  parseJobsBatch: async (rawContents, onItem, sourceType = '手动') => {
+    const response = await fetch(`${API_BASE_URL}/jobs/parse/batch`, {
+      method: 'POST',
+      headers: { 'Content-Type': 'application/json' },
+      body: JSON.stringify({
+        items: rawContents.map((rawContent) => ({ raw_content: rawContent, source_type: sourceType })),
+      }),
+    });
+    if (!response.ok) {
+      throw new Error((await response.text()) || `HTTP ${response.status}`);
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    const results = new Array(rawContents.length);
+    let buffer = '';
+    const flushLine = (line) => {
+      if (!line.trim()) return;
+      const item = JSON.parse(line);
+      results[item.index] = item;
+      if (onItem) onItem(item);
+    };
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split('\n');
+      buffer = lines.pop();
+      lines.forEach(flushLine);
+    }
+    flushLine(buffer);
+    return results;
+  },
   createJob: (jobData) => 
     apiRequest('/jobs', {
       method: 'POST',